@@ -5,7 +5,8 @@ Two routers:
 * ``event_router`` (``/api/analytics``) — ``POST /event`` accepts safe usage
   signals from any authenticated user. User/org are derived from the token, never
   from the request body. Works regardless of MULTI_TENANT_ENABLED. Event names are
-  validated against an allowlist and metadata is sanitized (PHI stripped).
+  validated against an allowlist and metadata is sanitized (PHI stripped). The
+  response reports whether the event was written, ``queued`` or ``dropped``.
 
 * ``owner_router`` (``/api/owner/analytics``) — ``GET /summary`` is platform
   owner / super-admin only. It returns counts, plan/billing breakdowns, an
@@ -58,7 +59,11 @@ async def record_event(payload: AnalyticsEvent, request: Request):
 
     Does NOT require multi-tenant mode. Identity (org_id / case_manager_id) is
     taken from the token only. Unknown event names are rejected (422); metadata
-    is always sanitized so PHI-like keys can never be persisted."""
+    is always sanitized so PHI-like keys can never be persisted.
+
+    The response says what happened to the event: written inline (``event_id``
+    set), ``queued`` for the background writer (``event_id`` is null), or
+    ``dropped`` because the write queue was full (``success`` is false)."""
     user = require_user(request)
 
     event_type = (payload.event_type or "").strip().lower()
@@ -84,7 +89,12 @@ async def record_event(payload: AnalyticsEvent, request: Request):
         referrer=payload.referrer,
         metadata=payload.metadata,
     )
-    return {"success": True, "event_id": result["event_id"]}
+    return {
+        "success": not result["dropped"],
+        "event_id": result["event_id"],
+        "queued": result["queued"],
+        "dropped": result["dropped"],
+    }
 
 
 # ── Owner analytics summary ──────────────────────────────────────────────────
@@ -9,16 +9,37 @@ Hard safety rule: metadata is sanitized before it is ever written. Any key that
 looks like PHI / protected client content is dropped, values are coerced to safe
 scalars, strings are length-capped, and the whole object is size-capped. There is
 no code path that stores raw client data here.
+
+Event capture is kept off the request path: once ``start_analytics_writer`` has
+run (app lifespan), ``record_event`` only sanitizes and queues the row, and a
+writer thread inserts queued rows with one ``executemany`` per transaction
+every ``CMSX_ANALYTICS_FLUSH_MS`` (default 1000) or as soon as
+``CMSX_ANALYTICS_BATCH_SIZE`` (default 500) rows are waiting. The queue holds at
+most ``CMSX_ANALYTICS_QUEUE_SIZE`` (default 10000) rows; past that new events
+are dropped and counted (``CMSX_ANALYTICS_OVERFLOW=inline`` writes them on the
+caller instead). Without a running writer, or with ``CMSX_ANALYTICS_BUFFER=0``,
+events are written inline as before. Reads flush the queue first.
+
+Aggregate reads come from hourly and daily rollup tables that triggers on
+``analytics_events`` keep current, so the owner dashboard costs O(days) rather
+than O(events). A rolling window is answered exactly: whole days from the daily
+rollup, the rest of the cutoff day from the hourly rollup, and only the cutoff
+hour itself from raw events.
 """
 from __future__ import annotations
 
 import json
 import logging
+import os
 import sqlite3
+import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import backend.shared.db_path as db_path_mod
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +119,34 @@ ALLOWED_WINDOW_DAYS = (7, 30, None)
 # the column name is never taken from user input (no SQL injection surface).
 ATTRIBUTION_COLUMNS = ("source", "medium", "campaign")
 
+# ── Rollups ──────────────────────────────────────────────────────────────────
+#
+# Each rollup row counts events per time bucket and per combination of these
+# columns. NULLs are stored as '' so the composite primary key can upsert.
+ROLLUP_DIMENSIONS = ("event_type", "module", "org_id", "case_manager_id", "source", "medium", "campaign")
+# table -> length of the ``created_at`` prefix that forms its bucket
+ROLLUP_TABLES = {"analytics_rollup_hourly": 13, "analytics_rollup_daily": 10}
+
+EVENT_COLUMNS = (
+    "event_type", "route", "module", "org_id", "case_manager_id",
+    "source", "medium", "campaign", "referrer", "metadata_json", "created_at",
+)
+
+
+def _rollup_change(table: str, width: int, ref: str, delta: int) -> str:
+    """Trigger statement(s) adding ``delta`` to the bucket of row ``ref`` (NEW/OLD)."""
+    dims = ", ".join(ROLLUP_DIMENSIONS)
+    bucket = f"substr({ref}.created_at, 1, {width})"
+    values = ", ".join(f"COALESCE({ref}.{dim}, '')" for dim in ROLLUP_DIMENSIONS)
+    sql = (
+        f"INSERT INTO {table} (bucket, {dims}, event_count) VALUES ({bucket}, {values}, {delta})"
+        f" ON CONFLICT (bucket, {dims}) DO UPDATE SET event_count = event_count + excluded.event_count;"
+    )
+    if delta < 0:
+        matches = " AND ".join(f"{dim} = COALESCE({ref}.{dim}, '')" for dim in ROLLUP_DIMENSIONS)
+        sql += f" DELETE FROM {table} WHERE bucket = {bucket} AND {matches} AND event_count <= 0;"
+    return sql
+
 
 def normalize_window_days(window: Any) -> Optional[int]:
     """Coerce a ``window`` request value to one of ALLOWED_WINDOW_DAYS.
@@ -177,6 +226,28 @@ def sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any
 class AnalyticsStore:
     """Thin SQLite wrapper for the analytics event log."""
 
+    def __init__(self) -> None:
+        self.queue_size = env_int("CMSX_ANALYTICS_QUEUE_SIZE", 10000)
+        self.batch_size = max(1, env_int("CMSX_ANALYTICS_BATCH_SIZE", 500))
+        self.flush_seconds = env_int("CMSX_ANALYTICS_FLUSH_MS", 1000) / 1000
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._queue: Deque[tuple] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    @staticmethod
+    def buffering_enabled() -> bool:
+        return env_bool("CMSX_ANALYTICS_BUFFER", True)
+
+    @staticmethod
+    def overflow_policy() -> str:
+        policy = os.environ.get("CMSX_ANALYTICS_OVERFLOW", "drop").strip().lower()
+        return policy if policy in ("drop", "inline") else "drop"
+
     def _db_path(self):
         # Resolve dynamically so a monkeypatched/redirected DB_DIR is honored.
         return db_path_mod.DB_DIR / DB_FILENAME
@@ -184,10 +255,9 @@ class AnalyticsStore:
     def _connect(self) -> sqlite3.Connection:
         path = self._db_path()
         path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
-        conn.row_factory = sqlite3.Row
-        self._ensure_schema(conn)
-        return conn
+        # Schema setup is idempotent; the pool runs it once per physical
+        # connection rather than on every call.
+        return get_connection(path, row_factory=sqlite3.Row, on_open=self._ensure_schema)
 
     def _ensure_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
@@ -217,6 +287,61 @@ class AnalyticsStore:
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_analytics_events_created_at ON analytics_events(created_at)"
         )
+        self._ensure_rollups(conn)
+
+    def _ensure_rollups(self, conn: sqlite3.Connection) -> None:
+        """Hourly / daily rollup tables kept current by triggers on ``analytics_events``.
+
+        Triggers (rather than the writer) maintain them so every write path —
+        batched inserts, backfills, manual corrections — stays consistent.
+        Existing event logs are rolled up once when the tables are created.
+        """
+        existing = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'analytics_rollup_%'")
+        }
+        dims = ", ".join(ROLLUP_DIMENSIONS)
+        for table, width in ROLLUP_TABLES.items():
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    bucket TEXT NOT NULL,
+                    {", ".join(f"{dim} TEXT NOT NULL DEFAULT ''" for dim in ROLLUP_DIMENSIONS)},
+                    event_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (bucket, {dims})
+                ) WITHOUT ROWID
+                """
+            )
+            if table not in existing:
+                conn.execute(
+                    f"""
+                    INSERT INTO {table} (bucket, {dims}, event_count)
+                    SELECT substr(created_at, 1, {width}),
+                           {", ".join(f"COALESCE({dim}, '')" for dim in ROLLUP_DIMENSIONS)},
+                           COUNT(*)
+                    FROM analytics_events
+                    GROUP BY 1, {", ".join(str(n) for n in range(2, len(ROLLUP_DIMENSIONS) + 2))}
+                    """
+                )
+        tables = ROLLUP_TABLES.items()
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS analytics_events_rollup_insert AFTER INSERT ON analytics_events BEGIN "
+            + " ".join(_rollup_change(table, width, "NEW", 1) for table, width in tables)
+            + " END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS analytics_events_rollup_delete AFTER DELETE ON analytics_events BEGIN "
+            + " ".join(_rollup_change(table, width, "OLD", -1) for table, width in tables)
+            + " END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS analytics_events_rollup_update AFTER UPDATE OF created_at, {dims}"
+            " ON analytics_events BEGIN "
+            + " ".join(_rollup_change(table, width, "OLD", -1) for table, width in tables)
+            + " "
+            + " ".join(_rollup_change(table, width, "NEW", 1) for table, width in tables)
+            + " END"
+        )
 
     # ── Writes ───────────────────────────────────────────────────────────────
 
@@ -236,49 +361,159 @@ class AnalyticsStore:
     ) -> Dict[str, Any]:
         """Insert one sanitized event. ``event_type`` is assumed already validated
         by the caller (the endpoint enforces the allowlist). Metadata is always
-        sanitized here as a defense-in-depth backstop."""
+        sanitized here as a defense-in-depth backstop.
+
+        ``event_id`` is only known for inline writes; a buffered event reports
+        ``queued`` and one lost to a full queue reports ``dropped``."""
         clean_metadata, dropped = sanitize_metadata(metadata)
         module_norm = _trim(module)
         if module_norm:
             module_norm = module_norm.lower()
-        created_at = datetime.utcnow().isoformat()
-        with self._connect() as conn:
-            cur = conn.execute(
-                """
-                INSERT INTO analytics_events (
-                    event_type, route, module, org_id, case_manager_id,
-                    source, medium, campaign, referrer, metadata_json, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(event_type).strip()[:64],
-                    _trim(route),
-                    module_norm,
-                    _trim(org_id, 128),
-                    _trim(case_manager_id, 128),
-                    _trim(source),
-                    _trim(medium),
-                    _trim(campaign),
-                    _trim(referrer),
-                    json.dumps(clean_metadata) if clean_metadata else None,
-                    created_at,
-                ),
-            )
-            conn.commit()
-            event_id = cur.lastrowid
+        row = (
+            str(event_type).strip()[:64],
+            _trim(route),
+            module_norm,
+            _trim(org_id, 128),
+            _trim(case_manager_id, 128),
+            _trim(source),
+            _trim(medium),
+            _trim(campaign),
+            _trim(referrer),
+            json.dumps(clean_metadata) if clean_metadata else None,
+            datetime.utcnow().isoformat(),
+        )
         if dropped:
             logger.info(
                 "analytics: dropped %d unsafe metadata key(s) from %s event",
                 len(dropped),
                 event_type,
             )
-        return {"event_id": event_id, "dropped_metadata_keys": dropped}
+        if self.is_running and self.buffering_enabled():
+            if self._enqueue(row):
+                return {"event_id": None, "dropped_metadata_keys": dropped, "queued": True, "dropped": False}
+            if self.overflow_policy() == "drop":
+                return {"event_id": None, "dropped_metadata_keys": dropped, "queued": False, "dropped": True}
+        with self._connect() as conn:
+            cur = conn.execute(self._insert_sql(), row)
+            conn.commit()
+            event_id = cur.lastrowid
+        self._record("inline_writes")
+        return {"event_id": event_id, "dropped_metadata_keys": dropped, "queued": False, "dropped": False}
+
+    @staticmethod
+    def _insert_sql() -> str:
+        return (
+            f"INSERT INTO analytics_events ({', '.join(EVENT_COLUMNS)})"
+            f" VALUES ({', '.join('?' for _ in EVENT_COLUMNS)})"
+        )
+
+    # ── Buffered writer ──────────────────────────────────────────────────────
+
+    def _enqueue(self, row: tuple) -> bool:
+        with self._lock:
+            if len(self._queue) >= self.queue_size:
+                self._metrics["dropped"] += 1
+                return False
+            self._queue.append(row)
+            self._metrics["queued"] += 1
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Write every queued event now, ``batch_size`` rows per transaction; returns how many."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return written
+                try:
+                    with self._connect() as conn:
+                        conn.executemany(self._insert_sql(), batch)
+                        conn.commit()
+                except Exception as exc:  # noqa: BLE001 — keep the rows for the next flush
+                    logger.warning("analytics: batch of %d event(s) not written: %s", len(batch), exc)
+                    with self._lock:
+                        room = max(0, self.queue_size - len(self._queue))
+                        self._queue.extendleft(reversed(batch[:room]))
+                        self._metrics["failed_batches"] += 1
+                        self._metrics["dropped"] += len(batch) - min(room, len(batch))
+                    return written
+                written += len(batch)
+                with self._lock:
+                    self._metrics["written"] += len(batch)
+                    self._metrics["batches"] += 1
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+            self._thread.start()
+        logger.info("Analytics event writer started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        self._stop.set()
+        self._wake.set()
+        if thread and thread.is_alive():
+            thread.join(timeout=timeout)
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+        # Events queued while the writer was stopping.
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def _record(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._metrics[name] += amount
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "queued": 0,
+                "written": 0,
+                "batches": 0,
+                "inline_writes": 0,
+                "dropped": 0,
+                "failed_batches": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["pending"] = len(self._queue)
+        snapshot["running"] = self.is_running
+        snapshot["buffering"] = self.buffering_enabled()
+        snapshot["queue_size"] = self.queue_size
+        snapshot["batch_size"] = self.batch_size
+        return snapshot
 
     # ── Reads (aggregates only — never raw rows to callers) ──────────────────
     #
     # Every read accepts an optional ``since_days`` rolling window. ``None`` means
-    # all-time. The cutoff is applied as ``created_at >= ?`` against the stored ISO
-    # timestamps, so windowing needs no schema change.
+    # all-time. The cutoff is compared against the stored ISO timestamps, so
+    # windowing needs no schema change. Aggregates read ``_window_rows``; only
+    # ``recent_events`` touches raw rows.
+
+    def _read_connection(self) -> sqlite3.Connection:
+        # Read-your-writes: queued events land before anything is counted.
+        self.flush()
+        return self._connect()
 
     @staticmethod
     def _window_clause(since_days: Optional[int]) -> Tuple[str, list]:
@@ -287,14 +522,32 @@ class AnalyticsStore:
             return "", []
         return "created_at >= ?", [cutoff]
 
+    @staticmethod
+    def _window_rows(since_days: Optional[int]) -> Tuple[str, list]:
+        """Subquery of ``(day, <ROLLUP_DIMENSIONS>, n)`` rows whose ``n`` sum to the window's events."""
+        dims = ", ".join(ROLLUP_DIMENSIONS)
+        daily = f"SELECT bucket AS day, {dims}, event_count AS n FROM analytics_rollup_daily"
+        cutoff = _cutoff_iso(since_days)
+        if cutoff is None:
+            return f"({daily})", []
+        cutoff_day, cutoff_hour = cutoff[:10], cutoff[:13]
+        next_day = (datetime.fromisoformat(cutoff_day) + timedelta(days=1)).isoformat()[:10]
+        next_hour = (datetime.fromisoformat(cutoff_hour + ":00") + timedelta(hours=1)).isoformat()[:13]
+        raw_dims = ", ".join(f"COALESCE({dim}, '')" for dim in ROLLUP_DIMENSIONS)
+        sql = (
+            f"({daily} WHERE bucket > ?"
+            f" UNION ALL SELECT substr(bucket, 1, 10), {dims}, event_count FROM analytics_rollup_hourly"
+            " WHERE bucket > ? AND bucket < ?"
+            f" UNION ALL SELECT substr(created_at, 1, 10), {raw_dims}, 1 FROM analytics_events"
+            " WHERE created_at >= ? AND created_at < ?)"
+        )
+        return sql, [cutoff_day, cutoff_hour, next_day, cutoff, next_hour]
+
     def total_events(self, *, since_days: Optional[int] = None) -> int:
-        where, params = self._window_clause(since_days)
-        sql = "SELECT COUNT(*) FROM analytics_events"
-        if where:
-            sql += f" WHERE {where}"
+        rows, params = self._window_rows(since_days)
         try:
-            with self._connect() as conn:
-                row = conn.execute(sql, params).fetchone()
+            with self._read_connection() as conn:
+                row = conn.execute(f"SELECT COALESCE(SUM(n), 0) FROM {rows}", params).fetchone()
             return int(row[0]) if row else 0
         except Exception:  # noqa: BLE001 — best-effort metric
             return 0
@@ -302,19 +555,12 @@ class AnalyticsStore:
     def module_usage(self, *, since_days: Optional[int] = None) -> Dict[str, int]:
         """Counts per module, including KNOWN_MODULES that have zero events."""
         counts: Dict[str, int] = {m: 0 for m in KNOWN_MODULES}
-        where, params = self._window_clause(since_days)
-        conds = ["module IS NOT NULL", "module != ''"]
-        if where:
-            conds.append(where)
-        sql = (
-            "SELECT module, COUNT(*) c FROM analytics_events WHERE "
-            + " AND ".join(conds)
-            + " GROUP BY module"
-        )
+        rows, params = self._window_rows(since_days)
+        sql = f"SELECT module, SUM(n) c FROM {rows} WHERE module != '' GROUP BY module"
         try:
-            with self._connect() as conn:
-                rows = conn.execute(sql, params).fetchall()
-            for r in rows:
+            with self._read_connection() as conn:
+                result = conn.execute(sql, params).fetchall()
+            for r in result:
                 counts[r["module"]] = int(r["c"])
         except Exception:  # noqa: BLE001
             pass
@@ -325,23 +571,16 @@ class AnalyticsStore:
         the window. These are activity signals (who is using the product), distinct
         from the commercial org roster. IDs are counted, never returned."""
         out = {"active_event_orgs": 0, "active_event_users": 0}
-        where, params = self._window_clause(since_days)
+        rows, params = self._window_rows(since_days)
         try:
-            with self._connect() as conn:
-                org_row = conn.execute(
-                    "SELECT COUNT(DISTINCT org_id) FROM analytics_events"
-                    " WHERE org_id IS NOT NULL AND org_id != ''"
-                    + (f" AND {where}" if where else ""),
+            with self._read_connection() as conn:
+                row = conn.execute(
+                    "SELECT COUNT(DISTINCT NULLIF(org_id, '')), COUNT(DISTINCT NULLIF(case_manager_id, ''))"
+                    f" FROM {rows}",
                     params,
                 ).fetchone()
-                user_row = conn.execute(
-                    "SELECT COUNT(DISTINCT case_manager_id) FROM analytics_events"
-                    " WHERE case_manager_id IS NOT NULL AND case_manager_id != ''"
-                    + (f" AND {where}" if where else ""),
-                    params,
-                ).fetchone()
-            out["active_event_orgs"] = int(org_row[0]) if org_row else 0
-            out["active_event_users"] = int(user_row[0]) if user_row else 0
+            out["active_event_orgs"] = int(row[0]) if row else 0
+            out["active_event_users"] = int(row[1]) if row else 0
         except Exception:  # noqa: BLE001
             pass
         return out
@@ -350,20 +589,16 @@ class AnalyticsStore:
         """Generic count-by-column for an allowlisted attribution column."""
         if column not in ATTRIBUTION_COLUMNS:
             return {}
-        where, params = self._window_clause(since_days)
-        conds = [f"{column} IS NOT NULL", f"{column} != ''"]
-        if where:
-            conds.append(where)
+        rows, params = self._window_rows(since_days)
         sql = (
-            f"SELECT {column} v, COUNT(*) c FROM analytics_events WHERE "
-            + " AND ".join(conds)
-            + f" GROUP BY {column} ORDER BY c DESC"
+            f"SELECT {column} v, SUM(n) c FROM {rows} WHERE {column} != ''"
+            f" GROUP BY {column} ORDER BY c DESC"
         )
         out: Dict[str, int] = {}
         try:
-            with self._connect() as conn:
-                rows = conn.execute(sql, params).fetchall()
-            out = {r["v"]: int(r["c"]) for r in rows}
+            with self._read_connection() as conn:
+                result = conn.execute(sql, params).fetchall()
+            out = {r["v"]: int(r["c"]) for r in result}
         except Exception:  # noqa: BLE001
             pass
         return out
@@ -376,18 +611,15 @@ class AnalyticsStore:
         return {col: self._field_breakdown(col, since_days=since_days) for col in ATTRIBUTION_COLUMNS}
 
     def recent_activity_by_day(self, *, days: int = 14, since_days: Optional[int] = None) -> List[Dict[str, Any]]:
-        where, params = self._window_clause(since_days)
-        suffix = f" WHERE {where}" if where else ""
+        rows, params = self._window_rows(since_days)
         out: List[Dict[str, Any]] = []
         try:
-            with self._connect() as conn:
-                rows = conn.execute(
-                    "SELECT substr(created_at, 1, 10) day, COUNT(*) c"
-                    " FROM analytics_events" + suffix +
-                    " GROUP BY day ORDER BY day DESC LIMIT ?",
+            with self._read_connection() as conn:
+                result = conn.execute(
+                    f"SELECT day, SUM(n) c FROM {rows} GROUP BY day ORDER BY day DESC LIMIT ?",
                     params + [max(1, int(days))],
                 ).fetchall()
-            out = [{"day": r["day"], "count": int(r["c"])} for r in rows]
+            out = [{"day": r["day"], "count": int(r["c"])} for r in result]
         except Exception:  # noqa: BLE001
             pass
         return out
@@ -401,7 +633,7 @@ class AnalyticsStore:
         suffix = f" WHERE {where}" if where else ""
         out: List[Dict[str, Any]] = []
         try:
-            with self._connect() as conn:
+            with self._read_connection() as conn:
                 rows = conn.execute(
                     "SELECT event_type, module, created_at FROM analytics_events"
                     + suffix +
@@ -452,3 +684,11 @@ class AnalyticsStore:
 
 # Module-level singleton, mirroring ``auth_service`` / ``billing`` usage.
 analytics_store = AnalyticsStore()
+
+
+def start_analytics_writer() -> None:
+    analytics_store.start()
+
+
+def stop_analytics_writer() -> None:
+    analytics_store.stop()
@@ -8,6 +8,7 @@ from fastapi import APIRouter, File, Form, HTTPException, Request, Query, Upload
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+import asyncio
 import html as html_lib
 import logging
 import os
@@ -17,8 +18,11 @@ import uuid
 import json
 from datetime import datetime
 from pathlib import Path
+from backend.shared.client_context_cache import client_context_cache, invalidate_client_context
 from backend.shared.database.railway_postgres import upsert_client_to_postgres
+from backend.shared.database.connection_pool import get_connection
 from backend.shared.database.workspace_store import workspace_store
+from backend.shared.fan_out import FanOutSource, run_fan_out
 from backend.api.client_data_integration import get_client_data_integrator
 from backend.auth.authorization import assert_client_access, effective_case_manager_id
 from backend.auth.service import require_authenticated_user
@@ -86,7 +90,7 @@ def get_database_connection(db_name: str, access_type: str = "READ_ONLY"):
         db_path.parent.mkdir(exist_ok=True)
         # Create empty database file
         db_path.touch()
-    return sqlite3.connect(str(db_path))
+    return get_connection(db_path)
 
 
 def ensure_core_clients_schema(conn: sqlite3.Connection) -> None:
@@ -604,63 +608,66 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
         raise KeyError("Client not found")
     client = normalize_client_record(row)
 
-    unavailable_sources: List[str] = []
+    # The module loaders are independent, so they run concurrently on the shared
+    # fan-out pool; each one degrades to its fallback on error or timeout.
+    fan_out = run_fan_out([
+        FanOutSource(
+            "overview",
+            lambda: get_client_data_integrator().get_client_overview_data(client_id),
+            {},
+        ),
+        FanOutSource(
+            "admissions",
+            lambda: __import__(
+                "backend.modules.admissions.summary",
+                fromlist=["build_admissions_context_for_operational"],
+            ).build_admissions_context_for_operational(client_id),
+            {},
+        ),
+        FanOutSource(
+            "saved_jobs",
+            lambda: __import__(
+                "backend.modules.jobs.routes",
+                fromlist=["list_saved_jobs_for_client"],
+            ).list_saved_jobs_for_client(client_id),
+            [],
+        ),
+        FanOutSource("benefits", lambda: get_client_benefits_summary(client_id), {}),
+        FanOutSource("legal", lambda: get_client_legal_summary(client_id), {}),
+        FanOutSource("services", lambda: get_client_services_summary(client_id), {}),
+        FanOutSource("groups", lambda: get_client_groups_summary(client_id, org_id=org_id), {}),
+        FanOutSource("fmla", lambda: get_client_fmla_summary(client_id, org_id=org_id), {}),
+        FanOutSource("ur", lambda: get_client_ur_summary(client_id, org_id=org_id), {}),
+        FanOutSource("medical_referrals", lambda: get_client_medical_referrals_summary(client_id), []),
+        FanOutSource("appointments", lambda: workspace_store.list_client_appointments(client_id), []),
+        FanOutSource(
+            "service_referrals",
+            lambda: workspace_store.list_client_service_referrals(client_id),
+            [],
+        ),
+        FanOutSource("documents", lambda: workspace_store.list_client_documents(client_id), []),
+        FanOutSource("roi_records", lambda: workspace_store.list_client_roi_records(client_id), []),
+    ])
 
-    def safe_load(source: str, loader, fallback):
-        try:
-            result = loader()
-            if getattr(result, "available", True) is False:
-                unavailable_sources.append(source)
-            return result
-        except Exception as exc:
+    unavailable_sources: List[str] = []
+    for source, value in fan_out.values.items():
+        if source in fan_out.errors:
+            logger.warning(
+                "Operational context %s unavailable for %s: %s", source, client_id, fan_out.errors[source]
+            )
+        if fan_out.failed(source) or getattr(value, "available", True) is False:
             unavailable_sources.append(source)
-            logger.warning("Operational context %s unavailable for %s: %s", source, client_id, exc)
-            return fallback
 
-    overview_data = safe_load(
-        "overview",
-        lambda: get_client_data_integrator().get_client_overview_data(client_id),
-        {},
-    )
-    admissions_context = safe_load(
-        "admissions",
-        lambda: __import__(
-            "backend.modules.admissions.summary",
-            fromlist=["build_admissions_context_for_operational"],
-        ).build_admissions_context_for_operational(client_id),
-        {},
-    )
-    saved_jobs = safe_load(
-        "saved_jobs",
-        lambda: __import__(
-            "backend.modules.jobs.routes",
-            fromlist=["list_saved_jobs_for_client"],
-        ).list_saved_jobs_for_client(client_id),
-        [],
-    )
-    benefits_summary = safe_load("benefits", lambda: get_client_benefits_summary(client_id), {})
-    legal_summary = safe_load("legal", lambda: get_client_legal_summary(client_id), {})
-    services_summary = safe_load("services", lambda: get_client_services_summary(client_id), {})
-    groups_summary = safe_load(
-        "groups",
-        lambda: get_client_groups_summary(client_id, org_id=org_id),
-        {},
-    )
-    fmla_summary = safe_load(
-        "fmla",
-        lambda: get_client_fmla_summary(client_id, org_id=org_id),
-        {},
-    )
-    ur_summary = safe_load(
-        "ur",
-        lambda: get_client_ur_summary(client_id, org_id=org_id),
-        {},
-    )
-    medical_referrals_raw = safe_load(
-        "medical_referrals",
-        lambda: get_client_medical_referrals_summary(client_id),
-        [],
-    )
+    overview_data = fan_out.values["overview"]
+    admissions_context = fan_out.values["admissions"]
+    saved_jobs = fan_out.values["saved_jobs"]
+    benefits_summary = fan_out.values["benefits"]
+    legal_summary = fan_out.values["legal"]
+    services_summary = fan_out.values["services"]
+    groups_summary = fan_out.values["groups"]
+    fmla_summary = fan_out.values["fmla"]
+    ur_summary = fan_out.values["ur"]
+    medical_referrals_raw = fan_out.values["medical_referrals"]
     medical_referrals = [
         {
             "provider_name": item.get("provider_name"),
@@ -671,11 +678,7 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
         }
         for item in medical_referrals_raw[:10]
     ]
-    appointments_raw = safe_load(
-        "appointments",
-        lambda: workspace_store.list_client_appointments(client_id),
-        [],
-    )
+    appointments_raw = fan_out.values["appointments"]
     appointments = [
         {
             "title": item.get("title"),
@@ -686,11 +689,7 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
         }
         for item in appointments_raw[:10]
     ]
-    service_referrals_raw = safe_load(
-        "service_referrals",
-        lambda: workspace_store.list_client_service_referrals(client_id),
-        [],
-    )
+    service_referrals_raw = fan_out.values["service_referrals"]
     service_referrals = [
         {
             "service_name": item.get("service_name"),
@@ -701,11 +700,7 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
         }
         for item in service_referrals_raw[:10]
     ]
-    documents_raw = safe_load(
-        "documents",
-        lambda: workspace_store.list_client_documents(client_id),
-        [],
-    )
+    documents_raw = fan_out.values["documents"]
     documents = [
         {
             "title": item.get("title"),
@@ -714,11 +709,7 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
         }
         for item in documents_raw[:10]
     ]
-    roi_records_raw = safe_load(
-        "roi_records",
-        lambda: workspace_store.list_client_roi_records(client_id),
-        [],
-    )
+    roi_records_raw = fan_out.values["roi_records"]
     roi_records = [
         {
             "authorized_party": item.get("authorized_party"),
@@ -748,9 +739,24 @@ def load_client_operational_context(client_id: str, org_id: Optional[str] = None
     )
     context["metadata"]["unavailable_sources"] = unavailable_sources
     context["metadata"]["complete"] = not unavailable_sources
+    context["metadata"].update(fan_out.metadata())
     return context
 
 
+def get_cached_client_operational_context(client_id: str, org_id: Optional[str] = None) -> Dict[str, Any]:
+    """``load_client_operational_context`` behind the write-invalidated client cache.
+
+    Only complete contexts are cached; one with unavailable sources is rebuilt
+    on the next request.
+    """
+    return client_context_cache.get_or_build(
+        client_id,
+        org_id,
+        lambda: load_client_operational_context(client_id, org_id),
+        cacheable=lambda context: bool(context.get("metadata", {}).get("complete")),
+    )
+
+
 class _SummaryResult(dict):
     """Dict-compatible summary carrying non-serialized source availability."""
 
@@ -1659,6 +1665,7 @@ async def update_client(client_id: str, client_data: ClientUpdateRequest, reques
             integration_results=integration_results,
         )
         integration_results["railway_postgres"] = railway_sync
+        invalidate_client_context(client_id)
 
         return {
             "success": True,
@@ -1703,6 +1710,7 @@ async def delete_client(client_id: str, request: Request):
                 # Module databases are best-effort mirrors; do not fail core deletion.
                 continue
 
+        invalidate_client_context(client_id)
         return {"success": True, "message": "Client deleted successfully"}
     except HTTPException:
         raise
@@ -1710,145 +1718,187 @@ async def delete_client(client_id: str, request: Request):
         logger.error(f"Database error deleting client {client_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-@router.get("/api/clients/{client_id}/unified-view")
-async def get_client_unified_view(client_id: str, request: Request):
-    """Get unified client view with all module data
-    Returns: { success: True, client_data: { client: {...}, housing: {}, ... } }
-    """
-    try:
-        current_user = require_authenticated_user(request)
-        assert_client_access(current_user, client_id)
-        with get_database_connection("core_clients", "READ_ONLY") as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM clients WHERE client_id = ?", (client_id,))
+def _load_employment_resumes(client_id: str) -> List[Dict[str, Any]]:
+    """Saved resumes from employment.db for the Employment tab."""
+    employment_resumes = []
+    with get_database_connection("employment", "READ_ONLY") as emp_conn:
+        emp_conn.row_factory = sqlite3.Row
+        emp_cursor = emp_conn.cursor()
+        emp_cursor.execute(
+            "SELECT * FROM resumes WHERE client_id = ? ORDER BY created_at DESC",
+            (client_id,),
+        )
+        for resume_row in emp_cursor.fetchall():
+            resume_record = dict(resume_row)
+            if not resume_record.get("resume_id"):
+                continue
+            if "is_active" in resume_record and resume_record["is_active"] in (0, False):
+                continue
+            employment_resumes.append({
+                "resume_id": resume_record["resume_id"],
+                "resume_name": resume_record.get("resume_title") or "Professional Resume",
+                "created_at": resume_record.get("created_at"),
+                "download_url": f"/api/resume/download/{resume_record['resume_id']}",
+            })
+    return employment_resumes
 
-            result = cursor.fetchone()
-            if not result:
-                raise HTTPException(status_code=404, detail="Client not found")
 
-        core_client = dict(result)
+def _load_saved_jobs(client_id: str) -> List[Dict[str, Any]]:
+    from backend.modules.jobs.routes import list_saved_jobs_for_client
 
-        overview_data = get_client_data_integrator().get_client_overview_data(client_id)
-        benefits_summary = get_client_benefits_summary(client_id)
-        legal_summary = get_client_legal_summary(client_id)
-        services_summary = get_client_services_summary(client_id)
-        groups_summary = get_client_groups_summary(
-            client_id,
-            org_id=resolve_org_id(current_user) if multi_tenant_enabled() else None,
-        )
-        fmla_summary = get_client_fmla_summary(
-            client_id,
-            org_id=resolve_org_id(current_user) if multi_tenant_enabled() else None,
-        )
-        ur_summary = get_client_ur_summary(
-            client_id,
-            org_id=resolve_org_id(current_user) if multi_tenant_enabled() else None,
-        )
+    return list_saved_jobs_for_client(client_id)
 
-        # Augment services summary with workspace-stored referrals
-        ws_referrals = workspace_store.list_client_service_referrals(client_id)
-        if ws_referrals:
-            existing = services_summary.get("referrals", [])
-            services_summary["referrals"] = ws_referrals + existing
-            services_summary["total_referrals"] = len(services_summary["referrals"])
-            services_summary["active_referrals"] = sum(
-                1 for r in services_summary["referrals"]
-                if str(r.get("status", "")).strip().lower() in {"pending", "active", "in progress", "open"}
-            )
 
-        medical_referrals = get_client_medical_referrals_summary(client_id)
-        if medical_referrals:
-            services_summary["referrals"] = medical_referrals + services_summary.get("referrals", [])
-            services_summary["total_referrals"] = len(services_summary["referrals"])
-            services_summary["active_referrals"] = sum(
-                1 for r in services_summary["referrals"]
-                if str(r.get("status", "")).strip().lower() in {"pending", "active", "in progress", "open", "identified"}
-            )
+# Sources whose failure still degrades to an empty section in the unified view
+# (every other loader error is surfaced as a 500, as before).
+_UNIFIED_VIEW_OPTIONAL_SOURCES = ("employment_resumes", "saved_jobs")
 
-        # Workspace-stored appointments
-        ws_appointments = workspace_store.list_client_appointments(client_id)
 
-        # Workspace-stored client documents
-        ws_documents = workspace_store.list_client_documents(client_id)
+def load_client_unified_view(client_id: str, org_id: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking body of the unified view; module loaders run concurrently."""
+    with get_database_connection("core_clients", "READ_ONLY") as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM clients WHERE client_id = ?", (client_id,))
 
-        # Saved resumes from employment.db so the Employment tab (which already
-        # renders employment.resumes) shows the client's resume artifacts.
-        employment_resumes = []
-        try:
-            with get_database_connection("employment", "READ_ONLY") as emp_conn:
-                emp_conn.row_factory = sqlite3.Row
-                emp_cursor = emp_conn.cursor()
-                emp_cursor.execute(
-                    "SELECT * FROM resumes WHERE client_id = ? ORDER BY created_at DESC",
-                    (client_id,),
-                )
-                for resume_row in emp_cursor.fetchall():
-                    resume_record = dict(resume_row)
-                    if not resume_record.get("resume_id"):
-                        continue
-                    if "is_active" in resume_record and resume_record["is_active"] in (0, False):
-                        continue
-                    employment_resumes.append({
-                        "resume_id": resume_record["resume_id"],
-                        "resume_name": resume_record.get("resume_title") or "Professional Resume",
-                        "created_at": resume_record.get("created_at"),
-                        "download_url": f"/api/resume/download/{resume_record['resume_id']}",
-                    })
-        except Exception as emp_exc:
-            logger.warning("Employment resumes unavailable for %s: %s", client_id, emp_exc)
+        result = cursor.fetchone()
+        if not result:
+            raise HTTPException(status_code=404, detail="Client not found")
 
-        employment_saved_jobs = []
-        try:
-            from backend.modules.jobs.routes import list_saved_jobs_for_client
+    core_client = dict(result)
+
+    fan_out = run_fan_out([
+        FanOutSource("overview", lambda: get_client_data_integrator().get_client_overview_data(client_id), {}),
+        FanOutSource("benefits", lambda: get_client_benefits_summary(client_id), {}),
+        FanOutSource("legal", lambda: get_client_legal_summary(client_id), {}),
+        FanOutSource("services", lambda: get_client_services_summary(client_id), {}),
+        FanOutSource("groups", lambda: get_client_groups_summary(client_id, org_id=org_id), {}),
+        FanOutSource("fmla", lambda: get_client_fmla_summary(client_id, org_id=org_id), {}),
+        FanOutSource("ur", lambda: get_client_ur_summary(client_id, org_id=org_id), {}),
+        FanOutSource("service_referrals", lambda: workspace_store.list_client_service_referrals(client_id), []),
+        FanOutSource("medical_referrals", lambda: get_client_medical_referrals_summary(client_id), []),
+        FanOutSource("appointments", lambda: workspace_store.list_client_appointments(client_id), []),
+        FanOutSource("documents", lambda: workspace_store.list_client_documents(client_id), []),
+        FanOutSource("employment_resumes", lambda: _load_employment_resumes(client_id), []),
+        FanOutSource("saved_jobs", lambda: _load_saved_jobs(client_id), []),
+    ])
+    required = [name for name in fan_out.values if name not in _UNIFIED_VIEW_OPTIONAL_SOURCES]
+    error = fan_out.first_error(required)
+    if error is not None:
+        raise error
+    # A timed-out required source would otherwise render as "no records".
+    timed_out = [name for name in required if name in fan_out.timed_out]
+    if timed_out:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Timed out loading client data: {', '.join(timed_out)}",
+        )
+    for name in _UNIFIED_VIEW_OPTIONAL_SOURCES:
+        if fan_out.failed(name):
+            logger.warning(
+                "Unified view %s unavailable for %s: %s",
+                name,
+                client_id,
+                fan_out.errors.get(name, "timed out"),
+            )
 
-            employment_saved_jobs = list_saved_jobs_for_client(client_id)
-        except Exception as jobs_exc:
-            logger.warning("Saved jobs unavailable for %s: %s", client_id, jobs_exc)
+    overview_data = fan_out.values["overview"]
+    benefits_summary = fan_out.values["benefits"]
+    legal_summary = fan_out.values["legal"]
+    services_summary = fan_out.values["services"]
+    groups_summary = fan_out.values["groups"]
+    fmla_summary = fan_out.values["fmla"]
+    ur_summary = fan_out.values["ur"]
+
+    # Augment services summary with workspace-stored referrals
+    ws_referrals = fan_out.values["service_referrals"]
+    if ws_referrals:
+        existing = services_summary.get("referrals", [])
+        services_summary["referrals"] = ws_referrals + existing
+        services_summary["total_referrals"] = len(services_summary["referrals"])
+        services_summary["active_referrals"] = sum(
+            1 for r in services_summary["referrals"]
+            if str(r.get("status", "")).strip().lower() in {"pending", "active", "in progress", "open"}
+        )
 
-        return {
-            "success": True,
-            "client_data": {
-                "client": core_client,
-                "housing": {
-                    "status": core_client.get("housing_status", "unknown"),
-                },
-                "employment": {
-                    "status": core_client.get("employment_status", "unknown"),
-                    "saved_jobs": employment_saved_jobs,
-                    # Only include the key when resumes exist so the dashboard's
-                    # conditional "Resumes" section keeps its prior empty-state.
-                    **({"resumes": employment_resumes} if employment_resumes else {}),
-                },
-                "benefits": benefits_summary or {"status": core_client.get("benefits_status", "unknown")},
-                "legal": legal_summary or {"status": core_client.get("legal_status", "No active cases")},
-                "services": services_summary,
-                "groups": groups_summary,
-                "fmla": fmla_summary,
-                "ur": ur_summary,
-                "tasks": overview_data.get("tasks", []),
-                "notes": overview_data.get("case_notes", []),
-                "appointments": ws_appointments + overview_data.get("appointments", []),
-                "documents": ws_documents,
-                "reminders": overview_data.get("reminders", []),
-                "recent_activity": overview_data.get("recent_activity", []),
-                "contact_history": overview_data.get("contact_history", []),
-                "program_milestones": overview_data.get("program_milestones", []),
-                "goals": overview_data.get("goals", []),
-                "barriers": overview_data.get("barriers", []),
-                "summary": overview_data.get("summary", {}),
+    medical_referrals = fan_out.values["medical_referrals"]
+    if medical_referrals:
+        services_summary["referrals"] = medical_referrals + services_summary.get("referrals", [])
+        services_summary["total_referrals"] = len(services_summary["referrals"])
+        services_summary["active_referrals"] = sum(
+            1 for r in services_summary["referrals"]
+            if str(r.get("status", "")).strip().lower() in {"pending", "active", "in progress", "open", "identified"}
+        )
+
+    # Workspace-stored appointments and client documents
+    ws_appointments = fan_out.values["appointments"]
+    ws_documents = fan_out.values["documents"]
+
+    # Saved resumes from employment.db so the Employment tab (which already
+    # renders employment.resumes) shows the client's resume artifacts.
+    employment_resumes = fan_out.values["employment_resumes"]
+    employment_saved_jobs = fan_out.values["saved_jobs"]
+
+    return {
+        "success": True,
+        "client_data": {
+            "client": core_client,
+            "housing": {
+                "status": core_client.get("housing_status", "unknown"),
             },
-            "data_sources": {
-                "client": "core_clients.db",
-                "overview": "case_management.db + reminders.db",
-                "benefits": "unified_platform.db",
-                "legal": "legal_cases.db",
-                "services": "social_services.db",
-                "groups": "groups.db",
-                "fmla": "fmla.db",
-                "ur": "ur.db",
+            "employment": {
+                "status": core_client.get("employment_status", "unknown"),
+                "saved_jobs": employment_saved_jobs,
+                # Only include the key when resumes exist so the dashboard's
+                # conditional "Resumes" section keeps its prior empty-state.
+                **({"resumes": employment_resumes} if employment_resumes else {}),
             },
-        }
+            "benefits": benefits_summary or {"status": core_client.get("benefits_status", "unknown")},
+            "legal": legal_summary or {"status": core_client.get("legal_status", "No active cases")},
+            "services": services_summary,
+            "groups": groups_summary,
+            "fmla": fmla_summary,
+            "ur": ur_summary,
+            "tasks": overview_data.get("tasks", []),
+            "notes": overview_data.get("case_notes", []),
+            "appointments": ws_appointments + overview_data.get("appointments", []),
+            "documents": ws_documents,
+            "reminders": overview_data.get("reminders", []),
+            "recent_activity": overview_data.get("recent_activity", []),
+            "contact_history": overview_data.get("contact_history", []),
+            "program_milestones": overview_data.get("program_milestones", []),
+            "goals": overview_data.get("goals", []),
+            "barriers": overview_data.get("barriers", []),
+            "summary": overview_data.get("summary", {}),
+        },
+        "data_sources": {
+            "client": "core_clients.db",
+            "overview": "case_management.db + reminders.db",
+            "benefits": "unified_platform.db",
+            "legal": "legal_cases.db",
+            "services": "social_services.db",
+            "groups": "groups.db",
+            "fmla": "fmla.db",
+            "ur": "ur.db",
+        },
+        "metadata": fan_out.metadata(),
+    }
+
+
+@router.get("/api/clients/{client_id}/unified-view")
+async def get_client_unified_view(client_id: str, request: Request):
+    """Get unified client view with all module data
+    Returns: { success: True, client_data: { client: {...}, housing: {}, ... } }
+    """
+    try:
+        current_user = require_authenticated_user(request)
+        assert_client_access(current_user, client_id)
+        # Off the event loop: the loaders are blocking sqlite/Postgres reads.
+        return await asyncio.to_thread(
+            load_client_unified_view,
+            client_id,
+            resolve_org_id(current_user) if multi_tenant_enabled() else None,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -1863,9 +1913,10 @@ async def get_client_operational_context(client_id: str, request: Request):
         current_user = require_authenticated_user(request)
         assert_client_access(current_user, client_id)
         try:
-            operational_context = load_client_operational_context(
+            operational_context = await asyncio.to_thread(
+                get_cached_client_operational_context,
                 client_id,
-                org_id=resolve_org_id(current_user) if multi_tenant_enabled() else None,
+                resolve_org_id(current_user) if multi_tenant_enabled() else None,
             )
         except KeyError:
             raise HTTPException(status_code=404, detail="Client not found")
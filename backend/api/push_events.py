@@ -0,0 +1,79 @@
+"""Server-sent-events stream for per-user push events.
+
+``GET /api/events/stream`` replaces polling of the messages and reminders
+endpoints: one authenticated connection per tab receives ``message``,
+``unread_count`` and ``reminder_due`` events published through
+``backend.shared.event_broker``. The stream sends a heartbeat comment every
+``CMSX_PUSH_HEARTBEAT_S`` seconds (default 15) so proxies keep it open, and
+resumes from the ``Last-Event-ID`` header (or ``last_event_id`` query
+parameter) after a reconnect. A ``resync`` event means the client missed
+events and should refetch its inbox / reminders once.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from backend.auth.service import require_authenticated_user
+from backend.shared.env import env_float
+from backend.shared.event_broker import PushEvent, event_broker
+from backend.shared.tenancy import resolve_org_id
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/events", tags=["push-events"])
+
+RETRY_MS = 3000
+
+
+def _heartbeat_seconds() -> float:
+    return env_float("CMSX_PUSH_HEARTBEAT_S", 15.0)
+
+
+def _frame(event: PushEvent) -> str:
+    lines = [] if event.id is None else [f"id: {event.id}"]
+    lines.append(f"event: {event.event}")
+    lines.append(f"data: {json.dumps(event.data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _resume_point(*candidates: Optional[str]) -> Optional[int]:
+    for candidate in candidates:
+        if candidate and candidate.strip().isdigit():
+            return int(candidate.strip())
+    return None
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id: Optional[str] = Query(None),
+) -> StreamingResponse:
+    user = require_authenticated_user(request)
+    user_id = user.case_manager_id or user.firebase_uid
+    subscription = event_broker.subscribe(
+        user_id,
+        org_id=resolve_org_id(user),
+        last_event_id=_resume_point(last_event_id_header, last_event_id),
+    )
+    heartbeat_seconds = _heartbeat_seconds()
+
+    async def event_stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next(heartbeat_seconds)
+                yield ": heartbeat\n\n" if event is None else _frame(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
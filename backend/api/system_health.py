@@ -7,11 +7,21 @@ Fixes the missing health check endpoints causing 404 errors
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 import logging
-import sqlite3
 import os
 from datetime import datetime
 from pathlib import Path
+from backend.analytics.store import analytics_store
+from backend.auth.service import auth_service
+from backend.modules.ai_unified.knowledge_index import get_knowledge_index
+from backend.modules.reminders.priority_index import task_priority_index
+from backend.search.http_pool import get_search_http_pool
+from backend.search.provider_engine import get_provider_engine
+from backend.shared.ai_response_cache import ai_response_cache
+from backend.shared.client_context_cache import get_client_context_cache_metrics
+from backend.shared.database.connection_pool import get_connection, get_pool_metrics
+from backend.shared.event_broker import event_broker
 from backend.shared.database.railway_postgres import check_postgres_health, is_postgres_configured
+from backend.shared.reconciliation_queue import reconciliation_queue
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +36,7 @@ def get_database_connection(db_name: str, access_type: str = "READ_ONLY"):
         db_path.parent.mkdir(exist_ok=True)
         # Create empty database file
         db_path.touch()
-    return sqlite3.connect(str(db_path))
+    return get_connection(db_path)
 
 @router.get("/health")
 async def health_check():
@@ -110,7 +120,19 @@ async def database_status():
     return {
         "database_status": status,
         "total_databases": len(status),
-        "operational_count": sum(1 for db in status.values() if db["status"] == "operational")
+        "operational_count": sum(1 for db in status.values() if db["status"] == "operational"),
+        "sqlite_pool": get_pool_metrics(),
+        "client_context_cache": get_client_context_cache_metrics(),
+        "auth_principal_cache": auth_service.principal_cache.metrics(),
+        "firebase_public_keys": auth_service.public_keys.metrics(),
+        "knowledge_index": get_knowledge_index().metrics(),
+        "search_http_pool": get_search_http_pool().metrics(),
+        "search_providers": get_provider_engine().metrics(),
+        "deadline_reconciliation": reconciliation_queue.metrics(),
+        "task_priority_index": task_priority_index.metrics(),
+        "ai_response_cache": ai_response_cache.metrics(),
+        "push_events": event_broker.metrics(),
+        "analytics_writer": analytics_store.metrics(),
     }
 
 @router.get("/api/system/access-matrix")
@@ -127,18 +127,14 @@ async def get_unified_client_view(
     try:
         org_id = resolve_org_id(current_user) if multi_tenant_enabled() else None
 
-        # Force cache refresh if requested
-        if force_refresh:
-            cache_key = unified_view_engine._generate_cache_key(client_id, org_id)
-            if cache_key in unified_view_engine.cache_storage:
-                del unified_view_engine.cache_storage[cache_key]
-
-        # Get unified view (org-scoped cache key when MT enabled)
+        # Get unified view (org-scoped cache key when MT enabled); force_refresh
+        # drops the memory and database cache and re-reads every section
         unified_view = unified_view_engine.get_unified_client_view(
             client_id=client_id,
             session_id=session_id,
             current_module=current_module,
             org_id=org_id,
+            force_refresh=force_refresh,
         )
         
         if not unified_view:
@@ -387,7 +383,9 @@ async def get_unified_view_system_status():
         cache_stats = {
             'total_cached_items': len(unified_view_engine.cache_storage),
             'cache_ttl_seconds': unified_view_engine.cache_ttl,
-            'memory_cache_active': True
+            'memory_cache_active': True,
+            'database_cache_active': True,
+            **unified_view_engine.metrics()
         }
         
         # Get module configuration
@@ -441,14 +439,8 @@ async def clear_client_cache(
         org_id = resolve_org_id(current_user) if multi_tenant_enabled() else None
         cache_key = unified_view_engine._generate_cache_key(client_id, org_id)
 
-        # Clear memory cache
-        cache_cleared = False
-        if cache_key in unified_view_engine.cache_storage:
-            del unified_view_engine.cache_storage[cache_key]
-            cache_cleared = True
-
-        if cache_key in unified_view_engine.cache_timestamps:
-            del unified_view_engine.cache_timestamps[cache_key]
+        # Clear memory and database cache
+        cache_cleared = unified_view_engine.invalidate_cached_view(client_id, org_id)
         
         return {
             'client_id': client_id,
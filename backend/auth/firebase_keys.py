@@ -0,0 +1,256 @@
+"""Cached Firebase ID-token signing keys and in-process RS256 verification.
+
+The public-cert fallback in ``FirebaseAuthService`` used to build a fresh
+``google.auth`` transport per call and let ``verify_firebase_token`` fetch
+Google's certificates during verification. ``FirebaseKeyStore`` keeps the
+signing keys as parsed ``cryptography`` public-key objects instead:
+
+* Keys are fetched from ``CMSX_FIREBASE_CERTS_URL`` (Google's securetoken x509
+  endpoint by default) and kept for the response's ``Cache-Control: max-age``.
+* Within ``CMSX_FIREBASE_KEY_REFRESH_MARGIN_S`` of expiry the next verification
+  starts a background refresh and keeps using the current keys; only a cold or
+  fully expired store fetches inline. A failed refresh keeps the previous keys
+  and retries after ``FETCH_RETRY_SECONDS``.
+* An unknown ``kid`` (Google rotated early) forces one refetch, rate-limited.
+* ``CMSX_FIREBASE_JWKS_PATH`` points the store at a local JWKS (or x509 kid->PEM)
+  file and disables the network entirely — used by tests and offline runs. The
+  file is re-read when its mtime changes.
+
+With warm keys, verification is a signature check plus claim validation.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+import requests
+from cryptography import x509
+from jwt.algorithms import RSAAlgorithm
+
+from backend.shared.env import env_int
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+FIREBASE_ISSUER_PREFIX = "https://securetoken.google.com/"
+DEFAULT_MAX_AGE_SECONDS = 3600
+FETCH_RETRY_SECONDS = 60
+FORCED_REFRESH_INTERVAL_SECONDS = 60
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def cache_max_age(cache_control: Optional[str], default: int = DEFAULT_MAX_AGE_SECONDS) -> int:
+    match = _MAX_AGE_RE.search(cache_control or "")
+    return int(match.group(1)) if match else default
+
+
+def parse_key_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a JWKS (``{"keys": [...]}``) or Google's x509 ``{kid: PEM}`` map into key objects."""
+    keys: Dict[str, Any] = {}
+    if isinstance(document.get("keys"), list):
+        for jwk in document["keys"]:
+            if jwk.get("kty") != "RSA" or not jwk.get("kid"):
+                continue
+            keys[jwk["kid"]] = RSAAlgorithm.from_jwk(jwk)
+        return keys
+    for kid, pem in document.items():
+        certificate = x509.load_pem_x509_certificate(str(pem).encode("utf-8"))
+        keys[kid] = certificate.public_key()
+    return keys
+
+
+class FirebaseKeyStore:
+    """Signing keys for Firebase ID tokens, refreshed per Cache-Control."""
+
+    def __init__(
+        self,
+        certs_url: Optional[str] = None,
+        jwks_path: Optional[str] = None,
+        refresh_margin_seconds: Optional[int] = None,
+        clock_skew_seconds: Optional[int] = None,
+    ) -> None:
+        self.certs_url = certs_url or os.getenv("CMSX_FIREBASE_CERTS_URL") or GOOGLE_CERTS_URL
+        self._jwks_path = jwks_path
+        self.refresh_margin_seconds = (
+            refresh_margin_seconds if refresh_margin_seconds is not None
+            else env_int("CMSX_FIREBASE_KEY_REFRESH_MARGIN_S", 300)
+        )
+        self.clock_skew_seconds = (
+            clock_skew_seconds if clock_skew_seconds is not None
+            else env_int("CMSX_FIREBASE_CLOCK_SKEW_S", 0)
+        )
+        # ``_lock`` guards the key set and expiry; ``_fetch_lock`` only serialises
+        # network fetches so verifications with warm keys never wait on one.
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refresh_guard = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch_at = 0.0
+        self._local_source: Optional[Tuple[str, float]] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    # ── Key material ────────────────────────────────────────────────────
+
+    @property
+    def local_path(self) -> Optional[str]:
+        return self._jwks_path or (os.getenv("CMSX_FIREBASE_JWKS_PATH") or "").strip() or None
+
+    @property
+    def offline(self) -> bool:
+        return self.local_path is not None
+
+    def _fetch_document(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.get(self.certs_url, timeout=10)
+        response.raise_for_status()
+        return response.json(), response.headers.get("Cache-Control")
+
+    def _load_local(self) -> None:
+        path = Path(self.local_path)
+        mtime = path.stat().st_mtime
+        if self._local_source == (str(path), mtime):
+            return
+        with self._lock:
+            if self._local_source == (str(path), mtime):
+                return
+            self._keys = parse_key_document(json.loads(path.read_text(encoding="utf-8")))
+            self._expires_at = float("inf")
+            self._local_source = (str(path), mtime)
+        self._record("local_loads")
+
+    def refresh(self, force: bool = False) -> None:
+        """Fetch the remote key set unless another caller already did."""
+        with self._fetch_lock:
+            with self._lock:
+                now = time.time()
+                if force:
+                    if now - self._last_fetch_at < FORCED_REFRESH_INTERVAL_SECONDS:
+                        return
+                elif now < self._expires_at - self.refresh_margin_seconds:
+                    return
+                self._last_fetch_at = now
+            try:
+                document, cache_control = self._fetch_document()
+                keys = parse_key_document(document)
+                if not keys:
+                    raise ValueError("Key document contained no RSA keys")
+            except Exception as exc:
+                self._record("fetch_errors")
+                with self._lock:
+                    if not self._keys:
+                        raise
+                    self._expires_at = max(self._expires_at, now + FETCH_RETRY_SECONDS)
+                logger.warning("Firebase signing key refresh failed, keeping cached keys: %s", exc)
+                return
+            with self._lock:
+                self._keys = keys
+                self._expires_at = now + cache_max_age(cache_control)
+            self._record("fetches")
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_guard:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="firebase-key-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+        self._record("background_refreshes")
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as exc:
+            logger.warning("Background Firebase signing key refresh failed: %s", exc)
+
+    def get_key(self, kid: Optional[str]) -> Any:
+        if self.offline:
+            self._load_local()
+            key = self._keys.get(kid or "")
+        else:
+            now = time.time()
+            if now >= self._expires_at:
+                self.refresh()
+            elif now >= self._expires_at - self.refresh_margin_seconds:
+                self._refresh_in_background()
+            key = self._keys.get(kid or "")
+            if key is None:
+                self._record("unknown_kid")
+                self.refresh(force=True)
+                key = self._keys.get(kid or "")
+        if key is None:
+            raise jwt.InvalidTokenError("Firebase token was signed with an unknown key")
+        return key
+
+    # ── Verification ────────────────────────────────────────────────────
+
+    def verify(self, token: str, project_id: str) -> Dict[str, Any]:
+        """Verify an ID token's RS256 signature and Firebase claims for ``project_id``."""
+        try:
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") != "RS256":
+                raise jwt.InvalidAlgorithmError("Firebase ID tokens must use RS256")
+            claims = jwt.decode(
+                token,
+                self.get_key(header.get("kid")),
+                algorithms=["RS256"],
+                audience=project_id,
+                issuer=FIREBASE_ISSUER_PREFIX + project_id,
+                leeway=self.clock_skew_seconds,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+            subject = claims.get("sub")
+            if not isinstance(subject, str) or not subject or len(subject) > 128:
+                raise jwt.InvalidTokenError("Firebase token has an invalid subject")
+            auth_time = claims.get("auth_time")
+            if auth_time is not None and float(auth_time) > time.time() + self.clock_skew_seconds:
+                raise jwt.ImmatureSignatureError("Firebase token auth_time is in the future")
+        except Exception:
+            self._record("failures")
+            raise
+        self._record("verifications")
+        claims["uid"] = subject
+        return claims
+
+    # ── Metrics ─────────────────────────────────────────────────────────
+
+    def _record(self, name: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += amount
+
+    def reset_metrics(self) -> None:
+        metrics = {
+            "verifications": 0,
+            "failures": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "background_refreshes": 0,
+            "unknown_kid": 0,
+            "local_loads": 0,
+        }
+        with self._metrics_lock:
+            self._metrics = metrics
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+        snapshot["keys"] = len(self._keys)
+        snapshot["source"] = "local" if self.offline else "remote"
+        if self._expires_at not in (0.0, float("inf")):
+            snapshot["expires_in_seconds"] = max(0, int(self._expires_at - time.time()))
+        return snapshot
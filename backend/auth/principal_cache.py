@@ -0,0 +1,134 @@
+"""Authenticated-principal cache for the API auth middleware.
+
+Every ``/api`` request used to verify the Firebase ID token and then upsert the
+caller's profile, turning each read into a write transaction on ``auth.db``.
+The SPA re-sends the same ID token for up to an hour, so the resolved
+``AuthenticatedUser`` is cached here keyed by a SHA-256 of the raw token:
+
+* An entry never outlives the token's ``exp`` claim, and is additionally capped
+  at ``CMSX_AUTH_PRINCIPAL_TTL_S`` (default 300s) so profile changes made by
+  another process are picked up within that window.
+* Profile writes in ``FirebaseAuthService`` (role/status/org changes, claim
+  changes on login) drop every cached entry for that ``firebase_uid``.
+* The cache is an LRU bounded by ``CMSX_AUTH_PRINCIPAL_CACHE_SIZE`` entries;
+  ``CMSX_AUTH_PRINCIPAL_CACHE=0`` disables it.
+
+Only the token hash is held as a key — never the raw token.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from backend.shared.env import env_bool, env_int
+
+if TYPE_CHECKING:
+    from backend.auth.service import AuthenticatedUser
+
+logger = logging.getLogger(__name__)
+
+
+def token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """Bounded token-hash -> ``AuthenticatedUser`` cache expiring at token ``exp``."""
+
+    def __init__(self, max_entries: Optional[int] = None, max_ttl_seconds: Optional[int] = None) -> None:
+        self.max_entries = max_entries or env_int("CMSX_AUTH_PRINCIPAL_CACHE_SIZE", 2048)
+        self.max_ttl_seconds = (
+            max_ttl_seconds if max_ttl_seconds is not None
+            else env_int("CMSX_AUTH_PRINCIPAL_TTL_S", 300)
+        )
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_AUTH_PRINCIPAL_CACHE", True)
+
+    def get(self, key: str) -> Optional["AuthenticatedUser"]:
+        if not self.enabled():
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+        # Callers get their own copy; the cached principal stays immutable.
+        return dataclasses.replace(user)
+
+    def put(self, key: str, user: "AuthenticatedUser", decoded_token: Dict[str, Any]) -> None:
+        if not self.enabled():
+            return
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        try:
+            token_exp = float(decoded_token.get("exp"))
+        except (TypeError, ValueError):
+            token_exp = None
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, dataclasses.replace(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def invalidate_uid(self, firebase_uid: str) -> None:
+        with self._lock:
+            stale = [key for key, (_, user) in self._entries.items() if user.firebase_uid == firebase_uid]
+            for key in stale:
+                del self._entries[key]
+            self._metrics["invalidations"] += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            self._metrics[counter] = self._metrics.get(counter, 0) + 1
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "hits": 0,
+                "misses": 0,
+                "expired": 0,
+                "evictions": 0,
+                "invalidations": 0,
+                "profile_updates": 0,
+                "last_login_updates": 0,
+                "profile_writes_skipped": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["max_entries"] = self.max_entries
+        snapshot["enabled"] = self.enabled()
+        return snapshot
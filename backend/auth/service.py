@@ -16,12 +16,14 @@ import firebase_admin
 from firebase_admin import auth as firebase_auth
 from firebase_admin import credentials
 from fastapi import HTTPException, Request, status
-from google.auth.transport import requests as google_auth_requests
-from google.oauth2 import id_token as google_id_token
 
 logger = logging.getLogger(__name__)
 
+from backend.auth.firebase_keys import FirebaseKeyStore
+from backend.auth.principal_cache import PrincipalCache, token_cache_key
+from backend.shared.database.connection_pool import get_connection
 from backend.shared.db_path import DB_DIR
+from backend.shared.env import env_int
 from backend.shared.tenancy import DEFAULT_ORG_ID, DEFAULT_ORG_NAME
 from backend.billing import plans as billing_plans
 AUTH_DB_PATH = DB_DIR / "auth.db"
@@ -42,6 +44,9 @@ BOOTSTRAP_ADMIN_EMAILS = {"blackulaphotography@gmail.com"}
 # (comma-separated env). Never grant this to every org admin.
 PLATFORM_SUPER_ADMIN_EMAILS = {"blackulaphotography@gmail.com"}
 TRUE_VALUES = {"1", "true", "yes", "on"}
+# Unchanged logins only refresh user_profiles.last_login_at this often, so an
+# authenticated read request does not become an auth.db write transaction.
+LAST_LOGIN_THROTTLE = timedelta(minutes=env_int("CMSX_AUTH_LAST_LOGIN_THROTTLE_MIN", 15))
 # Org types offered in first-login onboarding ("individual" is the personal
 # workspace created behind the scenes; the rest are explicit org choices).
 ALLOWED_ORG_TYPES = {
@@ -85,12 +90,12 @@ class FirebaseAuthService:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._firebase_app: Optional[firebase_admin.App] = None
+        self.principal_cache = PrincipalCache()
+        self.public_keys = FirebaseKeyStore()
         self._initialize_profile_store()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path, row_factory=sqlite3.Row)
 
     def _initialize_profile_store(self) -> None:
         with self._connect() as conn:
@@ -389,18 +394,13 @@ class FirebaseAuthService:
 
     def _verify_token_with_public_certs(self, token: str) -> Dict[str, Any]:
         try:
-            request_adapter = google_auth_requests.Request()
             project_id = self._get_project_id() or self._get_project_id_from_token(token)
             if not project_id:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Firebase project ID is not configured on the backend",
                 )
-            decoded = google_id_token.verify_firebase_token(
-                token,
-                request_adapter,
-                audience=project_id,
-            )
+            decoded = self.public_keys.verify(token, project_id)
             if not decoded:
                 raise ValueError("Decoded Firebase token was empty")
             return decoded
@@ -413,7 +413,8 @@ class FirebaseAuthService:
                 detail="Invalid Firebase token",
             ) from exc
 
-    def verify_bearer_token(self, authorization_header: Optional[str]) -> Dict[str, Any]:
+    @staticmethod
+    def _bearer_token(authorization_header: Optional[str]) -> str:
         if not authorization_header or not authorization_header.startswith("Bearer "):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -426,8 +427,15 @@ class FirebaseAuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Missing Firebase bearer token",
             )
+        return token
+
+    def verify_bearer_token(self, authorization_header: Optional[str]) -> Dict[str, Any]:
+        token = self._bearer_token(authorization_header)
 
         try:
+            if self.public_keys.offline:
+                # A local JWKS file pins verification to those keys, no network.
+                return self._verify_token_with_public_certs(token)
             try:
                 self._get_firebase_app()
                 return firebase_auth.verify_id_token(token)
@@ -443,6 +451,30 @@ class FirebaseAuthService:
                 detail="Invalid Firebase token",
             ) from exc
 
+    def authenticate_bearer(self, authorization_header: Optional[str]) -> AuthenticatedUser:
+        """Resolve the request principal, reusing it while the same token is valid.
+
+        A cache miss verifies the token and upserts the profile exactly as
+        before; a hit skips both (no token crypto, no auth.db access).
+        """
+        cache_key = token_cache_key(self._bearer_token(authorization_header))
+        user = self.principal_cache.get(cache_key)
+        if user is not None:
+            return user
+        decoded = self.verify_bearer_token(authorization_header)
+        user = self.upsert_profile_from_token(decoded)
+        self.principal_cache.put(cache_key, user, decoded)
+        return user
+
+    @staticmethod
+    def _login_is_recent(last_login_at: Optional[str], now: datetime) -> bool:
+        if not last_login_at:
+            return False
+        try:
+            return now - datetime.fromisoformat(last_login_at) < LAST_LOGIN_THROTTLE
+        except (TypeError, ValueError):
+            return False
+
     def _default_case_manager_id(self, firebase_uid: str) -> str:
         return firebase_uid
 
@@ -527,7 +559,33 @@ class FirebaseAuthService:
                 org_id = existing_org_id or DEFAULT_ORG_ID
                 existing_org_role = (existing["org_role"] or ORG_MEMBER_ROLE).strip()
                 org_role = ORG_ADMIN_ROLE if role == ADMIN_ROLE else existing_org_role
-                now = datetime.utcnow().isoformat()
+                photo_url = decoded_token.get("picture") or ""
+                current = datetime.utcnow()
+                now = current.isoformat()
+                claims_unchanged = (
+                    existing["email"] == email
+                    and existing["full_name"] == name
+                    and existing["role"] == role
+                    and existing["case_manager_id"] == case_manager_id
+                    and existing["auth_provider"] == provider
+                    and (existing["photo_url"] or "") == photo_url
+                    and existing["org_id"] == org_id
+                    and existing["org_role"] == org_role
+                )
+                if claims_unchanged:
+                    # Nothing the app reads changed: skip the write entirely, or
+                    # only bump last_login_at once per LAST_LOGIN_THROTTLE.
+                    if self._login_is_recent(existing["last_login_at"], current):
+                        self.principal_cache.record("profile_writes_skipped")
+                    else:
+                        conn.execute(
+                            "UPDATE user_profiles SET last_login_at = ? WHERE firebase_uid = ?",
+                            (now, firebase_uid),
+                        )
+                        conn.commit()
+                        self.principal_cache.record("last_login_updates")
+                    return self._row_to_user(existing)
+
                 conn.execute(
                     """
                     UPDATE user_profiles
@@ -540,7 +598,7 @@ class FirebaseAuthService:
                         role,
                         case_manager_id,
                         provider,
-                        decoded_token.get("picture") or "",
+                        photo_url,
                         now,
                         now,
                         org_id,
@@ -549,6 +607,8 @@ class FirebaseAuthService:
                     ),
                 )
                 conn.commit()
+                self.principal_cache.invalidate_uid(firebase_uid)
+                self.principal_cache.record("profile_updates")
                 refreshed = conn.execute(
                     "SELECT * FROM user_profiles WHERE firebase_uid = ?",
                     (firebase_uid,),
@@ -680,6 +740,7 @@ class FirebaseAuthService:
             )
             self._assign_user_to_org(conn, firebase_uid, org_id, ORG_ADMIN_ROLE, ADMIN_ROLE)
             conn.commit()
+            self.principal_cache.invalidate_uid(firebase_uid)
             row = conn.execute(
                 "SELECT * FROM user_profiles WHERE firebase_uid = ?",
                 (firebase_uid,),
@@ -739,6 +800,7 @@ class FirebaseAuthService:
                 (now, invite["invite_id"]),
             )
             conn.commit()
+            self.principal_cache.invalidate_uid(firebase_uid)
             row = conn.execute(
                 "SELECT * FROM user_profiles WHERE firebase_uid = ?",
                 (firebase_uid,),
@@ -911,6 +973,7 @@ class FirebaseAuthService:
                 (role, app_role, datetime.utcnow().isoformat(), target_uid, org_id),
             )
             conn.commit()
+        self.principal_cache.invalidate_uid(target_uid)
         return {"firebase_uid": target_uid, "org_role": role, "role": app_role}
 
     def disable_staff(self, org_id: str, target_uid: str) -> Dict[str, Any]:
@@ -930,6 +993,7 @@ class FirebaseAuthService:
                 (datetime.utcnow().isoformat(), target_uid, org_id),
             )
             conn.commit()
+        self.principal_cache.invalidate_uid(target_uid)
         return {"firebase_uid": target_uid, "is_active": False, "status": "disabled"}
 
     def set_staff_status(self, org_id: str, target_uid: str, status: str) -> Dict[str, Any]:
@@ -950,6 +1014,7 @@ class FirebaseAuthService:
                 (datetime.utcnow().isoformat(), target_uid, org_id),
             )
             conn.commit()
+        self.principal_cache.invalidate_uid(target_uid)
         return {"firebase_uid": target_uid, "is_active": True, "status": "active"}
 
     # ── Platform super-admin (owner command center) ─────────────────────────
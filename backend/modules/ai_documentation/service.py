@@ -9,7 +9,9 @@ from typing import Any, Dict, List, Optional
 
 from openai import AsyncOpenAI
 
+import backend.shared.ai_response_cache as ai_response_cache_mod
 from backend.modules.resume.file_processor import ResumeFileProcessor
+from backend.shared.ai_response_cache import CacheSavings
 from backend.shared.database.workspace_store import workspace_store
 from backend.shared.database.core_client_service import CoreClientService
 
@@ -2091,25 +2093,45 @@ class DocumentationAIService:
             "- Do not include any disclaimer or commentary outside the note.",
         ]
 
+        request = {
+            "model": self.model,
+            "temperature": 0.2,
+            "max_tokens": 900,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You draft accurate case management documentation from dictated transcripts without adding unstated facts.",
+                },
+                {"role": "user", "content": "\n".join(prompt)},
+            ],
+        }
+
+        async def create() -> Dict[str, Any]:
+            response = await self.client.chat.completions.create(**request)
+            usage = getattr(response, "usage", None)
+            return {
+                "content": response.choices[0].message.content or "",
+                "tokens": getattr(usage, "total_tokens", 0) or 0,
+            }
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                temperature=0.2,
-                max_tokens=900,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You draft accurate case management documentation from dictated transcripts without adding unstated facts.",
-                    },
-                    {"role": "user", "content": "\n".join(prompt)},
-                ],
+            # Re-generating from the same transcript (retries, double submits) is served from the cache.
+            cache = ai_response_cache_mod.ai_response_cache
+            savings = CacheSavings()
+            completion = await cache.aget_or_compute(
+                "completion",
+                cache.key("completion", payload.get("org_id"), "transcript_note", request),
+                create,
+                savings=savings,
+                tokens=lambda result: result["tokens"],
             )
-            draft = (response.choices[0].message.content or "").strip() or fallback_note
+            draft = completion["content"].strip() or fallback_note
             return {
                 "draft": draft,
                 "source": "openai",
                 "transcript": transcript,
                 "note_type": note_type,
+                "cache": savings.as_dict(),
             }
         except Exception as exc:
             logger.warning("Transcript note generation failed, using fallback: %s", exc)
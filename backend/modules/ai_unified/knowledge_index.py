@@ -0,0 +1,389 @@
+"""Persistent passage index for ``knowledge_files/`` (SQLite FTS5, BM25-ranked).
+
+``UnifiedAIService._search_local_knowledge_files`` used to score files by
+filename/title tokens and then extract PDF/DOCX/XLSX text at request time,
+truncated to 8,000 characters, for the top hits. Large guides were slow to read
+and mostly invisible. This index does the extraction once, off the request
+path:
+
+* Every knowledge file is extracted in full and split into overlapping
+  passages. A document is re-extracted only when its path, mtime, size or
+  manifest metadata change, and files that disappear are dropped.
+* Passages live in ``knowledge_passages`` (FTS5, porter stemming). The FTS
+  rowid is ``doc_id * ROWID_STRIDE + passage_no`` so a document's passages can
+  be replaced with one rowid-range delete.
+* A search returns each document's best BM25 passage, ranked across
+  documents, in milliseconds.
+
+Sync runs in a background thread. It is triggered at most every
+``CMSX_KNOWLEDGE_RESCAN_S`` seconds from search, or run offline with
+``python -m backend.modules.ai_unified.knowledge_index``. Until the first full
+sync completes, ``ready()`` is False and callers keep their previous search
+path. ``CMSX_KNOWLEDGE_INDEX=0`` disables the index.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "knowledge_index.db"
+ROWID_STRIDE = 1_000_000
+# BM25 column weights for (title, tags, body).
+BM25_WEIGHTS = (6.0, 3.0, 1.0)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+EntriesProvider = Callable[[], Iterable[Dict[str, Any]]]
+Extractor = Callable[[Path], str]
+
+
+PASSAGE_CHARS = env_int("CMSX_KNOWLEDGE_PASSAGE_CHARS", 1200)
+PASSAGE_OVERLAP = env_int("CMSX_KNOWLEDGE_PASSAGE_OVERLAP", 200)
+RESCAN_SECONDS = env_int("CMSX_KNOWLEDGE_RESCAN_S", 300)
+
+
+def knowledge_index_enabled() -> bool:
+    return env_bool("CMSX_KNOWLEDGE_INDEX", True)
+
+
+def split_passages(text: str, size: int = PASSAGE_CHARS, overlap: int = PASSAGE_OVERLAP) -> List[str]:
+    """Cut ``text`` into ~``size``-char windows overlapping by ``overlap``, on word boundaries."""
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if not text:
+        return []
+    step = max(1, size - overlap)
+    passages: List[str] = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            cut = text.rfind(" ", start + step, end)
+            if cut > start:
+                end = cut
+        passages.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        next_start = max(start + 1, end - overlap)
+        # Start the next window on a word boundary too.
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return [passage for passage in passages if passage]
+
+
+def build_match_expression(tokens: Iterable[str]) -> Optional[str]:
+    words: List[str] = []
+    for token in tokens:
+        for word in _WORD_RE.findall((token or "").lower()):
+            if len(word) > 2 and word not in words:
+                words.append(word)
+    if not words:
+        return None
+    return " OR ".join(f'"{word}"*' if len(word) >= 4 else f'"{word}"' for word in words)
+
+
+class KnowledgeIndex:
+    """Passage-level BM25 index over the knowledge files, persisted in SQLite."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._schema_ready = False
+        self._sync_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._last_scan = 0.0
+        self._metrics: Dict[str, Any] = {}
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_connection(self.db_path, row_factory=sqlite3.Row)
+        if not self._schema_ready:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS knowledge_documents (
+                    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    category TEXT NOT NULL DEFAULT '',
+                    sources TEXT NOT NULL DEFAULT '[]',
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    meta_hash TEXT NOT NULL,
+                    passage_count INTEGER NOT NULL DEFAULT 0,
+                    indexed_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS knowledge_index_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_passages USING fts5(
+                    title, tags, body, tokenize = 'porter unicode61 remove_diacritics 2'
+                );
+                """
+            )
+            self._schema_ready = True
+        return conn
+
+    # ── Sync ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _meta_hash(entry: Dict[str, Any]) -> str:
+        meta = [entry.get("title") or "", entry.get("tags") or [], entry.get("category") or "", entry.get("sources") or []]
+        return hashlib.sha1(json.dumps(meta, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def sync(self, entries: Iterable[Dict[str, Any]], extractor: Extractor) -> Dict[str, int]:
+        """Bring the index in line with ``entries``; returns per-outcome counts."""
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        with self._sync_lock:
+            with self._connect() as conn:
+                known = {
+                    row["path"]: row
+                    for row in conn.execute(
+                        "SELECT doc_id, path, mtime, size, meta_hash FROM knowledge_documents"
+                    ).fetchall()
+                }
+            seen = set()
+            for entry in entries:
+                path = Path(entry["path"])
+                try:
+                    resolved = str(path.resolve())
+                    stat = path.stat()
+                except OSError:
+                    continue
+                seen.add(resolved)
+                meta_hash = self._meta_hash(entry)
+                row = known.get(resolved)
+                if row and row["mtime"] == stat.st_mtime and row["size"] == stat.st_size and row["meta_hash"] == meta_hash:
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    text = extractor(path) or ""
+                except Exception as exc:
+                    logger.warning("Knowledge index extraction failed for %s: %s", path, exc)
+                    text = ""
+                if not text:
+                    stats["failed"] += 1
+                self._write_document(entry, resolved, stat, meta_hash, split_passages(text))
+                stats["indexed"] += 1
+
+            removed = [path for path in known if path not in seen]
+            if removed:
+                with self._connect() as conn:
+                    for path in removed:
+                        self._delete_passages(conn, known[path]["doc_id"])
+                        conn.execute("DELETE FROM knowledge_documents WHERE doc_id = ?", (known[path]["doc_id"],))
+                    conn.commit()
+                stats["removed"] = len(removed)
+
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO knowledge_index_state (key, value) VALUES ('last_full_sync', ?)",
+                    (str(time.time()),),
+                )
+                conn.commit()
+        with self._metrics_lock:
+            for key, value in stats.items():
+                self._metrics[f"documents_{key}"] += value
+            self._metrics["syncs"] += 1
+        logger.info("Knowledge index sync: %s", stats)
+        return stats
+
+    @staticmethod
+    def _delete_passages(conn: sqlite3.Connection, doc_id: int) -> None:
+        conn.execute(
+            "DELETE FROM knowledge_passages WHERE rowid >= ? AND rowid < ?",
+            (doc_id * ROWID_STRIDE, (doc_id + 1) * ROWID_STRIDE),
+        )
+
+    def _write_document(
+        self,
+        entry: Dict[str, Any],
+        resolved: str,
+        stat: os.stat_result,
+        meta_hash: str,
+        passages: List[str],
+    ) -> None:
+        path = Path(resolved)
+        title = entry.get("title") or path.stem
+        tags = list(entry.get("tags") or [])
+        category = entry.get("category") or ""
+        # The filename and tags are searchable alongside the title, as before.
+        title_text = f"{title} {path.stem.replace('_', ' ').replace('-', ' ')}"
+        tags_text = " ".join(str(tag) for tag in tags + [category] if tag)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO knowledge_documents
+                    (path, title, tags, category, sources, mtime, size, meta_hash, passage_count, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                ON CONFLICT(path) DO UPDATE SET
+                    title = excluded.title, tags = excluded.tags, category = excluded.category,
+                    sources = excluded.sources, mtime = excluded.mtime, size = excluded.size,
+                    meta_hash = excluded.meta_hash, passage_count = excluded.passage_count,
+                    indexed_at = excluded.indexed_at
+                """,
+                (
+                    resolved,
+                    title,
+                    json.dumps(tags),
+                    category,
+                    json.dumps(list(entry.get("sources") or [])),
+                    stat.st_mtime,
+                    stat.st_size,
+                    meta_hash,
+                    len(passages),
+                ),
+            )
+            doc_id = conn.execute("SELECT doc_id FROM knowledge_documents WHERE path = ?", (resolved,)).fetchone()[0]
+            self._delete_passages(conn, doc_id)
+            conn.executemany(
+                "INSERT INTO knowledge_passages (rowid, title, tags, body) VALUES (?, ?, ?, ?)",
+                [
+                    (doc_id * ROWID_STRIDE + number, title_text, tags_text, passage)
+                    for number, passage in enumerate(passages[:ROWID_STRIDE])
+                ],
+            )
+            conn.commit()
+
+    def refresh_in_background(self, entries_provider: EntriesProvider, extractor: Extractor) -> bool:
+        """Start a sync thread unless one is already running."""
+        with self._thread_lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return False
+            self._last_scan = time.time()
+            self._sync_thread = threading.Thread(
+                target=self._background_sync,
+                args=(entries_provider, extractor),
+                name="knowledge-index-sync",
+                daemon=True,
+            )
+            self._sync_thread.start()
+            return True
+
+    def _background_sync(self, entries_provider: EntriesProvider, extractor: Extractor) -> None:
+        try:
+            self.sync(list(entries_provider()), extractor)
+        except Exception as exc:
+            with self._metrics_lock:
+                self._metrics["sync_errors"] += 1
+            logger.warning("Knowledge index background sync failed: %s", exc)
+
+    def maybe_refresh(self, entries_provider: EntriesProvider, extractor: Extractor) -> None:
+        if time.time() - self._last_scan >= RESCAN_SECONDS:
+            self.refresh_in_background(entries_provider, extractor)
+
+    def ready(self) -> bool:
+        """True once a full sync has completed (the index covers every file)."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM knowledge_index_state WHERE key = 'last_full_sync'"
+            ).fetchone() is not None
+
+    # ── Search ──────────────────────────────────────────────────────────
+
+    def search(self, tokens: Iterable[str], limit: int = 6) -> List[Dict[str, Any]]:
+        """Best passage per document for ``tokens``, documents ranked by BM25."""
+        match_expression = build_match_expression(tokens)
+        if not match_expression:
+            return []
+        started = time.perf_counter()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                WITH hits AS (
+                    SELECT rowid / {ROWID_STRIDE} AS doc_id, body,
+                           bm25(knowledge_passages, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score
+                    FROM knowledge_passages WHERE knowledge_passages MATCH ?
+                ), best AS (
+                    SELECT doc_id, body, score,
+                           ROW_NUMBER() OVER (PARTITION BY doc_id ORDER BY score) AS rank_in_doc
+                    FROM hits
+                )
+                SELECT d.path, d.title, d.tags, d.category, d.sources, best.body, best.score
+                FROM best JOIN knowledge_documents d ON d.doc_id = best.doc_id
+                WHERE best.rank_in_doc = 1
+                ORDER BY best.score, d.title
+                LIMIT ?
+                """,
+                (match_expression, limit),
+            ).fetchall()
+        with self._metrics_lock:
+            self._metrics["searches"] += 1
+            self._metrics["search_ms_total"] += (time.perf_counter() - started) * 1000
+        return [
+            {
+                "path": row["path"],
+                "title": row["title"],
+                "tags": json.loads(row["tags"] or "[]"),
+                "category": row["category"] or "",
+                "sources": json.loads(row["sources"] or "[]"),
+                "passage": row["body"],
+                "score": row["score"],
+            }
+            for row in rows
+        ]
+
+    # ── Metrics ─────────────────────────────────────────────────────────
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._metrics = {
+                "syncs": 0,
+                "sync_errors": 0,
+                "documents_indexed": 0,
+                "documents_unchanged": 0,
+                "documents_removed": 0,
+                "documents_failed": 0,
+                "searches": 0,
+                "search_ms_total": 0.0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        searches = snapshot["searches"]
+        snapshot["search_ms_avg"] = round(snapshot["search_ms_total"] / searches, 3) if searches else 0.0
+        snapshot["search_ms_total"] = round(snapshot["search_ms_total"], 3)
+        snapshot["syncing"] = bool(self._sync_thread is not None and self._sync_thread.is_alive())
+        return snapshot
+
+
+_indexes: Dict[str, KnowledgeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_knowledge_index(db_dir: Optional[Path] = None) -> KnowledgeIndex:
+    """Process-wide index for ``db_dir`` (defaults to the current DB_DIR)."""
+    if db_dir is None:
+        from backend.shared import db_path as db_path_mod
+
+        db_dir = db_path_mod.DB_DIR
+    key = str(Path(db_dir).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = KnowledgeIndex(Path(db_dir) / INDEX_FILENAME)
+            _indexes[key] = index
+        return index
+
+
+if __name__ == "__main__":
+    # Offline build: extract and index every knowledge file now.
+    from backend.modules.ai_unified.unified_service import UnifiedAIService
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(UnifiedAIService().build_knowledge_index(), indent=2))
@@ -4,13 +4,16 @@ FastAPI router for GPT-4o + SQLite memory.
 """
 
 import asyncio
+import json
 import logging
 import re
 import sqlite3
+from contextlib import aclosing
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from backend.auth.service import auth_service, require_authenticated_user
@@ -99,6 +102,67 @@ async def chat(request: Request, body: ChatRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: Request, body: ChatRequest) -> StreamingResponse:
+    """Server-sent-events variant of ``/chat``.
+
+    Emits ``token`` / ``tool`` / ``status`` events as the turn runs and a final
+    ``done`` event with the same payload ``/chat`` returns. A gap of more than
+    ``AI_CHAT_TIMEOUT_SECONDS`` between events ends the stream with an ``error``
+    event. Disconnecting cancels the turn and the upstream model request.
+    """
+    current_user = require_authenticated_user(request)
+    case_manager_id = current_user.case_manager_id
+    org_id = resolve_org_id(current_user) if multi_tenant_enabled() else None
+    try:
+        message = body.message
+        _cleanup_tool_messages(case_manager_id)
+        injected_context = _build_chat_context(
+            message,
+            current_user=current_user,
+            client_id=body.client_id,
+            client_name=body.client_name,
+        )
+    except Exception as exc:
+        logger.error(f"Unified AI chat stream error: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    async def event_stream():
+        events = unified_ai.stream_message(
+            message=message,
+            case_manager_id=case_manager_id,
+            mode="central",
+            injected_context=injected_context,
+            injected_context_role="user",
+            org_id=org_id,
+        )
+        async with aclosing(events):
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), timeout=AI_CHAT_TIMEOUT_SECONDS)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    logger.warning("Unified AI chat stream stalled for case manager %s", case_manager_id)
+                    yield _sse("error", {"detail": "AI response timed out. Please try again."})
+                    return
+                except Exception as exc:
+                    logger.error(f"Unified AI chat stream error: {exc}")
+                    yield _sse("error", {"detail": str(exc)})
+                    return
+                yield _sse(event["event"], event["data"])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _build_assistant_context(message: str, *, current_route: Optional[str], current_user) -> Optional[str]:
     parts: List[str] = []
     documentation_context = _build_documentation_context(message)
@@ -276,9 +340,9 @@ def _build_selected_client_operational_facts_context(
         return None
 
     try:
-        from backend.api.clients import load_client_operational_context
+        from backend.api.clients import get_cached_client_operational_context
 
-        operational_context = load_client_operational_context(client_id, org_id=org_id)
+        operational_context = get_cached_client_operational_context(client_id, org_id=org_id)
     except Exception as exc:
         logger.warning("Selected client operational context unavailable for %s: %s", client_id, exc)
         return (
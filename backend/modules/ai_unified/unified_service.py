@@ -20,9 +20,11 @@ import logging
 import os
 import re
 import sqlite3
+import time
+from contextlib import aclosing
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from uuid import uuid4
 
@@ -35,14 +37,19 @@ from backend.modules.services.case_management_api import (
 )
 from backend.modules.services.virgil_db_service import get_virgil_db
 from backend.modules.ai_unified import platform_tools as _pt
+from backend.modules.ai_unified.knowledge_index import get_knowledge_index, knowledge_index_enabled
 from backend.modules.reminders.engine import IntelligentReminderEngine
 from backend.modules.reminders.repository import create_active_reminder as persist_active_reminder
 from backend.search.coordinator import get_coordinator
+import backend.shared.ai_response_cache as ai_response_cache_mod
+from backend.shared.ai_response_cache import CacheSavings
 from backend.shared.database.workspace_store import workspace_store
 from backend.modules.resources.retrieval_engine import get_resource_engine
 from backend.shared.tenancy import DEFAULT_ORG_ID, multi_tenant_enabled
 
 logger = logging.getLogger(__name__)
+# Read-only resource lookups whose results are shared through the AI response cache.
+CACHEABLE_TOOLS = {"search_internal_resources", "search_jobs", "search_housing", "search_services"}
 CRISIS_TERMS = {
     "rehab", "treatment", "detox", "shelter", "housing", "homeless",
     "street", "streets", "kicked out", "insurance", "benefits", "drug",
@@ -342,6 +349,16 @@ Your job is to reduce friction, increase clarity, and help humans make better de
 """
 
 
+async def _close_upstream(stream: Any) -> None:
+    """Close a streamed completion's HTTP response, even while the caller is being cancelled."""
+    # Shielded: if this task is cancelled mid-close, the close still runs to completion.
+    closing = asyncio.ensure_future(stream.response.aclose())
+    try:
+        await asyncio.shield(closing)
+    except Exception as exc:
+        logger.debug("Closing upstream completion stream failed: %s", exc)
+
+
 class UnifiedAIService:
     """Unified AI service with SQLite conversation memory."""
 
@@ -609,6 +626,7 @@ class UnifiedAIService:
         location: str = "Los Angeles, CA",
         page: int = 1,
         per_page: int = 10,
+        **_ignored,
     ) -> Dict[str, Any]:
         coordinator = get_coordinator()
         return await coordinator.search_jobs(query, location, page, per_page)
@@ -620,6 +638,7 @@ class UnifiedAIService:
         page: int = 1,
         per_page: int = 10,
         force_refresh: bool = False,
+        **_ignored,
     ) -> Dict[str, Any]:
         coordinator = get_coordinator()
         return await coordinator.search_housing(query, location, page, per_page, force_refresh=force_refresh)
@@ -630,6 +649,7 @@ class UnifiedAIService:
         location: str = "Los Angeles, CA",
         page: int = 1,
         per_page: int = 10,
+        **_ignored,
     ) -> Dict[str, Any]:
         coordinator = get_coordinator()
         return await coordinator.search_services(query, location, page, per_page)
@@ -639,6 +659,7 @@ class UnifiedAIService:
         query: str,
         location: str = "Los Angeles, CA",
         limit: int = 8,
+        **_ignored,
     ) -> Dict[str, Any]:
         """Search internal service and resource data before using the web."""
         try:
@@ -765,7 +786,10 @@ class UnifiedAIService:
     def _load_knowledge_index(self) -> List[Dict[str, Any]]:
         if self._knowledge_index_cache is not None:
             return self._knowledge_index_cache
+        self._knowledge_index_cache = self._scan_knowledge_entries()
+        return self._knowledge_index_cache
 
+    def _scan_knowledge_entries(self) -> List[Dict[str, Any]]:
         entries: List[Dict[str, Any]] = []
         seen_paths = set()
         for directory in self._knowledge_directories():
@@ -817,7 +841,6 @@ class UnifiedAIService:
                     }
                 )
 
-        self._knowledge_index_cache = entries
         return entries
 
     def _extract_knowledge_text(self, file_path: Path) -> str:
@@ -828,6 +851,22 @@ class UnifiedAIService:
             if cached and cached[0] == stat.st_mtime:
                 return cached[1]
 
+            normalized = self._read_knowledge_file(file_path)
+            if len(normalized) > 8000:
+                normalized = normalized[:8000]
+            self._knowledge_snippet_cache[cache_key] = (stat.st_mtime, normalized)
+            return normalized
+        except Exception as exc:
+            logger.warning("Failed to read knowledge file %s: %s", file_path, exc)
+            return ""
+
+    def _read_knowledge_file(self, file_path: Path, full: bool = False) -> str:
+        """Whitespace-normalized text of a knowledge file.
+
+        ``full`` reads every XLSX sheet/row (for the passage index) instead of
+        the first 2 sheets x 20 rows used for request-time snippets.
+        """
+        try:
             suffix = file_path.suffix.lower()
             text = ""
             if suffix in {".txt", ".md", ".markdown", ".csv"}:
@@ -841,9 +880,9 @@ class UnifiedAIService:
 
                     workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
                     rows: List[str] = []
-                    for sheet in workbook.worksheets[:2]:
+                    for sheet in workbook.worksheets if full else workbook.worksheets[:2]:
                         rows.append(sheet.title)
-                        for row in sheet.iter_rows(max_row=20, values_only=True):
+                        for row in sheet.iter_rows(max_row=None if full else 20, values_only=True):
                             values = [str(value).strip() for value in row if value not in (None, "")]
                             if values:
                                 rows.append(" | ".join(values))
@@ -865,15 +904,52 @@ class UnifiedAIService:
             if suffix in {".md", ".markdown"}:
                 text = re.sub(r"^---\s.*?---\s*", "", text, flags=re.DOTALL)
 
-            normalized = re.sub(r"\s+", " ", text).strip()
-            if len(normalized) > 8000:
-                normalized = normalized[:8000]
-            self._knowledge_snippet_cache[cache_key] = (stat.st_mtime, normalized)
-            return normalized
+            return re.sub(r"\s+", " ", text).strip()
         except Exception as exc:
             logger.warning("Failed to read knowledge file %s: %s", file_path, exc)
             return ""
 
+    def _read_full_knowledge_file(self, file_path: Path) -> str:
+        return self._read_knowledge_file(file_path, full=True)
+
+    def build_knowledge_index(self) -> Dict[str, int]:
+        """Extract and index every knowledge file synchronously (offline build)."""
+        return get_knowledge_index().sync(self._scan_knowledge_entries(), self._read_full_knowledge_file)
+
+    def _search_knowledge_index(self, tokens: List[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Passage-level BM25 results, or None while the index is off or not yet built."""
+        if not knowledge_index_enabled():
+            return None
+        try:
+            index = get_knowledge_index()
+            index.maybe_refresh(self._scan_knowledge_entries, self._read_full_knowledge_file)
+            if not index.ready():
+                return None
+            hits = index.search(tokens, limit=limit)
+        except sqlite3.Error as exc:
+            logger.warning("Knowledge index search failed, using file scan: %s", exc)
+            return None
+
+        results: List[Dict[str, Any]] = []
+        for hit in hits:
+            path = Path(hit["path"])
+            try:
+                display_path = str(path.relative_to(self.project_root))
+            except ValueError:
+                display_path = str(path)
+            results.append(
+                {
+                    "title": hit["title"] or path.stem,
+                    "path": display_path,
+                    "category": hit["category"],
+                    "tags": hit["tags"],
+                    "sources": hit["sources"],
+                    "snippet": self._build_knowledge_snippet(hit["passage"], tokens),
+                    "source": "knowledge_files",
+                }
+            )
+        return results
+
     def _build_knowledge_snippet(self, text: str, tokens: List[str]) -> str:
         if not text:
             return ""
@@ -901,6 +977,10 @@ class UnifiedAIService:
         if not tokens:
             return []
 
+        indexed = self._search_knowledge_index(tokens, limit)
+        if indexed is not None:
+            return indexed
+
         scored: List[Tuple[int, Dict[str, Any]]] = []
         for entry in self._load_knowledge_index():
             title = (entry.get("title") or "").lower()
@@ -1181,31 +1261,32 @@ class UnifiedAIService:
             "created_at": created_at,
         }
 
-    async def process_message(
+    async def _missing_key_response(
+        self, message: str, case_manager_id: str, org_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        fallback = (
+            "AI responses are unavailable because OPENAI_API_KEY is not configured. "
+            "Core app features remain available."
+        )
+        await self._save_message(case_manager_id, "user", message, org_id=org_id)
+        await self._save_message(case_manager_id, "assistant", fallback, org_id=org_id)
+        return {
+            "success": False,
+            "response": fallback,
+            "function_called": "",
+            "error": "missing_openai_api_key",
+        }
+
+    async def _prepare_turn(
         self,
         message: str,
         case_manager_id: str,
-        mode: str = "central",
-        injected_context: Optional[str] = None,
-        injected_context_role: str = "system",
-        org_id: Optional[str] = None,
+        mode: str,
+        injected_context: Optional[str],
+        injected_context_role: str,
+        org_id: Optional[str],
     ) -> Dict[str, Any]:
-        """Process a chat message and persist conversation history."""
-        await self.initialize()
-        if not self.client:
-            fallback = (
-                "AI responses are unavailable because OPENAI_API_KEY is not configured. "
-                "Core app features remain available."
-            )
-            await self._save_message(case_manager_id, "user", message, org_id=org_id)
-            await self._save_message(case_manager_id, "assistant", fallback, org_id=org_id)
-            return {
-                "success": False,
-                "response": fallback,
-                "function_called": "",
-                "error": "missing_openai_api_key",
-            }
-
+        """Assemble prompt messages, tools and grounding context for one chat turn."""
         history = await self._fetch_history(case_manager_id, limit=20, org_id=org_id)
         system_prompt = self._build_system_prompt(mode)
         messages: List[Dict[str, Any]] = [
@@ -1218,21 +1299,96 @@ class UnifiedAIService:
         if injected_context:
             context_role = "user" if injected_context_role == "user" else "system"
             messages.append({"role": context_role, "content": injected_context})
-        crisis_context = await self._maybe_build_crisis_support_context(message, history)
+        savings = CacheSavings()
+        cache_scope = org_id or DEFAULT_ORG_ID
+        crisis_context = await self._cached_context(
+            "crisis_support", self._maybe_build_crisis_support_context, cache_scope, savings, message, history
+        )
         resource_context = None
         internal_context = None
         if crisis_context:
             messages.append({"role": "system", "content": crisis_context})
         else:
-            resource_context = await self._maybe_build_case_manager_resource_context(message, history)
+            resource_context = await self._cached_context(
+                "case_manager_resources", self._maybe_build_case_manager_resource_context,
+                cache_scope, savings, message, history,
+            )
             if resource_context:
                 messages.append({"role": "system", "content": resource_context})
             else:
-                internal_context = await self._maybe_build_internal_resource_context(message)
+                internal_context = await self._cached_context(
+                    "internal_resources", lambda message, _history: self._maybe_build_internal_resource_context(message),
+                    cache_scope, savings, message, [],
+                )
                 if internal_context:
                     messages.append({"role": "system", "content": internal_context})
         messages.append({"role": "user", "content": message})
 
+        tools = self._chat_tools(mode)
+        return {
+            "history": history,
+            "system_prompt": system_prompt,
+            "messages": messages,
+            "tools": tools,
+            "allowed_functions": {tool["function"]["name"] for tool in tools},
+            "grounded_context": crisis_context or resource_context or internal_context,
+            "cache_scope": cache_scope,
+            "cache_savings": savings,
+        }
+
+    async def _cached_context(
+        self,
+        name: str,
+        build: Any,
+        scope: str,
+        savings: CacheSavings,
+        message: str,
+        history: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """Grounding context from ``build(message, history)``, reused for repeated questions.
+
+        Builders only read the last six history turns, so those (with the
+        message) make up the key. Empty contexts are not cached.
+        """
+        cache = ai_response_cache_mod.ai_response_cache
+        key = cache.key("context", scope, name, message, [h.get("content", "") for h in history[-6:]])
+        return await cache.aget_or_compute(
+            "context", key, lambda: build(message, history), savings=savings, cacheable=bool
+        )
+
+    async def _complete(self, savings: CacheSavings, scope: str, **request: Any) -> Dict[str, Any]:
+        """One chat completion as ``{"content", "tool_calls", "tokens"}``.
+
+        Requests at or below the cacheable temperature are answered from the
+        response cache when the same prompt was already completed in this org.
+        """
+
+        async def create() -> Dict[str, Any]:
+            response = await self.client.chat.completions.create(**request)
+            message = response.choices[0].message
+            usage = getattr(response, "usage", None)
+            return {
+                "content": message.content or "",
+                "tool_calls": [
+                    {
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments,
+                    }
+                    for tool_call in message.tool_calls or []
+                ],
+                "tokens": getattr(usage, "total_tokens", 0) or 0,
+            }
+
+        cache = ai_response_cache_mod.ai_response_cache
+        if not cache.cacheable_temperature(request.get("temperature")):
+            return await create()
+        key = cache.key("completion", scope, request)
+        return await cache.aget_or_compute(
+            "completion", key, create, savings=savings, tokens=lambda result: result["tokens"]
+        )
+
+    def _chat_tools(self, mode: str) -> List[Dict[str, Any]]:
         central_tools = [
             {
                 "type": "function",
@@ -1417,110 +1573,171 @@ class UnifiedAIService:
             for tool in central_tools
             if tool["function"]["name"] != "create_reminder"
         ]
-        tools = assistant_tools if mode == "assistant" else central_tools
-        allowed_functions = {tool["function"]["name"] for tool in tools}
+        return assistant_tools if mode == "assistant" else central_tools
+
+    def _grounded_messages(
+        self,
+        turn: Dict[str, Any],
+        message: str,
+        injected_context: Optional[str],
+        injected_context_role: str,
+    ) -> List[Dict[str, Any]]:
+        grounded_messages: List[Dict[str, Any]] = [
+            {"role": "system", "content": turn["system_prompt"]}
+        ]
+        grounded_messages.extend(
+            {"role": h["role"], "content": h["content"]} for h in turn["history"]
+        )
+        if injected_context:
+            context_role = "user" if injected_context_role == "user" else "system"
+            grounded_messages.append({"role": context_role, "content": injected_context})
+        grounded_messages.append(
+            {
+                "role": "user",
+                "content": (
+                    f"User request:\n{message}\n\n"
+                "Use the verified local data below before answering. "
+                "Give concrete options with provider names, phone numbers, addresses, what to say when calling, "
+                "Immediate next steps, This week, and one Clear next action. "
+                "If 3 or more verified options are listed below, do not collapse the answer to a single provider. "
+                "Return the 3 to 5 strongest options and explain which one to call first. "
+                "Do not claim detox, MAT, Suboxone, residential, couples treatment, or insurance acceptance unless it is explicit in the verified data below.\n\n"
+                f"{turn['grounded_context']}"
+            ),
+        }
+        )
+        return grounded_messages
+
+    @staticmethod
+    def _tool_call_request_message(content: str, tool_calls: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "content": content or "",
+            "tool_calls": [
+                {
+                    "id": tool_call["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tool_call["name"],
+                        "arguments": tool_call["arguments"],
+                    },
+                }
+                for tool_call in tool_calls
+            ],
+        }
+
+    async def _call_tool(
+        self,
+        tool_call: Dict[str, str],
+        case_manager_id: str,
+        org_id: Optional[str],
+        allowed_functions: set,
+        savings: Optional[CacheSavings] = None,
+    ) -> Dict[str, Any]:
+        """Run one model tool call and return the ``tool`` message carrying its result."""
+        params = json.loads(tool_call["arguments"] or "{}")
+        # Inject the authenticated identity for every tool call.
+        # Platform tools require case_manager_id; older tools that
+        # take it as an LLM param are also pinned here so they can
+        # never be redirected to a different user's data.
+        params["case_manager_id"] = case_manager_id
+        if org_id is not None:
+            params["org_id"] = org_id
+
+        async def run() -> Any:
+            return await self.execute_function(
+                tool_call["name"],
+                params,
+                allowed_functions=allowed_functions,
+            )
+
+        if tool_call["name"] in CACHEABLE_TOOLS:
+            # Resource lookups do not depend on who asks, only on the org scope.
+            cache = ai_response_cache_mod.ai_response_cache
+            arguments = {key: value for key, value in params.items() if key not in ("case_manager_id", "org_id")}
+            key = cache.key("tool", org_id or DEFAULT_ORG_ID, tool_call["name"], arguments)
+            result = await cache.aget_or_compute(
+                "tool", key, run, savings=savings,
+                cacheable=lambda value: not (isinstance(value, dict) and value.get("success") is False),
+            )
+        else:
+            result = await run()
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call["id"],
+            "content": json.dumps(result),
+        }
+
+    async def process_message(
+        self,
+        message: str,
+        case_manager_id: str,
+        mode: str = "central",
+        injected_context: Optional[str] = None,
+        injected_context_role: str = "system",
+        org_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Process a chat message and persist conversation history."""
+        await self.initialize()
+        if not self.client:
+            return await self._missing_key_response(message, case_manager_id, org_id=org_id)
+
+        turn = await self._prepare_turn(
+            message, case_manager_id, mode, injected_context, injected_context_role, org_id
+        )
+        messages = turn["messages"]
+        savings = turn["cache_savings"]
+        scope = turn["cache_scope"]
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._complete(
+                savings,
+                scope,
                 model=self.model,
                 messages=messages,
-                tools=tools,
+                tools=turn["tools"],
                 tool_choice="auto",
                 temperature=0.2,
                 max_tokens=800,
             )
 
             function_called = ""
-            assistant_message = response.choices[0].message
-
-            if assistant_message.tool_calls:
-                messages.append(
-                    {
-                        "role": "assistant",
-                        "content": assistant_message.content or "",
-                        "tool_calls": [
-                            {
-                                "id": tool_call.id,
-                                "type": "function",
-                                "function": {
-                                    "name": tool_call.function.name,
-                                    "arguments": tool_call.function.arguments,
-                                },
-                            }
-                            for tool_call in assistant_message.tool_calls
-                        ],
-                    }
-                )
-                for tool_call in assistant_message.tool_calls:
-                    function_called = tool_call.function.name
-                    params = json.loads(tool_call.function.arguments or "{}")
-                    # Inject the authenticated identity for every tool call.
-                    # Platform tools require case_manager_id; older tools that
-                    # take it as an LLM param are also pinned here so they can
-                    # never be redirected to a different user's data.
-                    params["case_manager_id"] = case_manager_id
-                    if org_id is not None:
-                        params["org_id"] = org_id
-                    result = await self.execute_function(
-                        function_called,
-                        params,
-                        allowed_functions=allowed_functions,
-                    )
+            tool_calls = response["tool_calls"]
 
+            if tool_calls:
+                messages.append(self._tool_call_request_message(response["content"], tool_calls))
+                for tool_call in tool_calls:
+                    function_called = tool_call["name"]
                     messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps(result),
-                        }
+                        await self._call_tool(
+                            tool_call, case_manager_id, org_id, turn["allowed_functions"], savings
+                        )
                     )
 
-                follow_up = await self.client.chat.completions.create(
+                follow_up = await self._complete(
+                    savings,
+                    scope,
                     model=self.model,
                     messages=messages,
                     temperature=0.2,
                     max_tokens=800,
                 )
-                assistant_text = follow_up.choices[0].message.content or ""
+                assistant_text = follow_up["content"]
             else:
-                assistant_text = assistant_message.content or ""
-
-                if self._should_force_resource_search(message):
-                    grounded_context = crisis_context or resource_context or internal_context
-                    if grounded_context:
-                        grounded_messages: List[Dict[str, Any]] = [
-                            {"role": "system", "content": system_prompt}
-                        ]
-                        grounded_messages.extend(
-                            {"role": h["role"], "content": h["content"]} for h in history
-                        )
-                        if injected_context:
-                            context_role = "user" if injected_context_role == "user" else "system"
-                            grounded_messages.append({"role": context_role, "content": injected_context})
-                        grounded_messages.append(
-                            {
-                                "role": "user",
-                                "content": (
-                                    f"User request:\n{message}\n\n"
-                                "Use the verified local data below before answering. "
-                                "Give concrete options with provider names, phone numbers, addresses, what to say when calling, "
-                                "Immediate next steps, This week, and one Clear next action. "
-                                "If 3 or more verified options are listed below, do not collapse the answer to a single provider. "
-                                "Return the 3 to 5 strongest options and explain which one to call first. "
-                                "Do not claim detox, MAT, Suboxone, residential, couples treatment, or insurance acceptance unless it is explicit in the verified data below.\n\n"
-                                f"{grounded_context}"
-                            ),
-                        }
-                        )
-                        grounded_follow_up = await self.client.chat.completions.create(
-                            model=self.model,
-                            messages=grounded_messages,
-                            temperature=0.2,
-                            max_tokens=900,
-                        )
-                        grounded_content = grounded_follow_up.choices[0].message.content or ""
-                        if grounded_content.strip():
-                            assistant_text = grounded_content
+                assistant_text = response["content"]
+
+                if self._should_force_resource_search(message) and turn["grounded_context"]:
+                    grounded_follow_up = await self._complete(
+                        savings,
+                        scope,
+                        model=self.model,
+                        messages=self._grounded_messages(turn, message, injected_context, injected_context_role),
+                        temperature=0.2,
+                        max_tokens=900,
+                    )
+                    grounded_content = grounded_follow_up["content"]
+                    if grounded_content.strip():
+                        assistant_text = grounded_content
 
             assistant_text = self._finalize_response_text(assistant_text)
         except Exception as exc:
@@ -1542,6 +1759,167 @@ class UnifiedAIService:
             "success": True,
             "response": assistant_text,
             "function_called": function_called,
+            "cache": savings.as_dict(),
+        }
+
+    # ── Streaming ──────────────────────────────────────────────────────────
+
+    async def _stream_completion(self, **request: Any) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ``("token", text)`` per content delta, then ``("tool_calls", [...])``.
+
+        The upstream response is closed on exit, including when the consumer
+        stops early, so a cancelled turn stops generating (and billing) tokens.
+        """
+        stream = await self.client.chat.completions.create(**request, stream=True)
+        tool_calls: Dict[int, Dict[str, str]] = {}
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    yield "token", delta.content
+                for call in delta.tool_calls or []:
+                    entry = tool_calls.setdefault(call.index, {"id": "", "name": "", "arguments": ""})
+                    if call.id:
+                        entry["id"] = call.id
+                    if call.function and call.function.name:
+                        entry["name"] += call.function.name
+                    if call.function and call.function.arguments:
+                        entry["arguments"] += call.function.arguments
+        finally:
+            await _close_upstream(stream)
+        if tool_calls:
+            yield "tool_calls", [tool_calls[index] for index in sorted(tool_calls)]
+
+    async def stream_message(
+        self,
+        message: str,
+        case_manager_id: str,
+        mode: str = "central",
+        injected_context: Optional[str] = None,
+        injected_context_role: str = "system",
+        org_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming ``process_message``: yields ``{"event": ..., "data": {...}}`` dicts.
+
+        ``token`` events carry text deltas as the model produces them, ``tool``
+        events report each tool call (``running`` then ``completed``), and a
+        final ``done`` event carries the ``process_message`` payload whose
+        polished ``response`` replaces the streamed draft. When the answer is
+        re-grounded on verified local data the first draft is not streamed; a
+        ``status`` event announces the grounded pass instead.
+
+        History is written once the turn completes. Closing the generator early
+        (the client disconnected) aborts the in-flight upstream request and
+        persists nothing.
+        """
+        await self.initialize()
+        if not self.client:
+            yield {"event": "done", "data": await self._missing_key_response(message, case_manager_id, org_id=org_id)}
+            return
+
+        started = time.perf_counter()
+        first_token_ms: Optional[float] = None
+
+        def token_event(text: str) -> Dict[str, Any]:
+            nonlocal first_token_ms
+            if first_token_ms is None:
+                first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+            return {"event": "token", "data": {"text": text}}
+
+        turn = await self._prepare_turn(
+            message, case_manager_id, mode, injected_context, injected_context_role, org_id
+        )
+        messages = turn["messages"]
+        grounded = bool(self._should_force_resource_search(message) and turn["grounded_context"])
+        function_called = ""
+
+        try:
+            draft: List[str] = []
+            tool_calls: List[Dict[str, str]] = []
+            async with aclosing(self._stream_completion(
+                model=self.model,
+                messages=messages,
+                tools=turn["tools"],
+                tool_choice="auto",
+                temperature=0.2,
+                max_tokens=800,
+            )) as upstream:
+                async for kind, value in upstream:
+                    if kind == "tool_calls":
+                        tool_calls = value
+                        continue
+                    draft.append(value)
+                    if not grounded:
+                        yield token_event(value)
+
+            if tool_calls:
+                messages.append(self._tool_call_request_message("".join(draft), tool_calls))
+                for tool_call in tool_calls:
+                    function_called = tool_call["name"]
+                    yield {"event": "tool", "data": {"name": function_called, "status": "running"}}
+                    messages.append(
+                        await self._call_tool(
+                            tool_call, case_manager_id, org_id, turn["allowed_functions"], turn["cache_savings"]
+                        )
+                    )
+                    yield {"event": "tool", "data": {"name": function_called, "status": "completed"}}
+                draft = []
+                async with aclosing(self._stream_completion(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.2,
+                    max_tokens=800,
+                )) as upstream:
+                    async for kind, value in upstream:
+                        if kind == "token":
+                            draft.append(value)
+                            yield token_event(value)
+            elif grounded:
+                yield {"event": "status", "data": {"status": "grounding"}}
+                grounded_draft: List[str] = []
+                async with aclosing(self._stream_completion(
+                    model=self.model,
+                    messages=self._grounded_messages(turn, message, injected_context, injected_context_role),
+                    temperature=0.2,
+                    max_tokens=900,
+                )) as upstream:
+                    async for kind, value in upstream:
+                        if kind == "token":
+                            grounded_draft.append(value)
+                            yield token_event(value)
+                if "".join(grounded_draft).strip():
+                    draft = grounded_draft
+                elif draft:
+                    yield token_event("".join(draft))
+
+            assistant_text = self._finalize_response_text("".join(draft))
+        except Exception as exc:
+            logger.warning("Unified AI provider failure in %s stream: %s", mode, exc)
+            degraded = await self._handle_provider_failure(
+                message=message,
+                case_manager_id=case_manager_id,
+                mode=mode,
+                error=str(exc),
+            )
+            await self._save_message(case_manager_id, "user", message, org_id=org_id)
+            await self._save_message(case_manager_id, "assistant", degraded["response"], org_id=org_id)
+            yield {"event": "done", "data": degraded}
+            return
+
+        await self._save_message(case_manager_id, "user", message, org_id=org_id)
+        await self._save_message(case_manager_id, "assistant", assistant_text, org_id=org_id)
+        yield {
+            "event": "done",
+            "data": {
+                "success": True,
+                "response": assistant_text,
+                "function_called": function_called,
+                "first_token_ms": first_token_ms,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                "cache": turn["cache_savings"].as_dict(),
+            },
         }
 
     def _build_system_prompt(self, mode: str) -> str:
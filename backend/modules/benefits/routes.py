@@ -16,6 +16,7 @@ import logging
 import json
 from datetime import datetime, timedelta
 
+from backend.shared.client_context_cache import invalidate_client_context
 from backend.shared.db_path import DB_DIR as _DB_DIR
 from .models import BenefitsApplication, BenefitsDatabase
 from .disability_assessment import DisabilityAssessment, QUALIFYING_CONDITIONS
@@ -474,6 +475,7 @@ async def create_benefits_application(application_data: BenefitApplication, requ
         ))
         
         conn.commit()
+        invalidate_client_context(application_data.client_id)
         conn.close()
         
         application = {
@@ -721,6 +723,7 @@ async def upload_application_document(
             ),
         )
         conn.commit()
+        invalidate_client_context(application_row["client_id"])
         conn.close()
 
         return {
@@ -1257,6 +1260,7 @@ async def api_start_disability_application(application_data: StartApplication, r
             datetime.now().isoformat()
         ))
         conn.commit()
+        invalidate_client_context(client_id)
         conn.close()
         
         return {
@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
 from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 from typing import Optional, Dict, List, Any
+import asyncio
 import html
 import os
 import re
@@ -14,9 +15,9 @@ import uuid
 import logging
 import sqlite3
 from urllib.parse import urlparse
-from datetime import datetime, timedelta
 
 from backend.shared.database.workspace_store import workspace_store
+from backend.modules.dashboard.supervisor_overview import build_supervisor_overview
 from backend.auth.service import ADMIN_ROLE, require_authenticated_user, require_role
 from backend.shared.db_path import DB_DIR as _DB_DIR
 from backend.shared.tenancy import DEFAULT_ORG_ID, multi_tenant_enabled, resolve_org_id
@@ -196,16 +197,6 @@ def _dict_connection(db_path: str) -> sqlite3.Connection:
     return conn
 
 
-def _safe_count_query(conn: sqlite3.Connection, query: str, params: tuple = ()) -> int:
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        return int(row[0]) if row and row[0] is not None else 0
-    except Exception:
-        return 0
-
-
 def _load_case_manager_names(org_id: Optional[str] = None) -> Dict[str, str]:
     name_map: Dict[str, str] = {}
     try:
@@ -228,168 +219,16 @@ def _load_case_manager_names(org_id: Optional[str] = None) -> Dict[str, str]:
     return name_map
 
 
-def _get_supervisor_overview(org_id: Optional[str] = None) -> Dict[str, Any]:
-    today = datetime.now().date().isoformat()
-    cutoff = (datetime.now() - timedelta(days=7)).date().isoformat()
-    name_map = _load_case_manager_names(org_id)
-
-    # Phase 3B: scope the core-client aggregate to one org when supplied. Because
-    # the per-case-manager and client_id sets become org-scoped here, the
-    # downstream reminders/benefits/legal/FMLA counts inherit org scoping without
-    # touching those module DBs. org_id=None preserves prior behavior exactly.
-    org_clause = "WHERE org_id = ?" if org_id is not None else ""
-    aggregate_params = (cutoff, org_id) if org_id is not None else (cutoff,)
-    with _dict_connection(str(_DB_DIR / "core_clients.db")) as core_conn:
-        core_cursor = core_conn.cursor()
-        core_cursor.execute(f"""
-            SELECT
-                COALESCE(NULLIF(TRIM(case_manager_id), ''), 'unassigned') AS case_manager_id,
-                COUNT(*) AS total_clients,
-                SUM(CASE WHEN LOWER(COALESCE(risk_level, '')) = 'high' THEN 1 ELSE 0 END) AS high_risk_clients,
-                SUM(CASE WHEN DATE(COALESCE(created_at, CURRENT_TIMESTAMP)) >= DATE(?) THEN 1 ELSE 0 END) AS recent_intakes,
-                SUM(CASE WHEN TRIM(COALESCE(barriers, '')) <> '' THEN 1 ELSE 0 END) AS clients_with_barriers
-            FROM clients
-            {org_clause}
-            GROUP BY COALESCE(NULLIF(TRIM(case_manager_id), ''), 'unassigned')
-            ORDER BY total_clients DESC, case_manager_id
-        """, aggregate_params)
-        manager_rows = core_cursor.fetchall()
-
-    case_managers: List[Dict[str, Any]] = []
-    all_client_ids: List[str] = []
-    all_high_risk = 0
-    total_clients = 0
-    clients_with_barriers = 0
-
-    for row in manager_rows:
-        case_manager_id = row["case_manager_id"]
-        with _dict_connection(str(_DB_DIR / "core_clients.db")) as core_conn:
-            client_cursor = core_conn.cursor()
-            if org_id is not None:
-                client_cursor.execute(
-                    "SELECT client_id FROM clients WHERE COALESCE(NULLIF(TRIM(case_manager_id), ''), 'unassigned') = ? AND org_id = ?",
-                    (case_manager_id, org_id),
-                )
-            else:
-                client_cursor.execute(
-                    "SELECT client_id FROM clients WHERE COALESCE(NULLIF(TRIM(case_manager_id), ''), 'unassigned') = ?",
-                    (case_manager_id,),
-                )
-            client_ids = [client_row["client_id"] for client_row in client_cursor.fetchall()]
-
-        all_client_ids.extend(client_ids)
-        total_clients += int(row["total_clients"] or 0)
-        all_high_risk += int(row["high_risk_clients"] or 0)
-        clients_with_barriers += int(row["clients_with_barriers"] or 0)
-
-        overdue_reminders = 0
-        open_benefits = 0
-        active_legal = 0
-        active_fmla = 0
-
-        try:
-            with _dict_connection(str(_DB_DIR / "reminders.db")) as reminders_conn:
-                overdue_reminders = _safe_count_query(
-                    reminders_conn,
-                    """
-                    SELECT COUNT(*)
-                    FROM active_reminders
-                    WHERE case_manager_id = ?
-                      AND status = 'Active'
-                      AND DATE(due_date) < DATE(?)
-                    """,
-                    (case_manager_id, today),
-                )
-        except Exception:
-            overdue_reminders = 0
-
-        if client_ids:
-            placeholders = ",".join("?" for _ in client_ids)
-            try:
-                with _dict_connection(str(_DB_DIR / "unified_platform.db")) as benefits_conn:
-                    open_benefits = _safe_count_query(
-                        benefits_conn,
-                        f"""
-                        SELECT COUNT(*)
-                        FROM benefits_applications
-                        WHERE client_id IN ({placeholders})
-                          AND LOWER(COALESCE(status, '')) NOT IN ('approved', 'denied', 'closed', 'expired')
-                        """,
-                        tuple(client_ids),
-                    )
-            except Exception:
-                open_benefits = 0
-
-            try:
-                with _dict_connection(str(_DB_DIR / "legal_cases.db")) as legal_conn:
-                    active_legal = _safe_count_query(
-                        legal_conn,
-                        f"""
-                        SELECT COUNT(*)
-                        FROM legal_cases
-                        WHERE client_id IN ({placeholders})
-                          AND COALESCE(is_active, 1) = 1
-                        """,
-                        tuple(client_ids),
-                    )
-            except Exception:
-                active_legal = 0
-
-        try:
-            with _dict_connection(str(_DB_DIR / "fmla.db")) as fmla_conn:
-                active_fmla = _safe_count_query(
-                    fmla_conn,
-                    """
-                    SELECT COUNT(*)
-                    FROM fmla_cases
-                    WHERE COALESCE(assigned_case_manager, '') = ?
-                      AND LOWER(COALESCE(status, '')) <> 'closed'
-                    """,
-                    (case_manager_id,),
-                )
-        except Exception:
-            active_fmla = 0
-
-        completion_rate = 0
-        total_work_items = overdue_reminders + open_benefits + active_legal
-        if total_work_items > 0:
-            completion_rate = max(0, round(100 - ((overdue_reminders / total_work_items) * 100)))
-
-        case_managers.append({
-            "case_manager_id": case_manager_id,
-            "case_manager_name": name_map.get(case_manager_id, case_manager_id.replace("_", " ").title()),
-            "total_clients": int(row["total_clients"] or 0),
-            "high_risk_clients": int(row["high_risk_clients"] or 0),
-            "recent_intakes": int(row["recent_intakes"] or 0),
-            "clients_with_barriers": int(row["clients_with_barriers"] or 0),
-            "overdue_reminders": overdue_reminders,
-            "open_benefits_applications": open_benefits,
-            "active_legal_cases": active_legal,
-            "active_fmla_cases": active_fmla,
-            "completion_rate": completion_rate,
-        })
-
-    highest_overdue = sorted(case_managers, key=lambda item: item["overdue_reminders"], reverse=True)[:5]
-    highest_risk = sorted(case_managers, key=lambda item: item["high_risk_clients"], reverse=True)[:5]
-
-    return {
-        "generated_at": datetime.now().isoformat(),
-        "team_summary": {
-            "case_manager_count": len(case_managers),
-            "total_clients": total_clients,
-            "high_risk_clients": all_high_risk,
-            "clients_with_barriers": clients_with_barriers,
-            "overdue_reminders": sum(item["overdue_reminders"] for item in case_managers),
-            "open_benefits_applications": sum(item["open_benefits_applications"] for item in case_managers),
-            "active_legal_cases": sum(item["active_legal_cases"] for item in case_managers),
-            "active_fmla_cases": sum(item["active_fmla_cases"] for item in case_managers),
-        },
-        "case_managers": case_managers,
-        "alerts": {
-            "highest_overdue_workloads": highest_overdue,
-            "highest_risk_caseloads": highest_risk,
-        }
-    }
+def _get_supervisor_overview(org_id: Optional[str] = None, force_refresh: bool = False) -> Dict[str, Any]:
+    # Phase 3B: org_id scopes the core-client aggregate (and, through the client
+    # join, benefits/legal); org_id=None preserves the all-orgs behavior. The
+    # grouped per-source aggregation and daily snapshot live in supervisor_overview.
+    return build_supervisor_overview(
+        _DB_DIR,
+        org_id,
+        _load_case_manager_names(org_id),
+        force_refresh=force_refresh,
+    )
 
 # Notes endpoints
 @router.get("/dashboard/notes")
@@ -766,7 +605,11 @@ async def get_dashboard_stats(request: Request):
 
 
 @router.get("/dashboard/supervisor/overview")
-async def get_supervisor_overview(request: Request, supervisor_id: str = Query("supervisor")):
+async def get_supervisor_overview(
+    request: Request,
+    supervisor_id: str = Query("supervisor"),
+    refresh: bool = Query(False),
+):
     """Get cross-module supervisor reporting overview"""
     try:
         current_user = require_authenticated_user(request)
@@ -774,7 +617,7 @@ async def get_supervisor_overview(request: Request, supervisor_id: str = Query("
         # Phase 3B: scope the team overview to the supervisor's org when the flag
         # is on; None preserves prior all-orgs behavior.
         org_id = resolve_org_id(current_user) if multi_tenant_enabled() else None
-        overview = _get_supervisor_overview(org_id)
+        overview = await asyncio.to_thread(_get_supervisor_overview, org_id, refresh)
         overview["supervisor_id"] = supervisor_id
         return {"success": True, "overview": overview}
     except Exception as e:
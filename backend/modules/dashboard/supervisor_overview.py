@@ -0,0 +1,445 @@
+"""Set-based supervisor overview engine with a materialized daily snapshot.
+
+The supervisor team overview used to loop over every case manager and, per
+manager, reopen ``core_clients.db`` plus the reminders, benefits, legal and FMLA
+databases to run one COUNT each (with a giant ``IN (...)`` list of that
+manager's client ids) — O(case managers x 5) connections and queries.
+
+This engine runs one grouped query per *source* instead, on a single
+connection with the module DBs ATTACHed, so benefits and legal counts are a
+JOIN against ``clients`` grouped by case manager rather than per-manager
+``IN`` lists. Results are joined in memory by case manager.
+
+Per-source results are materialized into a daily snapshot
+(``supervisor_snapshots.db`` under the DB dir), keyed by scope (org or all
+orgs) and date. Each source records a fingerprint of the DB files it reads
+(inode, size and mtime of the DB and its WAL); on the next request only
+sources whose fingerprint changed are re-aggregated, and an unchanged day is
+served from the snapshot without touching the module DBs at all. Counts that
+depend on "today" (overdue reminders, recent intakes) are naturally re-keyed
+by the snapshot date.
+
+``CMSX_SUPERVISOR_SNAPSHOT=0`` skips the snapshot and aggregates live.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DB_FILENAME = "supervisor_snapshots.db"
+SNAPSHOT_RETENTION_DAYS = env_int("CMSX_SUPERVISOR_SNAPSHOT_RETENTION_DAYS", 90)
+
+CLOSED_BENEFIT_STATUSES = ("approved", "denied", "closed", "expired")
+CASE_MANAGER_KEY = "COALESCE(NULLIF(TRIM({alias}case_manager_id), ''), 'unassigned')"
+
+# Source name -> DB files it reads. Benefits and legal join against clients, so
+# a core_clients.db change also invalidates them.
+SOURCE_FILES: Dict[str, Tuple[str, ...]] = {
+    "core": ("core_clients.db",),
+    "reminders": ("reminders.db",),
+    "benefits": ("core_clients.db", "unified_platform.db"),
+    "legal": ("core_clients.db", "legal_cases.db"),
+    "fmla": ("fmla.db",),
+}
+ATTACH_ALIASES = {
+    "reminders.db": "reminders_db",
+    "unified_platform.db": "benefits_db",
+    "legal_cases.db": "legal_db",
+    "fmla.db": "fmla_db",
+}
+
+_refresh_lock = threading.Lock()
+
+
+def snapshot_enabled() -> bool:
+    return env_bool("CMSX_SUPERVISOR_SNAPSHOT", True)
+
+
+def _file_fingerprint(path: Path) -> List[Any]:
+    parts: List[Any] = []
+    for suffix in ("", "-wal"):
+        try:
+            st = os.stat(f"{path}{suffix}")
+            parts.append([st.st_ino, st.st_size, st.st_mtime_ns])
+        except OSError:
+            parts.append(None)
+    return parts
+
+
+def source_fingerprint(db_dir: Path, source: str) -> str:
+    return json.dumps([_file_fingerprint(db_dir / name) for name in SOURCE_FILES[source]])
+
+
+# ── Grouped aggregation ─────────────────────────────────────────────────────
+
+
+def _open_aggregation_connection(db_dir: Path, sources: Sequence[str]) -> sqlite3.Connection:
+    """Open core_clients.db and ATTACH every existing module DB the sources need."""
+    conn = sqlite3.connect(str(db_dir / "core_clients.db"))
+    conn.row_factory = sqlite3.Row
+    needed = {name for source in sources for name in SOURCE_FILES[source]}
+    for name, alias in ATTACH_ALIASES.items():
+        # Never ATTACH a missing file: SQLite would create an empty DB there.
+        if name in needed and (db_dir / name).exists():
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(db_dir / name),))
+    return conn
+
+
+def _attached(conn: sqlite3.Connection, alias: str) -> bool:
+    return any(row["name"] == alias for row in conn.execute("PRAGMA database_list"))
+
+
+def _grouped_counts(conn: sqlite3.Connection, query: str, params: tuple) -> Dict[str, int]:
+    try:
+        rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error as exc:
+        # Same contract as the per-manager counts it replaces: a missing table
+        # or column in an optional module DB counts as zero.
+        logger.debug("Supervisor aggregate skipped: %s", exc)
+        return {}
+    return {row[0]: int(row[1] or 0) for row in rows if row[0] is not None}
+
+
+def _aggregate_core(conn: sqlite3.Connection, org_id: Optional[str], cutoff: str) -> Dict[str, Dict[str, int]]:
+    org_clause = "WHERE org_id = ?" if org_id is not None else ""
+    params = (cutoff, org_id) if org_id is not None else (cutoff,)
+    key = CASE_MANAGER_KEY.format(alias="")
+    rows = conn.execute(f"""
+        SELECT
+            {key} AS case_manager_id,
+            COUNT(*) AS total_clients,
+            SUM(CASE WHEN LOWER(COALESCE(risk_level, '')) = 'high' THEN 1 ELSE 0 END) AS high_risk_clients,
+            SUM(CASE WHEN DATE(COALESCE(created_at, CURRENT_TIMESTAMP)) >= DATE(?) THEN 1 ELSE 0 END) AS recent_intakes,
+            SUM(CASE WHEN TRIM(COALESCE(barriers, '')) <> '' THEN 1 ELSE 0 END) AS clients_with_barriers
+        FROM clients
+        {org_clause}
+        GROUP BY {key}
+    """, params).fetchall()
+    return {
+        row["case_manager_id"]: {
+            "total_clients": int(row["total_clients"] or 0),
+            "high_risk_clients": int(row["high_risk_clients"] or 0),
+            "recent_intakes": int(row["recent_intakes"] or 0),
+            "clients_with_barriers": int(row["clients_with_barriers"] or 0),
+        }
+        for row in rows
+    }
+
+
+def _aggregate_reminders(conn: sqlite3.Connection, org_id: Optional[str], today: str) -> Dict[str, Dict[str, int]]:
+    if not _attached(conn, "reminders_db"):
+        return {}
+    counts = _grouped_counts(conn, """
+        SELECT case_manager_id, COUNT(*)
+        FROM reminders_db.active_reminders
+        WHERE status = 'Active'
+          AND DATE(due_date) < DATE(?)
+        GROUP BY case_manager_id
+    """, (today,))
+    return {cm: {"overdue_reminders": count} for cm, count in counts.items()}
+
+
+def _aggregate_client_joined(
+    conn: sqlite3.Connection,
+    org_id: Optional[str],
+    alias: str,
+    table: str,
+    predicate: str,
+    predicate_params: tuple,
+    metric: str,
+) -> Dict[str, Dict[str, int]]:
+    if not _attached(conn, alias):
+        return {}
+    org_clause = "AND c.org_id = ?" if org_id is not None else ""
+    params = predicate_params + ((org_id,) if org_id is not None else ())
+    key = CASE_MANAGER_KEY.format(alias="c.")
+    counts = _grouped_counts(conn, f"""
+        SELECT {key} AS case_manager_id, COUNT(*)
+        FROM {alias}.{table} m
+        JOIN main.clients c ON c.client_id = m.client_id
+        WHERE {predicate}
+          {org_clause}
+        GROUP BY {key}
+    """, params)
+    return {cm: {metric: count} for cm, count in counts.items()}
+
+
+def _aggregate_benefits(conn: sqlite3.Connection, org_id: Optional[str], today: str) -> Dict[str, Dict[str, int]]:
+    placeholders = ",".join("?" for _ in CLOSED_BENEFIT_STATUSES)
+    return _aggregate_client_joined(
+        conn, org_id, "benefits_db", "benefits_applications",
+        f"LOWER(COALESCE(m.status, '')) NOT IN ({placeholders})",
+        CLOSED_BENEFIT_STATUSES,
+        "open_benefits_applications",
+    )
+
+
+def _aggregate_legal(conn: sqlite3.Connection, org_id: Optional[str], today: str) -> Dict[str, Dict[str, int]]:
+    return _aggregate_client_joined(
+        conn, org_id, "legal_db", "legal_cases",
+        "COALESCE(m.is_active, 1) = 1", (),
+        "active_legal_cases",
+    )
+
+
+def _aggregate_fmla(conn: sqlite3.Connection, org_id: Optional[str], today: str) -> Dict[str, Dict[str, int]]:
+    if not _attached(conn, "fmla_db"):
+        return {}
+    counts = _grouped_counts(conn, """
+        SELECT COALESCE(assigned_case_manager, ''), COUNT(*)
+        FROM fmla_db.fmla_cases
+        WHERE LOWER(COALESCE(status, '')) <> 'closed'
+        GROUP BY COALESCE(assigned_case_manager, '')
+    """, ())
+    return {cm: {"active_fmla_cases": count} for cm, count in counts.items()}
+
+
+SourceAggregator = Callable[[sqlite3.Connection, Optional[str], str], Dict[str, Dict[str, int]]]
+AGGREGATORS: Dict[str, SourceAggregator] = {
+    "reminders": _aggregate_reminders,
+    "benefits": _aggregate_benefits,
+    "legal": _aggregate_legal,
+    "fmla": _aggregate_fmla,
+}
+
+
+def aggregate_sources(
+    db_dir: Path,
+    sources: Sequence[str],
+    org_id: Optional[str],
+    today: str,
+    cutoff: str,
+) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Run one grouped query per requested source; returns ``{source: {cm: metrics}}``."""
+    results: Dict[str, Dict[str, Dict[str, int]]] = {}
+    conn = _open_aggregation_connection(db_dir, sources)
+    try:
+        for source in sources:
+            if source == "core":
+                results[source] = _aggregate_core(conn, org_id, cutoff)
+            else:
+                results[source] = AGGREGATORS[source](conn, org_id, today)
+    finally:
+        conn.close()
+    return results
+
+
+# ── Snapshot store ──────────────────────────────────────────────────────────
+
+
+def _ensure_snapshot_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS supervisor_snapshot_sources (
+            scope_key TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            source TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            refreshed_at TEXT NOT NULL,
+            refresh_ms REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope_key, snapshot_date, source)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS supervisor_snapshot_rows (
+            scope_key TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            source TEXT NOT NULL,
+            case_manager_id TEXT NOT NULL,
+            metrics_json TEXT NOT NULL,
+            PRIMARY KEY (scope_key, snapshot_date, source, case_manager_id)
+        )
+        """
+    )
+
+
+def _snapshot_connection(db_dir: Path) -> sqlite3.Connection:
+    return get_connection(db_dir / SNAPSHOT_DB_FILENAME, row_factory=sqlite3.Row, on_open=_ensure_snapshot_schema)
+
+
+def _read_snapshot(
+    db_dir: Path, scope_key: str, snapshot_date: str
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, Dict[str, int]]]]:
+    fingerprints: Dict[str, str] = {}
+    rows_by_source: Dict[str, Dict[str, Dict[str, int]]] = {}
+    with _snapshot_connection(db_dir) as conn:
+        for row in conn.execute(
+            "SELECT source, fingerprint FROM supervisor_snapshot_sources WHERE scope_key = ? AND snapshot_date = ?",
+            (scope_key, snapshot_date),
+        ):
+            fingerprints[row["source"]] = row["fingerprint"]
+        for row in conn.execute(
+            """
+            SELECT source, case_manager_id, metrics_json
+            FROM supervisor_snapshot_rows
+            WHERE scope_key = ? AND snapshot_date = ?
+            """,
+            (scope_key, snapshot_date),
+        ):
+            rows_by_source.setdefault(row["source"], {})[row["case_manager_id"]] = json.loads(row["metrics_json"])
+    return fingerprints, rows_by_source
+
+
+def _write_snapshot(
+    db_dir: Path,
+    scope_key: str,
+    snapshot_date: str,
+    refreshed: Dict[str, Dict[str, Dict[str, int]]],
+    fingerprints: Dict[str, str],
+    refresh_ms: float,
+) -> None:
+    now = datetime.now().isoformat()
+    retention_cutoff = (datetime.now() - timedelta(days=SNAPSHOT_RETENTION_DAYS)).date().isoformat()
+    with _snapshot_connection(db_dir) as conn:
+        for source, per_manager in refreshed.items():
+            conn.execute(
+                "DELETE FROM supervisor_snapshot_rows WHERE scope_key = ? AND snapshot_date = ? AND source = ?",
+                (scope_key, snapshot_date, source),
+            )
+            conn.executemany(
+                """
+                INSERT INTO supervisor_snapshot_rows
+                    (scope_key, snapshot_date, source, case_manager_id, metrics_json)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (scope_key, snapshot_date, source, case_manager_id, json.dumps(metrics))
+                    for case_manager_id, metrics in per_manager.items()
+                ],
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO supervisor_snapshot_sources
+                    (scope_key, snapshot_date, source, fingerprint, refreshed_at, refresh_ms)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (scope_key, snapshot_date, source, fingerprints[source], now, refresh_ms),
+            )
+        conn.execute("DELETE FROM supervisor_snapshot_rows WHERE snapshot_date < ?", (retention_cutoff,))
+        conn.execute("DELETE FROM supervisor_snapshot_sources WHERE snapshot_date < ?", (retention_cutoff,))
+
+
+# ── Overview ────────────────────────────────────────────────────────────────
+
+
+def _merge_overview(
+    per_source: Dict[str, Dict[str, Dict[str, int]]],
+    name_map: Dict[str, str],
+) -> Dict[str, Any]:
+    case_managers: List[Dict[str, Any]] = []
+    # Only managers with clients in scope are reported, exactly like the old
+    # per-manager loop; reminder/FMLA rows for other managers are ignored.
+    core_rows = sorted(
+        per_source.get("core", {}).items(),
+        key=lambda item: (-item[1]["total_clients"], item[0]),
+    )
+    for case_manager_id, core in core_rows:
+        overdue_reminders = per_source.get("reminders", {}).get(case_manager_id, {}).get("overdue_reminders", 0)
+        open_benefits = per_source.get("benefits", {}).get(case_manager_id, {}).get("open_benefits_applications", 0)
+        active_legal = per_source.get("legal", {}).get(case_manager_id, {}).get("active_legal_cases", 0)
+        active_fmla = per_source.get("fmla", {}).get(case_manager_id, {}).get("active_fmla_cases", 0)
+
+        completion_rate = 0
+        total_work_items = overdue_reminders + open_benefits + active_legal
+        if total_work_items > 0:
+            completion_rate = max(0, round(100 - ((overdue_reminders / total_work_items) * 100)))
+
+        case_managers.append({
+            "case_manager_id": case_manager_id,
+            "case_manager_name": name_map.get(case_manager_id, case_manager_id.replace("_", " ").title()),
+            "total_clients": core["total_clients"],
+            "high_risk_clients": core["high_risk_clients"],
+            "recent_intakes": core["recent_intakes"],
+            "clients_with_barriers": core["clients_with_barriers"],
+            "overdue_reminders": overdue_reminders,
+            "open_benefits_applications": open_benefits,
+            "active_legal_cases": active_legal,
+            "active_fmla_cases": active_fmla,
+            "completion_rate": completion_rate,
+        })
+
+    highest_overdue = sorted(case_managers, key=lambda item: item["overdue_reminders"], reverse=True)[:5]
+    highest_risk = sorted(case_managers, key=lambda item: item["high_risk_clients"], reverse=True)[:5]
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "team_summary": {
+            "case_manager_count": len(case_managers),
+            "total_clients": sum(item["total_clients"] for item in case_managers),
+            "high_risk_clients": sum(item["high_risk_clients"] for item in case_managers),
+            "clients_with_barriers": sum(item["clients_with_barriers"] for item in case_managers),
+            "overdue_reminders": sum(item["overdue_reminders"] for item in case_managers),
+            "open_benefits_applications": sum(item["open_benefits_applications"] for item in case_managers),
+            "active_legal_cases": sum(item["active_legal_cases"] for item in case_managers),
+            "active_fmla_cases": sum(item["active_fmla_cases"] for item in case_managers),
+        },
+        "case_managers": case_managers,
+        "alerts": {
+            "highest_overdue_workloads": highest_overdue,
+            "highest_risk_caseloads": highest_risk,
+        },
+    }
+
+
+def build_supervisor_overview(
+    db_dir: Path,
+    org_id: Optional[str],
+    name_map: Dict[str, str],
+    force_refresh: bool = False,
+) -> Dict[str, Any]:
+    """Return the team overview, refreshing only the snapshot sources that changed."""
+    db_dir = Path(db_dir)
+    today = datetime.now().date().isoformat()
+    cutoff = (datetime.now() - timedelta(days=7)).date().isoformat()
+    sources = list(SOURCE_FILES)
+
+    if not snapshot_enabled():
+        started = time.perf_counter()
+        per_source = aggregate_sources(db_dir, sources, org_id, today, cutoff)
+        overview = _merge_overview(per_source, name_map)
+        overview["snapshot"] = {
+            "enabled": False,
+            "snapshot_date": today,
+            "refreshed_sources": sources,
+            "refresh_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+        return overview
+
+    scope_key = org_id if org_id is not None else "*"
+    with _refresh_lock:
+        fingerprints = {source: source_fingerprint(db_dir, source) for source in sources}
+        stored_fingerprints, per_source = _read_snapshot(db_dir, scope_key, today)
+        stale = [
+            source for source in sources
+            if force_refresh or stored_fingerprints.get(source) != fingerprints[source]
+        ]
+        refresh_ms = 0.0
+        if stale:
+            started = time.perf_counter()
+            refreshed = aggregate_sources(db_dir, stale, org_id, today, cutoff)
+            refresh_ms = round((time.perf_counter() - started) * 1000.0, 3)
+            _write_snapshot(db_dir, scope_key, today, refreshed, fingerprints, refresh_ms)
+            per_source.update(refreshed)
+
+    overview = _merge_overview(per_source, name_map)
+    overview["snapshot"] = {
+        "enabled": True,
+        "snapshot_date": today,
+        "refreshed_sources": stale,
+        "refresh_ms": refresh_ms,
+    }
+    return overview
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy import text
 
+from backend.shared.client_context_cache import invalidate_client_context
+from backend.shared.reconciliation_queue import mark_deadlines_dirty
 from backend.shared.database.railway_fmla_postgres import _engine, ensure_postgres_fmla_tables
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
@@ -252,6 +254,13 @@ class PostgresFMLAStore(FMLAStore):
         columns = ", ".join(record.keys())
         values = ", ".join(f":{column}" for column in record.keys())
         self._execute(f"INSERT INTO railway_fmla_cases ({columns}) VALUES ({values})", record)
+        invalidate_client_context(record.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            record["case_id"],
+            case_manager_id=record.get("assigned_case_manager"),
+            org_id=record.get("org_id"),
+        )
         return record
 
     def update_case(self, case_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -275,6 +284,13 @@ class PostgresFMLAStore(FMLAStore):
         assignments = ", ".join(f"{key} = :{key}" for key in updates.keys())
         params = {**updates, "case_id": case_id}
         self._execute(f"UPDATE railway_fmla_cases SET {assignments} WHERE case_id = :case_id", params)
+        invalidate_client_context(existing.get("client_id"), updates.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            case_id,
+            case_manager_id=updates.get("assigned_case_manager", existing.get("assigned_case_manager")),
+            org_id=updates.get("org_id", existing.get("org_id")),
+        )
         return self.get_case(case_id)
 
     def delete_case(self, case_id: str) -> bool:
@@ -282,6 +298,14 @@ class PostgresFMLAStore(FMLAStore):
         if not existing:
             return False
         self._execute("DELETE FROM railway_fmla_cases WHERE case_id = :case_id", {"case_id": case_id})
+        invalidate_client_context(existing.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            case_id,
+            case_manager_id=existing.get("assigned_case_manager"),
+            org_id=existing.get("org_id"),
+            snapshot=existing,
+        )
         return True
 
     def create_document(self, case_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
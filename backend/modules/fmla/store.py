@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from backend.auth.authorization import get_client_org_id, get_org_for_user_id
+from backend.shared.client_context_cache import invalidate_client_context
+from backend.shared.reconciliation_queue import mark_deadlines_dirty
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
 
@@ -438,6 +440,13 @@ class FMLAStore:
         placeholders = ", ".join(["?"] * len(record))
         with self._db() as conn:
             conn.execute(f"INSERT INTO fmla_cases ({columns}) VALUES ({placeholders})", list(record.values()))
+        invalidate_client_context(record.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            record["case_id"],
+            case_manager_id=record.get("assigned_case_manager"),
+            org_id=record.get("org_id"),
+        )
         return record
 
     def update_case(self, case_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -462,6 +471,13 @@ class FMLAStore:
         params = list(updates.values()) + [case_id]
         with self._db() as conn:
             conn.execute(f"UPDATE fmla_cases SET {assignments} WHERE case_id = ?", params)
+        invalidate_client_context(existing.get("client_id"), updates.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            case_id,
+            case_manager_id=updates.get("assigned_case_manager", existing.get("assigned_case_manager")),
+            org_id=updates.get("org_id", existing.get("org_id")),
+        )
         return self.get_case(case_id)
 
     def delete_case(self, case_id: str) -> bool:
@@ -470,6 +486,14 @@ class FMLAStore:
             return False
         with self._db() as conn:
             conn.execute("DELETE FROM fmla_cases WHERE case_id = ?", (case_id,))
+        invalidate_client_context(existing.get("client_id"))
+        mark_deadlines_dirty(
+            "fmla",
+            case_id,
+            case_manager_id=existing.get("assigned_case_manager"),
+            org_id=existing.get("org_id"),
+            snapshot=existing,
+        )
         return True
 
     def create_document(self, case_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,6 +9,7 @@ from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
+from backend.shared.database.connection_pool import get_connection
 from backend.shared.db_path import DB_DIR as _DB_DIR
 from backend.auth.authorization import get_org_for_user_id
 from backend.shared.tenancy import DEFAULT_ORG_ID
@@ -22,16 +23,9 @@ class GroupsDatabase:
         self._init_tables()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        # WAL improves concurrent read performance in production.
-        # On Windows test environments the WAL file is held open;
-        # the try/except lets tests pass without it.
-        try:
-            conn.execute("PRAGMA journal_mode=WAL")
-        except Exception:
-            pass
-        return conn
+        # WAL / busy_timeout are applied once per pooled connection by the
+        # shared provider (which also tolerates WAL being unavailable).
+        return get_connection(self.db_path, row_factory=sqlite3.Row)
 
     def _init_tables(self) -> None:
         with self._connect() as conn:
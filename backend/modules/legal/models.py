@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import json
 import uuid
 
+from backend.shared.client_context_cache import invalidate_client_context
+
 logger = logging.getLogger(__name__)
 
 class LegalCase:
@@ -752,6 +754,7 @@ class LegalDatabase:
                 case.created_at, case.last_updated, case.is_active, case.notes
             ))
             self.connection.commit()
+            invalidate_client_context(case.client_id)
             return cursor.lastrowid
         except Exception as e:
             logger.error(f"Failed to save legal case: {e}")
@@ -788,6 +791,7 @@ class LegalDatabase:
                 court_date.last_updated, court_date.created_by, court_date.notes
             ))
             self.connection.commit()
+            invalidate_client_context(court_date.client_id)
             return cursor.lastrowid
         except Exception as e:
             logger.error(f"Failed to save court date: {e}")
@@ -824,6 +828,7 @@ class LegalDatabase:
                 document.last_updated, document.created_by, document.notes
             ))
             self.connection.commit()
+            invalidate_client_context(document.client_id)
             return cursor.lastrowid
         except Exception as e:
             logger.error(f"Failed to save legal document: {e}")
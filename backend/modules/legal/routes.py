@@ -17,6 +17,7 @@ import sqlite3
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
+from backend.shared.client_context_cache import invalidate_client_context
 from backend.shared.db_path import DB_DIR as _DB_DIR
 from .models import LegalCase, CourtDate, LegalDocument, LegalDatabase
 from .expungement_routes import router as expungement_router
@@ -753,6 +754,7 @@ async def upload_legal_document_file(document_id: str, request: Request, file: U
             ),
         )
         legal_db.connection.commit()
+        invalidate_client_context(document_row["client_id"])
 
         return {
             "success": True,
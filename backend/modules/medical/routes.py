@@ -18,6 +18,8 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 from backend.auth.authorization import assert_client_access, get_client_ids_for_org
 from backend.auth.service import require_authenticated_user
+from backend.shared.client_context_cache import invalidate_client_context
+from backend.shared.reconciliation_queue import mark_deadlines_dirty
 from backend.shared.tenancy import multi_tenant_enabled, resolve_org_id
 
 logger = logging.getLogger(__name__)
@@ -973,6 +975,7 @@ async def create_medical_appointment(payload: MedicalAppointmentCreate, request:
                 appointment_id,
                 exc,
             )
+            mark_deadlines_dirty("medical", payload.client_id, case_manager_id=case_manager_id)
 
         return {
             "success": True,
@@ -1018,6 +1021,9 @@ async def update_medical_appointment(appointment_id: str, payload: MedicalAppoin
                 appointment_id,
                 exc,
             )
+            mark_deadlines_dirty(
+                "medical", updated["client_id"], case_manager_id=updated["case_manager_id"],
+            )
         return {"success": True, "message": "Appointment updated successfully"}
     except HTTPException:
         raise
@@ -1152,6 +1158,7 @@ async def create_medical_referral(payload: MedicalReferralCreate, request: Reque
                 ),
             )
             conn.commit()
+        invalidate_client_context(payload.client_id)
         return {"success": True, "referral_id": referral_id, "message": "Medical referral saved"}
     except Exception as exc:
         logger.error("Create medical referral failed: %s", exc, exc_info=True)
@@ -1177,6 +1184,7 @@ async def update_medical_referral(referral_id: str, payload: ReferralStatusUpdat
                 (payload.referral_status, payload.notes, datetime.now().isoformat(), referral_id),
             )
             conn.commit()
+        invalidate_client_context(existing["client_id"])
         return {"success": True, "message": "Referral updated successfully"}
     except HTTPException:
         raise
@@ -119,6 +119,55 @@ def remove_medical_appointment_reminder(
     )
 
 
+def _medical_module_appointments(where: str, params: tuple) -> list:
+    """Rows from the medical module's appointments table matching ``where``."""
+    if not CASE_MGMT_DB_PATH.exists():
+        return []
+    with sqlite3.connect(CASE_MGMT_DB_PATH) as conn:
+        conn.row_factory = sqlite3.Row
+        table_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='appointments'"
+        ).fetchone()
+        if not table_exists:
+            return []
+        columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(appointments)").fetchall()
+        }
+        reminder_enabled = (
+            "reminder_enabled" if "reminder_enabled" in columns else "1 AS reminder_enabled"
+        )
+        rows = conn.execute(
+            f"""
+            SELECT id, client_id, case_manager_id, appointment_type, provider_name,
+                   appointment_date, appointment_time, status, {reminder_enabled}
+            FROM appointments
+            WHERE {where}
+            """,
+            params,
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def sync_client_medical_appointment_reminders(
+    client_id: str,
+    *,
+    case_manager_id: str,
+    org_id: Optional[str] = None,
+) -> None:
+    """Project one client's medical-module and workspace appointments."""
+    for row in _medical_module_appointments(
+        "client_id = ? AND case_manager_id = ?", (client_id, case_manager_id)
+    ):
+        sync_medical_appointment_reminder(row, source="medical", org_id=org_id)
+    for appointment in workspace_store.list_client_appointments(client_id):
+        sync_medical_appointment_reminder(
+            appointment,
+            source="workspace",
+            case_manager_id=case_manager_id,
+            org_id=org_id,
+        )
+
+
 def reconcile_medical_appointment_reminders(
     case_manager_id: str,
     client_ids: Iterable[str],
@@ -126,32 +175,8 @@ def reconcile_medical_appointment_reminders(
     org_id: Optional[str] = None,
 ) -> None:
     """Project pre-existing appointments assigned to a case manager."""
-    if CASE_MGMT_DB_PATH.exists():
-        with sqlite3.connect(CASE_MGMT_DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            table_exists = conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='appointments'"
-            ).fetchone()
-            if table_exists:
-                columns = {
-                    row[1] for row in conn.execute("PRAGMA table_info(appointments)").fetchall()
-                }
-                reminder_enabled = (
-                    "reminder_enabled" if "reminder_enabled" in columns else "1 AS reminder_enabled"
-                )
-                rows = conn.execute(
-                    f"""
-                    SELECT id, client_id, case_manager_id, appointment_type, provider_name,
-                           appointment_date, appointment_time, status, {reminder_enabled}
-                    FROM appointments
-                    WHERE case_manager_id = ?
-                    """,
-                    (case_manager_id,),
-                ).fetchall()
-                for row in rows:
-                    sync_medical_appointment_reminder(
-                        dict(row), source="medical", org_id=org_id
-                    )
+    for row in _medical_module_appointments("case_manager_id = ?", (case_manager_id,)):
+        sync_medical_appointment_reminder(row, source="medical", org_id=org_id)
 
     for client_id in client_ids:
         for appointment in workspace_store.list_client_appointments(client_id):
@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
+from backend.shared.database.connection_pool import get_connection
 from backend.shared.db_path import DB_DIR
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
@@ -15,6 +16,25 @@ logger = logging.getLogger(__name__)
 THREAD_TYPES = {"direct_message", "team_channel", "client_thread", "announcement"}
 
 
+# Threads a user can see: ones they participate in, plus org announcements when requested.
+_VISIBLE_THREADS_SQL = """
+    t.archived_at IS NULL
+    AND t.org_id = :org_id
+    AND (
+        EXISTS (SELECT 1 FROM thread_participants p WHERE p.thread_id = t.id AND p.user_id = :user_id)
+        OR (:announcements = 1 AND t.thread_type = 'announcement')
+    )
+"""
+# Maintained counter; announcement readers who never opened the thread have no
+# read state yet, so everything others posted there is unread.
+_UNREAD_SQL = """
+    COALESCE(
+        r.unread_count,
+        (SELECT COUNT(*) FROM messages u WHERE u.thread_id = t.id AND u.sender_id != :user_id AND u.deleted_at IS NULL)
+    )
+"""
+
+
 def utc_now() -> str:
     return datetime.utcnow().isoformat()
 
@@ -27,9 +47,7 @@ class MessagesDatabase:
         self.initialize()
 
     def connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path, row_factory=sqlite3.Row)
 
     def initialize(self) -> None:
         with self.connect() as conn:
@@ -98,8 +116,64 @@ class MessagesDatabase:
                 "UPDATE message_threads SET org_id = ? WHERE org_id IS NULL OR TRIM(org_id) = ''",
                 (DEFAULT_ORG_ID,),
             )
+            self._ensure_read_state(conn, thread_columns)
             conn.commit()
 
+    def _ensure_read_state(self, conn: sqlite3.Connection, thread_columns: set) -> None:
+        """Denormalized inbox state: per-(thread, user) unread counters and a last-message pointer.
+
+        Both are maintained by ``_insert_message`` and ``mark_read`` in the
+        writer's transaction, so listing an inbox or polling the badge never
+        recounts message rows. Existing databases are backfilled once.
+        """
+        has_read_state = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'thread_read_state'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS thread_read_state (
+                thread_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                unread_count INTEGER NOT NULL DEFAULT 0,
+                last_read_at TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (thread_id, user_id)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_thread_read_state_user ON thread_read_state(user_id)")
+        if not has_read_state:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO thread_read_state (thread_id, user_id, unread_count, last_read_at, updated_at)
+                SELECT
+                    p.thread_id,
+                    p.user_id,
+                    (
+                        SELECT COUNT(*) FROM messages m
+                        WHERE m.thread_id = p.thread_id AND m.sender_id != p.user_id AND m.deleted_at IS NULL
+                          AND (p.last_read_at IS NULL OR m.created_at > p.last_read_at)
+                    ),
+                    p.last_read_at,
+                    ?
+                FROM thread_participants p
+                """,
+                (utc_now(),),
+            )
+        if "last_message_id" not in thread_columns:
+            conn.execute("ALTER TABLE message_threads ADD COLUMN last_message_id TEXT")
+            conn.execute(
+                """
+                UPDATE message_threads
+                SET last_message_id = (
+                    SELECT m.id FROM messages m
+                    WHERE m.thread_id = message_threads.id AND m.deleted_at IS NULL
+                    ORDER BY m.created_at DESC
+                    LIMIT 1
+                )
+                """
+            )
+
     def create_thread(
         self,
         *,
@@ -146,6 +220,13 @@ class MessagesDatabase:
                         now,
                     ),
                 )
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO thread_read_state (thread_id, user_id, unread_count, last_read_at, updated_at)
+                    VALUES (?, ?, 0, ?, ?)
+                    """,
+                    (thread_id, user_id, now if user_id == created_by else None, now),
+                )
             if initial_message and initial_message.get("body"):
                 self._insert_message(
                     conn,
@@ -166,19 +247,7 @@ class MessagesDatabase:
         org_id: str = DEFAULT_ORG_ID,
     ) -> List[Dict[str, Any]]:
         with self.connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT DISTINCT t.*
-                FROM message_threads t
-                LEFT JOIN thread_participants p ON p.thread_id = t.id
-                WHERE t.archived_at IS NULL
-                  AND t.org_id = ?
-                  AND (p.user_id = ? OR (? = 1 AND t.thread_type = 'announcement'))
-                ORDER BY t.updated_at DESC
-                """,
-                (org_id, user_id, 1 if include_announcements else 0),
-            ).fetchall()
-            return [self._hydrate_thread(conn, row, user_id) for row in rows]
+            return self._load_threads(conn, user_id, include_announcements=include_announcements, org_id=org_id)
 
     def get_thread_for_user(
         self,
@@ -189,19 +258,10 @@ class MessagesDatabase:
         org_id: str = DEFAULT_ORG_ID,
     ) -> Optional[Dict[str, Any]]:
         with self.connect() as conn:
-            row = conn.execute(
-                """
-                SELECT t.*
-                FROM message_threads t
-                LEFT JOIN thread_participants p ON p.thread_id = t.id AND p.user_id = ?
-                WHERE t.id = ?
-                  AND t.archived_at IS NULL
-                  AND t.org_id = ?
-                  AND (p.user_id IS NOT NULL OR (? = 1 AND t.thread_type = 'announcement'))
-                """,
-                (user_id, thread_id, org_id, 1 if include_announcements else 0),
-            ).fetchone()
-            return self._hydrate_thread(conn, row, user_id) if row else None
+            threads = self._load_threads(
+                conn, user_id, include_announcements=include_announcements, org_id=org_id, thread_id=thread_id
+            )
+            return threads[0] if threads else None
 
     def list_messages(self, thread_id: str) -> List[Dict[str, Any]]:
         with self.connect() as conn:
@@ -227,10 +287,6 @@ class MessagesDatabase:
                 body=body,
                 created_at=now,
             )
-            conn.execute(
-                "UPDATE message_threads SET updated_at = ? WHERE id = ?",
-                (now, thread_id),
-            )
             conn.execute(
                 """
                 UPDATE thread_participants
@@ -254,14 +310,33 @@ class MessagesDatabase:
                 """,
                 (str(uuid.uuid4()), thread_id, user_id, display_name, now, now),
             )
+            conn.execute(
+                """
+                INSERT INTO thread_read_state (thread_id, user_id, unread_count, last_read_at, updated_at)
+                VALUES (?, ?, 0, ?, ?)
+                ON CONFLICT(thread_id, user_id) DO UPDATE SET
+                    unread_count = 0,
+                    last_read_at = excluded.last_read_at,
+                    updated_at = excluded.updated_at
+                """,
+                (thread_id, user_id, now, now),
+            )
             conn.commit()
         return {"thread_id": thread_id, "last_read_at": now}
 
     def unread_count(self, user_id: str, *, include_announcements: bool = True, org_id: str = DEFAULT_ORG_ID) -> int:
-        return sum(
-            thread.get("unread_count", 0)
-            for thread in self.list_threads(user_id, include_announcements=include_announcements, org_id=org_id)
-        )
+        """Badge total: one query over the maintained per-thread counters."""
+        with self.connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT COALESCE(SUM({_UNREAD_SQL}), 0) AS count
+                FROM message_threads t
+                LEFT JOIN thread_read_state r ON r.thread_id = t.id AND r.user_id = :user_id
+                WHERE {_VISIBLE_THREADS_SQL}
+                """,
+                {"user_id": user_id, "org_id": org_id, "announcements": 1 if include_announcements else 0},
+            ).fetchone()
+        return int(row["count"])
 
     def _insert_message(
         self,
@@ -300,53 +375,89 @@ class MessagesDatabase:
                 None,
             ),
         )
-        return message
-
-    def _hydrate_thread(self, conn: sqlite3.Connection, row: sqlite3.Row, user_id: str) -> Dict[str, Any]:
-        thread = dict(row)
-        participants = conn.execute(
+        conn.execute(
+            "UPDATE message_threads SET updated_at = ?, last_message_id = ? WHERE id = ?",
+            (created_at, message["id"], thread_id),
+        )
+        conn.execute(
             """
-            SELECT user_id, display_name, role, last_read_at, created_at
-            FROM thread_participants
+            UPDATE thread_read_state
+            SET unread_count = CASE WHEN user_id = ? THEN 0 ELSE unread_count + 1 END,
+                last_read_at = CASE WHEN user_id = ? THEN ? ELSE last_read_at END,
+                updated_at = ?
             WHERE thread_id = ?
-            ORDER BY created_at ASC
             """,
-            (thread["id"],),
+            (sender_id, sender_id, created_at, created_at, thread_id),
+        )
+        return message
+
+    def _load_threads(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        *,
+        include_announcements: bool,
+        org_id: str,
+        thread_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Visible threads with unread counts, last message and participants in two queries."""
+        params = {
+            "user_id": user_id,
+            "org_id": org_id,
+            "announcements": 1 if include_announcements else 0,
+            "thread_id": thread_id,
+        }
+        thread_filter = "AND t.id = :thread_id" if thread_id else ""
+        rows = conn.execute(
+            f"""
+            SELECT
+                t.*,
+                {_UNREAD_SQL} AS unread_count,
+                m.body AS last_message_body,
+                m.sender_name AS last_message_sender_name,
+                m.created_at AS last_message_created_at
+            FROM message_threads t
+            LEFT JOIN thread_read_state r ON r.thread_id = t.id AND r.user_id = :user_id
+            LEFT JOIN messages m ON m.id = t.last_message_id AND m.deleted_at IS NULL
+            WHERE {_VISIBLE_THREADS_SQL} {thread_filter}
+            ORDER BY t.updated_at DESC
+            """,
+            params,
         ).fetchall()
-        own_participant = next((p for p in participants if p["user_id"] == user_id), None)
-        last_read_at = own_participant["last_read_at"] if own_participant else None
-        if last_read_at:
-            unread_row = conn.execute(
-                """
-                SELECT COUNT(*) AS count
-                FROM messages
-                WHERE thread_id = ? AND sender_id != ? AND created_at > ? AND deleted_at IS NULL
-                """,
-                (thread["id"], user_id, last_read_at),
-            ).fetchone()
-        else:
-            unread_row = conn.execute(
-                """
-                SELECT COUNT(*) AS count
-                FROM messages
-                WHERE thread_id = ? AND sender_id != ? AND deleted_at IS NULL
-                """,
-                (thread["id"], user_id),
-            ).fetchone()
-        last_message = conn.execute(
-            """
-            SELECT body, sender_name, created_at
-            FROM messages
-            WHERE thread_id = ? AND deleted_at IS NULL
-            ORDER BY created_at DESC
-            LIMIT 1
+        if not rows:
+            return []
+
+        participants: Dict[str, List[Dict[str, Any]]] = {}
+        for participant in conn.execute(
+            f"""
+            SELECT p.thread_id, p.user_id, p.display_name, p.role, p.last_read_at, p.created_at
+            FROM thread_participants p
+            WHERE p.thread_id IN (
+                SELECT t.id FROM message_threads t WHERE {_VISIBLE_THREADS_SQL} {thread_filter}
+            )
+            ORDER BY p.thread_id, p.created_at ASC
             """,
-            (thread["id"],),
-        ).fetchone()
-        thread["participants"] = [dict(participant) for participant in participants]
-        thread["unread_count"] = int(unread_row["count"] if unread_row else 0)
-        thread["last_message"] = dict(last_message) if last_message else None
-        return thread
+            params,
+        ).fetchall():
+            entry = dict(participant)
+            participants.setdefault(entry.pop("thread_id"), []).append(entry)
+
+        threads = []
+        for row in rows:
+            thread = dict(row)
+            body = thread.pop("last_message_body")
+            sender_name = thread.pop("last_message_sender_name")
+            created_at = thread.pop("last_message_created_at")
+            thread.pop("last_message_id", None)
+            thread["participants"] = participants.get(thread["id"], [])
+            thread["unread_count"] = int(thread["unread_count"] or 0)
+            thread["last_message"] = (
+                {"body": body, "sender_name": sender_name, "created_at": created_at}
+                if created_at is not None
+                else None
+            )
+            threads.append(thread)
+        return threads
 
 
 _messages_db: Optional[MessagesDatabase] = None
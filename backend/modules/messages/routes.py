@@ -10,6 +10,7 @@ from backend.auth.authorization import assert_client_access, get_org_for_user_id
 from backend.auth.service import AuthenticatedUser, require_authenticated_user
 from backend.modules.messages.database import THREAD_TYPES, MessagesDatabase, get_messages_db
 from backend.shared.db_path import DB_DIR
+from backend.shared.event_broker import BROADCAST, publish_user_event, user_has_subscribers
 from backend.shared.tenancy import multi_tenant_enabled, resolve_org_id
 
 router = APIRouter()
@@ -116,6 +117,46 @@ def _assert_can_access_thread(
     return thread
 
 
+def _push_new_message(
+    db: MessagesDatabase,
+    thread: Dict[str, Any],
+    message: Optional[Dict[str, Any]],
+    sender_id: str,
+    org_id: str,
+) -> None:
+    """Push ``message`` to the thread's readers and their new unread counts to everyone but the sender."""
+    if not message:
+        return
+    payload = {
+        "thread_id": thread["id"],
+        "thread_type": thread["thread_type"],
+        "title": thread["title"],
+        "message": message,
+    }
+    if thread["thread_type"] == "announcement":
+        # Every org member can read announcements; clients refresh their badge on receipt.
+        publish_user_event(BROADCAST, "message", payload, org_id=org_id)
+        return
+    participant_ids = [participant["user_id"] for participant in thread.get("participants", [])]
+    for user_id in participant_ids:
+        publish_user_event(user_id, "message", payload, org_id=org_id)
+    for user_id in participant_ids:
+        if user_id != sender_id:
+            _push_unread_count(db, user_id, org_id)
+
+
+def _push_unread_count(db: MessagesDatabase, user_id: str, org_id: str) -> None:
+    # Counting unread messages costs a query; skip it for users with no open stream.
+    if not user_has_subscribers(user_id, org_id=org_id):
+        return
+    publish_user_event(
+        user_id,
+        "unread_count",
+        {"unread_count": db.unread_count(user_id, include_announcements=True, org_id=org_id)},
+        org_id=org_id,
+    )
+
+
 @router.get("/threads")
 async def list_threads(
     request: Request,
@@ -187,6 +228,7 @@ async def create_thread(
         } if payload.initial_message and payload.initial_message.strip() else None,
         org_id=user_org_id,
     )
+    _push_new_message(db, thread, thread.get("last_message"), _user_id(user), user_org_id)
     return {"success": True, "thread": thread}
 
 
@@ -226,6 +268,7 @@ async def send_message(
     if not body:
         raise HTTPException(status_code=400, detail="Message body is required")
     message = db.add_message(thread_id, _user_id(user), _display_name(user), body)
+    _push_new_message(db, thread, message, _user_id(user), resolve_org_id(user))
     return {"success": True, "message": message}
 
 
@@ -237,7 +280,10 @@ async def mark_thread_read(
 ) -> Dict[str, Any]:
     user = require_authenticated_user(request)
     _assert_can_access_thread(db, thread_id, user)
-    return {"success": True, "read": db.mark_read(thread_id, _user_id(user), _display_name(user))}
+    read = db.mark_read(thread_id, _user_id(user), _display_name(user))
+    # Other open tabs of this user update their badge.
+    _push_unread_count(db, _user_id(user), resolve_org_id(user))
+    return {"success": True, "read": read}
 
 
 @router.get("/case-managers")
@@ -0,0 +1,370 @@
+"""Materialized Smart Daily priority index.
+
+``get_prioritized_tasks`` used to fetch every open task and active reminder
+for a case manager, score each one and sort seven buckets in Python on every
+request. ``task_priority_index`` stores those items already prepared, one row
+per item, in ``task_priority_index.db`` under ``DB_DIR``:
+
+* **Date-free score** - ``_task_priority_score`` is a static part (priority,
+  treatment plan, module urgency) plus a due-date bonus that is constant
+  within each bucket. Rows keep the static ``base_score`` and the due date as
+  a ``date.toordinal()`` value, so bucket boundaries are range predicates on
+  ``due_ordinal`` evaluated against the reader's local date. Rolling past
+  midnight only moves those boundaries; no row is rewritten.
+* **Indexed read** - rows are read in ``(base_score DESC, due_ordinal,
+  created_at)`` order (undated rows last) straight off
+  ``idx_task_priority_sort``, an index on that same sort expression, with no
+  separate sort step. Within a bucket that is exactly the Smart Daily sort
+  order.
+* **Per-client maintenance** - rows are grouped into units by client. Each
+  unit records the token it was built at: the client's context-cache
+  generation (bumped by every task, reminder, workspace task and appointment
+  write), caseload membership and client name. Refreshes rebuild only units
+  whose token changed, plus units older than ``CMSX_TASK_INDEX_MAX_AGE_S``
+  (default 900) as a backstop for writers that do not report.
+* **Writers refresh, readers only read** - the repository's task and reminder
+  writers refresh the indexes holding the touched clients after committing,
+  and every other generation bump queues a background refresh on the
+  reconciliation queue. Smart Daily reads never write: a (case manager, org)
+  index that was never built, or not refreshed within the max age, is queued
+  for a background refresh from the read instead.
+
+``CMSX_TASK_INDEX=0`` turns the index off; Smart Daily then scores in Python
+as before. Building rows (scoring, bucketing, dedupe rules) stays in the
+repository; this module only stores and reads them.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import backend.shared.db_path as db_path_mod
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+INDEX_DB_FILENAME = "task_priority_index.db"
+
+# Due-date part of _task_priority_score per bucket (undated buckets get none).
+BUCKET_BONUS = {
+    "overdue": 60,
+    "today": 45,
+    "next_3_days": 30,
+    "this_week": 15,
+    "later": 0,
+    "treatment_plan": 0,
+    "high_priority_no_date": 0,
+}
+
+# Sort key for a row's due date; undated rows sort after every dated one. The
+# read orders by exactly this expression so idx_task_priority_sort covers it.
+DUE_SORT_SQL = "COALESCE(due_ordinal, 99999999)"
+
+
+@dataclass
+class IndexRow:
+    item_id: str
+    kind: str  # "task" | "reminder"
+    source: str
+    base_score: int
+    due_ordinal: Optional[int]
+    # Bucket for rows without a due date; undated rows that Smart Daily omits are not stored.
+    undated_bucket: Optional[str]
+    created_at: str
+    payload: Dict[str, Any]
+
+
+@dataclass
+class UnitState:
+    token: str
+    built_at: float
+
+
+class TaskPriorityIndex:
+    def __init__(self, max_age_seconds: Optional[int] = None) -> None:
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None else env_int("CMSX_TASK_INDEX_MAX_AGE_S", 900)
+        )
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._metrics: Dict[str, float] = {}
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_TASK_INDEX", True)
+
+    # ── Storage ─────────────────────────────────────────────────────────────
+
+    def _ensure_schema(self, conn) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_priority_index (
+                case_manager_id TEXT NOT NULL,
+                org_key TEXT NOT NULL,
+                client_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                base_score INTEGER NOT NULL,
+                due_ordinal INTEGER,
+                undated_bucket TEXT,
+                created_at TEXT NOT NULL DEFAULT '',
+                payload_json TEXT NOT NULL,
+                PRIMARY KEY (case_manager_id, org_key, client_id, kind, item_id)
+            )
+            """
+        )
+        # The read's ORDER BY, expression for expression, so rows come off the
+        # index already sorted. Replaces an earlier index on the bare
+        # due_ordinal column that still left a temp b-tree sort.
+        conn.execute("DROP INDEX IF EXISTS idx_task_priority_order")
+        conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_task_priority_sort
+            ON task_priority_index (case_manager_id, org_key, base_score DESC, {DUE_SORT_SQL}, created_at, item_id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_priority_index_units (
+                case_manager_id TEXT NOT NULL,
+                org_key TEXT NOT NULL,
+                client_id TEXT NOT NULL,
+                token TEXT NOT NULL,
+                built_at REAL NOT NULL,
+                PRIMARY KEY (case_manager_id, org_key, client_id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_task_priority_units_client
+            ON task_priority_index_units (client_id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_priority_index_scopes (
+                case_manager_id TEXT NOT NULL,
+                org_key TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                PRIMARY KEY (case_manager_id, org_key)
+            )
+            """
+        )
+
+    def _path(self) -> Path:
+        return Path(db_path_mod.DB_DIR) / INDEX_DB_FILENAME
+
+    def exists(self) -> bool:
+        return self._path().exists()
+
+    def _connect(self):
+        path = self._path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return get_connection(path, on_open=self._ensure_schema)
+
+    def lock(self, case_manager_id: str, org_key: str) -> threading.Lock:
+        """Serialize refreshes of one (case manager, org) index within this process."""
+        key = (str(Path(db_path_mod.DB_DIR).resolve()), case_manager_id, org_key)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def unit_states(self, case_manager_id: str, org_key: str) -> Dict[str, UnitState]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT client_id, token, built_at FROM task_priority_index_units
+                WHERE case_manager_id = ? AND org_key = ?
+                """,
+                (case_manager_id, org_key),
+            ).fetchall()
+        return {row[0]: UnitState(row[1], row[2]) for row in rows}
+
+    def refreshed_at(self, case_manager_id: str, org_key: str) -> Optional[float]:
+        """When this index last had every unit checked, or None if it was never built."""
+        if not self.exists():
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT refreshed_at FROM task_priority_index_scopes WHERE case_manager_id = ? AND org_key = ?",
+                (case_manager_id, org_key),
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_expired(self, refreshed_at: float, now: Optional[float] = None) -> bool:
+        return self.max_age_seconds > 0 and (now or time.time()) - refreshed_at > self.max_age_seconds
+
+    def scopes(
+        self, case_manager_ids: Iterable[str] = (), client_ids: Iterable[str] = ()
+    ) -> List[Tuple[str, str]]:
+        """Built ``(case_manager_id, org_key)`` indexes for these case managers or holding these clients."""
+        case_manager_ids = [cm for cm in dict.fromkeys(case_manager_ids) if cm]
+        client_ids = list(dict.fromkeys(client_ids))
+        found: List[Tuple[str, str]] = []
+        if not self.exists():
+            return found
+        with self._connect() as conn:
+            for values, sql in (
+                (case_manager_ids, "SELECT case_manager_id, org_key FROM task_priority_index_scopes"
+                                   " WHERE case_manager_id IN ({})"),
+                (client_ids, "SELECT DISTINCT case_manager_id, org_key FROM task_priority_index_units"
+                             " WHERE client_id IN ({})"),
+            ):
+                for start in range(0, len(values), 500):
+                    chunk = values[start:start + 500]
+                    found.extend(
+                        (row[0], row[1])
+                        for row in conn.execute(sql.format(",".join("?" * len(chunk))), chunk).fetchall()
+                    )
+        return list(dict.fromkeys(found))
+
+    def is_fresh(self, state: Optional[UnitState], token: str, now: Optional[float] = None) -> bool:
+        if state is None or state.token != token:
+            return False
+        return not self.is_expired(state.built_at, now)
+
+    def replace_units(
+        self,
+        case_manager_id: str,
+        org_key: str,
+        units: Dict[str, Tuple[str, List[IndexRow]]],
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Swap in the rows for each ``{client_id: (token, rows)}`` unit and drop ``removed`` units.
+
+        Also marks the whole index refreshed: callers pass every stale unit,
+        possibly none.
+        """
+        now = time.time()
+        drop = list(dict.fromkeys([*units, *removed]))
+        with self._connect() as conn:
+            for start in range(0, len(drop), 500):
+                chunk = drop[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                params = [case_manager_id, org_key, *chunk]
+                conn.execute(
+                    f"DELETE FROM task_priority_index WHERE case_manager_id = ? AND org_key = ?"
+                    f" AND client_id IN ({placeholders})",
+                    params,
+                )
+                conn.execute(
+                    f"DELETE FROM task_priority_index_units WHERE case_manager_id = ? AND org_key = ?"
+                    f" AND client_id IN ({placeholders})",
+                    params,
+                )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO task_priority_index
+                    (case_manager_id, org_key, client_id, kind, item_id, source, base_score,
+                     due_ordinal, undated_bucket, created_at, payload_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        case_manager_id, org_key, client_id, row.kind, row.item_id, row.source,
+                        row.base_score, row.due_ordinal, row.undated_bucket, row.created_at,
+                        json.dumps(row.payload, default=str),
+                    )
+                    for client_id, (_, rows) in units.items()
+                    for row in rows
+                ],
+            )
+            conn.executemany(
+                """
+                INSERT INTO task_priority_index_units (case_manager_id, org_key, client_id, token, built_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(case_manager_id, org_key, client_id, token, now) for client_id, (token, _) in units.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO task_priority_index_scopes (case_manager_id, org_key, refreshed_at)"
+                " VALUES (?, ?, ?)",
+                (case_manager_id, org_key, now),
+            )
+        with self._metrics_lock:
+            self._metrics["units_rebuilt"] += len(units)
+            self._metrics["units_removed"] += len(drop) - len(units)
+            self._metrics["rows_written"] += sum(len(rows) for _, rows in units.values())
+
+    def read(self, case_manager_id: str, org_key: str, today_ordinal: int) -> Iterator[Tuple[str, int, Dict[str, Any]]]:
+        """Yield ``(bucket, priority_score, payload)`` in Smart Daily order within each bucket.
+
+        Reminders that duplicate a workspace appointment task (same id) are skipped.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    CASE
+                        WHEN due_ordinal IS NULL THEN undated_bucket
+                        WHEN due_ordinal < :today THEN 'overdue'
+                        WHEN due_ordinal = :today THEN 'today'
+                        WHEN due_ordinal <= :today + 3 THEN 'next_3_days'
+                        WHEN due_ordinal <= :today + 7 THEN 'this_week'
+                        ELSE 'later'
+                    END AS bucket,
+                    base_score,
+                    payload_json
+                FROM task_priority_index AS item
+                WHERE case_manager_id = :cm AND org_key = :org
+                  AND NOT (
+                      kind = 'reminder' AND EXISTS (
+                          SELECT 1 FROM task_priority_index AS appointment
+                          WHERE appointment.case_manager_id = :cm AND appointment.org_key = :org
+                            AND appointment.source = 'workspace_appointment'
+                            AND appointment.item_id = item.item_id
+                      )
+                  )
+                ORDER BY base_score DESC, {DUE_SORT_SQL}, created_at, item_id
+                """,
+                {"cm": case_manager_id, "org": org_key, "today": today_ordinal},
+            ).fetchall()
+        with self._metrics_lock:
+            self._metrics["reads"] += 1
+            self._metrics["rows_read"] += len(rows)
+        for bucket, base_score, payload_json in rows:
+            yield bucket, int(base_score) + BUCKET_BONUS[bucket], json.loads(payload_json)
+
+    # ── Observability ───────────────────────────────────────────────────────
+
+    def record_refresh(self, elapsed_ms: float) -> None:
+        with self._metrics_lock:
+            self._metrics["refreshes"] += 1
+            self._metrics["refresh_ms"] += elapsed_ms
+
+    def record_queued(self) -> None:
+        with self._metrics_lock:
+            self._metrics["refreshes_queued"] += 1
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._metrics = {
+                "reads": 0,
+                "rows_read": 0,
+                "refreshes": 0,
+                "refresh_ms": 0.0,
+                "refreshes_queued": 0,
+                "units_rebuilt": 0,
+                "units_removed": 0,
+                "rows_written": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+        snapshot["refresh_ms"] = round(snapshot["refresh_ms"], 2)
+        snapshot["enabled"] = self.enabled()
+        snapshot["max_age_seconds"] = self.max_age_seconds
+        return snapshot
+
+
+task_priority_index = TaskPriorityIndex()
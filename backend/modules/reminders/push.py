@@ -0,0 +1,84 @@
+"""Reminder-due push events.
+
+Registers a sweep on ``backend.shared.event_broker``: for each case manager
+with an open event stream it loads their active reminders and publishes one
+``reminder_due`` event per reminder that has come due (due date today or
+earlier), so the reminder UI no longer polls. Announcements are remembered per
+stream channel for the day; a reminder whose due date moves is announced again.
+
+``start_push_worker`` is called from the app lifespan.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date
+from typing import Dict, List, Set, Tuple
+
+from backend.shared.event_broker import Channel, EventBroker, event_broker
+from backend.shared.tenancy import multi_tenant_enabled
+
+from . import repository
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderDueNotifier:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._day = ""
+        self._announced: Dict[Channel, Set[Tuple[str, str]]] = {}
+
+    def sweep(self, broker: EventBroker, channels: List[Channel]) -> None:
+        today = date.today().isoformat()
+        with self._lock:
+            if today != self._day:
+                self._day = today
+                self._announced.clear()
+            # Forget channels whose streams closed so a reconnect starts fresh.
+            for channel in [channel for channel in self._announced if channel not in channels]:
+                del self._announced[channel]
+        for org_key, case_manager_id in channels:
+            try:
+                reminders = repository.get_active_reminders_for_case_manager(
+                    case_manager_id, org_id=org_key if multi_tenant_enabled() else None
+                )
+            except Exception as exc:
+                logger.warning("Reminder push sweep failed for %s: %s", case_manager_id, exc)
+                continue
+            for reminder in reminders:
+                due_date = str(reminder.get("due_date") or "")[:10]
+                if not due_date or due_date > today:
+                    continue
+                marker = (str(reminder.get("reminder_id")), due_date)
+                with self._lock:
+                    announced = self._announced.setdefault((org_key, case_manager_id), set())
+                    if marker in announced:
+                        continue
+                    announced.add(marker)
+                broker.publish(
+                    case_manager_id,
+                    "reminder_due",
+                    {
+                        "reminder_id": reminder.get("reminder_id"),
+                        "client_id": reminder.get("client_id"),
+                        "reminder_type": reminder.get("reminder_type"),
+                        "message": reminder.get("message"),
+                        "priority": reminder.get("priority"),
+                        "due_date": due_date,
+                        "overdue": due_date < today,
+                    },
+                    org_id=org_key,
+                )
+
+
+reminder_due_notifier = ReminderDueNotifier()
+event_broker.register_sweep("reminders_due", reminder_due_notifier.sweep)
+
+
+def start_push_worker() -> None:
+    event_broker.start()
+
+
+def stop_push_worker() -> None:
+    event_broker.stop()
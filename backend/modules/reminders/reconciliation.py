@@ -0,0 +1,143 @@
+"""Smart Daily deadline reconciliation handlers.
+
+Registers one handler per ``backend.shared.reconciliation_queue`` kind. Each
+resyncs only the keys the module stores reported dirty:
+
+* ``ur`` / ``fmla`` - reload the case and re-project its deadlines. A case that
+  no longer exists is projected from its last known record as closed, so its
+  reminders are retired instead of lingering.
+* ``medical`` / ``treatment_plan`` - re-project one client's appointments /
+  plan reviews, resolving the case manager (and org, when multi-tenancy is on)
+  from the client when the writer did not know it.
+* ``caseload`` - the full ``reconcile_operational_deadlines`` pass, queued by
+  Smart Daily reads as a backfill (see ``ReconciliationQueue.ensure_caseload``).
+* ``priority_index`` - refresh the Smart Daily priority indexes holding the
+  dirty clients, or (``*``) build one case manager's index for a read.
+
+``start_reconciliation_worker`` is called from the app lifespan.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from backend.auth.authorization import get_client_case_manager_id, get_client_org_id
+from backend.shared.reconciliation_queue import CASELOAD_KEY, reconciliation_queue
+from backend.shared.tenancy import multi_tenant_enabled
+
+from .repository import (
+    get_clients_for_case_manager,
+    reconcile_operational_deadlines,
+    refresh_priority_index,
+    refresh_priority_index_for_clients,
+)
+
+logger = logging.getLogger(__name__)
+
+DirtyKeys = Dict[str, Optional[Dict[str, Any]]]
+
+
+def _sync_cases(kind: str, store, sync, keys: DirtyKeys) -> List[str]:
+    failed: List[str] = []
+    for case_id, snapshot in keys.items():
+        try:
+            record = store.get_case(case_id)
+            if record is None and snapshot:
+                record = {**snapshot, "status": "closed"}
+            if record:
+                sync(record)
+        except Exception as exc:
+            logger.warning("%s deadline resync failed for case %s: %s", kind.upper(), case_id, exc)
+            failed.append(case_id)
+    return failed
+
+
+def reconcile_ur_cases(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> List[str]:
+    from backend.modules.ur.store_factory import get_ur_store
+    from backend.modules.ur.work_items import sync_ur_deadline_reminders
+
+    return _sync_cases("ur", get_ur_store(), sync_ur_deadline_reminders, keys)
+
+
+def reconcile_fmla_cases(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> List[str]:
+    from backend.modules.fmla.store_factory import get_fmla_store
+    from backend.modules.fmla.work_items import sync_fmla_deadline_reminders
+
+    return _sync_cases("fmla", get_fmla_store(), sync_fmla_deadline_reminders, keys)
+
+
+def _client_assignment(client_id: str, case_manager_id: str, org_id: Optional[str]):
+    assigned_to = case_manager_id or get_client_case_manager_id(client_id) or ""
+    if org_id is None and multi_tenant_enabled():
+        org_id = get_client_org_id(client_id)
+    return assigned_to, org_id
+
+
+def reconcile_client_appointments(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> List[str]:
+    from backend.modules.medical.work_items import sync_client_medical_appointment_reminders
+
+    failed: List[str] = []
+    for client_id in keys:
+        try:
+            assigned_to, client_org_id = _client_assignment(client_id, case_manager_id, org_id)
+            if assigned_to:
+                sync_client_medical_appointment_reminders(
+                    client_id, case_manager_id=assigned_to, org_id=client_org_id,
+                )
+        except Exception as exc:
+            logger.warning("Appointment reminder resync failed for client %s: %s", client_id, exc)
+            failed.append(client_id)
+    return failed
+
+
+def reconcile_client_treatment_plans(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> List[str]:
+    from backend.modules.treatment_plan.work_items import sync_client_treatment_plan_review_reminders
+
+    failed: List[str] = []
+    names: Dict[str, Dict[str, str]] = {}
+    for client_id in keys:
+        try:
+            assigned_to, client_org_id = _client_assignment(client_id, case_manager_id, org_id)
+            if not assigned_to:
+                continue
+            if assigned_to not in names:
+                names[assigned_to] = get_clients_for_case_manager(assigned_to)[1]
+            sync_client_treatment_plan_review_reminders(
+                client_id,
+                case_manager_id=assigned_to,
+                client_name=names[assigned_to].get(client_id, ""),
+                org_id=client_org_id,
+            )
+        except Exception as exc:
+            logger.warning("Treatment plan reminder resync failed for client %s: %s", client_id, exc)
+            failed.append(client_id)
+    return failed
+
+
+def reconcile_caseload(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> None:
+    if case_manager_id:
+        reconcile_operational_deadlines(case_manager_id, org_id=org_id)
+
+
+def reconcile_priority_index(case_manager_id: str, org_id: Optional[str], keys: DirtyKeys) -> None:
+    if CASELOAD_KEY in keys and case_manager_id:
+        refresh_priority_index(case_manager_id, org_id=org_id)
+    client_ids = [client_id for client_id in keys if client_id != CASELOAD_KEY]
+    if client_ids:
+        refresh_priority_index_for_clients(client_ids, [case_manager_id])
+
+
+reconciliation_queue.register("ur", reconcile_ur_cases)
+reconciliation_queue.register("fmla", reconcile_fmla_cases)
+reconciliation_queue.register("medical", reconcile_client_appointments)
+reconciliation_queue.register("treatment_plan", reconcile_client_treatment_plans)
+reconciliation_queue.register("caseload", reconcile_caseload)
+reconciliation_queue.register("priority_index", reconcile_priority_index)
+
+
+def start_reconciliation_worker() -> None:
+    reconciliation_queue.start()
+
+
+def stop_reconciliation_worker() -> None:
+    reconciliation_queue.stop()
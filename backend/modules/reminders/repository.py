@@ -14,20 +14,33 @@ to share across requests (all operations open/close their own connections).
 
 from __future__ import annotations
 
+import functools
+import inspect
 import logging
 import os
 import sqlite3
+import time
 import uuid
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict, Generator, List, Optional, Tuple
-
-from backend.auth.authorization import get_client_ids_for_org, get_client_org_id, get_org_for_user_id
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from backend.auth.authorization import (
+    get_client_case_manager_id,
+    get_client_ids_for_org,
+    get_client_org_id,
+    get_org_for_user_id,
+)
+import backend.shared.client_context_cache as client_context_cache_mod
+from backend.shared.client_context_cache import add_invalidation_listener, invalidate_client_context
 from backend.shared.database.workspace_store import workspace_store
+from backend.shared.reconciliation_queue import CASELOAD_KEY, reconciliation_queue
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
+from .priority_index import IndexRow, task_priority_index
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -204,6 +217,12 @@ def _ensure_sqlite_tenancy_schema(force: bool = False) -> None:
             if "org_id" not in columns:
                 conn.execute(f"ALTER TABLE {table_name} ADD COLUMN org_id TEXT")
             conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_org ON {table_name}(org_id)")
+            if table_name == "active_reminders":
+                # Smart Daily priority index: which clients have active reminders for a case manager.
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_active_reminders_case_manager"
+                    " ON active_reminders(case_manager_id, status, client_id)"
+                )
         _backfill_sqlite_org_ids(conn)
     _sqlite_tenancy_ready = True
 
@@ -378,6 +397,10 @@ def ensure_storage_ready() -> bool:
                         pass  # column already exists — safe to ignore
                 conn.execute(text("CREATE INDEX IF NOT EXISTS idx_railway_intelligent_tasks_org ON railway_intelligent_tasks(org_id)"))
                 conn.execute(text("CREATE INDEX IF NOT EXISTS idx_railway_active_reminders_org ON railway_active_reminders(org_id)"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_railway_active_reminders_case_manager"
+                    " ON railway_active_reminders(case_manager_id, status, client_id)"
+                ))
                 _backfill_pg_org_ids(conn)
             logger.info("Postgres reminders tables ready")
             return True
@@ -611,12 +634,29 @@ def _workspace_task_to_task_dict(task: Dict[str, Any], name_map: Dict[str, str],
     return converted
 
 
-def list_workspace_tasks_for_case_manager(case_manager_id: str, org_id: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Return open workspace client_tasks for this case manager's clients."""
-    client_ids, name_map = get_clients_for_case_manager(case_manager_id)
+def _scoped_client_ids(
+    case_manager_id: str,
+    org_id: Optional[str] = None,
+    client_ids: Optional[List[str]] = None,
+) -> Tuple[List[str], Dict[str, str]]:
+    """Caseload client ids (org-filtered, optionally narrowed to ``client_ids``) plus the name map."""
+    caseload_ids, name_map = get_clients_for_case_manager(case_manager_id)
     if org_id:
         allowed_client_ids = set(get_client_ids_for_org(org_id))
-        client_ids = [client_id for client_id in client_ids if client_id in allowed_client_ids]
+        caseload_ids = [client_id for client_id in caseload_ids if client_id in allowed_client_ids]
+    if client_ids is not None:
+        wanted = set(client_ids)
+        caseload_ids = [client_id for client_id in caseload_ids if client_id in wanted]
+    return caseload_ids, name_map
+
+
+def list_workspace_tasks_for_case_manager(
+    case_manager_id: str,
+    org_id: Optional[str] = None,
+    client_ids: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Return open workspace client_tasks for this case manager's clients (or just ``client_ids``)."""
+    client_ids, name_map = _scoped_client_ids(case_manager_id, org_id, client_ids)
     if not client_ids:
         return []
 
@@ -636,12 +676,10 @@ def list_workspace_tasks_for_case_manager(case_manager_id: str, org_id: Optional
 def list_workspace_appointment_tasks_for_case_manager(
     case_manager_id: str,
     org_id: Optional[str] = None,
+    client_ids: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """Project persisted client appointments directly into prioritized work."""
-    client_ids, name_map = get_clients_for_case_manager(case_manager_id)
-    if org_id:
-        allowed_client_ids = set(get_client_ids_for_org(org_id))
-        client_ids = [client_id for client_id in client_ids if client_id in allowed_client_ids]
+    client_ids, name_map = _scoped_client_ids(case_manager_id, org_id, client_ids)
     if not client_ids:
         return []
 
@@ -736,12 +774,17 @@ def list_tasks_for_client(client_id: str, org_id: Optional[str] = None) -> List[
         return [_row_to_task_dict(r) for r in cur.fetchall()]
 
 
-def list_tasks_for_case_manager(case_manager_id: str, org_id: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Return all non-completed tasks across all clients owned by this case manager."""
-    client_ids, name_map = get_clients_for_case_manager(case_manager_id)
-    if org_id:
-        allowed_client_ids = set(get_client_ids_for_org(org_id))
-        client_ids = [client_id for client_id in client_ids if client_id in allowed_client_ids]
+def list_tasks_for_case_manager(
+    case_manager_id: str,
+    org_id: Optional[str] = None,
+    client_ids: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Return all non-completed tasks across all clients owned by this case manager.
+
+    ``client_ids`` narrows the read to those caseload clients (the Smart Daily
+    priority index rebuilds one client at a time).
+    """
+    client_ids, name_map = _scoped_client_ids(case_manager_id, org_id, client_ids)
     if not client_ids:
         return []
 
@@ -771,8 +814,10 @@ def list_tasks_for_case_manager(case_manager_id: str, org_id: Optional[str] = No
                 t = _row_to_task_dict(r)
                 t["client_name"] = name_map.get(t.get("client_id", ""), "Unknown Client")
                 tasks.append(t)
-            tasks.extend(list_workspace_tasks_for_case_manager(case_manager_id, org_id=org_id))
-            tasks.extend(list_workspace_appointment_tasks_for_case_manager(case_manager_id, org_id=org_id))
+            tasks.extend(list_workspace_tasks_for_case_manager(case_manager_id, org_id=org_id, client_ids=client_ids))
+            tasks.extend(
+                list_workspace_appointment_tasks_for_case_manager(case_manager_id, org_id=org_id, client_ids=client_ids)
+            )
             return tasks
         except Exception as exc:
             logger.warning("Postgres list_tasks_for_case_manager failed (%s), using SQLite", exc)
@@ -801,8 +846,10 @@ def list_tasks_for_case_manager(case_manager_id: str, org_id: Optional[str] = No
     except sqlite3.OperationalError as exc:
         logger.warning("SQLite intelligent_tasks lookup failed (%s); continuing with workspace tasks", exc)
 
-    tasks.extend(list_workspace_tasks_for_case_manager(case_manager_id, org_id=org_id))
-    tasks.extend(list_workspace_appointment_tasks_for_case_manager(case_manager_id, org_id=org_id))
+    tasks.extend(list_workspace_tasks_for_case_manager(case_manager_id, org_id=org_id, client_ids=client_ids))
+    tasks.extend(
+        list_workspace_appointment_tasks_for_case_manager(case_manager_id, org_id=org_id, client_ids=client_ids)
+    )
     return tasks
 
 
@@ -881,56 +928,52 @@ def get_today_tasks(case_manager_id: str, org_id: Optional[str] = None) -> List[
         return tasks
 
 
-def get_prioritized_tasks(case_manager_id: str, client_date: Optional[str] = None, org_id: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Return tasks bucketed into overdue / today / next_3_days / this_week /
-    treatment_plan / high_priority_no_date / later, plus an AI summary string.
-    Pass client_date (YYYY-MM-DD) to use the client's local date for bucketing
-    instead of the server's UTC date.today().
-    """
-    reconcile_operational_deadlines(case_manager_id, org_id=org_id)
-    all_tasks = list_tasks_for_case_manager(case_manager_id, org_id=org_id)
+PRIORITY_BUCKETS = ("overdue", "today", "next_3_days", "this_week", "treatment_plan", "high_priority_no_date", "later")
+
+
+def _reminder_as_task(reminder: Dict[str, Any], name_map: Dict[str, str]) -> Dict[str, Any]:
+    reminder.setdefault("client_name", name_map.get(reminder.get("client_id", ""), "Unknown"))
+    reminder.setdefault("source", "active_reminder")
+    reminder.setdefault("title", reminder.get("message", ""))
+    # Map reminder_id → task_id so the frontend completion handler can target the right row
+    reminder.setdefault("task_id", reminder.get("reminder_id", ""))
+    # Map reminder_type → task_type so the category filter works
+    reminder.setdefault("task_type", reminder.get("reminder_type", ""))
+    return reminder
+
+
+def _undated_bucket(item: Dict[str, Any], kind: str) -> Optional[str]:
+    """Smart Daily bucket for an item without a due date (None: not shown)."""
+    if kind == "task" and _is_treatment_plan_task(item):
+        return "treatment_plan"
+    if str(item.get("priority", "")).lower() in {"high", "critical"}:
+        return "high_priority_no_date"
+    return None
+
+
+def _due_bucket(due: date, today: date) -> str:
+    if due < today:
+        return "overdue"
+    if due == today:
+        return "today"
+    if due <= today + timedelta(days=3):
+        return "next_3_days"
+    if due <= today + timedelta(days=7):
+        return "this_week"
+    return "later"
 
-    if client_date:
-        try:
-            today = datetime.strptime(client_date, "%Y-%m-%d").date()
-        except ValueError:
-            today = date.today()
-    else:
-        today = date.today()
-    in_3_days = today + timedelta(days=3)
-    in_7_days = today + timedelta(days=7)
-
-    buckets: Dict[str, List[Dict]] = {
-        "overdue": [],
-        "today": [],
-        "next_3_days": [],
-        "this_week": [],
-        "treatment_plan": [],
-        "high_priority_no_date": [],
-        "later": [],
-    }
 
-    for task in all_tasks:
+def _score_buckets_in_python(case_manager_id: str, today: date, org_id: Optional[str]) -> Dict[str, List[Dict]]:
+    """Fetch, score and sort every open item (the path used when the priority index is off)."""
+    buckets: Dict[str, List[Dict]] = {bucket: [] for bucket in PRIORITY_BUCKETS}
+
+    for task in list_tasks_for_case_manager(case_manager_id, org_id=org_id):
         due = _parse_due_date(task.get("due_date"))
         task["priority_score"] = _task_priority_score(task, today)
         task.setdefault("priority_reason", _priority_reason(task, today))
-
-        if due is None:
-            if _is_treatment_plan_task(task):
-                buckets["treatment_plan"].append(task)
-            elif str(task.get("priority", "")).lower() in {"high", "critical"}:
-                buckets["high_priority_no_date"].append(task)
-        elif due < today:
-            buckets["overdue"].append(task)
-        elif due == today:
-            buckets["today"].append(task)
-        elif due <= in_3_days:
-            buckets["next_3_days"].append(task)
-        elif due <= in_7_days:
-            buckets["this_week"].append(task)
-        else:
-            buckets["later"].append(task)
+        bucket = _due_bucket(due, today) if due else _undated_bucket(task, "task")
+        if bucket:
+            buckets[bucket].append(task)
 
     # Also pull active_reminders into buckets
     active_reminders = get_active_reminders_for_case_manager(case_manager_id, org_id=org_id)
@@ -945,32 +988,229 @@ def get_prioritized_tasks(case_manager_id: str, client_date: Optional[str] = Non
         if str(r.get("reminder_id") or "") in appointment_task_ids:
             continue
         due = _parse_due_date(r.get("due_date"))
-        r.setdefault("client_name", name_map.get(r.get("client_id", ""), "Unknown"))
-        r.setdefault("source", "active_reminder")
-        r.setdefault("title", r.get("message", ""))
-        # Map reminder_id → task_id so the frontend completion handler can target the right row
-        r.setdefault("task_id", r.get("reminder_id", ""))
-        # Map reminder_type → task_type so the category filter works
-        r.setdefault("task_type", r.get("reminder_type", ""))
+        _reminder_as_task(r, name_map)
         r["priority_score"] = _task_priority_score(r, today)
         r.setdefault("priority_reason", _priority_reason(r, today))
-
-        if due is None:
-            if str(r.get("priority", "")).lower() in {"high", "critical"}:
-                buckets["high_priority_no_date"].append(r)
-        elif due < today:
-            buckets["overdue"].append(r)
-        elif due == today:
-            buckets["today"].append(r)
-        elif due <= in_3_days:
-            buckets["next_3_days"].append(r)
-        elif due <= in_7_days:
-            buckets["this_week"].append(r)
-        else:
-            buckets["later"].append(r)
+        bucket = _due_bucket(due, today) if due else _undated_bucket(r, "reminder")
+        if bucket:
+            buckets[bucket].append(r)
 
     for bucket_key, bucket_tasks in buckets.items():
         buckets[bucket_key] = _sort_bucket(bucket_tasks, today)
+    return buckets
+
+
+# ---------------------------------------------------------------------------
+# Smart Daily priority index maintenance (see priority_index.py)
+# ---------------------------------------------------------------------------
+
+def _active_reminder_client_ids(case_manager_id: str, org_id: Optional[str] = None) -> List[str]:
+    """Distinct clients (``""`` for none) with an Active reminder assigned to this case manager."""
+    client_ids: List[str] = []
+    if use_postgres():
+        try:
+            from sqlalchemy import text
+            with _pg_conn() as conn:
+                rows = conn.execute(
+                    text("""
+                        SELECT DISTINCT COALESCE(client_id, '') FROM railway_active_reminders
+                        WHERE case_manager_id = :cm AND LOWER(status) = 'active'
+                          AND (:org_id IS NULL OR org_id = :org_id)
+                    """),
+                    {"cm": case_manager_id, "org_id": org_id},
+                ).fetchall()
+            client_ids.extend(str(row[0]) for row in rows)
+        except Exception as exc:
+            logger.warning("Postgres active reminder client lookup failed (%s), using SQLite", exc)
+    try:
+        _ensure_sqlite_tenancy_schema()
+        with _sqlite_conn(_SQLITE_REMINDERS_PATH) as conn:
+            rows = conn.execute(
+                """
+                SELECT DISTINCT COALESCE(client_id, '') FROM active_reminders
+                WHERE case_manager_id = ? AND status = 'Active'
+                  AND (? IS NULL OR org_id = ?)
+                """,
+                (case_manager_id, org_id, org_id),
+            ).fetchall()
+        client_ids.extend(str(row[0]) for row in rows)
+    except sqlite3.OperationalError as exc:
+        logger.warning("SQLite active reminder client lookup failed (%s)", exc)
+    return list(dict.fromkeys(client_ids))
+
+
+def _priority_index_row(item: Dict[str, Any], kind: str, position: int) -> Optional[IndexRow]:
+    due = _parse_due_date(item.get("due_date"))
+    undated_bucket = None if due else _undated_bucket(item, kind)
+    if due is None and undated_bucket is None:
+        return None
+    payload = {key: value for key, value in item.items() if key not in {"priority_score", "priority_reason"}}
+    return IndexRow(
+        item_id=str(item.get("task_id") or item.get("id") or f"{kind}-{position}"),
+        kind=kind,
+        source=str(item.get("source") or ""),
+        # The due-date part of the score is added back per bucket at read time.
+        base_score=_task_priority_score({**item, "due_date": None}, date.today()),
+        due_ordinal=due.toordinal() if due else None,
+        undated_bucket=undated_bucket,
+        created_at=str(item.get("created_at") or ""),
+        payload=payload,
+    )
+
+
+def refresh_priority_index(case_manager_id: str, org_id: Optional[str] = None) -> None:
+    """Rebuild the index units (one per client) whose token changed since they were built."""
+    started = time.perf_counter()
+    org_key = org_id or ""
+    caseload_ids, name_map = _scoped_client_ids(case_manager_id, org_id)
+    caseload = set(caseload_ids)
+    units = list(dict.fromkeys([*caseload_ids, *_active_reminder_client_ids(case_manager_id, org_id)]))
+    # Generations are read before any rebuild, so a write landing mid-build leaves its unit stale.
+    context_cache = client_context_cache_mod.client_context_cache
+    generations = context_cache.generations([client_id for client_id in units if client_id])
+    epoch = context_cache.epoch()
+    tokens = {
+        client_id: f"{epoch}:{generations.get(client_id, 0)}:{int(client_id in caseload)}:{name_map.get(client_id, '')}"
+        for client_id in units
+    }
+
+    with task_priority_index.lock(case_manager_id, org_key):
+        states = task_priority_index.unit_states(case_manager_id, org_key)
+        now = time.time()
+        # Reminders without a client have no generation to check; that unit is always rebuilt.
+        stale = [
+            client_id for client_id in units
+            if not client_id or not task_priority_index.is_fresh(states.get(client_id), tokens[client_id], now)
+        ]
+        removed = [client_id for client_id in states if client_id not in tokens]
+        rows: Dict[str, List[IndexRow]] = {client_id: [] for client_id in stale}
+        stale_caseload = [client_id for client_id in stale if client_id in caseload]
+        tasks = (
+            list_tasks_for_case_manager(case_manager_id, org_id=org_id, client_ids=stale_caseload)
+            if stale_caseload else []
+        )
+        reminders = (
+            get_active_reminders_for_case_manager(case_manager_id, org_id=org_id, client_ids=stale)
+            if stale else []
+        )
+        items = [("task", task) for task in tasks]
+        items += [("reminder", _reminder_as_task(reminder, name_map)) for reminder in reminders]
+        for position, (kind, item) in enumerate(items):
+            client_rows = rows.get(str(item.get("client_id") or ""))
+            row = _priority_index_row(item, kind, position) if client_rows is not None else None
+            if row is not None:
+                client_rows.append(row)
+        task_priority_index.replace_units(
+            case_manager_id,
+            org_key,
+            {client_id: (tokens[client_id], client_rows) for client_id, client_rows in rows.items()},
+            removed,
+        )
+    task_priority_index.record_refresh((time.perf_counter() - started) * 1000)
+
+
+def refresh_priority_index_for_clients(
+    client_ids: Iterable[Optional[str]], case_manager_ids: Iterable[Optional[str]] = ()
+) -> None:
+    """Refresh every built index a write to these clients can change.
+
+    That is the indexes already holding one of the clients (including a case
+    manager the client just left), plus those of ``case_manager_ids`` and of
+    each client's current case manager. Indexes that were never built are left
+    for the first Smart Daily read to queue.
+    """
+    if not task_priority_index.enabled() or not task_priority_index.exists():
+        return
+    client_ids = [str(client_id) for client_id in dict.fromkeys(client_ids) if client_id is not None]
+    owners = [str(cm) for cm in case_manager_ids if cm]
+    for client_id in client_ids:
+        if client_id:
+            try:
+                owners.append(get_client_case_manager_id(client_id) or "")
+            except Exception as exc:
+                logger.debug("Could not resolve case manager for client %s: %s", client_id, exc)
+    for case_manager_id, org_key in task_priority_index.scopes(owners, client_ids):
+        refresh_priority_index(case_manager_id, org_id=org_key or None)
+
+
+def _refresh_priority_index_after_write(
+    client_ids: List[Optional[str]], case_manager_ids: List[Optional[str]]
+) -> None:
+    # The invalidation listener has already queued a background refresh, so a
+    # failure here only delays the index until the worker retries.
+    try:
+        refresh_priority_index_for_clients(client_ids, case_manager_ids)
+    except Exception as exc:
+        logger.warning("Smart Daily priority index refresh failed after write (%s); left to the worker", exc)
+
+
+def _queue_priority_index_refresh(client_id: str) -> None:
+    """Invalidation listener: refresh the indexes holding ``client_id`` in the background.
+
+    Catches writers outside this repository (workspace store, module stores)
+    that only bump the client's context generation.
+    """
+    if task_priority_index.enabled():
+        reconciliation_queue.mark_dirty("priority_index", client_id)
+
+
+add_invalidation_listener(_queue_priority_index_refresh)
+
+
+def _read_priority_index(
+    case_manager_id: str, today: date, org_id: Optional[str] = None
+) -> Optional[Dict[str, List[Dict]]]:
+    """Serve Smart Daily from the index; None if it was never built (a build is queued instead)."""
+    org_key = org_id or ""
+    refreshed_at = task_priority_index.refreshed_at(case_manager_id, org_key)
+    if refreshed_at is None or task_priority_index.is_expired(refreshed_at):
+        reconciliation_queue.mark_dirty("priority_index", CASELOAD_KEY, case_manager_id=case_manager_id, org_id=org_id)
+        task_priority_index.record_queued()
+        if refreshed_at is None:
+            return None
+    buckets: Dict[str, List[Dict]] = {bucket: [] for bucket in PRIORITY_BUCKETS}
+    for bucket, score, item in task_priority_index.read(case_manager_id, org_key, today.toordinal()):
+        item["priority_score"] = score
+        item["priority_reason"] = _priority_reason(item, today)
+        buckets[bucket].append(item)
+    return buckets
+
+
+def get_prioritized_tasks(case_manager_id: str, client_date: Optional[str] = None, org_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return tasks bucketed into overdue / today / next_3_days / this_week /
+    treatment_plan / high_priority_no_date / later, plus an AI summary string.
+    Pass client_date (YYYY-MM-DD) to use the client's local date for bucketing
+    instead of the server's UTC date.today().
+
+    This is a pure read: module deadline projections are kept current by the
+    reconciliation worker (``backend.modules.reminders.reconciliation``). The
+    call below only queues a caseload backfill the first time a case manager
+    is read in this process (and once per sweep interval after that).
+
+    Buckets are served from the materialized priority index, which writers
+    keep current (see ``priority_index``). Until a case manager's index has
+    been built in the background, and with ``CMSX_TASK_INDEX=0`` or an index
+    failure, every item is scored in Python instead.
+    """
+    reconciliation_queue.ensure_caseload(case_manager_id, org_id)
+
+    if client_date:
+        try:
+            today = datetime.strptime(client_date, "%Y-%m-%d").date()
+        except ValueError:
+            today = date.today()
+    else:
+        today = date.today()
+
+    buckets: Optional[Dict[str, List[Dict]]] = None
+    if task_priority_index.enabled():
+        try:
+            buckets = _read_priority_index(case_manager_id, today, org_id=org_id)
+        except Exception as exc:
+            logger.warning("Smart Daily priority index unavailable (%s); scoring in Python", exc)
+    if buckets is None:
+        buckets = _score_buckets_in_python(case_manager_id, today, org_id)
 
     overdue_n = len(buckets["overdue"])
     today_n = len(buckets["today"])
@@ -1023,7 +1263,11 @@ def get_prioritized_tasks(case_manager_id: str, client_date: Optional[str] = Non
 
 
 def reconcile_operational_deadlines(case_manager_id: str, org_id: Optional[str] = None) -> None:
-    """Project existing assigned module deadlines before Smart Daily reads them."""
+    """Project every module deadline assigned to a case manager into reminders.
+
+    Run by the reconciliation worker as the caseload backfill; targeted writes
+    are resynced per case / client instead.
+    """
     try:
         from backend.modules.medical.work_items import reconcile_medical_appointment_reminders
 
@@ -1204,21 +1448,36 @@ def get_client_work_items(
 # Active reminders reads
 # ---------------------------------------------------------------------------
 
-def get_active_reminders_for_case_manager(case_manager_id: str, org_id: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Return Active reminders for the given case manager."""
+def get_active_reminders_for_case_manager(
+    case_manager_id: str,
+    org_id: Optional[str] = None,
+    client_ids: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Return Active reminders for the given case manager (optionally only for ``client_ids``;
+    ``""`` matches reminders without a client)."""
+    if client_ids is not None and not client_ids:
+        return []
+    client_ids = list(dict.fromkeys(client_ids)) if client_ids is not None else None
     postgres_rows: List[Dict[str, Any]] = []
     postgres_ids = set()
     if use_postgres():
         try:
             from sqlalchemy import text
+            client_filter, client_params = "", {}
+            if client_ids is not None:
+                client_filter = "AND COALESCE(client_id, '') IN ({})".format(
+                    ", ".join(f":cid{i}" for i in range(len(client_ids)))
+                )
+                client_params = {f"cid{i}": cid for i, cid in enumerate(client_ids)}
             with _pg_conn() as conn:
                 rows = conn.execute(
-                    text("""
+                    text(f"""
                         SELECT reminder_id, client_id, case_manager_id, reminder_type,
                                message, priority, due_date, status, created_at, org_id
                         FROM railway_active_reminders
                         WHERE case_manager_id = :cm
                           AND (:org_id IS NULL OR org_id = :org_id)
+                          {client_filter}
                         ORDER BY
                             CASE priority
                                 WHEN 'Critical' THEN 1 WHEN 'High' THEN 2
@@ -1226,7 +1485,7 @@ def get_active_reminders_for_case_manager(case_manager_id: str, org_id: Optional
                             END,
                             due_date ASC NULLS LAST
                     """),
-                    {"cm": case_manager_id, "org_id": org_id},
+                    {"cm": case_manager_id, "org_id": org_id, **client_params},
                 ).fetchall()
             all_postgres_rows = [dict(r._mapping) for r in rows]
             postgres_ids = {
@@ -1241,14 +1500,18 @@ def get_active_reminders_for_case_manager(case_manager_id: str, org_id: Optional
 
     try:
         _ensure_sqlite_tenancy_schema()
+        client_filter = ""
+        if client_ids is not None:
+            client_filter = f"AND COALESCE(client_id, '') IN ({','.join('?' * len(client_ids))})"
         with _sqlite_conn(_SQLITE_REMINDERS_PATH) as conn:
             cur = conn.execute(
-                """
+                f"""
                 SELECT reminder_id, client_id, case_manager_id, reminder_type,
                        message, priority, due_date, status, created_at, org_id
                 FROM active_reminders
                 WHERE case_manager_id = ? AND status = 'Active'
                   AND (? IS NULL OR org_id = ?)
+                  {client_filter}
                 ORDER BY
                     CASE priority
                         WHEN 'Critical' THEN 1 WHEN 'High' THEN 2
@@ -1256,7 +1519,7 @@ def get_active_reminders_for_case_manager(case_manager_id: str, org_id: Optional
                     END,
                     due_date ASC
                 """,
-                (case_manager_id, org_id, org_id),
+                [case_manager_id, org_id, org_id, *(client_ids or [])],
             )
             sqlite_rows = [
                 dict(row) for row in cur.fetchall()
@@ -1355,10 +1618,47 @@ def get_intelligent_task(task_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _invalidates_client_context(func):
+    """Bump the client context-cache generation for every client a write touches.
+
+    Owning clients are resolved *before* the write runs (a delete removes the
+    row): the explicit ``client_id`` argument plus, for writes addressed by
+    ``reminder_id`` / ``task_id``, the client currently on that row. The
+    Smart Daily priority indexes for those clients (and case managers) are
+    refreshed afterwards, so the next read sees the write.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        client_ids = [arguments.get("client_id")]
+        case_manager_ids = [arguments.get("case_manager_id")]
+        try:
+            existing = None
+            if arguments.get("reminder_id"):
+                existing = get_active_reminder(arguments["reminder_id"])
+            elif arguments.get("task_id"):
+                existing = get_intelligent_task(arguments["task_id"])
+            if existing:
+                client_ids.append(existing.get("client_id"))
+                case_manager_ids.append(existing.get("case_manager_id"))
+        except Exception as exc:
+            logger.debug("Could not resolve client for context invalidation: %s", exc)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate_client_context(*client_ids)
+            _refresh_priority_index_after_write(client_ids, case_manager_ids)
+
+    return wrapper
+
+
 # ---------------------------------------------------------------------------
 # Task writes
 # ---------------------------------------------------------------------------
 
+@_invalidates_client_context
 def create_intelligent_tasks(
     client_id: str,
     tasks: List[Dict[str, Any]],
@@ -1492,6 +1792,7 @@ def create_intelligent_tasks(
     return {"success": True, "inserted": inserted, "errors": errors, "backend": "sqlite"}
 
 
+@_invalidates_client_context
 def update_task_status(
     task_id: str,
     status: str,
@@ -1540,6 +1841,7 @@ def update_task_status(
 # Active reminder writes
 # ---------------------------------------------------------------------------
 
+@_invalidates_client_context
 def create_active_reminder(
     client_id: str,
     case_manager_id: str,
@@ -1684,6 +1986,8 @@ def sync_active_reminder(
                         "org_id": record_org_id,
                     },
                 )
+            invalidate_client_context(client_id)
+            _refresh_priority_index_after_write([client_id], [case_manager_id])
             return reminder_id
         except Exception as exc:
             logger.warning(
@@ -1706,9 +2010,12 @@ def sync_active_reminder(
                 message, priority, due_date, created_at, record_org_id,
             ),
         )
+    invalidate_client_context(client_id)
+    _refresh_priority_index_after_write([client_id], [case_manager_id])
     return reminder_id
 
 
+@_invalidates_client_context
 def update_active_reminder(
     reminder_id: str,
     message: Optional[str] = None,
@@ -1771,6 +2078,7 @@ def update_active_reminder(
         return False
 
 
+@_invalidates_client_context
 def delete_active_reminder(reminder_id: str, org_id: Optional[str] = None) -> bool:
     """Permanently delete an active reminder. Returns True if a row was removed."""
     if use_postgres():
@@ -1799,6 +2107,7 @@ def delete_active_reminder(reminder_id: str, org_id: Optional[str] = None) -> bo
         return False
 
 
+@_invalidates_client_context
 def reopen_active_reminder(reminder_id: str, org_id: Optional[str] = None) -> bool:
     """Set a completed active reminder back to Active."""
     if use_postgres():
@@ -1827,6 +2136,7 @@ def reopen_active_reminder(reminder_id: str, org_id: Optional[str] = None) -> bo
         return False
 
 
+@_invalidates_client_context
 def complete_active_reminder(reminder_id: str, org_id: Optional[str] = None) -> bool:
     """Mark an active reminder as Completed. Returns True if a row was updated."""
     if use_postgres():
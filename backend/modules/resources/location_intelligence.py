@@ -83,6 +83,21 @@ SERVICE_URGENCY_WEIGHTS = {
     "routine": 1.0,  # Outpatient, ongoing care - wider radius acceptable
 }
 
+# San Fernando Valley neighborhoods and the cities bordering them
+SFV_NEIGHBORHOODS = {
+    'north hollywood', 'van nuys', 'sherman oaks', 'studio city',
+    'encino', 'tarzana', 'reseda', 'canoga park', 'woodland hills',
+    'sun valley', 'pacoima'
+}
+SFV_ADJACENT = {'burbank', 'glendale'}
+
+# Metro Red Line (North Hollywood, Universal City, Hollywood) and Orange Line
+# (Van Nuys, Sherman Oaks, etc.) neighborhoods
+TRANSIT_NEIGHBORHOODS = {
+    'north hollywood', 'universal city', 'hollywood', 'downtown', 'union station',
+    'van nuys', 'sherman oaks', 'reseda', 'canoga park', 'woodland hills',
+}
+
 
 class LocationIntelligence:
     """Geographic scoring for provider proximity"""
@@ -254,19 +269,12 @@ class LocationIntelligence:
             return 0.6
 
         # San Fernando Valley region match
-        sfv_neighborhoods = {
-            'north hollywood', 'van nuys', 'sherman oaks', 'studio city',
-            'encino', 'tarzana', 'reseda', 'canoga park', 'woodland hills',
-            'sun valley', 'pacoima'
-        }
-
-        if provider_neighborhood in sfv_neighborhoods and user_neighborhood in sfv_neighborhoods:
+        if provider_neighborhood in SFV_NEIGHBORHOODS and user_neighborhood in SFV_NEIGHBORHOODS:
             return 0.7
 
         # Adjacent to SFV
-        sfv_adjacent = {'burbank', 'glendale'}
-        if (provider_neighborhood in sfv_adjacent and user_neighborhood in sfv_neighborhoods) or \
-           (provider_neighborhood in sfv_neighborhoods and user_neighborhood in sfv_adjacent):
+        if (provider_neighborhood in SFV_ADJACENT and user_neighborhood in SFV_NEIGHBORHOODS) or \
+           (provider_neighborhood in SFV_NEIGHBORHOODS and user_neighborhood in SFV_ADJACENT):
             return 0.5
 
         # Default: unknown proximity
@@ -287,26 +295,66 @@ class LocationIntelligence:
 
     def _transit_accessibility_bonus(self, provider_location: Dict) -> float:
         """Bonus for metro/transit proximity"""
-        # Metro Red Line neighborhoods (North Hollywood, Universal City, Hollywood)
-        red_line_neighborhoods = {
-            'north hollywood', 'universal city', 'hollywood',
-            'downtown', 'union station'
-        }
-
-        # Metro Orange Line (Van Nuys, Sherman Oaks, etc.)
-        orange_line_neighborhoods = {
-            'van nuys', 'sherman oaks', 'reseda', 'canoga park',
-            'woodland hills', 'north hollywood'
-        }
-
         neighborhood = provider_location.get('neighborhood') or ''
         neighborhood_lower = neighborhood.lower() if isinstance(neighborhood, str) else ''
 
-        if neighborhood_lower in red_line_neighborhoods or neighborhood_lower in orange_line_neighborhoods:
+        if neighborhood_lower in TRANSIT_NEIGHBORHOODS:
             return 0.05  # 5% bonus for metro access
 
         return 0.0
 
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        radius: Optional[float] = None,
+        kinds: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        providers: Optional[List] = None,
+    ) -> List[Dict]:
+        """
+        Closest geolocated resources across the curated providers, Virgil St
+        treatment centers and sober-living listings, served from the spatial grid.
+
+        ``radius`` is in miles; ``kinds`` filters by service type/subtype (e.g. ["detox"]);
+        ``sources`` restricts the source tables. ``providers`` is the KnowledgeLoader
+        list the caller resolves ``knowledge`` ids against.
+        """
+        from .spatial_index import get_spatial_index
+
+        index = get_spatial_index(providers=providers)
+        results = []
+        for point, distance in index.nearest(latitude, longitude, k=k, radius=radius, kinds=kinds, sources=sources):
+            results.append({
+                "source": point.source,
+                "id": point.key,
+                "name": point.name,
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "distance_miles": round(distance, 2),
+                "approximate_location": not point.precise,
+                **point.payload,
+            })
+        return results
+
+    def nearest_to_context(
+        self,
+        user_context: LocationContext,
+        k: int = 5,
+        radius: Optional[float] = None,
+        kinds: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        providers: Optional[List] = None,
+    ) -> List[Dict]:
+        """``nearest`` for a LocationContext (coordinates, or neighborhood/city centroid)"""
+        coords = self._get_user_coordinates(user_context)
+        if not coords:
+            return []
+        return self.nearest(
+            coords[0], coords[1], k=k, radius=radius, kinds=kinds, sources=sources, providers=providers
+        )
+
     def extract_location_from_query(self, query: str) -> LocationContext:
         """Extract location context from user query"""
         query_lower = query.lower()
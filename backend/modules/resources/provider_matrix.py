@@ -0,0 +1,350 @@
+"""
+Provider Matrix
+Columnar NumPy view of the curated provider corpus for vectorized retrieval scoring.
+
+The corpus is compiled once per KnowledgeLoader load into arrays:
+coordinates, service-type codes, subtype / specialization / service / insurance
+bitmasks, and the query-independent quality and aggregator columns. A query then
+computes the location, service-match, quality and eligibility scores for every
+candidate as array operations and selects the top-k with ``argpartition``.
+
+Scores are the same as the per-provider scorers in LocationIntelligence,
+ServiceMatcher, QualityScorer and ResourceRetrievalEngine._score_eligibility;
+those remain the reference implementation (and the fallback when
+CMSX_RESOURCE_VECTOR_SCORING=0).
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .knowledge_loader import Provider
+from .location_intelligence import (
+    SERVICE_URGENCY_WEIGHTS,
+    SFV_ADJACENT,
+    SFV_NEIGHBORHOODS,
+    TRANSIT_NEIGHBORHOODS,
+    LocationContext,
+    LocationIntelligence,
+)
+from .quality_scorer import QualityScorer
+from .service_matcher import (
+    HOUSING_EMERGENCY_KEYWORDS,
+    MEDICAL_EMERGENCY_KEYWORDS,
+    SPECIALIZATION_KEYWORDS,
+    ServiceMatcher,
+)
+from backend.shared.env import env_bool
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3956
+# Component weights for the total retrieval score (location, service, quality, eligibility)
+SCORE_WEIGHTS = (0.35, 0.30, 0.25, 0.10)
+FREE_INCOME_REQUIREMENTS = {"free", "sliding_scale", "low_cost"}
+
+
+def vectorized_scoring_enabled() -> bool:
+    return env_bool("CMSX_RESOURCE_VECTOR_SCORING", True)
+
+
+def _lower(value) -> str:
+    return value.lower() if isinstance(value, str) else ""
+
+
+class _Vocabulary:
+    """String -> bit position, packed into rows of uint64 words."""
+
+    def __init__(self, rows: Sequence[Iterable[str]]):
+        self.bits: Dict[str, int] = {}
+        for row in rows:
+            for value in row:
+                self.bits.setdefault(value, len(self.bits))
+        self.words = max(1, (len(self.bits) + 63) // 64)
+        self.masks = np.zeros((len(rows), self.words), dtype=np.uint64)
+        self.counts = np.zeros(len(rows), dtype=np.int32)
+        for i, row in enumerate(rows):
+            row = list(row)
+            self.counts[i] = len(row)
+            for value in row:
+                bit = self.bits[value]
+                self.masks[i, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    def mask(self, values: Iterable[str]) -> np.ndarray:
+        query = np.zeros(self.words, dtype=np.uint64)
+        for value in values:
+            bit = self.bits.get(value)
+            if bit is not None:
+                query[bit // 64] |= np.uint64(1 << (bit % 64))
+        return query
+
+    def intersects(self, values: Iterable[str]) -> np.ndarray:
+        return (self.masks & self.mask(values)).any(axis=1)
+
+
+def _codes(values: Sequence[str]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Integer code per value; empty strings get -1 so they never compare equal."""
+    vocabulary: Dict[str, int] = {}
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if value:
+            codes[i] = vocabulary.setdefault(value, len(vocabulary))
+    return codes, vocabulary
+
+
+class ProviderMatrix:
+    """Compiled provider corpus; build with :meth:`compile`."""
+
+    def __init__(
+        self,
+        providers: List[Provider],
+        location_intelligence: LocationIntelligence,
+        service_matcher: ServiceMatcher,
+        quality_scorer: QualityScorer,
+    ):
+        self.providers = providers
+        self.location_intelligence = location_intelligence
+        self.service_matcher = service_matcher
+        self.quality_revision = quality_scorer.revision
+        self.size = len(providers)
+        n = self.size
+
+        # ── Location ────────────────────────────────────────────────────────
+        rows = [provider.to_dict() for provider in providers]
+        self.has_location = np.array(
+            [location_intelligence._has_location_data(row) for row in rows], dtype=bool
+        )
+        latitudes = np.full(n, np.nan)
+        longitudes = np.full(n, np.nan)
+        for i, row in enumerate(rows):
+            coords = location_intelligence._get_coordinates(row)
+            if coords:
+                latitudes[i], longitudes[i] = coords
+        self.has_coords = ~np.isnan(latitudes)
+        self.lat_rad = np.radians(latitudes)
+        self.lon_rad = np.radians(longitudes)
+
+        neighborhoods = [_lower(row.get("neighborhood")) for row in rows]
+        cities = [_lower(row.get("city")) for row in rows]
+        self.neighborhood_codes, self.neighborhood_vocab = _codes(neighborhoods)
+        self.city_codes, self.city_vocab = _codes(cities)
+        self.in_sfv = np.array([name in SFV_NEIGHBORHOODS for name in neighborhoods], dtype=bool)
+        self.sfv_adjacent = np.array([name in SFV_ADJACENT for name in neighborhoods], dtype=bool)
+        self.transit_bonus = np.where(
+            np.array([name in TRANSIT_NEIGHBORHOODS for name in neighborhoods], dtype=bool), 0.05, 0.0
+        )
+
+        # ── Service match ───────────────────────────────────────────────────
+        self.service_type_codes, self.service_type_vocab = _codes([p.service_type or "" for p in providers])
+        self.subtypes = _Vocabulary([p.service_subtypes or [] for p in providers])
+        self.specializations = _Vocabulary([p.specializations or [] for p in providers])
+        self.services = _Vocabulary([[s.lower() for s in p.services_offered or []] for p in providers])
+
+        # ── Quality (query independent) ─────────────────────────────────────
+        self.quality = np.array([quality_scorer.score_quality(row) for row in rows], dtype=float)
+        self.is_aggregator = np.array([quality_scorer.is_aggregator(row) for row in rows], dtype=bool)
+
+        # ── Eligibility ─────────────────────────────────────────────────────
+        self.insurance = _Vocabulary([p.insurance_accepted or [] for p in providers])
+        self.income_bonus = np.where(
+            np.array([p.income_requirement in FREE_INCOME_REQUIREMENTS for p in providers], dtype=bool), 0.2, 0.0
+        )
+
+    @classmethod
+    def compile(
+        cls,
+        providers: List[Provider],
+        location_intelligence: LocationIntelligence,
+        service_matcher: ServiceMatcher,
+        quality_scorer: QualityScorer,
+    ) -> "ProviderMatrix":
+        matrix = cls(providers, location_intelligence, service_matcher, quality_scorer)
+        logger.info(f"Compiled provider matrix for {matrix.size} providers")
+        return matrix
+
+    def is_current(self, providers: List[Provider], quality_scorer: QualityScorer) -> bool:
+        """False once the loader's corpus or the trust/avoid lists have changed."""
+        return (
+            providers is self.providers
+            and len(providers) == self.size
+            and quality_scorer.revision == self.quality_revision
+        )
+
+    # ── Candidates ──────────────────────────────────────────────────────────
+
+    def candidate_indices(self, service_type: Optional[str]) -> np.ndarray:
+        """Provider rows for the service type, without aggregators unless only aggregators match."""
+        if service_type:
+            code = self.service_type_vocab.get(service_type)
+            if code is None:
+                return np.empty(0, dtype=np.intp)
+            in_type = self.service_type_codes == code
+        else:
+            in_type = np.ones(self.size, dtype=bool)
+
+        direct = in_type & ~self.is_aggregator
+        if direct.any():
+            return np.nonzero(direct)[0]
+        if in_type.any():
+            logger.warning("No direct providers found, including aggregators as fallback")
+        return np.nonzero(in_type)[0]
+
+    # ── Component scores ────────────────────────────────────────────────────
+
+    def location_scores(self, context: Optional[LocationContext]) -> np.ndarray:
+        li = self.location_intelligence
+        scores = np.full(self.size, 0.5)
+        if context is None or not li._has_user_location(context):
+            return scores
+
+        user_neighborhood = _lower(context.neighborhood)
+        user_city = _lower(context.city)
+        same_neighborhood = self.neighborhood_codes == self.neighborhood_vocab.get(user_neighborhood, -2)
+        same_city = self.city_codes == self.city_vocab.get(user_city, -2)
+
+        user_in_sfv = user_neighborhood in SFV_NEIGHBORHOODS
+        user_sfv_adjacent = user_neighborhood in SFV_ADJACENT
+        by_neighborhood = np.select(
+            [
+                same_neighborhood,
+                same_city,
+                self.in_sfv & user_in_sfv,
+                (self.sfv_adjacent & user_in_sfv) | (self.in_sfv & user_sfv_adjacent),
+            ],
+            [0.9, 0.6, 0.7, 0.5],
+            default=0.3,
+        )
+
+        user_coords = li._get_user_coordinates(context)
+        if not user_coords:
+            return np.where(self.has_location, by_neighborhood, scores)
+
+        user_lat, user_lon = np.radians(user_coords[0]), np.radians(user_coords[1])
+        dlat = user_lat - self.lat_rad
+        dlon = user_lon - self.lon_rad
+        with np.errstate(invalid="ignore"):
+            a = np.sin(dlat / 2) ** 2 + np.cos(self.lat_rad) * np.cos(user_lat) * np.sin(dlon / 2) ** 2
+            distance = 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS_MILES
+
+        urgency_weight = SERVICE_URGENCY_WEIGHTS.get(context.service_urgency, 1.0)
+        base = np.exp(-(distance / urgency_weight) / 10.0)
+        neighborhood_bonus = np.where(same_neighborhood, 0.1, 0.0)
+        by_distance = np.minimum(1.0, base + neighborhood_bonus + self.transit_bonus)
+
+        located = np.where(self.has_coords, by_distance, by_neighborhood)
+        return np.where(self.has_location, located, scores)
+
+    def service_scores(self, service_type: Optional[str], subtypes: List[str], query_text: str) -> np.ndarray:
+        code = self.service_type_vocab.get(service_type) if service_type else None
+        if code is None:
+            return np.zeros(self.size)
+
+        query = query_text.lower()
+        has_subtypes = self.subtypes.counts > 0
+        overlap = self.subtypes.intersects(subtypes)
+
+        if subtypes:
+            exact = np.where(has_subtypes, np.where(overlap, 1.0, 0.0), 0.5)
+        else:
+            exact = np.full(self.size, 0.5)
+
+        hierarchy = self._hierarchy_scores(service_type, subtypes, overlap, query)
+
+        matched_specs = [
+            spec for spec, keywords in SPECIALIZATION_KEYWORDS.items() if any(kw in query for kw in keywords)
+        ]
+        specialization = np.where(
+            (self.specializations.counts > 0) & self.specializations.intersects(matched_specs), 1.0, 0.5
+        )
+
+        offered = [service for service in self.services.bits if service in query]
+        offering = np.where((self.services.counts > 0) & self.services.intersects(offered), 1.0, 0.5)
+
+        combined = exact * 0.4 + hierarchy * 0.3 + specialization * 0.2 + offering * 0.1
+        return np.where(self.service_type_codes == code, combined, 0.0)
+
+    def _hierarchy_scores(
+        self, service_type: str, subtypes: List[str], overlap: np.ndarray, query: str
+    ) -> np.ndarray:
+        """Array form of ServiceMatcher._score_hierarchy_match."""
+        if service_type == "treatment":
+            level = self.service_matcher.requested_treatment_level(subtypes, query)
+            if not level:
+                return np.full(self.size, 0.5)
+            next_steps = self.service_matcher.treatment_continuum[level].get("next_steps", [])
+            return np.select(
+                [self.subtypes.intersects([level]), self.subtypes.intersects(next_steps)],
+                [1.0, 0.7],
+                default=0.3,
+            )
+
+        if service_type == "medical":
+            if any(kw in query for kw in MEDICAL_EMERGENCY_KEYWORDS):
+                return np.where(self.subtypes.intersects(["urgent_care", "emergency_room"]), 1.0, 0.4)
+            return np.where(overlap, 1.0, 0.5)
+
+        if service_type == "housing":
+            if any(kw in query for kw in HOUSING_EMERGENCY_KEYWORDS):
+                return np.select(
+                    [self.subtypes.intersects(["emergency_shelter"]), self.subtypes.intersects(["bridge_housing"])],
+                    [1.0, 0.7],
+                    default=0.4,
+                )
+            return np.where(overlap, 1.0, 0.6)
+
+        return np.where(overlap, 0.8, 0.5)
+
+    def eligibility_scores(self, insurance: Optional[str]) -> np.ndarray:
+        scores = np.full(self.size, 0.5)
+        if insurance:
+            adjustment = np.select(
+                [
+                    self.insurance.intersects([insurance]),
+                    self.insurance.intersects(["all", "any"]),
+                    self.insurance.counts == 0,
+                ],
+                [0.3, 0.2, 0.0],
+                default=-0.2,
+            )
+            scores = scores + adjustment
+        return np.clip(scores + self.income_bonus, 0.0, 1.0)
+
+    # ── Ranking ─────────────────────────────────────────────────────────────
+
+    def score(self, resource_query) -> Dict[str, np.ndarray]:
+        """All four component scores and the weighted total for every provider."""
+        location = self.location_scores(resource_query.location_context)
+        service = self.service_scores(
+            resource_query.service_type, resource_query.service_subtypes or [], resource_query.query_text
+        )
+        eligibility = self.eligibility_scores(resource_query.insurance)
+        w_location, w_service, w_quality, w_eligibility = SCORE_WEIGHTS
+        total = location * w_location + service * w_service + self.quality * w_quality + eligibility * w_eligibility
+        return {
+            "total": total,
+            "location": location,
+            "service": service,
+            "quality": self.quality,
+            "eligibility": eligibility,
+        }
+
+    def top_k(
+        self, candidates: np.ndarray, scores: Dict[str, np.ndarray], limit: int, min_score: float
+    ) -> Tuple[np.ndarray, int]:
+        """Best ``limit`` candidate rows by total score (ties keep corpus order), plus the count above min_score."""
+        totals = scores["total"][candidates]
+        keep = totals >= min_score
+        rows, totals = candidates[keep], totals[keep]
+        if limit <= 0 or not len(rows):
+            return np.empty(0, dtype=np.intp), int(len(rows))
+
+        if len(rows) > limit:
+            partition = np.argpartition(-totals, limit - 1)[:limit]
+            # Widen to every row tied with the cutoff so the stable order below matches a full sort.
+            selected = np.nonzero(totals >= totals[partition].min())[0]
+        else:
+            selected = np.arange(len(rows))
+
+        order = selected[np.lexsort((rows[selected], -totals[selected]))][:limit]
+        return rows[order], int(len(rows))
@@ -147,6 +147,8 @@ class QualityScorer:
         self.trusted_providers = TRUSTED_PROVIDERS
         self.avoid_providers = AVOID_PROVIDERS
         self.aggregator_domains = AGGREGATOR_DOMAINS
+        # Bumped whenever the trust/avoid lists change so compiled scores can be rebuilt
+        self.revision = 0
 
     def score_quality(self, provider: Dict) -> float:
         """
@@ -301,6 +303,7 @@ class QualityScorer:
             "keywords": [name.lower()],
             "notes": notes,
         }
+        self.revision += 1
         logger.info(f"Added trusted provider: {name} (boost: {boost})")
 
     def add_avoid_provider(self, name: str, penalty: float, reason: str = ""):
@@ -311,6 +314,7 @@ class QualityScorer:
             "keywords": [name.lower()],
             "reason": reason,
         }
+        self.revision += 1
         logger.info(f"Added avoid provider: {name} (penalty: {penalty})")
 
 
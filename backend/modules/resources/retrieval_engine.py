@@ -4,6 +4,7 @@ Main orchestrator for full-spectrum social services resource retrieval.
 """
 
 import logging
+import re
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -11,9 +12,18 @@ from .knowledge_loader import KnowledgeLoader, Provider, get_knowledge_loader
 from .location_intelligence import LocationIntelligence, LocationContext, get_location_intelligence
 from .service_matcher import ServiceMatcher, get_service_matcher
 from .quality_scorer import QualityScorer, get_quality_scorer
+from .provider_matrix import ProviderMatrix, SCORE_WEIGHTS, vectorized_scoring_enabled
 
 logger = logging.getLogger(__name__)
 
+# Only return providers with reasonable match
+MIN_RETRIEVAL_SCORE = 0.2
+
+# "closest detox near Van Nuys": candidates come nearest-first from the spatial
+# index instead of scoring every provider of the service type.
+PROXIMITY_QUERY_RE = re.compile(r"\b(closest|nearest|nearby|near|close to)\b")
+NEARBY_CANDIDATES_PER_RESULT = 5
+
 
 @dataclass
 class ResourceQuery:
@@ -68,6 +78,7 @@ class ResourceRetrievalEngine:
         self.location_intelligence = get_location_intelligence()
         self.service_matcher = get_service_matcher()
         self.quality_scorer = get_quality_scorer()
+        self._provider_matrix: Optional[ProviderMatrix] = None
 
         logger.info("Resource Retrieval Engine initialized")
 
@@ -97,7 +108,11 @@ class ResourceRetrievalEngine:
         resource_query = self._build_query(query, client_context, service_type)
 
         # Get candidate providers
-        candidates = self._get_candidates(resource_query)
+        candidates = self._get_nearby_candidates(resource_query, limit)
+        if candidates is None:
+            if vectorized_scoring_enabled():
+                return self._search_vectorized(resource_query, limit)
+            candidates = self._get_candidates(resource_query)
 
         if not candidates:
             logger.warning(f"No candidates found for query: {query}")
@@ -107,8 +122,7 @@ class ResourceRetrievalEngine:
         scored_providers = self._score_providers(candidates, resource_query)
 
         # Filter by minimum score threshold
-        min_score = 0.2  # Only return providers with reasonable match
-        scored_providers = [sp for sp in scored_providers if sp.total_score >= min_score]
+        scored_providers = [sp for sp in scored_providers if sp.total_score >= MIN_RETRIEVAL_SCORE]
 
         # Sort by total score
         scored_providers.sort(key=lambda sp: sp.total_score, reverse=True)
@@ -120,6 +134,45 @@ class ResourceRetrievalEngine:
 
         return results
 
+    def _search_vectorized(self, resource_query: ResourceQuery, limit: int) -> List[ScoredProvider]:
+        """Score every candidate with array operations and materialize only the top results"""
+        matrix = self.get_provider_matrix()
+        candidates = matrix.candidate_indices(resource_query.service_type)
+
+        if not len(candidates):
+            logger.warning(f"No candidates found for query: {resource_query.query_text}")
+            return []
+
+        scores = matrix.score(resource_query)
+        rows, scored_count = matrix.top_k(candidates, scores, limit, MIN_RETRIEVAL_SCORE)
+
+        results = [
+            ScoredProvider(
+                provider=matrix.providers[row],
+                total_score=float(scores["total"][row]),
+                location_score=float(scores["location"][row]),
+                service_score=float(scores["service"][row]),
+                quality_score=float(scores["quality"][row]),
+                eligibility_score=float(scores["eligibility"][row]),
+            )
+            for row in rows
+        ]
+
+        logger.info(f"Returning {len(results)} providers (from {scored_count} scored)")
+
+        return results
+
+    def get_provider_matrix(self) -> ProviderMatrix:
+        """Compiled provider corpus, rebuilt when the loader or trust lists change"""
+        providers = self.knowledge_loader.providers
+        matrix = self._provider_matrix
+        if matrix is None or not matrix.is_current(providers, self.quality_scorer):
+            matrix = ProviderMatrix.compile(
+                providers, self.location_intelligence, self.service_matcher, self.quality_scorer
+            )
+            self._provider_matrix = matrix
+        return matrix
+
     def _build_query(
         self,
         query_text: str,
@@ -179,7 +232,33 @@ class ResourceRetrievalEngine:
         else:
             candidates = self.knowledge_loader.providers
 
-        # Filter aggregators (unless no direct providers available)
+        return self._without_aggregators(candidates)
+
+    def _get_nearby_candidates(self, resource_query: ResourceQuery, limit: int) -> Optional[List[Provider]]:
+        """Closest providers of the requested kind for a proximity query, or None to use the full set"""
+        if not PROXIMITY_QUERY_RE.search(resource_query.query_text.lower()):
+            return None
+
+        providers = self.knowledge_loader.providers
+        kinds = resource_query.service_subtypes or (
+            [resource_query.service_type] if resource_query.service_type else None
+        )
+        nearby = self.location_intelligence.nearest_to_context(
+            resource_query.location_context,
+            k=limit * NEARBY_CANDIDATES_PER_RESULT,
+            kinds=kinds,
+            sources=["knowledge"],
+            providers=providers,
+        )
+        candidates = [providers[int(row["id"])] for row in nearby]
+        if not candidates:
+            return None
+
+        logger.info(f"Scoring {len(candidates)} nearby candidates of {len(providers)} providers")
+        return self._without_aggregators(candidates)
+
+    def _without_aggregators(self, candidates: List[Provider]) -> List[Provider]:
+        """Drop aggregators unless only aggregators match"""
         non_aggregator_candidates = [
             p for p in candidates
             if not self.quality_scorer.is_aggregator(p.to_dict())
@@ -225,12 +304,14 @@ class ResourceRetrievalEngine:
             # Eligibility score
             eligibility_score = self._score_eligibility(provider_dict, resource_query)
 
-            # Calculate weighted total score
+            # Calculate weighted total score: location is most important, then
+            # service match, quality/trust, and an eligibility bonus
+            w_location, w_service, w_quality, w_eligibility = SCORE_WEIGHTS
             total_score = (
-                location_score * 0.35 +      # Location is most important
-                service_score * 0.30 +       # Service match second
-                quality_score * 0.25 +       # Quality/trust third
-                eligibility_score * 0.10     # Eligibility bonus
+                location_score * w_location +
+                service_score * w_service +
+                quality_score * w_quality +
+                eligibility_score * w_eligibility
             )
 
             scored.append(ScoredProvider(
@@ -117,6 +117,22 @@ FOOD_SERVICE_TYPES = {
     },
 }
 
+# Population specializations and the query phrases that request them
+SPECIALIZATION_KEYWORDS = {
+    'dual_diagnosis': ['dual diagnosis', 'co-occurring', 'mental health'],
+    'lgbtq': ['lgbtq', 'lgbt', 'gay', 'lesbian', 'transgender', 'queer'],
+    'veterans': ['veteran', 'military', 'va'],
+    'women': ['women', 'female'],
+    'men': ['men', 'male'],
+    'youth': ['youth', 'adolescent', 'teen', 'young adult'],
+    'seniors': ['senior', 'elder', 'older adult'],
+    'families': ['family', 'children', 'kids'],
+    'pregnant': ['pregnant', 'prenatal', 'postpartum'],
+}
+
+MEDICAL_EMERGENCY_KEYWORDS = ['emergency', 'urgent', 'now', 'today', 'asap']
+HOUSING_EMERGENCY_KEYWORDS = ['tonight', 'now', 'street', 'homeless', 'emergency']
+
 
 class ServiceMatcher:
     """Match and rank providers by service type and specialization"""
@@ -226,19 +242,7 @@ class ServiceMatcher:
     ) -> float:
         """Score treatment providers by placement continuum"""
 
-        # Identify what's being requested
-        requested_level = None
-        for subtype in requested_subtypes:
-            if subtype in self.treatment_continuum:
-                requested_level = subtype
-                break
-
-        # If no specific level requested, infer from query
-        if not requested_level:
-            for level, config in self.treatment_continuum.items():
-                if any(kw in query for kw in config['keywords']):
-                    requested_level = level
-                    break
+        requested_level = self.requested_treatment_level(requested_subtypes, query)
 
         if not requested_level:
             return 0.5  # Can't determine level
@@ -255,6 +259,18 @@ class ServiceMatcher:
         # Provider offers different level
         return 0.3
 
+    def requested_treatment_level(self, requested_subtypes: List[str], query: str) -> Optional[str]:
+        """Continuum level being asked for: an explicit subtype first, else inferred from the query"""
+        for subtype in requested_subtypes:
+            if subtype in self.treatment_continuum:
+                return subtype
+
+        for level, config in self.treatment_continuum.items():
+            if any(kw in query for kw in config['keywords']):
+                return level
+
+        return None
+
     def _score_medical_priority(
         self,
         requested_subtypes: List[str],
@@ -264,8 +280,7 @@ class ServiceMatcher:
         """Score medical providers by priority level"""
 
         # Check for emergency keywords
-        emergency_keywords = ['emergency', 'urgent', 'now', 'today', 'asap']
-        is_emergency = any(kw in query for kw in emergency_keywords)
+        is_emergency = any(kw in query for kw in MEDICAL_EMERGENCY_KEYWORDS)
 
         if is_emergency:
             # Urgent care or ER is best for emergencies
@@ -288,8 +303,7 @@ class ServiceMatcher:
         """Score housing providers by continuum"""
 
         # Emergency housing is highest priority
-        emergency_keywords = ['tonight', 'now', 'street', 'homeless', 'emergency']
-        is_emergency = any(kw in query for kw in emergency_keywords)
+        is_emergency = any(kw in query for kw in HOUSING_EMERGENCY_KEYWORDS)
 
         if is_emergency:
             if 'emergency_shelter' in provider_subtypes:
@@ -311,20 +325,8 @@ class ServiceMatcher:
             return 0.5  # Neutral if no specializations
 
         # Check for specialization keywords in query
-        specialization_keywords = {
-            'dual_diagnosis': ['dual diagnosis', 'co-occurring', 'mental health'],
-            'lgbtq': ['lgbtq', 'lgbt', 'gay', 'lesbian', 'transgender', 'queer'],
-            'veterans': ['veteran', 'military', 'va'],
-            'women': ['women', 'female'],
-            'men': ['men', 'male'],
-            'youth': ['youth', 'adolescent', 'teen', 'young adult'],
-            'seniors': ['senior', 'elder', 'older adult'],
-            'families': ['family', 'children', 'kids'],
-            'pregnant': ['pregnant', 'prenatal', 'postpartum'],
-        }
-
         for spec in specializations:
-            keywords = specialization_keywords.get(spec, [])
+            keywords = SPECIALIZATION_KEYWORDS.get(spec, [])
             if any(kw in query for kw in keywords):
                 return 1.0  # Perfect match
 
@@ -0,0 +1,349 @@
+"""
+Spatial Index
+Grid-bucketed nearest-provider lookup over every geolocated resource source.
+
+Points come from the KnowledgeLoader providers, the Virgil St
+``treatment_centers`` table and the sober-living directory listings. Rows
+without stored coordinates are placed at their neighborhood / city centroid
+(``LA_NEIGHBORHOODS``) once, at build time. Points are bucketed into a fixed
+lat/lon grid, and ``nearest`` searches outward ring by ring from the query
+cell. It stops as soon as the next ring cannot hold anything closer than the
+current k-th result, so a query only scores the handful of cells around it
+instead of the whole provider set.
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.shared.env import env_int
+from .location_intelligence import LA_NEIGHBORHOODS
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3956
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * math.pi / 180
+# ~3.5 miles north-south per cell in LA
+DEFAULT_CELL_DEGREES = 0.05
+
+
+SPATIAL_INDEX_TTL_SECONDS = env_int("CMSX_SPATIAL_INDEX_TTL_S", 600)
+
+
+@dataclass
+class SpatialPoint:
+    """One geolocated resource"""
+    source: str  # knowledge, treatment_centers, sober_living
+    key: str
+    name: str
+    latitude: float
+    longitude: float
+    kinds: FrozenSet[str] = field(default_factory=frozenset)
+    precise: bool = True  # False when placed at a neighborhood/city centroid
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+def centroid_for(*place_names: Optional[str]) -> Optional[Tuple[float, float]]:
+    """First known LA neighborhood/city centroid among the given names"""
+    for name in place_names:
+        if name and isinstance(name, str):
+            coords = LA_NEIGHBORHOODS.get(name.strip().lower())
+            if coords:
+                return coords
+    return None
+
+
+def _kinds(*values: Any) -> FrozenSet[str]:
+    kinds = set()
+    for value in values:
+        for item in value if isinstance(value, (list, tuple, set, frozenset)) else [value]:
+            if item and isinstance(item, str):
+                kinds.add(item.strip().lower().replace(" ", "_"))
+    return frozenset(kinds)
+
+
+class SpatialGridIndex:
+    """Immutable grid of SpatialPoints; build once and share across queries."""
+
+    def __init__(self, points: Iterable[SpatialPoint], cell_degrees: float = DEFAULT_CELL_DEGREES):
+        self.points: List[SpatialPoint] = list(points)
+        self.cell_degrees = cell_degrees
+        self.built_at = time.time()
+        self.lat_rad = np.radians([p.latitude for p in self.points]) if self.points else np.empty(0)
+        self.lon_rad = np.radians([p.longitude for p in self.points]) if self.points else np.empty(0)
+
+        buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, point in enumerate(self.points):
+            buckets[self._cell(point.latitude, point.longitude)].append(i)
+        self.buckets: Dict[Tuple[int, int], np.ndarray] = {
+            cell: np.array(rows, dtype=np.intp) for cell, rows in buckets.items()
+        }
+        self.max_abs_lat = max((abs(p.latitude) for p in self.points), default=0.0)
+        cells = list(self.buckets) or [(0, 0)]
+        self._cell_bounds = (
+            min(cy for cy, _ in cells), max(cy for cy, _ in cells),
+            min(cx for _, cx in cells), max(cx for _, cx in cells),
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def _ring(self, center: Tuple[int, int], radius: int) -> Iterable[Tuple[int, int]]:
+        cy, cx = center
+        if radius == 0:
+            yield center
+            return
+        for dx in range(-radius, radius + 1):
+            yield (cy - radius, cx + dx)
+            yield (cy + radius, cx + dx)
+        for dy in range(-radius + 1, radius):
+            yield (cy + dy, cx - radius)
+            yield (cy + dy, cx + radius)
+
+    def _ring_min_miles(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance from the query point to anything in ring ``radius``."""
+        if radius <= 1:
+            return 0.0
+        # East-west cells shrink with latitude; use the widest latitude the grid can reach.
+        widest = min(89.0, max(abs(lat), self.max_abs_lat) + radius * self.cell_degrees)
+        return (radius - 1) * self.cell_degrees * MILES_PER_DEGREE * math.cos(math.radians(widest))
+
+    def _distances(self, rows: np.ndarray, lat: float, lon: float) -> np.ndarray:
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        dlat = self.lat_rad[rows] - lat1
+        dlon = self.lon_rad[rows] - lon1
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(self.lat_rad[rows]) * np.sin(dlon / 2) ** 2
+        return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_MILES
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        radius: Optional[float] = None,
+        kinds: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[SpatialPoint, float]]:
+        """
+        Up to ``k`` points closest to (lat, lon), nearest first, as (point, miles).
+
+        ``radius`` caps the distance in miles; ``kinds`` keeps points tagged with any
+        of the given service types/subtypes; ``sources`` restricts the source tables.
+        """
+        if k <= 0 or not self.points:
+            return []
+
+        wanted_kinds = _kinds(list(kinds)) if kinds else None
+        wanted_sources = set(sources) if sources else None
+        center = self._cell(lat, lon)
+        min_y, max_y, min_x, max_x = self._cell_bounds
+        max_ring = max(abs(center[0] - min_y), abs(center[0] - max_y), abs(center[1] - min_x), abs(center[1] - max_x))
+
+        found_rows: List[np.ndarray] = []
+        found_dist: List[np.ndarray] = []
+        best = np.empty(0)
+        for ring in range(max_ring + 1):
+            bound = self._ring_min_miles(lat, ring)
+            if radius is not None and bound > radius:
+                break
+            if len(best) >= k and bound > best[k - 1]:
+                break
+
+            rows = [self.buckets[cell] for cell in self._ring(center, ring) if cell in self.buckets]
+            if not rows:
+                continue
+            rows = np.concatenate(rows)
+            if wanted_kinds is not None or wanted_sources is not None:
+                rows = rows[[
+                    (wanted_kinds is None or not wanted_kinds.isdisjoint(self.points[row].kinds))
+                    and (wanted_sources is None or self.points[row].source in wanted_sources)
+                    for row in rows
+                ]] if len(rows) else rows
+            if not len(rows):
+                continue
+
+            distances = self._distances(rows, lat, lon)
+            if radius is not None:
+                inside = distances <= radius
+                rows, distances = rows[inside], distances[inside]
+            found_rows.append(rows)
+            found_dist.append(distances)
+            best = np.sort(np.concatenate(found_dist))
+
+        if not found_rows:
+            return []
+        rows = np.concatenate(found_rows)
+        distances = np.concatenate(found_dist)
+        if len(rows) > k:
+            keep = np.argpartition(distances, k - 1)[:k]
+            rows, distances = rows[keep], distances[keep]
+        order = np.lexsort((rows, distances))
+        return [(self.points[rows[i]], float(distances[i])) for i in order]
+
+
+# ── Source loaders ──────────────────────────────────────────────────────────
+
+def points_from_providers(providers: Iterable[Any]) -> List[SpatialPoint]:
+    points = []
+    for i, provider in enumerate(providers):
+        precise = bool(provider.latitude and provider.longitude)
+        coords = (provider.latitude, provider.longitude) if precise else centroid_for(provider.neighborhood, provider.city)
+        if not coords:
+            continue
+        points.append(SpatialPoint(
+            source="knowledge",
+            key=str(i),
+            name=provider.name,
+            latitude=float(coords[0]),
+            longitude=float(coords[1]),
+            kinds=_kinds(provider.service_type, provider.service_subtypes),
+            precise=precise,
+            payload={
+                "address": provider.address,
+                "city": provider.city,
+                "neighborhood": provider.neighborhood,
+                "phone": provider.phone,
+                "website": provider.website,
+            },
+        ))
+    return points
+
+
+def _read_rows(db_path: Path, sql: str) -> List[sqlite3.Row]:
+    if not Path(db_path).exists():
+        return []
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return conn.execute(sql).fetchall()
+    except sqlite3.OperationalError as exc:
+        logger.warning(f"Spatial index skipped {db_path}: {exc}")
+        return []
+    finally:
+        conn.close()
+
+
+def points_from_treatment_centers(db_path: Path) -> List[SpatialPoint]:
+    rows = _read_rows(
+        db_path,
+        "SELECT id, name, type, address, city, zipCode, phone, latitude, longitude "
+        "FROM treatment_centers WHERE isPublished = 1",
+    )
+    points = []
+    for row in rows:
+        precise = bool(row["latitude"] and row["longitude"])
+        coords = (row["latitude"], row["longitude"]) if precise else centroid_for(row["city"])
+        if not coords:
+            continue
+        points.append(SpatialPoint(
+            source="treatment_centers",
+            key=str(row["id"]),
+            name=row["name"],
+            latitude=float(coords[0]),
+            longitude=float(coords[1]),
+            kinds=_kinds("treatment", row["type"]),
+            precise=precise,
+            payload={k: row[k] for k in ("type", "address", "city", "zipCode", "phone")},
+        ))
+    return points
+
+
+def points_from_sober_living(db_path: Path) -> List[SpatialPoint]:
+    rows = _read_rows(
+        db_path,
+        "SELECT listing_id, name, address, city, neighborhood, zip_code, phone, latitude, longitude, status "
+        "FROM sober_living_directory_listings WHERE status != 'archived'",
+    )
+    points = []
+    for row in rows:
+        precise = bool(row["latitude"] and row["longitude"])
+        coords = (row["latitude"], row["longitude"]) if precise else centroid_for(row["neighborhood"], row["city"])
+        if not coords:
+            continue
+        points.append(SpatialPoint(
+            source="sober_living",
+            key=row["listing_id"],
+            name=row["name"],
+            latitude=float(coords[0]),
+            longitude=float(coords[1]),
+            kinds=_kinds("housing", "sober_living"),
+            precise=precise,
+            payload={k: row[k] for k in ("address", "city", "zip_code", "phone", "status")},
+        ))
+    return points
+
+
+def build_spatial_index(
+    providers: Iterable[Any] = (),
+    virgil_db_path: Optional[Path] = None,
+    sober_living_db_path: Optional[Path] = None,
+    cell_degrees: float = DEFAULT_CELL_DEGREES,
+) -> SpatialGridIndex:
+    points = points_from_providers(providers)
+    if virgil_db_path:
+        points += points_from_treatment_centers(virgil_db_path)
+    if sober_living_db_path:
+        points += points_from_sober_living(sober_living_db_path)
+    index = SpatialGridIndex(points, cell_degrees=cell_degrees)
+    logger.info(f"Built spatial index with {len(index)} points in {len(index.buckets)} cells")
+    return index
+
+
+def default_source_paths() -> Tuple[Path, Path]:
+    """Virgil St and sober-living databases, resolved like their services do."""
+    from backend.shared import db_path as db_path_mod
+
+    virgil = Path(__file__).resolve().parents[3] / "databases" / "virgil_st_dev.db"
+    return virgil, Path(db_path_mod.DB_DIR) / "sober_living_directory.db"
+
+
+_spatial_index: Optional[SpatialGridIndex] = None
+_spatial_index_providers: Optional[Tuple[List[Any], int]] = None
+_spatial_index_lock = threading.Lock()
+
+
+def get_spatial_index(refresh: bool = False, providers: Optional[List[Any]] = None) -> SpatialGridIndex:
+    """Process-wide index over all sources, rebuilt after CMSX_SPATIAL_INDEX_TTL_S
+
+    ``providers`` is the caller's KnowledgeLoader list (the loader singleton's by
+    default); the index is also rebuilt when a caller passes a list other than
+    the one it was built from, or that list has grown, so a ``knowledge``
+    point's key is always its position in that list.
+    """
+    global _spatial_index, _spatial_index_providers
+
+    def is_current(index: Optional[SpatialGridIndex]) -> bool:
+        if index is None or refresh or time.time() - index.built_at >= SPATIAL_INDEX_TTL_SECONDS:
+            return False
+        if providers is None or _spatial_index_providers is None:
+            return True
+        corpus, size = _spatial_index_providers
+        return corpus is providers and size == len(providers)
+
+    index = _spatial_index
+    if is_current(index):
+        return index
+    with _spatial_index_lock:
+        index = _spatial_index
+        if not is_current(index):
+            corpus = providers
+            if corpus is None:
+                from .knowledge_loader import get_knowledge_loader
+
+                corpus = get_knowledge_loader().providers
+            virgil_path, sober_living_path = default_source_paths()
+            index = build_spatial_index(corpus, virgil_path, sober_living_path)
+            _spatial_index = index
+            _spatial_index_providers = (corpus, len(corpus))
+    return index
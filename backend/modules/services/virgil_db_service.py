@@ -11,21 +11,75 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import re
 
+from backend.modules.services.virgil_search_index import (
+    BM25_WEIGHTS,
+    FTS_TABLE,
+    INDEXED_SOURCES,
+    SOURCE_STRIDE,
+    build_match_expression,
+    ensure_search_index,
+)
+
 logger = logging.getLogger(__name__)
 
+# Category-first ordering for search_services: the first matching rule gives the
+# result's priority (lower sorts first); anything unmatched gets 5. A rule tests
+# the result 'source', or a substring of its lowercased 'service_type' /
+# 'description'.
+CATEGORY_PRIORITY_RULES: Dict[str, List[Tuple[int, str, str]]] = {
+    'substance-abuse': [(0, 'source', 'virgil_st_treatment'), (1, 'source', 'virgil_st_meetings')],
+    'support-groups': [(0, 'source', 'virgil_st_meetings'), (1, 'service_type', 'support group')],
+    'mental-health': [
+        (0, 'service_type', 'mental health'),
+        (0, 'description', 'psychi'),
+        (1, 'source', 'virgil_st_medical'),
+    ],
+    'housing': [
+        (0, 'service_type', 'housing'),
+        (0, 'service_type', 'shelter'),
+        (1, 'service_type', 'sober living'),
+    ],
+    'transportation': [(0, 'service_type', 'transportation')],
+    'dental-care': [(0, 'service_type', 'dental')],
+    'couples-counseling': [(0, 'service_type', 'couples counseling')],
+    'parenting-classes': [(0, 'service_type', 'parenting classes')],
+    'hygiene-services': [(0, 'service_type', 'hygiene')],
+}
+DEFAULT_CATEGORY_PRIORITY = 5
+
 class VirgilServiceDatabase:
     """Query service data from virgil_st_dev.db"""
 
+    _RESOURCE_COLUMNS = (
+        "id, name, type, description, address, phone, website, hours, "
+        "zipCode, latitude, longitude, isVerified"
+    )
+    _TREATMENT_COLUMNS = (
+        "id, name, type, description, address, city, zipCode, phone, website, "
+        "servesPopulation, acceptsMediCal, acceptsMedicare, acceptsPrivateInsurance, "
+        "servicesOffered, amenities, priceRange"
+    )
+    _MEDICAL_COLUMNS = (
+        "id, providerName, facilityName, address, city, zipCode, phone, "
+        "specialties, gender, languagesSpoken, networks"
+    )
+    _MEETING_COLUMNS = (
+        "id, name, type, dayOfWeek, time, duration, venueName, address, city, zipCode, "
+        "format, meetingMode, zoomId, description, notes"
+    )
+
     def __init__(self, db_path: str = None):
         _repo_db = Path(__file__).resolve().parents[3] / "databases" / "virgil_st_dev.db"
         self.db_path = db_path or str(_repo_db)
         self.connection = None
+        self._indexed_sources: Optional[List[str]] = None
 
     def connect(self):
         """Establish database connection"""
         try:
             self.connection = sqlite3.connect(self.db_path)
             self.connection.row_factory = sqlite3.Row
+            self._indexed_sources = None
             logger.info(f"Connected to Virgil St database: {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to connect to Virgil St database: {e}")
@@ -436,46 +490,16 @@ class VirgilServiceDatabase:
 
     def _score_result_for_category(self, result: Dict[str, Any], category: Optional[str]) -> Tuple[int, str]:
         normalized = self._normalize_category(category)
-        source = result.get('source', '')
-        service_type = (result.get('service_type') or '').lower()
-
-        if normalized == 'substance-abuse':
-            if source == 'virgil_st_treatment':
-                return (0, result.get('title', ''))
-            if source == 'virgil_st_meetings':
-                return (1, result.get('title', ''))
-        elif normalized == 'support-groups':
-            if source == 'virgil_st_meetings':
-                return (0, result.get('title', ''))
-            if 'support group' in service_type:
-                return (1, result.get('title', ''))
-        elif normalized == 'mental-health':
-            if 'mental health' in service_type or 'psychi' in result.get('description', '').lower():
-                return (0, result.get('title', ''))
-            if source == 'virgil_st_medical':
-                return (1, result.get('title', ''))
-        elif normalized == 'housing':
-            if 'housing' in service_type or 'shelter' in service_type:
-                return (0, result.get('title', ''))
-            if 'sober living' in service_type:
-                return (1, result.get('title', ''))
-        elif normalized == 'transportation':
-            if 'transportation' in service_type:
-                return (0, result.get('title', ''))
-        elif normalized == 'dental-care':
-            if 'dental' in service_type:
-                return (0, result.get('title', ''))
-        elif normalized == 'couples-counseling':
-            if 'couples counseling' in service_type:
-                return (0, result.get('title', ''))
-        elif normalized == 'parenting-classes':
-            if 'parenting classes' in service_type:
-                return (0, result.get('title', ''))
-        elif normalized == 'hygiene-services':
-            if 'hygiene' in service_type:
-                return (0, result.get('title', ''))
-
-        return (5, result.get('title', ''))
+        fields = {
+            'source': result.get('source', ''),
+            'service_type': (result.get('service_type') or '').lower(),
+            'description': (result.get('description') or '').lower(),
+        }
+        for priority, field, value in CATEGORY_PRIORITY_RULES.get(normalized, []):
+            if (fields[field] == value) if field == 'source' else (value in fields[field]):
+                return (priority, result.get('title', ''))
+
+        return (DEFAULT_CATEGORY_PRIORITY, result.get('title', ''))
 
     def search_services(
         self,
@@ -499,7 +523,6 @@ class VirgilServiceDatabase:
             normalized_population = self._normalize_population(population)
             normalized_insurance = self._normalize_insurance_type(insurance_type)
             category_filters = self._category_filters(normalized_category)
-            all_results = []
             treatment_filter_active = bool(normalized_population or normalized_insurance)
 
             has_category_filter = bool(normalized_category)
@@ -520,57 +543,47 @@ class VirgilServiceDatabase:
                 )
             )
 
-            # 1. Search resources table
-            if include_resources:
-                resources = self._search_resources(search_terms, location, normalized_category, category_filters)
-                all_results.extend(resources)
-
-            # 2. Search treatment_centers table
-            if include_treatment:
-                treatment_centers = self._search_treatment_centers(
-                    search_terms,
-                    location,
-                    normalized_category,
-                    category_filters,
-                    population=normalized_population,
-                    insurance_type=normalized_insurance,
-                )
-                all_results.extend(treatment_centers)
-
-            # 3. Search medi_cal_providers table (for mental health/medical queries)
+            # Medi-Cal providers only for mental health/medical queries.
             should_include_medical = category_filters['include_medical'] or any(
                 term in query.lower() for term in ['mental', 'health', 'doctor', 'medical', 'provider', 'clinic']
             )
-            if should_include_medical:
-                medi_cal = self._search_medi_cal_providers(search_terms, location, normalized_category, category_filters)
-                all_results.extend(medi_cal)
-
-            # 4. Search meetings table (for AA/NA/support groups)
-            if include_meetings:
-                meetings = self._search_meetings(search_terms, location, normalized_category, category_filters)
-                all_results.extend(meetings)
-
-            # Remove obvious duplicates and prioritize category-relevant rows first.
-            deduped_results = []
-            seen = set()
-            for result in all_results:
-                dedupe_key = (
-                    (result.get('title') or '').strip().lower(),
-                    (result.get('address') or '').strip().lower(),
-                    (result.get('service_type') or '').strip().lower(),
-                )
-                if dedupe_key in seen:
-                    continue
-                seen.add(dedupe_key)
-                deduped_results.append(result)
-
-            deduped_results.sort(key=lambda item: self._score_result_for_category(item, normalized_category))
+            sources = {
+                'resources': include_resources,
+                'treatment_centers': include_treatment,
+                'medi_cal_providers': should_include_medical,
+                'meetings': include_meetings,
+            }
 
-            # Paginate results
-            total_results = len(deduped_results)
             start_index = (page - 1) * per_page
             end_index = start_index + per_page
-            paginated_results = deduped_results[start_index:end_index]
+
+            # Ranking, dedupe and pagination run in SQL against the FTS index;
+            # the LIKE scan below is the fallback when FTS5 is unavailable.
+            ranked_page = self._search_services_ranked(
+                sources,
+                search_terms,
+                location,
+                normalized_category,
+                category_filters,
+                normalized_population,
+                normalized_insurance,
+                offset=start_index,
+                limit=per_page,
+            )
+            if ranked_page is not None:
+                paginated_results, total_results = ranked_page
+            else:
+                deduped_results = self._search_services_scan(
+                    sources,
+                    search_terms,
+                    location,
+                    normalized_category,
+                    category_filters,
+                    normalized_population,
+                    normalized_insurance,
+                )
+                total_results = len(deduped_results)
+                paginated_results = deduped_results[start_index:end_index]
 
             # Calculate pagination metadata
             total_pages = max(1, (total_results + per_page - 1) // per_page)
@@ -611,6 +624,242 @@ class VirgilServiceDatabase:
                 }
             }
 
+    def _search_services_scan(
+        self,
+        sources: Dict[str, bool],
+        search_terms: List[str],
+        location: Optional[str],
+        category: Optional[str],
+        category_filters: Dict[str, Any],
+        population: Optional[str],
+        insurance_type: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """LIKE-scan every included table, then dedupe and sort in Python."""
+        all_results = []
+        if sources['resources']:
+            all_results.extend(self._search_resources(search_terms, location, category, category_filters))
+        if sources['treatment_centers']:
+            all_results.extend(self._search_treatment_centers(
+                search_terms,
+                location,
+                category,
+                category_filters,
+                population=population,
+                insurance_type=insurance_type,
+            ))
+        if sources['medi_cal_providers']:
+            all_results.extend(self._search_medi_cal_providers(search_terms, location, category, category_filters))
+        if sources['meetings']:
+            all_results.extend(self._search_meetings(search_terms, location, category, category_filters))
+
+        # Remove obvious duplicates and prioritize category-relevant rows first.
+        deduped_results = self._deduplicate_results(all_results)
+        deduped_results.sort(key=lambda item: self._score_result_for_category(item, category))
+        return deduped_results
+
+    def _ensure_search_index(self) -> List[str]:
+        if self._indexed_sources is None:
+            try:
+                self._indexed_sources = ensure_search_index(self.connection)
+            except sqlite3.Error as e:
+                logger.warning(f"Virgil St search index unavailable, using LIKE scan: {e}")
+                self._indexed_sources = []
+        return self._indexed_sources
+
+    def _priority_sql(self, category: Optional[str], source: str, service_type_sql: str, description_sql: str) -> str:
+        """CATEGORY_PRIORITY_RULES as a CASE expression over one source table."""
+        whens = []
+        for priority, field, value in CATEGORY_PRIORITY_RULES.get(category, []):
+            if field == 'source':
+                if value == source:
+                    whens.append(f"WHEN 1 THEN {priority}")
+                continue
+            expr = service_type_sql if field == 'service_type' else description_sql
+            whens.append(f"WHEN LOWER({expr}) LIKE '%{value}%' THEN {priority}")
+        if not whens:
+            return str(DEFAULT_CATEGORY_PRIORITY)
+        return f"CASE {' '.join(whens)} ELSE {DEFAULT_CATEGORY_PRIORITY} END"
+
+    def _search_services_ranked(
+        self,
+        sources: Dict[str, bool],
+        search_terms: List[str],
+        location: Optional[str],
+        category: Optional[str],
+        category_filters: Dict[str, Any],
+        population: Optional[str],
+        insurance_type: Optional[str],
+        offset: int,
+        limit: int,
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Return (page, total) from one BM25-ranked query, or None to fall back.
+
+        Each included table contributes a UNION ALL branch (joined to the FTS
+        matches when there are search terms) carrying the category priority and
+        the same (title, address, service_type) dedupe key the scan path uses.
+        Rows matched only through a synonym rank no better than priority 1 and
+        are dropped for Medi-Cal providers, whose directory rows would otherwise
+        crowd out the curated sources. Duplicates keep their first source in
+        table order, then rows sort by category priority, term match, BM25 score
+        and title, and only the requested page is hydrated and formatted.
+        """
+        indexed = self._ensure_search_index()
+        if not indexed:
+            return None
+        match_expression = build_match_expression(search_terms) if search_terms else None
+        if search_terms and not match_expression:
+            return None
+        term_expression = build_match_expression(search_terms, synonyms=False) if match_expression else None
+
+        fallback_location = location or None
+        facility_address = (
+            "CASE WHEN COALESCE(address, '') <> '' "
+            "THEN address || ', ' || COALESCE(city, '') || ', CA ' || COALESCE(zipCode, '') "
+            "ELSE COALESCE(?, 'Los Angeles, CA') END"
+        )
+        branches = {
+            'resources': {
+                'source': 'virgil_st_resources',
+                'title': "name",
+                'address': "COALESCE(NULLIF(address, ''), ?, 'Los Angeles, CA')",
+                'service_type': "REPLACE(type, '_', ' ')",
+                'description': "COALESCE(NULLIF(description, ''), REPLACE(type, '_', ' ') || ' service')",
+                'filters': self._resource_filter_clauses(category_filters),
+                'published_only': False,
+            },
+            'treatment_centers': {
+                'source': 'virgil_st_treatment',
+                'title': "name",
+                'address': facility_address,
+                'service_type': "REPLACE(type, '_', ' ') || ' - ' || COALESCE(servesPopulation, '')",
+                'description': "COALESCE(description, '') || ' ' || COALESCE(servicesOffered, '')",
+                'filters': self._treatment_filter_clauses(category_filters, population, insurance_type),
+                'published_only': True,
+            },
+            'medi_cal_providers': {
+                'source': 'virgil_st_medical',
+                'title': "COALESCE(NULLIF(facilityName, ''), providerName)",
+                'address': facility_address,
+                'service_type': "'medical/mental health provider'",
+                'description': "COALESCE(providerName, '') || ' ' || COALESCE(specialties, '')",
+                'filters': self._medical_filter_clauses(category_filters),
+                'published_only': False,
+            },
+            'meetings': {
+                'source': 'virgil_st_meetings',
+                'title': "name",
+                'address': (
+                    "COALESCE(NULLIF(venueName, ''), NULLIF(address, ''), ?, 'Los Angeles, CA') "
+                    "|| CASE WHEN COALESCE(city, '') <> '' THEN ', ' || city || ', CA' ELSE '' END"
+                ),
+                'service_type': "type || ' support group'",
+                'description': "type || ' meeting ' || COALESCE(description, '')",
+                'filters': self._meeting_filter_clauses(category_filters),
+                'published_only': True,
+            },
+        }
+        # Medi-Cal providers are never listed wholesale (too many rows).
+        if not search_terms and not category_filters.get('medical_terms'):
+            sources = dict(sources, medi_cal_providers=False)
+
+        params: List[Any] = []
+        ctes = []
+        if match_expression:
+            # term_match: the row matches the query's own words, not just a synonym.
+            term_match = "1"
+            if term_expression != match_expression:
+                term_match = f"rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)"
+                params.append(term_expression)
+            ctes.append(
+                f"matches AS (SELECT rowid / {SOURCE_STRIDE} AS ref_id, rowid % {SOURCE_STRIDE} AS code, "
+                f"bm25({FTS_TABLE}, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score, "
+                f"{term_match} AS term_match FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)"
+            )
+            params.append(match_expression)
+
+        branch_sql = []
+        for table, branch in branches.items():
+            if not sources.get(table) or table not in indexed:
+                continue
+            code = INDEXED_SOURCES[table]['code']
+            filter_clauses, filter_params = branch['filters']
+            where = list(filter_clauses)
+            if branch['published_only']:
+                where.append("isPublished = 1")
+            join = ""
+            score = "0.0"
+            term_match = "1"
+            priority = self._priority_sql(category, branch['source'], branch['service_type'], branch['description'])
+            if match_expression:
+                join = f"JOIN matches ON matches.ref_id = {table}.id AND matches.code = {code}"
+                if table == 'medi_cal_providers':
+                    join += " AND matches.term_match"
+                score = "matches.score"
+                term_match = "matches.term_match"
+                priority = f"CASE WHEN matches.term_match THEN {priority} ELSE MAX({priority}, 1) END"
+            branch_sql.append(
+                f"SELECT {code} AS code, {table}.id AS ref_id, {score} AS score, {priority} AS priority, "
+                f"{term_match} AS term_match, "
+                f"{branch['title']} AS title, LOWER(TRIM({branch['title']})) AS k_title, "
+                f"LOWER(TRIM({branch['address']})) AS k_address, LOWER(TRIM({branch['service_type']})) AS k_type "
+                f"FROM {table} {join} WHERE {' AND '.join(where) or '1=1'}"
+            )
+            params.append(fallback_location)
+            params.extend(filter_params)
+        if not branch_sql:
+            return [], 0
+
+        ctes.append(f"candidates AS ({' UNION ALL '.join(branch_sql)})")
+        ctes.append(
+            "deduped AS (SELECT *, ROW_NUMBER() OVER ("
+            "PARTITION BY k_title, k_address, k_type ORDER BY code, score, ref_id) AS dup FROM candidates)"
+        )
+        with_sql = f"WITH {', '.join(ctes)}"
+        cursor = self.connection.cursor()
+        page_rows = cursor.execute(
+            f"""
+            {with_sql}
+            SELECT code, ref_id, COUNT(*) OVER () AS total
+            FROM deduped WHERE dup = 1
+            ORDER BY priority, term_match DESC, score, title, code, ref_id
+            LIMIT ? OFFSET ?
+            """,
+            params + [limit, offset],
+        ).fetchall()
+        if page_rows:
+            total = page_rows[0]['total']
+        else:
+            total = cursor.execute(f"{with_sql} SELECT COUNT(*) FROM deduped WHERE dup = 1", params).fetchone()[0]
+        return self._hydrate_ranked_rows(page_rows, location), total
+
+    def _hydrate_ranked_rows(self, page_rows: List[sqlite3.Row], location: Optional[str]) -> List[Dict[str, Any]]:
+        """Load and format just the rows on the requested page, keeping their order."""
+        loaders = {
+            'resources': (self._RESOURCE_COLUMNS, self._format_resource_row),
+            'treatment_centers': (self._TREATMENT_COLUMNS, self._format_treatment_row),
+            'medi_cal_providers': (self._MEDICAL_COLUMNS, self._format_medical_row),
+            'meetings': (self._MEETING_COLUMNS, self._format_meeting_row),
+        }
+        table_by_code = {spec['code']: table for table, spec in INDEXED_SOURCES.items()}
+        ids_by_table: Dict[str, List[int]] = {}
+        for row in page_rows:
+            ids_by_table.setdefault(table_by_code[row['code']], []).append(row['ref_id'])
+
+        formatted: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for table, ids in ids_by_table.items():
+            columns, formatter = loaders[table]
+            placeholders = ", ".join("?" for _ in ids)
+            for row in self.connection.execute(
+                f"SELECT {columns} FROM {table} WHERE id IN ({placeholders})", ids
+            ).fetchall():
+                formatted[(table, row['id'])] = formatter(row, location)
+
+        return [
+            formatted[key]
+            for key in ((table_by_code[row['code']], row['ref_id']) for row in page_rows)
+            if key in formatted
+        ]
+
     def search_services_enhanced(
         self,
         query: str,
@@ -1120,15 +1369,10 @@ class VirgilServiceDatabase:
 
         return None
 
-    def _search_resources(self, search_terms: List[str], location: str = None, category: Optional[str] = None, category_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search the resources table"""
-        cursor = self.connection.cursor()
-
-        # Build WHERE clause
+    def _resource_filter_clauses(self, category_filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Category WHERE clauses for resources (everything except user text terms)."""
         where_clauses = []
         params = []
-
-        category_filters = category_filters or self._category_filters(category)
         resource_types = category_filters.get('resource_types') or set()
 
         # Category filter: resource types (exact) OR keyword terms (LIKE) — OR'd together,
@@ -1153,6 +1397,15 @@ class VirgilServiceDatabase:
             where_clauses.append(f"({' OR '.join(category_filter_clauses)})")
             params.extend(category_filter_params)
 
+        return where_clauses, params
+
+    def _search_resources(self, search_terms: List[str], location: str = None, category: Optional[str] = None, category_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search the resources table"""
+        cursor = self.connection.cursor()
+
+        category_filters = category_filters or self._category_filters(category)
+        where_clauses, params = self._resource_filter_clauses(category_filters)
+
         if search_terms:
             term_clauses = []
             for term in search_terms:
@@ -1167,33 +1420,29 @@ class VirgilServiceDatabase:
             where_sql = "1=1"
 
         sql = f"""
-            SELECT id, name, type, description, address, phone, website, hours,
-                   zipCode, latitude, longitude, isVerified
+            SELECT {self._RESOURCE_COLUMNS}
             FROM resources
             WHERE {where_sql}
             LIMIT 100
         """
 
         cursor.execute(sql, params)
-        rows = cursor.fetchall()
-
-        results = []
-        for row in rows:
-            results.append({
-                'title': row['name'],
-                'description': row['description'] or f"{row['type'].replace('_', ' ').title()} service",
-                'link': row['website'] or '',
-                'url': row['website'] or '',
-                'address': row['address'] or location or 'Los Angeles, CA',
-                'phone': row['phone'] or 'Contact for details',
-                'location': row['address'] or location or 'Los Angeles, CA',
-                'service_type': row['type'].replace('_', ' ').title() if row['type'] else 'General Services',
-                'source': 'virgil_st_resources',
-                'relevance_reason': f"Matches {row['type']} services in your area",
-                'background_friendly_score': 70,  # Most social services are background-friendly
-            })
-
-        return results
+        return [self._format_resource_row(row, location) for row in cursor.fetchall()]
+
+    def _format_resource_row(self, row: sqlite3.Row, location: str = None) -> Dict[str, Any]:
+        return {
+            'title': row['name'],
+            'description': row['description'] or f"{row['type'].replace('_', ' ').title()} service",
+            'link': row['website'] or '',
+            'url': row['website'] or '',
+            'address': row['address'] or location or 'Los Angeles, CA',
+            'phone': row['phone'] or 'Contact for details',
+            'location': row['address'] or location or 'Los Angeles, CA',
+            'service_type': row['type'].replace('_', ' ').title() if row['type'] else 'General Services',
+            'source': 'virgil_st_resources',
+            'relevance_reason': f"Matches {row['type']} services in your area",
+            'background_friendly_score': 70,  # Most social services are background-friendly
+        }
 
     def _search_treatment_centers(
         self,
@@ -1207,10 +1456,41 @@ class VirgilServiceDatabase:
         """Search the treatment_centers table"""
         cursor = self.connection.cursor()
 
+        category_filters = category_filters or self._category_filters(category)
+        where_clauses, params = self._treatment_filter_clauses(category_filters, population, insurance_type)
+
+        if search_terms:
+            term_clauses = []
+            for term in search_terms:
+                term_clauses.append("(LOWER(name) LIKE ? OR LOWER(type) LIKE ? OR LOWER(description) LIKE ? OR LOWER(servicesOffered) LIKE ?)")
+                search_pattern = f"%{term}%"
+                params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
+            where_clauses.append(f"({' OR '.join(term_clauses)})")
+
+        if where_clauses:
+            where_sql = " AND ".join(where_clauses)
+        else:
+            where_sql = "1=1"
+
+        sql = f"""
+            SELECT {self._TREATMENT_COLUMNS}
+            FROM treatment_centers
+            WHERE ({where_sql}) AND isPublished = 1
+            LIMIT 100
+        """
+
+        cursor.execute(sql, params)
+        return [self._format_treatment_row(row, location) for row in cursor.fetchall()]
+
+    def _treatment_filter_clauses(
+        self,
+        category_filters: Dict[str, Any],
+        population: Optional[str] = None,
+        insurance_type: Optional[str] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        """Category / population / insurance WHERE clauses for treatment_centers."""
         where_clauses = []
         params = []
-
-        category_filters = category_filters or self._category_filters(category)
         treatment_types = category_filters.get('treatment_types') or set()
 
         # Category filter: treatment types (exact) OR keyword terms (LIKE) — OR'd together,
@@ -1244,82 +1524,47 @@ class VirgilServiceDatabase:
         elif insurance_type == 'private':
             where_clauses.append("acceptsPrivateInsurance = 1")
 
-        if search_terms:
-            term_clauses = []
-            for term in search_terms:
-                term_clauses.append("(LOWER(name) LIKE ? OR LOWER(type) LIKE ? OR LOWER(description) LIKE ? OR LOWER(servicesOffered) LIKE ?)")
-                search_pattern = f"%{term}%"
-                params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
-            where_clauses.append(f"({' OR '.join(term_clauses)})")
-
-        if where_clauses:
-            where_sql = " AND ".join(where_clauses)
-        else:
-            where_sql = "1=1"
-
-        sql = f"""
-            SELECT id, name, type, description, address, city, zipCode, phone, website,
-                   servesPopulation, acceptsMediCal, acceptsMedicare, acceptsPrivateInsurance,
-                   servicesOffered, amenities, priceRange
-            FROM treatment_centers
-            WHERE ({where_sql}) AND isPublished = 1
-            LIMIT 100
-        """
-
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
-
-        results = []
-        for row in rows:
-            # Build description
-            desc_parts = []
-            if row['description']:
-                desc_parts.append(row['description'])
-            if row['servicesOffered']:
-                desc_parts.append(f"Services: {row['servicesOffered']}")
-            if row['acceptsMediCal']:
-                desc_parts.append("Accepts Medi-Cal")
-            if row['acceptsMedicare']:
-                desc_parts.append("Accepts Medicare")
-
-            description = '. '.join(desc_parts) if desc_parts else f"{row['type'].replace('_', ' ').title()} treatment center"
-
-            results.append({
-                'title': row['name'],
-                'description': description,
-                'link': row['website'] or '',
-                'url': row['website'] or '',
-                'address': f"{row['address']}, {row['city']}, CA {row['zipCode']}" if row['address'] else (location or 'Los Angeles, CA'),
-                'phone': row['phone'] or 'Contact for details',
-                'location': f"{row['city']}, CA" if row['city'] else (location or 'Los Angeles, CA'),
-                'service_type': f"{row['type'].replace('_', ' ').title()} - {row['servesPopulation'].title()}",
-                'source': 'virgil_st_treatment',
-                'relevance_reason': f"{row['type'].replace('_', ' ').title()} treatment facility serving {row['servesPopulation']}",
-                'background_friendly_score': 75,
-                'serves_population': row['servesPopulation'] or '',
-                'accepts_medi_cal': bool(row['acceptsMediCal']),
-                'accepts_private_insurance': bool(row['acceptsPrivateInsurance']),
-                'accepts_medicare': bool(row['acceptsMedicare']),
-            })
-
-        return results
+        return where_clauses, params
+
+    def _format_treatment_row(self, row: sqlite3.Row, location: str = None) -> Dict[str, Any]:
+        # Build description
+        desc_parts = []
+        if row['description']:
+            desc_parts.append(row['description'])
+        if row['servicesOffered']:
+            desc_parts.append(f"Services: {row['servicesOffered']}")
+        if row['acceptsMediCal']:
+            desc_parts.append("Accepts Medi-Cal")
+        if row['acceptsMedicare']:
+            desc_parts.append("Accepts Medicare")
+
+        description = '. '.join(desc_parts) if desc_parts else f"{row['type'].replace('_', ' ').title()} treatment center"
+
+        return {
+            'title': row['name'],
+            'description': description,
+            'link': row['website'] or '',
+            'url': row['website'] or '',
+            'address': f"{row['address']}, {row['city']}, CA {row['zipCode']}" if row['address'] else (location or 'Los Angeles, CA'),
+            'phone': row['phone'] or 'Contact for details',
+            'location': f"{row['city']}, CA" if row['city'] else (location or 'Los Angeles, CA'),
+            'service_type': f"{row['type'].replace('_', ' ').title()} - {row['servesPopulation'].title()}",
+            'source': 'virgil_st_treatment',
+            'relevance_reason': f"{row['type'].replace('_', ' ').title()} treatment facility serving {row['servesPopulation']}",
+            'background_friendly_score': 75,
+            'serves_population': row['servesPopulation'] or '',
+            'accepts_medi_cal': bool(row['acceptsMediCal']),
+            'accepts_private_insurance': bool(row['acceptsPrivateInsurance']),
+            'accepts_medicare': bool(row['acceptsMedicare']),
+        }
 
     def _search_medi_cal_providers(self, search_terms: List[str], location: str = None, category: Optional[str] = None, category_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search the medi_cal_providers table"""
         cursor = self.connection.cursor()
 
-        where_clauses = []
-        params = []
-
         category_filters = category_filters or self._category_filters(category)
         medical_terms = category_filters.get('medical_terms') or []
-
-        if medical_terms:
-            specialty_clauses = []
-            for term in medical_terms:
-                specialty_clauses.append("LOWER(specialties) LIKE ?")
-                params.append(f"%{term}%")
-            where_clauses.append(f"({' OR '.join(specialty_clauses)})")
+        where_clauses, params = self._medical_filter_clauses(category_filters)
 
         if search_terms:  # Specific search
             term_clauses = []
@@ -1334,55 +1579,56 @@ class VirgilServiceDatabase:
         where_sql = " AND ".join(where_clauses)
 
         sql = f"""
-            SELECT id, providerName, facilityName, address, city, zipCode, phone,
-                   specialties, gender, languagesSpoken, networks
+            SELECT {self._MEDICAL_COLUMNS}
             FROM medi_cal_providers
             WHERE {where_sql}
             LIMIT 50
         """
 
         cursor.execute(sql, params)
-        rows = cursor.fetchall()
-
-        results = []
-        for row in rows:
-            name = row['facilityName'] or row['providerName']
-            desc_parts = [row['providerName']]
-            if row['specialties']:
-                desc_parts.append(f"Specialties: {row['specialties']}")
-            if row['languagesSpoken']:
-                desc_parts.append(f"Languages: {row['languagesSpoken']}")
+        return [self._format_medical_row(row, location) for row in cursor.fetchall()]
 
-            results.append({
-                'title': name,
-                'description': '. '.join(desc_parts),
-                'link': '',
-                'url': '',
-                'address': f"{row['address']}, {row['city']}, CA {row['zipCode']}" if row['address'] else (location or 'Los Angeles, CA'),
-                'phone': row['phone'] or 'Contact for details',
-                'location': f"{row['city']}, CA" if row['city'] else (location or 'Los Angeles, CA'),
-                'service_type': 'Medical/Mental Health Provider',
-                'source': 'virgil_st_medical',
-                'relevance_reason': 'Medi-Cal provider in your area',
-                'background_friendly_score': 80,
-            })
-
-        return results
+    def _medical_filter_clauses(self, category_filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Specialty WHERE clauses for medi_cal_providers."""
+        where_clauses = []
+        params = []
+        medical_terms = category_filters.get('medical_terms') or []
+        if medical_terms:
+            specialty_clauses = []
+            for term in medical_terms:
+                specialty_clauses.append("LOWER(specialties) LIKE ?")
+                params.append(f"%{term}%")
+            where_clauses.append(f"({' OR '.join(specialty_clauses)})")
+        return where_clauses, params
+
+    def _format_medical_row(self, row: sqlite3.Row, location: str = None) -> Dict[str, Any]:
+        name = row['facilityName'] or row['providerName']
+        desc_parts = [row['providerName']]
+        if row['specialties']:
+            desc_parts.append(f"Specialties: {row['specialties']}")
+        if row['languagesSpoken']:
+            desc_parts.append(f"Languages: {row['languagesSpoken']}")
+
+        return {
+            'title': name,
+            'description': '. '.join(desc_parts),
+            'link': '',
+            'url': '',
+            'address': f"{row['address']}, {row['city']}, CA {row['zipCode']}" if row['address'] else (location or 'Los Angeles, CA'),
+            'phone': row['phone'] or 'Contact for details',
+            'location': f"{row['city']}, CA" if row['city'] else (location or 'Los Angeles, CA'),
+            'service_type': 'Medical/Mental Health Provider',
+            'source': 'virgil_st_medical',
+            'relevance_reason': 'Medi-Cal provider in your area',
+            'background_friendly_score': 80,
+        }
 
     def _search_meetings(self, search_terms: List[str], location: str = None, category: Optional[str] = None, category_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search the meetings table"""
         cursor = self.connection.cursor()
 
-        where_clauses = []
-        params = []
-
         category_filters = category_filters or self._category_filters(category)
-        meeting_types = category_filters.get('meeting_types') or set()
-
-        if meeting_types:
-            type_clause = " OR ".join(["LOWER(type) = ?"] * len(meeting_types))
-            where_clauses.append(f"({type_clause})")
-            params.extend(sorted(meeting_types))
+        where_clauses, params = self._meeting_filter_clauses(category_filters)
 
         if search_terms:  # Specific search
             term_clauses = []
@@ -1398,44 +1644,51 @@ class VirgilServiceDatabase:
             where_sql = "1=1"
 
         sql = f"""
-            SELECT id, name, type, dayOfWeek, time, duration, venueName, address, city, zipCode,
-                   format, meetingMode, zoomId, description, notes
+            SELECT {self._MEETING_COLUMNS}
             FROM meetings
             WHERE ({where_sql}) AND isPublished = 1
             LIMIT 50
         """
 
         cursor.execute(sql, params)
-        rows = cursor.fetchall()
-
-        results = []
-        for row in rows:
-            meeting_info = []
-            meeting_info.append(f"{row['type']} meeting")
-            meeting_info.append(f"{row['dayOfWeek']} at {row['time']}")
-            meeting_info.append(f"{row['format']} - {row['meetingMode']}")
-            if row['description']:
-                meeting_info.append(row['description'])
-
-            location_str = row['venueName'] or row['address'] or location or 'Los Angeles, CA'
-            if row['city']:
-                location_str = f"{location_str}, {row['city']}, CA"
-
-            results.append({
-                'title': row['name'],
-                'description': '. '.join(meeting_info),
-                'link': '',
-                'url': '',
-                'address': location_str,
-                'phone': 'Check meeting details',
-                'location': location_str,
-                'service_type': f"{row['type']} Support Group",
-                'source': 'virgil_st_meetings',
-                'relevance_reason': f"{row['type']} {row['format']} meeting on {row['dayOfWeek']}",
-                'background_friendly_score': 95,  # Support groups are very background-friendly
-            })
+        return [self._format_meeting_row(row, location) for row in cursor.fetchall()]
 
-        return results
+    def _meeting_filter_clauses(self, category_filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Meeting-type WHERE clauses for meetings."""
+        where_clauses = []
+        params = []
+        meeting_types = category_filters.get('meeting_types') or set()
+        if meeting_types:
+            type_clause = " OR ".join(["LOWER(type) = ?"] * len(meeting_types))
+            where_clauses.append(f"({type_clause})")
+            params.extend(sorted(meeting_types))
+        return where_clauses, params
+
+    def _format_meeting_row(self, row: sqlite3.Row, location: str = None) -> Dict[str, Any]:
+        meeting_info = []
+        meeting_info.append(f"{row['type']} meeting")
+        meeting_info.append(f"{row['dayOfWeek']} at {row['time']}")
+        meeting_info.append(f"{row['format']} - {row['meetingMode']}")
+        if row['description']:
+            meeting_info.append(row['description'])
+
+        location_str = row['venueName'] or row['address'] or location or 'Los Angeles, CA'
+        if row['city']:
+            location_str = f"{location_str}, {row['city']}, CA"
+
+        return {
+            'title': row['name'],
+            'description': '. '.join(meeting_info),
+            'link': '',
+            'url': '',
+            'address': location_str,
+            'phone': 'Check meeting details',
+            'location': location_str,
+            'service_type': f"{row['type']} Support Group",
+            'source': 'virgil_st_meetings',
+            'relevance_reason': f"{row['type']} {row['format']} meeting on {row['dayOfWeek']}",
+            'background_friendly_score': 95,  # Support groups are very background-friendly
+        }
 
 # Singleton instance
 _virgil_db = None
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Virgil St full-text index - one FTS5 table over the four searchable service tables
+
+``virgil_search_fts`` holds a row per resource, treatment center, Medi-Cal
+provider and meeting. The FTS rowid encodes the source row as
+``id * SOURCE_STRIDE + source code`` so triggers can keep the index in sync with
+indexed point deletes, and search queries can join back to the source table by
+primary key. Columns are ``name`` / ``kind`` / ``body`` and are ranked with
+BM25 weighted towards the name.
+
+The index lives inside virgil_st_dev.db next to the tables it covers. It is
+created and back-filled on first use per source (tracked in
+``virgil_search_meta``); from then on the AFTER INSERT/UPDATE/DELETE triggers
+keep it current for every writer (importers included).
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Dict, List, Optional
+
+from backend.shared.env import env_bool
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "virgil_search_fts"
+META_TABLE = "virgil_search_meta"
+SOURCE_STRIDE = 4
+# BM25 column weights for (name, kind, body).
+BM25_WEIGHTS = (5.0, 3.0, 1.0)
+
+# source table -> (source code, name expr, kind expr, body expr) over NEW./OLD. rows
+INDEXED_SOURCES: Dict[str, Dict[str, object]] = {
+    "resources": {
+        "code": 0,
+        "name": "{r}.name",
+        "kind": "REPLACE({r}.type, '_', ' ')",
+        "body": "COALESCE({r}.description, '')",
+    },
+    "treatment_centers": {
+        "code": 1,
+        "name": "{r}.name",
+        "kind": "REPLACE({r}.type, '_', ' ') || ' ' || COALESCE({r}.servesPopulation, '')",
+        "body": "COALESCE({r}.description, '') || ' ' || COALESCE({r}.servicesOffered, '')",
+    },
+    "medi_cal_providers": {
+        "code": 2,
+        "name": "COALESCE({r}.providerName, '') || ' ' || COALESCE({r}.facilityName, '')",
+        "kind": "COALESCE({r}.specialties, '')",
+        "body": "''",
+    },
+    "meetings": {
+        "code": 3,
+        "name": "{r}.name",
+        "kind": "{r}.type",
+        "body": "COALESCE({r}.format, '') || ' ' || COALESCE({r}.tags, '')",
+    },
+}
+
+# Query-time synonym expansion. Keys are the terms produced by
+# VirgilServiceDatabase._build_search_conditions plus common user words; every
+# expansion is OR'd into the MATCH expression and ranked by BM25. A row matched
+# only through a synonym never takes a category's top priority and is left out
+# for Medi-Cal providers (see VirgilServiceDatabase._search_services_ranked).
+SEARCH_SYNONYMS: Dict[str, tuple] = {
+    "mental": ("psychiatric", "behavioral", "therapy", "counseling"),
+    "treatment": ("rehab", "detox", "recovery"),
+    "recovery": ("treatment",),
+    "substance": ("addiction", "drug", "alcohol"),
+    "housing": ("shelter", "apartment", "residence"),
+    "shelter": ("housing",),
+    "sober": ("sobriety",),
+    "food": ("meal", "pantry", "nutrition"),
+    "dental": ("dentist", "teeth"),
+    "couples": ("relationship", "marriage"),
+    "counseling": ("therapy", "counselor"),
+    "parenting": ("parent",),
+    "hygiene": ("shower", "toiletries"),
+    "legal": ("lawyer", "attorney"),
+    "transport": ("transportation", "bus", "metro"),
+    "meeting": ("aa", "na"),
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fts_search_enabled() -> bool:
+    return env_bool("CMSX_VIRGIL_FTS", True)
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE IF EXISTS temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def build_match_expression(search_terms: List[str], synonyms: bool = True) -> Optional[str]:
+    """OR together every term and, with ``synonyms``, its SEARCH_SYNONYMS.
+
+    The query's own words of 3+ chars match as prefixes; synonyms match whole
+    tokens only, so an expansion is not widened a second time by prefix.
+    """
+    words: List[str] = []
+    for term in search_terms:
+        for word in _TOKEN_RE.findall((term or "").lower()):
+            if word not in words:
+                words.append(word)
+    expansions: List[str] = []
+    if synonyms:
+        for word in words:
+            for candidate in SEARCH_SYNONYMS.get(word, ()):
+                if candidate not in words and candidate not in expansions:
+                    expansions.append(candidate)
+    if not words:
+        return None
+    return " OR ".join(
+        [f'"{word}"*' if len(word) >= 3 else f'"{word}"' for word in words]
+        + [f'"{candidate}"' for candidate in expansions]
+    )
+
+
+def _row_values(spec: Dict[str, object], alias: str) -> str:
+    return ", ".join(str(spec[column]).format(r=alias) for column in ("name", "kind", "body"))
+
+
+def _create_triggers(conn: sqlite3.Connection, table: str, spec: Dict[str, object]) -> None:
+    code = spec["code"]
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, name, kind, body) "
+        f"VALUES (NEW.id * {SOURCE_STRIDE} + {code}, {_row_values(spec, 'NEW')});"
+    )
+    delete_old = f"DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id * {SOURCE_STRIDE} + {code};"
+    conn.executescript(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+            {insert_new}
+        END;
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+            {delete_old}
+        END;
+        CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} BEGIN
+            {delete_old}
+            {insert_new}
+        END;
+        """
+    )
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> List[str]:
+    """Create / back-fill the index and return the source tables it covers.
+
+    Returns an empty list when FTS5 is unavailable or none of the source tables
+    exist, in which case callers fall back to the LIKE scan path.
+    """
+    if not fts_search_enabled() or not fts5_available(conn):
+        return []
+    existing = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    }
+    tables = [table for table in INDEXED_SOURCES if table in existing]
+    if not tables:
+        return []
+
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "name, kind, body, tokenize = 'porter unicode61 remove_diacritics 2', prefix = '3')"
+    )
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {META_TABLE} (source TEXT PRIMARY KEY, indexed_at TEXT NOT NULL)"
+    )
+    indexed = {row[0] for row in conn.execute(f"SELECT source FROM {META_TABLE}").fetchall()}
+    for table in tables:
+        spec = INDEXED_SOURCES[table]
+        _create_triggers(conn, table, spec)
+        if table in indexed:
+            continue
+        code = spec["code"]
+        conn.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid % {SOURCE_STRIDE} = {code}"
+        )
+        conn.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, kind, body) "
+            f"SELECT src.id * {SOURCE_STRIDE} + {code}, {_row_values(spec, 'src')} FROM {table} AS src"
+        )
+        conn.execute(
+            f"INSERT OR REPLACE INTO {META_TABLE} (source, indexed_at) VALUES (?, datetime('now'))",
+            (table,),
+        )
+        logger.info(f"Built Virgil St search index for {table}")
+    conn.commit()
+    return tables
@@ -1,14 +1,34 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import logging
 import os
 import sqlite3
+import threading
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-
+from typing import Any, Dict, List, Optional, Set
+
+from .duplicate_index import (
+    FUZZY_NAME_THRESHOLD,
+    DuplicateBlockingIndex,
+    lookup_keys,
+    normalize_lookup,
+    normalize_phone,
+    normalize_website,
+)
+from .ingestion import (
+    INGEST_CHUNK_SIZE,
+    IngestRecord,
+    IngestResult,
+    IngestUnit,
+    StageTimer,
+    bulk_transaction,
+    score_duplicate_pairs,
+    write_units,
+)
 from .models import (
     ALLOWED_DISCOVERY_RUN_STATUSES,
     ALLOWED_LISTING_STATUSES,
@@ -67,15 +87,75 @@ LISTING_CHANGE_LOG_FIELDS = DUPLICATE_DIFF_FIELDS + [
     "internal_referral_notes",
     "status",
 ]
+LOOKUP_COLUMNS = ("lookup_name", "lookup_city", "lookup_phone", "lookup_website")
+LISTING_ORDER_SQL = """
+    CASE status
+        WHEN 'pending_review' THEN 1
+        WHEN 'needs_reverification' THEN 2
+        WHEN 'use_caution' THEN 3
+        WHEN 'approved' THEN 4
+        WHEN 'do_not_refer' THEN 5
+        WHEN 'archived' THEN 6
+        ELSE 7
+    END,
+    LOWER(name),
+    id
+"""
+LISTING_INSERT_SQL = """
+INSERT INTO sober_living_directory_listings (
+    listing_id, name, operator_name, website, phone, email, address, city, state, zip_code,
+    latitude, longitude, neighborhood, population_served, house_type, certification_status,
+    certification_body, certification_expiration_date, monthly_rent_min, monthly_rent_max,
+    deposit_required, accepts_insurance, accepts_mat, accepts_probation_parole, pets_allowed,
+    bed_availability_status, last_availability_check_date, last_verified_date, verification_method,
+    trust_score, risk_flags_json, notes, internal_referral_notes, primary_source_id, source_urls_json,
+    first_seen_at, last_seen_at, status, created_at, updated_at,
+    lookup_name, lookup_city, lookup_phone, lookup_website
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+RAW_LISTING_INSERT_SQL = """
+INSERT INTO sober_living_raw_listings (
+    raw_id, source_id, run_id, source_url, raw_name, raw_address, raw_phone, raw_email,
+    raw_website, raw_text, extracted_json, content_hash, discovered_at,
+    matched_listing_id, review_status, review_notes
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+DUPLICATE_CANDIDATE_INSERT_SQL = """
+INSERT INTO sober_living_duplicate_candidates (
+    candidate_id, raw_id, existing_listing_id, proposed_name, existing_name,
+    confidence_score, match_reasons_json, status, resolution_notes, created_at, updated_at, resolved_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+CHANGE_LOG_INSERT_SQL = """
+INSERT INTO sober_living_directory_change_log (
+    change_id, listing_id, raw_id, change_type, old_value, new_value, source_id, detected_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
 PROTECTED_DUPLICATE_STATUSES = {"do_not_refer", "use_caution", "archived"}
 RAW_APPROVAL_REQUIRED_FIELDS = ["name", "city", "state"]
 
 
+def _serialized(method):
+    """Hold the database write lock for a write.
+
+    All threads share one connection, so a commit from one thread would
+    otherwise land in the middle of another thread's open transaction (such as
+    a ``bulk_ingest`` batch). Every method that writes or commits on the
+    connection takes the lock; it is re-entrant, so writers can call each other.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class SoberLivingDirectoryDatabase:
     def __init__(self, db_path: str = None):
         from backend.shared.db_path import DB_DIR
         self.db_path = db_path or str(DB_DIR / "sober_living_directory.db")
         self.connection: Optional[sqlite3.Connection] = None
+        self.write_lock = threading.RLock()
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self.setup_database()
 
@@ -328,6 +408,26 @@ class SoberLivingDirectoryDatabase:
                 column_name="trigger_type",
                 column_sql="TEXT NOT NULL DEFAULT 'manual'",
             )
+            self._ensure_column(
+                conn,
+                table_name="sober_living_discovery_runs",
+                column_name="stage_timings_json",
+                column_sql="TEXT",
+            )
+            for column_name in LOOKUP_COLUMNS:
+                self._ensure_column(
+                    conn,
+                    table_name="sober_living_directory_listings",
+                    column_name=column_name,
+                    column_sql="TEXT",
+                )
+            for statement in [
+                "CREATE INDEX IF NOT EXISTS idx_sld_listings_lookup_phone ON sober_living_directory_listings(lookup_phone)",
+                "CREATE INDEX IF NOT EXISTS idx_sld_listings_lookup_website ON sober_living_directory_listings(lookup_website)",
+                "CREATE INDEX IF NOT EXISTS idx_sld_listings_lookup_name_city ON sober_living_directory_listings(lookup_name, lookup_city)",
+            ]:
+                conn.execute(statement)
+            self._backfill_lookup_columns(conn)
             conn.commit()
         except Exception as exc:
             logger.error("Failed setting up sober living directory database: %s", exc)
@@ -341,8 +441,34 @@ class SoberLivingDirectoryDatabase:
         if column_name not in existing_columns:
             conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_sql}")
 
+    def _backfill_lookup_columns(self, conn: sqlite3.Connection) -> int:
+        """Fill duplicate lookup keys for listings written before the columns existed."""
+        rows = conn.execute(
+            """
+            SELECT listing_id, name, city, phone, website
+            FROM sober_living_directory_listings
+            WHERE lookup_name IS NULL
+            """
+        ).fetchall()
+        conn.executemany(
+            """
+            UPDATE sober_living_directory_listings
+            SET lookup_name = ?, lookup_city = ?, lookup_phone = ?, lookup_website = ?
+            WHERE listing_id = ?
+            """,
+            [
+                (*lookup_keys(row["name"], row["city"], row["phone"], row["website"]), row["listing_id"])
+                for row in rows
+            ],
+        )
+        if rows:
+            logger.info("Backfilled duplicate lookup keys for %s sober living listings", len(rows))
+        return len(rows)
+
     def _row_to_listing(self, row: sqlite3.Row) -> Dict[str, Any]:
         item = dict(row)
+        for key in LOOKUP_COLUMNS:
+            item.pop(key, None)
         item["risk_flags_json"] = self._parse_json_list(item.get("risk_flags_json"))
         item["source_urls_json"] = self._parse_json_list(item.get("source_urls_json"))
         for key in [
@@ -379,7 +505,12 @@ class SoberLivingDirectoryDatabase:
         return item
 
     def _row_to_discovery_run(self, row: sqlite3.Row) -> Dict[str, Any]:
-        return dict(row)
+        item = dict(row)
+        try:
+            item["stage_timings_json"] = json.loads(item.get("stage_timings_json") or "{}")
+        except json.JSONDecodeError:
+            item["stage_timings_json"] = {}
+        return item
 
     def _row_to_raw_listing(self, row: sqlite3.Row) -> Dict[str, Any]:
         item = dict(row)
@@ -549,17 +680,7 @@ class SoberLivingDirectoryDatabase:
             SELECT *
             FROM sober_living_directory_listings
             {where_sql}
-            ORDER BY
-                CASE status
-                    WHEN 'pending_review' THEN 1
-                    WHEN 'needs_reverification' THEN 2
-                    WHEN 'use_caution' THEN 3
-                    WHEN 'approved' THEN 4
-                    WHEN 'do_not_refer' THEN 5
-                    WHEN 'archived' THEN 6
-                    ELSE 7
-                END,
-                LOWER(name)
+            ORDER BY {LISTING_ORDER_SQL}
             """,
             params,
         ).fetchall()
@@ -578,73 +699,68 @@ class SoberLivingDirectoryDatabase:
         listing["verification_tasks"] = self.list_tasks(listing_id=listing_id)
         return listing
 
-    def create_listing(self, payload: SoberLivingDirectoryListingCreate) -> Dict[str, Any]:
-        conn = self.connect()
-        listing_id = f"sld_{uuid.uuid4().hex[:12]}"
+    def _prepare_listing_data(self, payload: SoberLivingDirectoryListingCreate) -> Dict[str, Any]:
         timestamp = utcnow_iso()
         data = payload.model_dump()
-        data["listing_id"] = listing_id
+        data["listing_id"] = f"sld_{uuid.uuid4().hex[:12]}"
         data["first_seen_at"] = data.get("first_seen_at") or timestamp
         data["last_seen_at"] = data.get("last_seen_at") or timestamp
         data["created_at"] = timestamp
         data["updated_at"] = timestamp
         data["trust_score"] = self.calculate_trust_score(data)
-
-        conn.execute(
-            """
-            INSERT INTO sober_living_directory_listings (
-                listing_id, name, operator_name, website, phone, email, address, city, state, zip_code,
-                latitude, longitude, neighborhood, population_served, house_type, certification_status,
-                certification_body, certification_expiration_date, monthly_rent_min, monthly_rent_max,
-                deposit_required, accepts_insurance, accepts_mat, accepts_probation_parole, pets_allowed,
-                bed_availability_status, last_availability_check_date, last_verified_date, verification_method,
-                trust_score, risk_flags_json, notes, internal_referral_notes, primary_source_id, source_urls_json,
-                first_seen_at, last_seen_at, status, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                listing_id,
-                data["name"],
-                data.get("operator_name"),
-                data.get("website"),
-                data.get("phone"),
-                data.get("email"),
-                data.get("address"),
-                data["city"],
-                data.get("state", "CA"),
-                data.get("zip_code"),
-                data.get("latitude"),
-                data.get("longitude"),
-                data.get("neighborhood"),
-                data.get("population_served"),
-                data.get("house_type"),
-                data.get("certification_status"),
-                data.get("certification_body"),
-                data.get("certification_expiration_date"),
-                data.get("monthly_rent_min"),
-                data.get("monthly_rent_max"),
-                self._to_db_bool(data.get("deposit_required")),
-                self._to_db_bool(data.get("accepts_insurance")),
-                self._to_db_bool(data.get("accepts_mat")),
-                self._to_db_bool(data.get("accepts_probation_parole")),
-                self._to_db_bool(data.get("pets_allowed")),
-                data.get("bed_availability_status"),
-                data.get("last_availability_check_date"),
-                data.get("last_verified_date"),
-                data.get("verification_method"),
-                data["trust_score"],
-                self._serialize_json_list(data.get("risk_flags_json")),
-                data.get("notes"),
-                data.get("internal_referral_notes"),
-                data.get("primary_source_id"),
-                self._serialize_json_list(data.get("source_urls_json")),
-                timestamp,
-                timestamp,
-                data.get("status", "pending_review"),
-                timestamp,
-                timestamp,
-            ),
+        return data
+
+    def _listing_insert_row(self, data: Dict[str, Any]) -> tuple:
+        return (
+            data["listing_id"],
+            data["name"],
+            data.get("operator_name"),
+            data.get("website"),
+            data.get("phone"),
+            data.get("email"),
+            data.get("address"),
+            data["city"],
+            data.get("state", "CA"),
+            data.get("zip_code"),
+            data.get("latitude"),
+            data.get("longitude"),
+            data.get("neighborhood"),
+            data.get("population_served"),
+            data.get("house_type"),
+            data.get("certification_status"),
+            data.get("certification_body"),
+            data.get("certification_expiration_date"),
+            data.get("monthly_rent_min"),
+            data.get("monthly_rent_max"),
+            self._to_db_bool(data.get("deposit_required")),
+            self._to_db_bool(data.get("accepts_insurance")),
+            self._to_db_bool(data.get("accepts_mat")),
+            self._to_db_bool(data.get("accepts_probation_parole")),
+            self._to_db_bool(data.get("pets_allowed")),
+            data.get("bed_availability_status"),
+            data.get("last_availability_check_date"),
+            data.get("last_verified_date"),
+            data.get("verification_method"),
+            data["trust_score"],
+            self._serialize_json_list(data.get("risk_flags_json")),
+            data.get("notes"),
+            data.get("internal_referral_notes"),
+            data.get("primary_source_id"),
+            self._serialize_json_list(data.get("source_urls_json")),
+            data["created_at"],
+            data["created_at"],
+            data.get("status", "pending_review"),
+            data["created_at"],
+            data["updated_at"],
+            *lookup_keys(data["name"], data["city"], data.get("phone"), data.get("website")),
         )
+
+    @_serialized
+    def create_listing(self, payload: SoberLivingDirectoryListingCreate) -> Dict[str, Any]:
+        conn = self.connect()
+        data = self._prepare_listing_data(payload)
+        listing_id = data["listing_id"]
+        conn.execute(LISTING_INSERT_SQL, self._listing_insert_row(data))
         self._insert_change_log(
             listing_id=listing_id,
             change_type="new_listing",
@@ -658,6 +774,7 @@ class SoberLivingDirectoryDatabase:
         payload = SoberLivingDirectoryListingCreate(**data)
         return self.create_listing(payload)
 
+    @_serialized
     def update_listing(self, listing_id: str, payload: SoberLivingDirectoryListingUpdate) -> Optional[Dict[str, Any]]:
         existing = self.get_listing(listing_id)
         if not existing:
@@ -678,7 +795,8 @@ class SoberLivingDirectoryDatabase:
                 monthly_rent_max = ?, deposit_required = ?, accepts_insurance = ?, accepts_mat = ?, accepts_probation_parole = ?,
                 pets_allowed = ?, bed_availability_status = ?, last_availability_check_date = ?, last_verified_date = ?,
                 verification_method = ?, trust_score = ?, risk_flags_json = ?, notes = ?, internal_referral_notes = ?, primary_source_id = ?,
-                source_urls_json = ?, last_seen_at = ?, status = ?, updated_at = ?
+                source_urls_json = ?, last_seen_at = ?, status = ?, updated_at = ?,
+                lookup_name = ?, lookup_city = ?, lookup_phone = ?, lookup_website = ?
             WHERE listing_id = ?
             """,
             (
@@ -719,6 +837,7 @@ class SoberLivingDirectoryDatabase:
                 merged.get("last_seen_at") or utcnow_iso(),
                 merged.get("status"),
                 merged["updated_at"],
+                *lookup_keys(merged["name"], merged["city"], merged.get("phone"), merged.get("website")),
                 listing_id,
             ),
         )
@@ -744,6 +863,7 @@ class SoberLivingDirectoryDatabase:
         conn.commit()
         return self.get_listing(listing_id)
 
+    @_serialized
     def verify_listing(self, listing_id: str, payload: ListingVerifyRequest) -> Optional[Dict[str, Any]]:
         existing = self.get_listing(listing_id)
         if not existing:
@@ -885,6 +1005,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchone()
         return self._row_to_source(row) if row else None
 
+    @_serialized
     def create_source(self, payload: SoberLivingDirectorySourceCreate) -> Dict[str, Any]:
         conn = self.connect()
         source_id = f"src_{uuid.uuid4().hex[:12]}"
@@ -915,6 +1036,7 @@ class SoberLivingDirectoryDatabase:
         conn.commit()
         return self.get_source(source_id)
 
+    @_serialized
     def update_source(self, source_id: str, payload: SoberLivingDirectorySourceUpdate) -> Optional[Dict[str, Any]]:
         existing = self.get_source(source_id)
         if not existing:
@@ -972,6 +1094,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchone()
         return self._row_to_discovery_job(row) if row else None
 
+    @_serialized
     def create_discovery_job(self, payload: DiscoveryJobCreate) -> Dict[str, Any]:
         if not self.get_source(payload.source_id):
             raise ValueError("Source not found for discovery job")
@@ -1021,6 +1144,7 @@ class SoberLivingDirectoryDatabase:
         conn.commit()
         return self.get_discovery_job(job_id)
 
+    @_serialized
     def update_discovery_job(self, job_id: str, payload: DiscoveryJobUpdate) -> Optional[Dict[str, Any]]:
         existing = self.get_discovery_job(job_id)
         if not existing:
@@ -1142,6 +1266,7 @@ class SoberLivingDirectoryDatabase:
     def mark_manual_run_finished(self, job_id: str, status: str) -> Dict[str, Any]:
         return self._mark_job_run_finished(job_id, status=status, scheduled=False)
 
+    @_serialized
     def _mark_job_run_started(self, job_id: str, *, scheduled: bool) -> Dict[str, Any]:
         job = self.get_discovery_job(job_id)
         if not job:
@@ -1163,6 +1288,7 @@ class SoberLivingDirectoryDatabase:
             raise ValueError("Discovery job not found")
         return updated
 
+    @_serialized
     def _mark_job_run_finished(self, job_id: str, *, status: str, scheduled: bool) -> Dict[str, Any]:
         job = self.get_discovery_job(job_id)
         if not job:
@@ -1262,6 +1388,7 @@ class SoberLivingDirectoryDatabase:
         run["raw_records"] = self.list_raw_records(run_id=run_id)
         return run
 
+    @_serialized
     def _create_discovery_run(
         self,
         *,
@@ -1301,6 +1428,7 @@ class SoberLivingDirectoryDatabase:
         conn.commit()
         return run_id
 
+    @_serialized
     def _finish_discovery_run(
         self,
         run_id: str,
@@ -1312,6 +1440,7 @@ class SoberLivingDirectoryDatabase:
         errors_count: int,
         error_message: Optional[str] = None,
         notes: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None,
     ):
         if status not in ALLOWED_DISCOVERY_RUN_STATUSES:
             raise ValueError("Invalid discovery run status")
@@ -1320,7 +1449,8 @@ class SoberLivingDirectoryDatabase:
             """
             UPDATE sober_living_discovery_runs
             SET finished_at = ?, status = ?, records_found = ?, raw_records_created = ?,
-                duplicates_detected = ?, errors_count = ?, error_message = ?, notes = ?
+                duplicates_detected = ?, errors_count = ?, error_message = ?, notes = ?,
+                stage_timings_json = ?
             WHERE run_id = ?
             """,
             (
@@ -1332,6 +1462,7 @@ class SoberLivingDirectoryDatabase:
                 errors_count,
                 error_message,
                 notes,
+                json.dumps(stage_timings) if stage_timings is not None else None,
                 run_id,
             ),
         )
@@ -1455,6 +1586,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchall()
         return [self._row_to_duplicate_candidate(row) for row in rows]
 
+    @_serialized
     def approve_raw_record(
         self,
         raw_id: str,
@@ -1524,6 +1656,7 @@ class SoberLivingDirectoryDatabase:
     def mark_raw_record_error(self, raw_id: str, *, review_notes: Optional[str] = None) -> Dict[str, Any]:
         return self._update_raw_record_review_status(raw_id, status="error", review_notes=review_notes, change_type="raw_record_marked_error")
 
+    @_serialized
     def _update_raw_record_review_status(
         self,
         raw_id: str,
@@ -1581,6 +1714,7 @@ class SoberLivingDirectoryDatabase:
             notes=notes,
         )
 
+    @_serialized
     def record_discovery_run_failure(
         self,
         *,
@@ -1624,6 +1758,7 @@ class SoberLivingDirectoryDatabase:
         self._mark_job_run_finished(job_id, status="failed", scheduled=trigger_type == "scheduled")
         return self.get_discovery_run(run_id)
 
+    @_serialized
     def process_discovery_records(
         self,
         *,
@@ -1632,6 +1767,8 @@ class SoberLivingDirectoryDatabase:
         records: List[Dict[str, Any]],
         trigger_type: str = "manual",
         notes: Optional[str] = None,
+        fuzzy_names: bool = False,
+        timer: Optional[StageTimer] = None,
     ) -> Dict[str, Any]:
         job = self.get_discovery_job(job_id)
         if not job:
@@ -1644,51 +1781,45 @@ class SoberLivingDirectoryDatabase:
             notes=notes,
         )
 
-        records_found = 0
-        raw_records_created = 0
-        duplicates_detected = 0
-        errors_count = 0
+        timer = timer or StageTimer()
+        result = IngestResult()
         try:
-            for record in records:
-                records_found += 1
-                duplicate = self.find_possible_duplicate(
-                    name=record.get("name"),
-                    city=record.get("city"),
-                    phone=record.get("phone"),
-                    website=record.get("website"),
-                )
-                raw_id = self.create_raw_listing(
-                    source_id=source_id,
-                    run_id=run_id,
-                    source_url=record.get("source_url") or record.get("website"),
-                    raw_name=record.get("name"),
-                    raw_address=record.get("address"),
-                    raw_phone=record.get("phone"),
-                    raw_email=record.get("email"),
-                    raw_website=record.get("website"),
-                    raw_text=json.dumps(record),
-                    extracted_json=record,
-                    matched_listing_id=duplicate["listing_id"] if duplicate else None,
-                    review_status="possible_duplicate" if duplicate else "new",
-                )
-                raw_records_created += 1
-                if duplicate:
-                    duplicates_detected += 1
-                    confidence_score, match_reasons = self.score_duplicate_candidate(
+            result = self.bulk_ingest(
+                [
+                    IngestRecord(
+                        raw={
+                            "source_url": record.get("source_url") or record.get("website"),
+                            "raw_name": record.get("name"),
+                            "raw_address": record.get("address"),
+                            "raw_phone": record.get("phone"),
+                            "raw_email": record.get("email"),
+                            "raw_website": record.get("website"),
+                            "extracted_json": record,
+                        },
                         name=record.get("name"),
                         city=record.get("city"),
                         phone=record.get("phone"),
                         website=record.get("website"),
-                        existing_listing=duplicate,
-                    )
-                    self.create_duplicate_candidate(
-                        raw_id=raw_id,
-                        existing_listing_id=duplicate["listing_id"],
-                        proposed_name=record.get("name"),
-                        existing_name=duplicate.get("name"),
-                        match_reasons=match_reasons or ["possible_duplicate"],
-                        confidence_score=confidence_score,
                     )
+                    for record in records
+                ],
+                source_id=source_id,
+                run_id=run_id,
+                fuzzy_names=fuzzy_names,
+                timer=timer,
+            )
+            # Commits the staged rows together with the completed run record.
+            self._finish_discovery_run(
+                run_id,
+                status="completed",
+                records_found=len(records),
+                raw_records_created=result.raw_records_created,
+                duplicates_detected=result.duplicates_detected,
+                errors_count=len(result.errors),
+                error_message="; ".join(result.errors[:5]) or None,
+                notes=notes,
+                stage_timings=timer.timings_ms,
+            )
 
             now = utcnow_iso()
             job_updates = {"last_run_status": "completed"}
@@ -1701,27 +1832,18 @@ class SoberLivingDirectoryDatabase:
                 source_id,
                 SoberLivingDirectorySourceUpdate(last_checked_at=now),
             )
-            self._finish_discovery_run(
-                run_id,
-                status="completed",
-                records_found=records_found,
-                raw_records_created=raw_records_created,
-                duplicates_detected=duplicates_detected,
-                errors_count=errors_count,
-                notes=notes,
-            )
             self._mark_job_run_finished(job_id, status="completed", scheduled=trigger_type == "scheduled")
         except Exception as exc:
-            errors_count += 1
             self._finish_discovery_run(
                 run_id,
                 status="failed",
-                records_found=records_found,
-                raw_records_created=raw_records_created,
-                duplicates_detected=duplicates_detected,
-                errors_count=errors_count,
+                records_found=len(records),
+                raw_records_created=0,
+                duplicates_detected=0,
+                errors_count=len(result.errors) + 1,
                 error_message=str(exc),
                 notes=notes,
+                stage_timings=timer.timings_ms,
             )
             self._mark_job_run_finished(job_id, status="failed", scheduled=trigger_type == "scheduled")
             raise
@@ -1786,6 +1908,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchall()
         return [self._row_to_task(row) for row in rows]
 
+    @_serialized
     def create_task(self, payload: VerificationTaskCreate) -> Dict[str, Any]:
         if not self.get_listing(payload.listing_id):
             raise ValueError("Listing not found for verification task")
@@ -1825,6 +1948,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchone()
         return self._row_to_task(row) if row else None
 
+    @_serialized
     def update_task(self, task_id: str, payload: VerificationTaskUpdate) -> Optional[Dict[str, Any]]:
         existing = self.get_task(task_id)
         if not existing:
@@ -1873,6 +1997,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchall()
         return [dict(row) for row in rows]
 
+    @_serialized
     def create_duplicate_candidate(
         self,
         *,
@@ -1895,30 +2020,16 @@ class SoberLivingDirectoryDatabase:
         if existing:
             return self._row_to_duplicate_candidate(existing)
 
-        candidate_id = f"dup_{uuid.uuid4().hex[:12]}"
-        timestamp = utcnow_iso()
-        conn.execute(
-            """
-            INSERT INTO sober_living_duplicate_candidates (
-                candidate_id, raw_id, existing_listing_id, proposed_name, existing_name,
-                confidence_score, match_reasons_json, status, resolution_notes, created_at, updated_at, resolved_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                candidate_id,
-                raw_id,
-                existing_listing_id,
-                proposed_name,
-                existing_name,
-                confidence_score,
-                self._serialize_json_list(match_reasons),
-                "open",
-                None,
-                timestamp,
-                timestamp,
-                None,
-            ),
+        row_values = self._duplicate_candidate_row(
+            raw_id=raw_id,
+            existing_listing_id=existing_listing_id,
+            proposed_name=proposed_name,
+            existing_name=existing_name,
+            match_reasons=match_reasons,
+            confidence_score=confidence_score,
         )
+        candidate_id = row_values[0]
+        conn.execute(DUPLICATE_CANDIDATE_INSERT_SQL, row_values)
         conn.commit()
         row = conn.execute(
             "SELECT * FROM sober_living_duplicate_candidates WHERE candidate_id = ?",
@@ -1926,6 +2037,34 @@ class SoberLivingDirectoryDatabase:
         ).fetchone()
         return self._row_to_duplicate_candidate(row)
 
+    def _duplicate_candidate_row(
+        self,
+        *,
+        raw_id: str,
+        existing_listing_id: str,
+        proposed_name: Optional[str],
+        existing_name: Optional[str],
+        match_reasons: List[str],
+        confidence_score: int,
+        timestamp: Optional[str] = None,
+    ) -> tuple:
+        timestamp = timestamp or utcnow_iso()
+        return (
+            f"dup_{uuid.uuid4().hex[:12]}",
+            raw_id,
+            existing_listing_id,
+            proposed_name,
+            existing_name,
+            confidence_score,
+            self._serialize_json_list(match_reasons),
+            "open",
+            None,
+            timestamp,
+            timestamp,
+            None,
+        )
+
+    @_serialized
     def resolve_duplicate_candidate(
         self,
         candidate_id: str,
@@ -2017,6 +2156,7 @@ class SoberLivingDirectoryDatabase:
         ).fetchone()
         return self._row_to_duplicate_candidate(resolved_row) if resolved_row else None
 
+    @_serialized
     def create_raw_listing(
         self,
         *,
@@ -2034,41 +2174,66 @@ class SoberLivingDirectoryDatabase:
         review_status: str = "new",
         review_notes: Optional[str] = None,
     ) -> str:
-        if review_status not in ALLOWED_RAW_REVIEW_STATUSES:
-            raise ValueError("Invalid raw listing review status")
         conn = self.connect()
-        raw_id = f"raw_{uuid.uuid4().hex[:12]}"
-        content_hash = hashlib.sha256(raw_text.encode("utf-8", errors="ignore")).hexdigest()
-        conn.execute(
-            """
-            INSERT INTO sober_living_raw_listings (
-                raw_id, source_id, run_id, source_url, raw_name, raw_address, raw_phone, raw_email,
-                raw_website, raw_text, extracted_json, content_hash, discovered_at,
-                matched_listing_id, review_status, review_notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                raw_id,
-                source_id,
-                run_id,
-                source_url,
-                raw_name,
-                raw_address,
-                raw_phone,
-                raw_email,
-                raw_website,
-                raw_text,
-                json.dumps(extracted_json or {}),
-                content_hash,
-                utcnow_iso(),
-                matched_listing_id,
-                review_status,
-                review_notes,
-            ),
+        row_values = self._raw_listing_row(
+            source_id=source_id,
+            run_id=run_id,
+            source_url=source_url,
+            raw_name=raw_name,
+            raw_address=raw_address,
+            raw_phone=raw_phone,
+            raw_email=raw_email,
+            raw_website=raw_website,
+            raw_text=raw_text,
+            extracted_json=extracted_json,
+            matched_listing_id=matched_listing_id,
+            review_status=review_status,
+            review_notes=review_notes,
         )
+        conn.execute(RAW_LISTING_INSERT_SQL, row_values)
         conn.commit()
-        return raw_id
+        return row_values[0]
 
+    def _raw_listing_row(
+        self,
+        *,
+        source_id: Optional[str],
+        run_id: Optional[str] = None,
+        source_url: Optional[str],
+        raw_name: Optional[str],
+        raw_address: Optional[str],
+        raw_phone: Optional[str],
+        raw_email: Optional[str],
+        raw_website: Optional[str],
+        raw_text: str,
+        extracted_json: Dict[str, Any],
+        matched_listing_id: Optional[str] = None,
+        review_status: str = "new",
+        review_notes: Optional[str] = None,
+        discovered_at: Optional[str] = None,
+    ) -> tuple:
+        if review_status not in ALLOWED_RAW_REVIEW_STATUSES:
+            raise ValueError("Invalid raw listing review status")
+        return (
+            f"raw_{uuid.uuid4().hex[:12]}",
+            source_id,
+            run_id,
+            source_url,
+            raw_name,
+            raw_address,
+            raw_phone,
+            raw_email,
+            raw_website,
+            raw_text,
+            json.dumps(extracted_json or {}),
+            hashlib.sha256(raw_text.encode("utf-8", errors="ignore")).hexdigest(),
+            discovered_at or utcnow_iso(),
+            matched_listing_id,
+            review_status,
+            review_notes,
+        )
+
+    @_serialized
     def get_or_create_source(
         self,
         *,
@@ -2122,6 +2287,169 @@ class SoberLivingDirectoryDatabase:
         conn.commit()
         return source_id
 
+    @_serialized
+    def bulk_ingest(
+        self,
+        records: List[IngestRecord],
+        *,
+        source_id: str,
+        run_id: Optional[str] = None,
+        new_review_status: str = "new",
+        import_file_name: Optional[str] = None,
+        fuzzy_names: bool = False,
+        chunk_size: Optional[int] = None,
+        timer: Optional[StageTimer] = None,
+    ) -> IngestResult:
+        """Stage raw listings, imported listings and duplicate candidates for a batch in one transaction.
+
+        Records that fail validation or whose rows cannot be written are
+        reported in ``errors`` and skipped. The transaction is left open for the
+        caller to commit alongside its own bookkeeping (holding ``write_lock``
+        until then); it is rolled back if anything else fails.
+        """
+        chunk_size = chunk_size or INGEST_CHUNK_SIZE
+        timer = timer or StageTimer()
+        result = IngestResult(stage_timings_ms=timer.timings_ms)
+        conn = self.connect()
+        timestamp = utcnow_iso()
+
+        with timer.stage("index"):
+            index = self.build_duplicate_index(fuzzy_names=fuzzy_names)
+            next_row_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM sober_living_directory_listings").fetchone()[0]
+
+        units: List[IngestUnit] = []
+        listing_units: Set[int] = set()
+        # (record position, raw_id, existing listing_id, proposed name, incoming lookup keys, fuzzy match)
+        pairs: List[tuple] = []
+        with timer.stage("match"):
+            for position, record in enumerate(records):
+                try:
+                    match = index.match(name=record.name, city=record.city, phone=record.phone, website=record.website)
+                    listing_data = None
+                    if match is None and record.listing is not None:
+                        listing_data = self._prepare_listing_data(SoberLivingDirectoryListingCreate(**record.listing))
+                    raw_row = self._raw_listing_row(
+                        source_id=source_id,
+                        run_id=run_id,
+                        raw_text=record.raw_text if record.raw_text is not None else json.dumps(record.raw.get("extracted_json") or {}),
+                        matched_listing_id=match.listing_id if match else None,
+                        review_status="possible_duplicate" if match else new_review_status,
+                        discovered_at=timestamp,
+                        **record.raw,
+                    )
+                except Exception as exc:
+                    result.errors.append(f"record {position + 1}: {exc}")
+                    continue
+
+                raw_id = raw_row[0]
+                statements = [(RAW_LISTING_INSERT_SQL, raw_row)]
+                if match:
+                    pairs.append((
+                        position,
+                        raw_id,
+                        match.listing_id,
+                        record.name,
+                        lookup_keys(record.name, record.city, record.phone, record.website),
+                        match.reason == "similar_name",
+                    ))
+                elif listing_data:
+                    listing_id = listing_data["listing_id"]
+                    statements.append((LISTING_INSERT_SQL, self._listing_insert_row(listing_data)))
+                    statements.append((
+                        CHANGE_LOG_INSERT_SQL,
+                        self._change_log_row(listing_id, "new_listing", None, listing_data["name"], detected_at=timestamp),
+                    ))
+                    if import_file_name:
+                        statements.append((
+                            CHANGE_LOG_INSERT_SQL,
+                            self._change_log_row(
+                                listing_id,
+                                "imported_from_file",
+                                None,
+                                import_file_name,
+                                raw_id=raw_id,
+                                source_id=source_id,
+                                detected_at=timestamp,
+                            ),
+                        ))
+                    next_row_id += 1
+                    index.add({**listing_data, "id": next_row_id})
+                    listing_units.add(position)
+                units.append(IngestUnit(position, statements))
+
+        with bulk_transaction(conn):
+            with timer.stage("write"):
+                failed = write_units(conn, units, chunk_size)
+            result.errors.extend(f"record {key + 1}: {error}" for key, error in failed.items())
+            result.raw_records_created = len(units) - len(failed)
+            result.listings_created = len(listing_units - failed.keys())
+            pairs = [pair for pair in pairs if pair[0] not in failed]
+            result.duplicates_detected = len(pairs)
+
+            with timer.stage("score"):
+                existing = self._duplicate_lookup_rows({pair[2] for pair in pairs})
+                pairs = [pair for pair in pairs if pair[2] in existing]
+                scores = score_duplicate_pairs(
+                    [pair[4] for pair in pairs],
+                    [existing[pair[2]][1] for pair in pairs],
+                    [pair[5] for pair in pairs],
+                )
+
+            with timer.stage("candidates"):
+                candidate_units = [
+                    IngestUnit(position, [(
+                        DUPLICATE_CANDIDATE_INSERT_SQL,
+                        self._duplicate_candidate_row(
+                            raw_id=raw_id,
+                            existing_listing_id=existing_listing_id,
+                            proposed_name=proposed_name,
+                            existing_name=existing[existing_listing_id][0],
+                            match_reasons=reasons or ["possible_duplicate"],
+                            confidence_score=score,
+                            timestamp=timestamp,
+                        ),
+                    )])
+                    for (position, raw_id, existing_listing_id, proposed_name, _, _), (score, reasons)
+                    in zip(pairs, scores)
+                ]
+                failed = write_units(conn, candidate_units, chunk_size)
+            result.errors.extend(f"record {key + 1}: {error}" for key, error in failed.items())
+        return result
+
+    def _duplicate_lookup_rows(self, listing_ids: Set[str]) -> Dict[str, tuple]:
+        """``listing_id -> (name, lookup keys)`` for duplicate scoring."""
+        conn = self.connect()
+        ids = sorted(listing_ids)
+        rows: Dict[str, tuple] = {}
+        for start in range(0, len(ids), INGEST_CHUNK_SIZE):
+            chunk = ids[start:start + INGEST_CHUNK_SIZE]
+            for row in conn.execute(
+                f"""
+                SELECT listing_id, name, lookup_name, lookup_city, lookup_phone, lookup_website
+                FROM sober_living_directory_listings
+                WHERE listing_id IN ({', '.join('?' for _ in chunk)})
+                """,
+                chunk,
+            ):
+                rows[row["listing_id"]] = (
+                    row["name"],
+                    (row["lookup_name"] or "", row["lookup_city"] or "", row["lookup_phone"], row["lookup_website"]),
+                )
+        return rows
+
+    def build_duplicate_index(self, *, fuzzy_names: bool = False) -> DuplicateBlockingIndex:
+        """Load every listing's lookup keys once for a batch of duplicate checks."""
+        rows = self.connect().execute(
+            """
+            SELECT id, listing_id, status, name, lookup_name, lookup_city, lookup_phone, lookup_website
+            FROM sober_living_directory_listings
+            """
+        ).fetchall()
+        return DuplicateBlockingIndex.build(
+            rows,
+            fuzzy_threshold=FUZZY_NAME_THRESHOLD if fuzzy_names else None,
+        )
+
     def find_possible_duplicate(
         self,
         *,
@@ -2129,28 +2457,47 @@ class SoberLivingDirectoryDatabase:
         city: Optional[str],
         phone: Optional[str],
         website: Optional[str],
+        index: Optional[DuplicateBlockingIndex] = None,
     ) -> Optional[Dict[str, Any]]:
+        """Return the first listing (in ``list_listings`` order) sharing a phone, website or name+city.
+
+        Batch callers pass an ``index`` from ``build_duplicate_index``; single
+        lookups go through the indexed ``lookup_*`` columns.
+        """
         if not name:
             return None
 
-        normalized_name = self._normalize_lookup(name)
-        normalized_city = self._normalize_lookup(city)
-        normalized_phone = self._normalize_phone(phone)
-        normalized_website = self._normalize_website(website)
-
-        for candidate in self.list_listings():
-            candidate_name = self._normalize_lookup(candidate.get("name"))
-            candidate_city = self._normalize_lookup(candidate.get("city"))
-            candidate_phone = self._normalize_phone(candidate.get("phone"))
-            candidate_website = self._normalize_website(candidate.get("website"))
-
-            if normalized_phone and candidate_phone and normalized_phone == candidate_phone:
-                return candidate
-            if normalized_website and candidate_website and normalized_website == candidate_website:
-                return candidate
-            if normalized_name == candidate_name and normalized_city and normalized_city == candidate_city:
-                return candidate
-        return None
+        conn = self.connect()
+        if index is not None:
+            match = index.match(name=name, city=city, phone=phone, website=website)
+            if match is None:
+                return None
+            row = conn.execute(
+                "SELECT * FROM sober_living_directory_listings WHERE listing_id = ?",
+                (match.listing_id,),
+            ).fetchone()
+            if not row:
+                return None
+            listing = self._row_to_listing(row)
+            if match.reason != "exact":
+                listing["duplicate_match_reason"] = match.reason
+                listing["name_similarity"] = match.similarity
+            return listing
+
+        name_key, city_key, phone_key, website_key = lookup_keys(name, city, phone, website)
+        row = conn.execute(
+            f"""
+            SELECT *
+            FROM sober_living_directory_listings
+            WHERE lookup_phone = ?
+               OR lookup_website = ?
+               OR (lookup_name = ? AND lookup_city = ?)
+            ORDER BY {LISTING_ORDER_SQL}
+            LIMIT 1
+            """,
+            (phone_key, website_key, name_key, city_key or None),
+        ).fetchone()
+        return self._row_to_listing(row) if row else None
 
     def score_duplicate_candidate(
         self,
@@ -2185,6 +2532,9 @@ class SoberLivingDirectoryDatabase:
         if normalized_city and existing_city and normalized_city == existing_city:
             score += 15
             reasons.append("city_match")
+        if existing_listing.get("duplicate_match_reason") == "similar_name":
+            score += 20
+            reasons.append("similar_name")
 
         return min(score, 100), reasons
 
@@ -2347,24 +2697,11 @@ class SoberLivingDirectoryDatabase:
                 values.append(normalized)
         return values
 
-    @staticmethod
-    def _normalize_lookup(value: Optional[str]) -> str:
-        return "".join(ch.lower() for ch in str(value or "") if ch.isalnum() or ch.isspace()).strip()
-
-    @staticmethod
-    def _normalize_phone(value: Optional[str]) -> str:
-        return "".join(ch for ch in str(value or "") if ch.isdigit())
-
-    @staticmethod
-    def _normalize_website(value: Optional[str]) -> str:
-        website = str(value or "").strip().lower()
-        for prefix in ("https://", "http://"):
-            if website.startswith(prefix):
-                website = website[len(prefix):]
-        if website.startswith("www."):
-            website = website[4:]
-        return website.rstrip("/")
+    _normalize_lookup = staticmethod(normalize_lookup)
+    _normalize_phone = staticmethod(normalize_phone)
+    _normalize_website = staticmethod(normalize_website)
 
+    @_serialized
     def _insert_change_log(
         self,
         listing_id: Optional[str],
@@ -2376,23 +2713,38 @@ class SoberLivingDirectoryDatabase:
     ):
         conn = self.connect()
         conn.execute(
-            """
-            INSERT INTO sober_living_directory_change_log (
-                change_id, listing_id, raw_id, change_type, old_value, new_value, source_id, detected_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                f"chg_{uuid.uuid4().hex[:12]}",
-                listing_id,
-                raw_id,
-                change_type,
-                old_value,
-                new_value,
-                source_id,
-                utcnow_iso(),
+            CHANGE_LOG_INSERT_SQL,
+            self._change_log_row(
+                listing_id=listing_id,
+                change_type=change_type,
+                old_value=old_value,
+                new_value=new_value,
+                raw_id=raw_id,
+                source_id=source_id,
             ),
         )
 
+    @staticmethod
+    def _change_log_row(
+        listing_id: Optional[str],
+        change_type: str,
+        old_value: Optional[str],
+        new_value: Optional[str],
+        raw_id: Optional[str] = None,
+        source_id: Optional[str] = None,
+        detected_at: Optional[str] = None,
+    ) -> tuple:
+        return (
+            f"chg_{uuid.uuid4().hex[:12]}",
+            listing_id,
+            raw_id,
+            change_type,
+            old_value,
+            new_value,
+            source_id,
+            detected_at or utcnow_iso(),
+        )
+
     @staticmethod
     def _merge_notes(existing_notes: Optional[str], new_notes: Optional[str]) -> Optional[str]:
         if not new_notes:
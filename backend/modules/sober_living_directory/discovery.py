@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import logging
 import re
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, ContextManager, Dict, List
 from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
 from .database import SoberLivingDirectoryDatabase
+from .fetcher import DirectoryFetcher
 from .importer import SoberLivingDirectoryImporter
+from .ingestion import StageTimer
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,14 @@ class SoberLivingDiscoveryService:
         self.db = db
         self.importer = SoberLivingDirectoryImporter(db)
         self.workspace_root = Path(__file__).resolve().parents[3]
+        self.fetcher = DirectoryFetcher(
+            Path(db.db_path).with_name("sober_living_fetch_cache.db"),
+            user_agent=self.REMOTE_USER_AGENT,
+            timeout_seconds=self.REQUEST_TIMEOUT_SECONDS,
+            max_response_bytes=self.MAX_REMOTE_RESPONSE_BYTES,
+        )
+        # Per-thread state of the job run in progress (timer, unchanged-page skip).
+        self._run_state = threading.local()
 
     def run_job(self, job_id: str, *, trigger_type: str = "manual") -> Dict[str, Any]:
         job = self.db.get_discovery_job(job_id)
@@ -66,6 +77,13 @@ class SoberLivingDiscoveryService:
         else:
             self.db.mark_manual_run_started(job_id)
 
+        timer = StageTimer()
+        # Scheduled runs skip parsing a remote page this job already processed unchanged.
+        self._run_state.timer = timer
+        self._run_state.skip_unchanged = trigger_type == "scheduled"
+        self._run_state.unchanged = False
+        self._run_state.job_key = self._processed_page_key(job)
+        self._run_state.pages = []
         try:
             records = self._load_records_for_source(source, job)
         except Exception as exc:
@@ -78,14 +96,43 @@ class SoberLivingDiscoveryService:
                 error_message=str(exc),
             )
             raise
+        finally:
+            self._run_state.timer = None
+            self._run_state.skip_unchanged = False
+            self._run_state.job_key = None
+        pages, self._run_state.pages = self._run_state.pages, []
         notes = self._build_run_notes(source=source, job=job, records=records)
-        return self.db.process_discovery_records(
+        source_unchanged = trigger_type == "scheduled" and self._run_state.unchanged
+        if source_unchanged:
+            notes = f"{notes} Source page unchanged since this job last processed it; parsing skipped."
+        run = self.db.process_discovery_records(
             job_id=job_id,
             source_id=source["source_id"],
             records=records,
             trigger_type=trigger_type,
             notes=notes,
+            timer=timer,
         )
+        # Only a run that got this far counts as having processed the page.
+        job_key = self._processed_page_key(job)
+        for url, body_hash in pages:
+            self.fetcher.mark_processed(job_key, url, body_hash)
+        run["source_unchanged"] = source_unchanged
+        return run
+
+    @staticmethod
+    def _processed_page_key(job: Dict[str, Any]) -> str:
+        """Per-job key for the processed-page hashes, including the filters the page is read with."""
+        target_city = (job.get("target_city") or "").strip().lower()
+        target_state = (job.get("target_state") or "").strip().upper()
+        return f"{job['job_id']}|{target_city}|{target_state}"
+
+    def _stage(self, name: str) -> ContextManager[None]:
+        timer = getattr(self._run_state, "timer", None)
+        return timer.stage(name) if timer else contextlib.nullcontext()
+
+    def _skip_unchanged_page(self) -> bool:
+        return bool(getattr(self._run_state, "skip_unchanged", False) and getattr(self._run_state, "unchanged", False))
 
     def search_live_results(
         self,
@@ -175,15 +222,17 @@ class SoberLivingDiscoveryService:
         if suffix not in {".xlsx", ".csv"}:
             raise ValueError("Spreadsheet source must be a .xlsx or .csv file")
 
-        content = file_path.read_bytes()
-        rows = list(self.importer._extract_rows(file_name=file_path.name, content=content))
-        normalized_records: List[Dict[str, Any]] = []
-        for row in rows:
-            if not row:
-                continue
-            normalized = self.importer._normalize_row(row, file_name=file_path.name)
-            if normalized.get("name") and normalized.get("city"):
-                normalized_records.append(normalized)
+        with self._stage("fetch"):
+            content = file_path.read_bytes()
+        with self._stage("parse"):
+            rows = list(self.importer._extract_rows(file_name=file_path.name, content=content))
+            normalized_records: List[Dict[str, Any]] = []
+            for row in rows:
+                if not row:
+                    continue
+                normalized = self.importer._normalize_row(row, file_name=file_path.name)
+                if normalized.get("name") and normalized.get("city"):
+                    normalized_records.append(normalized)
         return normalized_records
 
     def _load_ccapp_directory_records(self, source: Dict[str, Any], job: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -194,9 +243,13 @@ class SoberLivingDiscoveryService:
         if not self._is_ccapp_source(source):
             raise ValueError("Unsupported certification directory source")
 
-        html = self._fetch_remote_text(base_url)
-        records = self._parse_ccapp_search_results(html=html, base_url=base_url)
-        return self._filter_records_for_job(records=records, job=job)
+        with self._stage("fetch"):
+            html = self._fetch_remote_text(base_url)
+        if self._skip_unchanged_page():
+            return []
+        with self._stage("parse"):
+            records = self._parse_ccapp_search_results(html=html, base_url=base_url)
+            return self._filter_records_for_job(records=records, job=job)
 
     def _is_ccapp_source(self, source: Dict[str, Any]) -> bool:
         base_url = (source.get("base_url") or "").strip()
@@ -233,21 +286,14 @@ class SoberLivingDiscoveryService:
         return source.get("source_type") or "unknown"
 
     def _fetch_remote_text(self, url: str) -> str:
-        response = requests.get(
-            url,
-            timeout=self.REQUEST_TIMEOUT_SECONDS,
-            headers={
-                "User-Agent": self.REMOTE_USER_AGENT,
-                "Accept": "text/html,application/xhtml+xml",
-            },
-        )
-        response.raise_for_status()
-        content = response.content
-        if len(content) > self.MAX_REMOTE_RESPONSE_BYTES:
-            raise ValueError(
-                f"Remote connector response exceeded {self.MAX_REMOTE_RESPONSE_BYTES} bytes for {url}"
+        result = self.fetcher.fetch(url)
+        job_key = getattr(self._run_state, "job_key", None)
+        if job_key:
+            self._run_state.pages.append((url, result.body_hash))
+            self._run_state.unchanged = (
+                self._run_state.skip_unchanged and self.fetcher.processed_hash(job_key, url) == result.body_hash
             )
-        return content.decode(response.encoding or "utf-8", errors="replace")
+        return result.text
 
     def _parse_ccapp_search_results(self, *, html: str, base_url: str) -> List[Dict[str, Any]]:
         soup = BeautifulSoup(html, "html.parser")
@@ -341,14 +387,18 @@ class SoberLivingDiscoveryService:
         if not self._is_oxford_source(source):
             raise ValueError("Unsupported Oxford House directory source")
 
-        html = self._fetch_remote_text(base_url)
-        records = self._parse_oxford_vacancy_results(
-            html=html,
-            base_url=base_url,
-            job=job,
-            source_name=source.get("source_name") or "Oxford House",
-        )
-        return self._filter_records_for_job(records=records, job=job)
+        with self._stage("fetch"):
+            html = self._fetch_remote_text(base_url)
+        if self._skip_unchanged_page():
+            return []
+        with self._stage("parse"):
+            records = self._parse_oxford_vacancy_results(
+                html=html,
+                base_url=base_url,
+                job=job,
+                source_name=source.get("source_name") or "Oxford House",
+            )
+            return self._filter_records_for_job(records=records, job=job)
 
     def _parse_oxford_vacancy_results(
         self,
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Trigram Jaccard similarity at or above which two names in the same city are
+# treated as a possible duplicate when fuzzy matching is enabled.
+FUZZY_NAME_THRESHOLD = 0.8
+
+
+def normalize_lookup(value: Optional[str]) -> str:
+    return "".join(ch.lower() for ch in str(value or "") if ch.isalnum() or ch.isspace()).strip()
+
+
+def normalize_phone(value: Optional[str]) -> str:
+    return "".join(ch for ch in str(value or "") if ch.isdigit())
+
+
+def normalize_website(value: Optional[str]) -> str:
+    website = str(value or "").strip().lower()
+    for prefix in ("https://", "http://"):
+        if website.startswith(prefix):
+            website = website[len(prefix):]
+    if website.startswith("www."):
+        website = website[4:]
+    return website.rstrip("/")
+
+
+def lookup_keys(
+    name: Optional[str],
+    city: Optional[str],
+    phone: Optional[str],
+    website: Optional[str],
+) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """Persisted lookup columns for a listing: (name, city, phone, website).
+
+    Empty phone / website keys are ``None`` so they never match each other.
+    """
+    return (
+        normalize_lookup(name),
+        normalize_lookup(city),
+        normalize_phone(phone) or None,
+        normalize_website(website) or None,
+    )
+
+
+def name_trigrams(normalized_name: str) -> FrozenSet[str]:
+    padded = f"  {normalized_name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+# Mirrors the status ordering of ``list_listings``; unknown statuses sort last.
+LISTING_STATUS_RANK = {
+    "pending_review": 1,
+    "needs_reverification": 2,
+    "use_caution": 3,
+    "approved": 4,
+    "do_not_refer": 5,
+    "archived": 6,
+}
+
+SortKey = Tuple[int, str, int]
+
+
+def listing_sort_key(status: Optional[str], name: Optional[str], row_id: Optional[int]) -> SortKey:
+    return (LISTING_STATUS_RANK.get(status or "", 7), str(name or "").lower(), int(row_id or 0))
+
+
+@dataclass
+class DuplicateMatch:
+    listing_id: str
+    # "exact" for phone / website / name+city key matches, "similar_name" for fuzzy ones.
+    reason: str
+    similarity: float = 1.0
+
+
+@dataclass
+class DuplicateBlockingIndex:
+    """In-memory blocking index over directory listings for one import or discovery run.
+
+    Every key keeps the listing that sorts first in ``list_listings`` order, so a
+    lookup returns the same listing the old per-record scan over
+    ``list_listings()`` returned. Fuzzy name candidates are blocked by city.
+    """
+
+    fuzzy_threshold: Optional[float] = None
+    _by_phone: Dict[str, Tuple[SortKey, str]] = field(default_factory=dict)
+    _by_website: Dict[str, Tuple[SortKey, str]] = field(default_factory=dict)
+    _by_name_city: Dict[Tuple[str, str], Tuple[SortKey, str]] = field(default_factory=dict)
+    _by_city: Dict[str, List[Tuple[SortKey, str, FrozenSet[str]]]] = field(default_factory=dict)
+    _size: int = 0
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]],
+              fuzzy_threshold: Optional[float] = None) -> "DuplicateBlockingIndex":
+        """``rows`` carry ``id``, ``listing_id``, ``status`` and the persisted ``lookup_*`` columns."""
+        index = cls(fuzzy_threshold=fuzzy_threshold)
+        for row in rows:
+            index._add_keys(
+                listing_sort_key(row["status"], row["name"], row["id"]),
+                row["listing_id"],
+                row["lookup_name"] or "",
+                row["lookup_city"] or "",
+                row["lookup_phone"],
+                row["lookup_website"],
+            )
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, listing: Dict[str, Any]) -> None:
+        """Index a listing created during the run."""
+        self._add_keys(
+            listing_sort_key(listing.get("status"), listing.get("name"), listing.get("id")),
+            listing["listing_id"],
+            *lookup_keys(listing.get("name"), listing.get("city"), listing.get("phone"), listing.get("website")),
+        )
+
+    def _add_keys(self, sort_key: SortKey, listing_id: str, name_key: str, city_key: str,
+                  phone_key: Optional[str], website_key: Optional[str]) -> None:
+        self._size += 1
+        entry = (sort_key, listing_id)
+        for table, key in (
+            (self._by_phone, phone_key),
+            (self._by_website, website_key),
+            (self._by_name_city, (name_key, city_key) if city_key else None),
+        ):
+            if key and (key not in table or sort_key < table[key][0]):
+                table[key] = entry
+        if self.fuzzy_threshold and city_key:
+            self._by_city.setdefault(city_key, []).append((sort_key, listing_id, name_trigrams(name_key)))
+
+    def match(self, *, name: Optional[str], city: Optional[str],
+              phone: Optional[str], website: Optional[str]) -> Optional[DuplicateMatch]:
+        if not name:
+            return None
+        name_key, city_key, phone_key, website_key = lookup_keys(name, city, phone, website)
+        hits = [
+            hit
+            for hit in (
+                self._by_phone.get(phone_key) if phone_key else None,
+                self._by_website.get(website_key) if website_key else None,
+                self._by_name_city.get((name_key, city_key)) if city_key else None,
+            )
+            if hit is not None
+        ]
+        if hits:
+            return DuplicateMatch(min(hits)[1], "exact")
+        if not (self.fuzzy_threshold and city_key):
+            return None
+
+        incoming = name_trigrams(name_key)
+        best: Optional[Tuple[float, SortKey, str]] = None
+        for sort_key, listing_id, trigrams in self._by_city.get(city_key, []):
+            similarity = trigram_similarity(incoming, trigrams)
+            if similarity < self.fuzzy_threshold:
+                continue
+            if best is None or (-similarity, sort_key) < (-best[0], best[1]):
+                best = (similarity, sort_key, listing_id)
+        if best is None:
+            return None
+        return DuplicateMatch(best[2], "similar_name", round(best[0], 3))
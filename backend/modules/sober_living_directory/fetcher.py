@@ -0,0 +1,255 @@
+"""Polite, cached page fetches for the directory connectors.
+
+Concurrent scheduler runs share one ``DirectoryFetcher``:
+
+* **Per-host limits** - at most ``SOBER_LIVING_DIRECTORY_FETCH_PER_HOST``
+  requests in flight per host, and request starts to the same host spaced by
+  ``SOBER_LIVING_DIRECTORY_FETCH_MIN_INTERVAL_MS``.
+* **Conditional GETs** - the last body, ``ETag`` and ``Last-Modified`` of each
+  URL are kept in a small SQLite cache next to the directory database. Later
+  fetches send ``If-None-Match`` / ``If-Modified-Since``; a 304 (or a 200 with
+  an identical body) is reported as ``not_modified``.
+* **Processed pages** - the cache is shared by every job reading a URL, so
+  "unchanged" is decided per caller: each result carries its ``body_hash`` and
+  callers record the hash they last processed under their own key
+  (``mark_processed`` / ``processed_hash``), skipping a page only when their own
+  last successful run saw the same body.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    status_code: int
+    # True when the server answered 304 or returned the same body as last time.
+    not_modified: bool
+    elapsed_ms: float
+    body_hash: str
+
+
+class _HostSlot:
+    def __init__(self, concurrency: int) -> None:
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+
+class DirectoryFetcher:
+    def __init__(
+        self,
+        cache_path: str | Path,
+        *,
+        user_agent: str,
+        timeout_seconds: float,
+        max_response_bytes: int,
+    ) -> None:
+        self.cache_path = Path(cache_path)
+        self.user_agent = user_agent
+        self.timeout_seconds = timeout_seconds
+        self.max_response_bytes = max_response_bytes
+        self.per_host_concurrency = env_int("SOBER_LIVING_DIRECTORY_FETCH_PER_HOST", default=2, minimum=1, maximum=8)
+        self.min_interval_seconds = env_int(
+            "SOBER_LIVING_DIRECTORY_FETCH_MIN_INTERVAL_MS",
+            default=1000,
+            minimum=0,
+            maximum=60000,
+        ) / 1000
+        self._hosts: Dict[str, _HostSlot] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metrics: Dict[str, float] = {}
+        self.reset_metrics()
+
+    # ── Fetching ────────────────────────────────────────────────────────────
+
+    def fetch(self, url: str) -> FetchResult:
+        cached = self._cache_get(url)
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+        }
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        slot = self._host_slot(urlparse(url).netloc.lower())
+        with slot.semaphore:
+            self._wait_for_turn(slot)
+            started = time.perf_counter()
+            response = self._session().get(url, timeout=self.timeout_seconds, headers=headers)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if response.status_code == 304 and cached:
+            self._record(elapsed_ms, not_modified=True, size=0)
+            return FetchResult(url, cached["body"], 304, True, round(elapsed_ms, 2), cached["body_hash"])
+
+        response.raise_for_status()
+        content = response.content
+        if len(content) > self.max_response_bytes:
+            raise ValueError(f"Remote connector response exceeded {self.max_response_bytes} bytes for {url}")
+        text = content.decode(response.encoding or "utf-8", errors="replace")
+        body_hash = hashlib.sha256(content).hexdigest()
+        unchanged = bool(cached and cached["body_hash"] == body_hash)
+        self._cache_put(url, response, text, body_hash)
+        self._record(elapsed_ms, not_modified=unchanged, size=len(content))
+        return FetchResult(url, text, response.status_code, unchanged, round(elapsed_ms, 2), body_hash)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _host_slot(self, host: str) -> _HostSlot:
+        with self._lock:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = _HostSlot(self.per_host_concurrency)
+            return slot
+
+    def _wait_for_turn(self, slot: _HostSlot) -> None:
+        with slot.lock:
+            now = time.monotonic()
+            start_at = max(now, slot.next_start)
+            slot.next_start = start_at + self.min_interval_seconds
+        if start_at > now:
+            with self._lock:
+                self._metrics["politeness_wait_ms"] += (start_at - now) * 1000
+            time.sleep(start_at - now)
+
+    # ── Response cache ──────────────────────────────────────────────────────
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sober_living_fetch_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sober_living_processed_pages (
+                job_key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                processed_at REAL NOT NULL,
+                PRIMARY KEY (job_key, url)
+            )
+            """
+        )
+
+    def _connect(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        return get_connection(self.cache_path, row_factory=sqlite3.Row, on_open=self._ensure_schema)
+
+    def _cache_get(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT etag, last_modified, body, body_hash FROM sober_living_fetch_cache WHERE url = ?",
+                    (url,),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Directory fetch cache read failed: %s", exc)
+            return None
+        return dict(row) if row else None
+
+    def _cache_put(self, url: str, response: requests.Response, text: str, body_hash: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO sober_living_fetch_cache
+                        (url, etag, last_modified, body, body_hash, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        url,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        text,
+                        body_hash,
+                        time.time(),
+                    ),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Directory fetch cache write failed: %s", exc)
+
+    def processed_hash(self, job_key: str, url: str) -> Optional[str]:
+        """Body hash of ``url`` as of the last successful run recorded under ``job_key``."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT body_hash FROM sober_living_processed_pages WHERE job_key = ? AND url = ?",
+                    (job_key, url),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Directory processed-page read failed: %s", exc)
+            return None
+        return row["body_hash"] if row else None
+
+    def mark_processed(self, job_key: str, url: str, body_hash: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO sober_living_processed_pages (job_key, url, body_hash, processed_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (job_key, url, body_hash, time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Directory processed-page write failed: %s", exc)
+
+    # ── Observability ───────────────────────────────────────────────────────
+
+    def _record(self, elapsed_ms: float, *, not_modified: bool, size: int) -> None:
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["not_modified"] += int(not_modified)
+            self._metrics["bytes"] += size
+            self._metrics["fetch_ms"] += elapsed_ms
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {"requests": 0, "not_modified": 0, "bytes": 0, "fetch_ms": 0.0, "politeness_wait_ms": 0.0}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            requests_made = int(self._metrics["requests"])
+            return {
+                "requests": requests_made,
+                "not_modified": int(self._metrics["not_modified"]),
+                "bytes": int(self._metrics["bytes"]),
+                "avg_fetch_ms": round(self._metrics["fetch_ms"] / requests_made, 2) if requests_made else 0.0,
+                "politeness_wait_ms": round(self._metrics["politeness_wait_ms"], 2),
+                "per_host_concurrency": self.per_host_concurrency,
+                "min_interval_ms": int(self.min_interval_seconds * 1000),
+                "hosts": sorted(self._hosts),
+            }
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 from .database import SoberLivingDirectoryDatabase
+from .ingestion import IngestRecord
 from .models import SoberLivingDirectoryListingUpdate
 
 logger = logging.getLogger(__name__)
@@ -50,68 +51,48 @@ class SoberLivingDirectoryImporter:
             "errors": [],
         }
 
+        records: List[IngestRecord] = []
         for row in rows:
             try:
                 normalized = self._normalize_row(row, file_name=file_name)
                 if not normalized.get("name") or not normalized.get("city"):
                     continue
-
-                duplicate = self.db.find_possible_duplicate(
+                records.append(IngestRecord(
+                    raw={
+                        "source_url": normalized.get("website"),
+                        "raw_name": normalized.get("name"),
+                        "raw_address": normalized.get("address"),
+                        "raw_phone": normalized.get("phone"),
+                        "raw_email": normalized.get("email"),
+                        "raw_website": normalized.get("website"),
+                        "extracted_json": normalized,
+                    },
+                    raw_text=json.dumps(row, ensure_ascii=True),
                     name=normalized.get("name"),
                     city=normalized.get("city"),
                     phone=normalized.get("phone"),
                     website=normalized.get("website"),
-                )
-
-                raw_id = self.db.create_raw_listing(
-                    source_id=source_id,
-                    source_url=normalized.get("website"),
-                    raw_name=normalized.get("name"),
-                    raw_address=normalized.get("address"),
-                    raw_phone=normalized.get("phone"),
-                    raw_email=normalized.get("email"),
-                    raw_website=normalized.get("website"),
-                    raw_text=json.dumps(row, ensure_ascii=True),
-                    extracted_json=normalized,
-                    matched_listing_id=duplicate["listing_id"] if duplicate else None,
-                    review_status="possible_duplicate" if duplicate else "approved",
-                )
-                stats["raw_created"] += 1
-
-                if duplicate:
-                    stats["duplicates_detected"] += 1
-                    confidence_score, match_reasons = self.db.score_duplicate_candidate(
-                        name=normalized.get("name"),
-                        city=normalized.get("city"),
-                        phone=normalized.get("phone"),
-                        website=normalized.get("website"),
-                        existing_listing=duplicate,
-                    )
-                    self.db.create_duplicate_candidate(
-                        raw_id=raw_id,
-                        existing_listing_id=duplicate["listing_id"],
-                        proposed_name=normalized.get("name"),
-                        existing_name=duplicate.get("name"),
-                        match_reasons=match_reasons or ["possible_duplicate"],
-                        confidence_score=confidence_score,
-                    )
-                    continue
-
-                created = self.db.create_listing_from_import_data(normalized)
-                self.db._insert_change_log(  # noqa: SLF001 - phase 2 importer needs initial raw linkage
-                    listing_id=created["listing_id"],
-                    raw_id=raw_id,
-                    change_type="imported_from_file",
-                    old_value=None,
-                    new_value=file_name,
-                    source_id=source_id,
-                )
-                self.db.connect().commit()
-                stats["listings_created"] += 1
+                    listing=normalized,
+                ))
             except Exception as exc:
                 logger.warning("Failed to import sober living row: %s", exc)
                 stats["errors"].append(str(exc))
 
+        with self.db.write_lock:
+            result = self.db.bulk_ingest(
+                records,
+                source_id=source_id,
+                new_review_status="approved",
+                import_file_name=file_name,
+            )
+            self.db.connect().commit()
+        for error in result.errors:
+            logger.warning("Failed to import sober living row: %s", error)
+        stats["raw_created"] = result.raw_records_created
+        stats["listings_created"] = result.listings_created
+        stats["duplicates_detected"] = result.duplicates_detected
+        stats["errors"].extend(result.errors)
+        stats["stage_timings_ms"] = result.stage_timings_ms
         return stats
 
     def _extract_rows(self, *, file_name: str, content: bytes) -> Iterable[Dict[str, Any]]:
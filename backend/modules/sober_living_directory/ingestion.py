@@ -0,0 +1,158 @@
+"""Bulk ingestion helpers for discovery runs and spreadsheet imports.
+
+``SoberLivingDirectoryDatabase.bulk_ingest`` stages a whole batch of raw
+listings, imported listings, change-log rows and duplicate candidates inside
+one transaction:
+
+* **Chunked writes** - each table's rows for a chunk go through one
+  ``executemany`` under a savepoint. If the chunk fails it is rolled back and
+  replayed record by record, each under its own savepoint, so a bad record is
+  reported instead of aborting the batch.
+* **Deferred scoring** - duplicate candidates are scored after the writes, for
+  every matched pair at once, as NumPy array operations.
+* **Stage timings** - ``StageTimer`` records milliseconds per stage for the
+  discovery run record / import stats.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+INGEST_CHUNK_SIZE = 500
+
+# Same weights as SoberLivingDirectoryDatabase.score_duplicate_candidate.
+DUPLICATE_MATCH_WEIGHTS: Tuple[Tuple[str, int], ...] = (
+    ("phone_match", 45),
+    ("website_match", 35),
+    ("name_match", 30),
+    ("city_match", 15),
+    ("similar_name", 20),
+)
+
+LookupKeys = Tuple[str, str, Optional[str], Optional[str]]
+Statement = Tuple[str, Sequence[Any]]
+
+
+@dataclass
+class IngestRecord:
+    """One discovered or imported record.
+
+    ``raw`` holds ``create_raw_listing`` keyword arguments other than the
+    source / run / raw text / match / review fields; ``listing`` is listing
+    create data to insert when no duplicate is found (spreadsheet imports only).
+    """
+
+    raw: Dict[str, Any]
+    name: Optional[str]
+    city: Optional[str]
+    phone: Optional[str] = None
+    website: Optional[str] = None
+    listing: Optional[Dict[str, Any]] = None
+    # Defaults to the JSON of ``raw["extracted_json"]``.
+    raw_text: Optional[str] = None
+
+
+@dataclass
+class IngestResult:
+    raw_records_created: int = 0
+    listings_created: int = 0
+    duplicates_detected: int = 0
+    errors: List[str] = field(default_factory=list)
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class IngestUnit:
+    """Statements that must be written together for one record."""
+
+    key: int
+    statements: List[Statement]
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.timings_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings_ms[name] = round(self.timings_ms.get(name, 0.0) + elapsed_ms, 2)
+
+
+@contextmanager
+def bulk_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Open an explicit transaction; roll it back if the block raises.
+
+    Committing is left to the caller so run bookkeeping can land in the same
+    transaction as the staged rows.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def write_units(conn: sqlite3.Connection, units: Sequence[IngestUnit],
+                chunk_size: int = INGEST_CHUNK_SIZE) -> Dict[int, str]:
+    """Write ``units`` in chunks; returns ``{unit.key: error}`` for units that failed."""
+    failed: Dict[int, str] = {}
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(units), chunk_size):
+        chunk = units[start:start + chunk_size]
+        conn.execute("SAVEPOINT ingest_chunk")
+        try:
+            grouped: Dict[str, List[Sequence[Any]]] = {}
+            for unit in chunk:
+                for sql, params in unit.statements:
+                    grouped.setdefault(sql, []).append(params)
+            for sql, rows in grouped.items():
+                conn.executemany(sql, rows)
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO ingest_chunk")
+            for unit in chunk:
+                conn.execute("SAVEPOINT ingest_unit")
+                try:
+                    for sql, params in unit.statements:
+                        conn.execute(sql, params)
+                except sqlite3.Error as exc:
+                    conn.execute("ROLLBACK TO ingest_unit")
+                    failed[unit.key] = str(exc)
+                conn.execute("RELEASE ingest_unit")
+        conn.execute("RELEASE ingest_chunk")
+    return failed
+
+
+def score_duplicate_pairs(
+    incoming: Sequence[LookupKeys],
+    existing: Sequence[LookupKeys],
+    similar_name: Sequence[bool],
+) -> List[Tuple[int, List[str]]]:
+    """Score matched (incoming, existing) lookup-key pairs like ``score_duplicate_candidate``."""
+    if not incoming:
+        return []
+    left = np.array([(name, city, phone or "", website or "") for name, city, phone, website in incoming], dtype=str)
+    right = np.array([(name, city, phone or "", website or "") for name, city, phone, website in existing], dtype=str)
+    # Columns: phone, website, name, city - equal and non-empty on both sides.
+    order = [2, 3, 0, 1]
+    equal = (left[:, order] == right[:, order]) & (left[:, order] != "") & (right[:, order] != "")
+    matches = np.column_stack([equal, np.asarray(similar_name, dtype=bool)])
+
+    weights = np.array([weight for _, weight in DUPLICATE_MATCH_WEIGHTS])
+    scores = np.minimum(matches @ weights, 100)
+    labels = [label for label, _ in DUPLICATE_MATCH_WEIGHTS]
+    return [
+        (int(score), [labels[column] for column in np.flatnonzero(row)])
+        for score, row in zip(scores, matches)
+    ]
@@ -2,37 +2,25 @@ from __future__ import annotations
 
 import atexit
 import logging
-import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from backend.shared.env import env_bool, env_int
 from .database import SoberLivingDirectoryDatabase
 from .discovery import SoberLivingDiscoveryService
 
 logger = logging.getLogger(__name__)
 
+INGEST_STAGES = ("index", "match", "write", "score", "candidates")
+
 
 def _utcnow_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat()
 
 
-def _env_bool(name: str, default: bool = False) -> bool:
-    value = os.getenv(name)
-    if value is None:
-        return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
-
-
-def _env_int(name: str, default: int, minimum: int, maximum: int) -> int:
-    raw = os.getenv(name)
-    try:
-        parsed = int(raw) if raw is not None else default
-    except (TypeError, ValueError):
-        parsed = default
-    return max(minimum, min(maximum, parsed))
-
-
 class SoberLivingDiscoverySchedulerWorker:
     def __init__(
         self,
@@ -41,30 +29,37 @@ class SoberLivingDiscoverySchedulerWorker:
     ) -> None:
         self.db = db
         self.discovery_service = discovery_service
-        self.poll_interval_seconds = _env_int(
+        self.poll_interval_seconds = env_int(
             "SOBER_LIVING_DIRECTORY_SCHEDULER_POLL_SECONDS",
             default=300,
             minimum=30,
             maximum=3600,
         )
-        self.max_jobs_per_cycle = _env_int(
+        self.max_jobs_per_cycle = env_int(
             "SOBER_LIVING_DIRECTORY_SCHEDULER_MAX_JOBS_PER_CYCLE",
             default=3,
             minimum=1,
             maximum=25,
         )
-        self.autostart_enabled = _env_bool("SOBER_LIVING_DIRECTORY_SCHEDULER_AUTOSTART", default=False)
+        # Due jobs run on a bounded pool; per-host fetch limits live in the discovery service's fetcher.
+        self.max_workers = env_int(
+            "SOBER_LIVING_DIRECTORY_SCHEDULER_WORKERS",
+            default=4,
+            minimum=1,
+            maximum=16,
+        )
+        self.autostart_enabled = env_bool("SOBER_LIVING_DIRECTORY_SCHEDULER_AUTOSTART", default=False)
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._state_lock = threading.Lock()
+        # status() is also called from start()/stop() while the lock is held.
+        self._state_lock = threading.RLock()
         self._cycle_lock = threading.Lock()
         self.started_at: Optional[str] = None
         self.stopped_at: Optional[str] = None
         self.last_poll_at: Optional[str] = None
         self.last_cycle_started_at: Optional[str] = None
         self.last_cycle_finished_at: Optional[str] = None
-        self.current_job_id: Optional[str] = None
-        self.current_job_name: Optional[str] = None
+        self.current_jobs: Dict[str, Optional[str]] = {}
         self.last_cycle_summary: Dict[str, Any] = {
             "checked_jobs": 0,
             "due_jobs": 0,
@@ -110,8 +105,7 @@ class SoberLivingDiscoverySchedulerWorker:
         with self._state_lock:
             if self._thread is thread:
                 self._thread = None
-            self.current_job_id = None
-            self.current_job_name = None
+            self.current_jobs = {}
             self.stopped_at = _utcnow_iso()
             logger.info("Sober living directory scheduler worker stopped")
         return self.status()
@@ -122,19 +116,26 @@ class SoberLivingDiscoverySchedulerWorker:
 
     def status(self) -> Dict[str, Any]:
         with self._state_lock:
+            current_job_id, current_job_name = next(iter(self.current_jobs.items()), (None, None))
+            fetcher = getattr(self.discovery_service, "fetcher", None)
             return {
                 "running": self.is_running,
                 "autostart_enabled": self.autostart_enabled,
                 "poll_interval_seconds": self.poll_interval_seconds,
                 "max_jobs_per_cycle": self.max_jobs_per_cycle,
+                "max_workers": self.max_workers,
                 "started_at": self.started_at,
                 "stopped_at": self.stopped_at,
                 "last_poll_at": self.last_poll_at,
                 "last_cycle_started_at": self.last_cycle_started_at,
                 "last_cycle_finished_at": self.last_cycle_finished_at,
-                "current_job_id": self.current_job_id,
-                "current_job_name": self.current_job_name,
+                "current_job_id": current_job_id,
+                "current_job_name": current_job_name,
+                "current_jobs": [
+                    {"job_id": job_id, "job_name": job_name} for job_id, job_name in self.current_jobs.items()
+                ],
                 "last_cycle_summary": dict(self.last_cycle_summary),
+                "fetcher": fetcher.metrics() if fetcher else None,
                 "warning": (
                     "Scheduler worker is disabled by default. All discovered records remain raw review items; "
                     "no listings are auto-published or auto-merged."
@@ -167,22 +168,21 @@ class SoberLivingDiscoverySchedulerWorker:
             executed_job_ids: List[str] = []
             failed_job_ids: List[str] = []
             executed_runs: List[Dict[str, Any]] = []
-            for item in runnable_items[: self.max_jobs_per_cycle]:
-                job_id = item["job_id"]
-                with self._state_lock:
-                    self.current_job_id = job_id
-                    self.current_job_name = item.get("job_name")
-                try:
-                    run = self.discovery_service.run_job(job_id, trigger_type="scheduled")
-                    executed_job_ids.append(job_id)
-                    executed_runs.append(run)
-                except Exception:
-                    logger.exception("Scheduled discovery run failed for job %s", job_id)
-                    failed_job_ids.append(job_id)
-                finally:
-                    with self._state_lock:
-                        self.current_job_id = None
-                        self.current_job_name = None
+            batch = runnable_items[: self.max_jobs_per_cycle]
+            cycle_started = time.perf_counter()
+            if batch:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(batch)),
+                    thread_name_prefix="sober-living-discovery",
+                ) as executor:
+                    outcomes = list(executor.map(self._run_job, batch))
+                for item, (run, failed) in zip(batch, outcomes):
+                    if failed:
+                        failed_job_ids.append(item["job_id"])
+                    else:
+                        executed_job_ids.append(item["job_id"])
+                        executed_runs.append(run)
+            wall_ms = (time.perf_counter() - cycle_started) * 1000
 
             cycle_finished_at = _utcnow_iso()
             summary = {
@@ -196,6 +196,7 @@ class SoberLivingDiscoverySchedulerWorker:
                 "skipped_reasons": skipped_reasons,
                 "trigger": trigger,
                 "runs": executed_runs,
+                "metrics": self._cycle_metrics(executed_runs, wall_ms),
             }
             with self._state_lock:
                 self.last_cycle_finished_at = cycle_finished_at
@@ -208,6 +209,48 @@ class SoberLivingDiscoverySchedulerWorker:
         finally:
             self._cycle_lock.release()
 
+    def _run_job(self, item: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        job_id = item["job_id"]
+        with self._state_lock:
+            self.current_jobs[job_id] = item.get("job_name")
+        try:
+            return self.discovery_service.run_job(job_id, trigger_type="scheduled"), False
+        except Exception:
+            logger.exception("Scheduled discovery run failed for job %s", job_id)
+            return None, True
+        finally:
+            with self._state_lock:
+                self.current_jobs.pop(job_id, None)
+
+    def _cycle_metrics(self, runs: List[Dict[str, Any]], wall_ms: float) -> Dict[str, Any]:
+        per_run = []
+        for run in runs:
+            timings = run.get("stage_timings_json") or {}
+            fetch_ms = timings.get("fetch", 0.0)
+            parse_ms = timings.get("parse", 0.0)
+            ingest_ms = sum(timings.get(stage, 0.0) for stage in INGEST_STAGES)
+            total_ms = fetch_ms + parse_ms + ingest_ms
+            records = int(run.get("records_found") or 0)
+            per_run.append({
+                "run_id": run.get("run_id"),
+                "job_id": run.get("job_id"),
+                "fetch_ms": round(fetch_ms, 2),
+                "parse_ms": round(parse_ms, 2),
+                "ingest_ms": round(ingest_ms, 2),
+                "records": records,
+                "records_per_s": round(records / (total_ms / 1000), 1) if total_ms else 0.0,
+                "source_unchanged": bool(run.get("source_unchanged")),
+            })
+        total_records = sum(item["records"] for item in per_run)
+        return {
+            "wall_ms": round(wall_ms, 2),
+            "workers": self.max_workers,
+            "records": total_records,
+            "records_per_s": round(total_records / (wall_ms / 1000), 1) if wall_ms else 0.0,
+            "unchanged_sources": sum(1 for item in per_run if item["source_unchanged"]),
+            "runs": per_run,
+        }
+
     def _run_loop(self) -> None:
         while not self._stop_event.is_set():
             try:
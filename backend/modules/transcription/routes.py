@@ -135,6 +135,7 @@ async def generate_note_from_transcript(payload: GenerateFromTranscriptRequest,
                 "note_type": payload.noteType,
                 "transcript": transcript,
                 "case_manager_id": current_user.case_manager_id,
+                "org_id": current_user.org_id,
             }
         )
         return {"success": True, **result}
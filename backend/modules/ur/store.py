@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from backend.auth.authorization import get_client_org_id, get_org_for_user_id
+from backend.shared.client_context_cache import invalidate_client_context
+from backend.shared.reconciliation_queue import mark_deadlines_dirty
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
 from .postgres_store import (
@@ -329,6 +331,13 @@ class URStore:
         placeholders = ", ".join("?" for _ in record)
         with self._db() as conn:
             conn.execute(f"INSERT INTO railway_ur_cases ({columns}) VALUES ({placeholders})", list(record.values()))
+        invalidate_client_context(record.get("client_id"))
+        mark_deadlines_dirty(
+            "ur",
+            record["case_id"],
+            case_manager_id=record.get("assigned_case_manager"),
+            org_id=record.get("org_id"),
+        )
         return record
 
     def update_case(self, case_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -341,6 +350,13 @@ class URStore:
         params = list(updates.values()) + [case_id]
         with self._db() as conn:
             conn.execute(f"UPDATE railway_ur_cases SET {assignments} WHERE case_id = ?", params)
+        invalidate_client_context(existing.get("client_id"), updates.get("client_id"))
+        mark_deadlines_dirty(
+            "ur",
+            case_id,
+            case_manager_id=updates.get("assigned_case_manager", existing.get("assigned_case_manager")),
+            org_id=updates.get("org_id", existing.get("org_id")),
+        )
         return self.get_case(case_id)
 
     def delete_case(self, case_id: str) -> bool:
@@ -350,6 +366,14 @@ class URStore:
         with self._db() as conn:
             conn.execute("DELETE FROM railway_ur_review_events WHERE case_id = ?", (case_id,))
             conn.execute("DELETE FROM railway_ur_cases WHERE case_id = ?", (case_id,))
+        invalidate_client_context(existing.get("client_id"))
+        mark_deadlines_dirty(
+            "ur",
+            case_id,
+            case_manager_id=existing.get("assigned_case_manager"),
+            org_id=existing.get("org_id"),
+            snapshot=existing,
+        )
         return True
 
     def create_event(self, case_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
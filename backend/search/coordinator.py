@@ -7,17 +7,18 @@ Unifies Jobs | Housing | Services | General Web search behind ONE coordinator
 import os
 import logging
 import asyncio
-import requests
-import hashlib
+import httpx
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 from urllib.parse import urlparse
 import re
-import sqlite3
 from dataclasses import dataclass
 from enum import Enum
 from backend.modules.services.virgil_db_service import get_virgil_db
+from backend.search.http_pool import get_search_http_pool
+from backend.search.provider_engine import ProviderAttempt, ProviderUnavailable, get_provider_engine
+from backend.search.search_cache import SearchCache, search_cache_key
 
 # Load environment variables
 try:
@@ -86,7 +87,9 @@ class SimpleSearchCoordinator:
         self.cache_db_path = str(_DB_DIR / "search_cache.db")
         self.sample_db_path = str(_DB_DIR / "sample_data.db")
         self.blocked_google_cse_ids: Dict[str, str] = {}
-        self.job_search_memory_cache: Dict[str, Dict[str, Any]] = {}
+        self.search_cache = SearchCache(self.cache_db_path)
+        self.http_pool = get_search_http_pool()
+        self.provider_engine = get_provider_engine()
         logger.info(f"SerpAPI Key: {'Loaded' if self.serper_api_key else 'Missing'}")
 
         # Config validation — log warnings for missing critical providers at startup
@@ -110,38 +113,17 @@ class SimpleSearchCoordinator:
                 "job search will always return empty results"
             )
         
-        # Initialize cache database
-        self._init_cache_db()
-        
         # Search configuration
         self.max_results = 20
-        self.cache_ttl_hours = 0.1  # 6 minutes for testing scrapers
+        self.cache_ttl_hours = SearchCache.ttl_seconds("general") / 3600
         self.fallback_to_samples = False
         
         logger.info("Simple Search Coordinator initialized")
 
-    def _generate_job_search_cache_key(self, query: str, location: Optional[str]) -> str:
-        normalized = {
-            "query": (query or "").strip().lower(),
-            "location": (location or "").strip().lower(),
-        }
-        return hashlib.md5(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
-
-    def _get_cached_job_search_results(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
-        cached = self.job_search_memory_cache.get(cache_key)
-        if not cached:
-            return None
-        if datetime.now().timestamp() > cached["expires_at"]:
-            self.job_search_memory_cache.pop(cache_key, None)
-            return None
-        return cached["results"]
-
-    def _set_cached_job_search_results(self, cache_key: str, results: List[Dict[str, Any]]) -> None:
-        expires_at = datetime.now().timestamp() + (24 * 60 * 60)
-        self.job_search_memory_cache[cache_key] = {
-            "results": results,
-            "expires_at": expires_at,
-        }
+    @staticmethod
+    def _payload_cacheable(payload: Dict[str, Any]) -> bool:
+        """Only successful provider payloads are cached; errors retry upstream next time."""
+        return isinstance(payload, dict) and not payload.get("error")
 
     def _extract_serpapi_job_links(self, job: Dict[str, Any]) -> Dict[str, Optional[str]]:
         apply_option_link = next(
@@ -276,7 +258,8 @@ class SimpleSearchCoordinator:
         }
 
         try:
-            response = requests.post(
+            response = self.http_pool.post(
+                "openai",
                 "https://api.openai.com/v1/responses",
                 headers={
                     "Authorization": f"Bearer {self.openai_api_key}",
@@ -388,7 +371,7 @@ class SimpleSearchCoordinator:
         cse_name = self._resolve_cse_name(cse_id)
         return f"Google Custom Search is blocked for the configured {cse_name} CSE."
 
-    def _is_google_permission_block(self, response: Optional[requests.Response] = None, payload: Optional[Dict[str, Any]] = None) -> bool:
+    def _is_google_permission_block(self, response: Optional[httpx.Response] = None, payload: Optional[Dict[str, Any]] = None) -> bool:
         """Detect the Google permission-denied shape for blocked Custom Search APIs."""
         payload = payload or {}
         error = payload.get("error", {}) if isinstance(payload, dict) else {}
@@ -398,30 +381,6 @@ class SimpleSearchCoordinator:
             return True
         return bool(response is not None and response.status_code == 403 and "blocked" in message)
     
-    def _init_cache_db(self):
-        """Initialize search cache database"""
-        try:
-            conn = sqlite3.connect(self.cache_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS search_cache (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    query TEXT NOT NULL,
-                    search_type TEXT NOT NULL,
-                    location TEXT,
-                    results TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(query, search_type, location)
-                )
-            """)
-            
-            conn.commit()
-            conn.close()
-            logger.info("Search cache database initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize cache DB: {e}")
-    
     def search(self, query: str, search_type: SearchType, location: str = "Los Angeles, CA", force_refresh: bool = False) -> Dict[str, Any]:
         """
         Main search method - unified interface for all search types
@@ -430,31 +389,37 @@ class SimpleSearchCoordinator:
         try:
             logger.info(f"Search: '{query}' | Type: {search_type.value} | Location: {location} | Force: {force_refresh}")
             
-            # Check cache first (unless force refresh)
-            if not force_refresh:
-                cached_results = self._get_cached_results(query, search_type, location)
-                if cached_results:
-                    logger.info(f"Returning cached results: {len(cached_results)} items")
-                    return self._format_response(cached_results, "cache")
-            else:
+            if force_refresh:
                 logger.info("Force refresh requested - bypassing cache")
-            
-            # Perform fresh search based on type
-            if search_type == SearchType.JOBS:
-                results = self._search_jobs(query, location)
-            elif search_type == SearchType.HOUSING:
-                results = self._search_housing(query, location)
-            elif search_type == SearchType.SERVICES:
-                results = self._search_services(query, location)
-            elif search_type == SearchType.GENERAL:
-                results = self._search_general(query, location)
-            else:
-                results = []
-            
-            # Cache results
-            if results:
-                self._cache_results(query, search_type, location, results)
-            
+
+            def fetch_fresh() -> List[Dict[str, Any]]:
+                # Perform fresh search based on type
+                if search_type == SearchType.JOBS:
+                    results = self._search_jobs(query, location)
+                elif search_type == SearchType.HOUSING:
+                    results = self._search_housing(query, location)
+                elif search_type == SearchType.SERVICES:
+                    results = self._search_services(query, location)
+                elif search_type == SearchType.GENERAL:
+                    results = self._search_general(query, location)
+                else:
+                    results = []
+                return self._serialize_results(results)
+
+            vertical = search_type.value if hasattr(search_type, 'value') else str(search_type)
+            results_data, cache_state = self.search_cache.get_or_fetch_with_state(
+                vertical,
+                search_cache_key(vertical, query, location),
+                fetch_fresh,
+                force_refresh=force_refresh,
+                cacheable=bool,
+            )
+            results = [SearchResult(**item) for item in results_data]
+
+            if cache_state in ("fresh", "stale"):
+                logger.info(f"Returning cached results: {len(results)} items")
+                return self._format_response(results, "cache")
+
             # No sample data fallback
             if not results:
                 logger.info("No results found from live providers")
@@ -706,8 +671,6 @@ class SimpleSearchCoordinator:
     def _google_custom_search_with_cse(self, query: str, location: str, cse_id: str) -> List[Dict]:
         """Google Custom Search API with specific CSE ID"""
         try:
-            import requests
-
             if not self.google_api_key or not cse_id:
                 logger.warning("Google Custom Search credentials not available")
                 return []
@@ -726,7 +689,7 @@ class SimpleSearchCoordinator:
             }
             
             logger.info(f"Google Custom Search query: '{search_query}' using CSE: {cse_id}")
-            response = requests.get(url, params=params, timeout=5)
+            response = self.http_pool.get("google_cse", url, params=params, timeout=5)
             if response.status_code == 403:
                 payload = response.json()
                 if self._is_google_permission_block(response=response, payload=payload):
@@ -740,7 +703,7 @@ class SimpleSearchCoordinator:
             
             return items
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             response = getattr(e, "response", None)
             payload = {}
             if response is not None:
@@ -760,8 +723,6 @@ class SimpleSearchCoordinator:
     def _google_places_search(self, query: str, location: str) -> List[Dict]:
         """Google Places API search"""
         try:
-            import requests
-            
             # First get coordinates for location
             geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
             geocode_params = {
@@ -769,7 +730,7 @@ class SimpleSearchCoordinator:
                 'key': self.google_api_key
             }
             
-            geocode_response = requests.get(geocode_url, params=geocode_params, timeout=10)
+            geocode_response = self.http_pool.get("google_places", geocode_url, params=geocode_params, timeout=10)
             geocode_data = geocode_response.json()
             
             if geocode_data.get('results'):
@@ -784,7 +745,7 @@ class SimpleSearchCoordinator:
                     'key': self.google_api_key
                 }
                 
-                places_response = requests.get(places_url, params=places_params, timeout=10)
+                places_response = self.http_pool.get("google_places", places_url, params=places_params, timeout=10)
                 places_data = places_response.json()
                 
                 return places_data.get('results', [])
@@ -794,65 +755,21 @@ class SimpleSearchCoordinator:
         
         return []
     
-    def _get_cached_results(self, query: str, search_type: SearchType, location: str) -> List[SearchResult]:
-        """Get cached search results"""
-        try:
-            conn = sqlite3.connect(self.cache_db_path)
-            cursor = conn.cursor()
-            
-            # Check if cache is still valid
-            cutoff_time = datetime.now() - timedelta(hours=self.cache_ttl_hours)
-            
-            cursor.execute("""
-                SELECT results FROM search_cache 
-                WHERE query = ? AND search_type = ? AND location = ? 
-                AND timestamp > ?
-            """, (query, search_type.value if hasattr(search_type, 'value') else str(search_type), location, cutoff_time))
-            
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                results_data = json.loads(row[0])
-                return [SearchResult(**item) for item in results_data]
-            
-        except Exception as e:
-            logger.error(f"Cache retrieval error: {e}")
-        
-        return []
-    
-    def _cache_results(self, query: str, search_type: SearchType, location: str, results: List[SearchResult]):
-        """Cache search results"""
-        try:
-            conn = sqlite3.connect(self.cache_db_path)
-            cursor = conn.cursor()
-            
-            # Convert results to JSON-serializable format
-            results_data = []
-            for result in results:
-                result_dict = {
-                    'title': result.title,
-                    'description': result.description,
-                    'url': result.url,
-                    'source': result.source,
-                    'type': result.type.value if hasattr(result.type, 'value') else str(result.type),
-                    'metadata': result.metadata,
-                    'confidence_score': result.confidence_score,
-                    'timestamp': datetime.now().isoformat()
-                }
-                results_data.append(result_dict)
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO search_cache 
-                (query, search_type, location, results) 
-                VALUES (?, ?, ?, ?)
-            """, (query, search_type.value if hasattr(search_type, 'value') else str(search_type), location, json.dumps(results_data)))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"Cache storage error: {e}")
+    def _serialize_results(self, results: List[SearchResult]) -> List[Dict[str, Any]]:
+        """Convert results to the JSON-serializable form kept in the search cache"""
+        return [
+            {
+                'title': result.title,
+                'description': result.description,
+                'url': result.url,
+                'source': result.source,
+                'type': result.type.value if hasattr(result.type, 'value') else str(result.type),
+                'metadata': result.metadata,
+                'confidence_score': result.confidence_score,
+                'timestamp': datetime.now().isoformat()
+            }
+            for result in results
+        ]
     
     def _get_sample_data(self, search_type: SearchType, query: str) -> List[SearchResult]:
         """Get sample data as fallback"""
@@ -1461,215 +1378,38 @@ class SimpleSearchCoordinator:
             }
 
     async def _search_jobs_impl(self, query: str, location: str = None, page: int = 1, per_page: int = 10):
-        """Core job search logic called by search_jobs."""
+        """Core job search logic called by search_jobs.
+
+        SerpAPI (Google Jobs plus organic fallbacks) and the dedicated jobs CSE
+        run through the provider engine, hedged by default, so a slow or failing
+        provider no longer holds every search until the 6.5 s cap.
+        """
         try:
             # Validate pagination parameters
             page = max(1, page)  # Ensure page is at least 1
             per_page = min(max(1, per_page), 40)  # Limit per_page between 1 and 40
 
-            # Primary: SerpAPI when available
-            if self.serper_api_key:
-                location_phrase = f" in {location}" if location else ""
-                job_query = f"{query} jobs hiring{location_phrase}"
-                serp_jobs = self._serpapi_jobs_search(job_query, location, page, per_page)
-                serp_results = self._filter_job_results_by_location(serp_jobs.get("results", []), location, strict=False)
-                serp_results = self._rank_job_results_for_exact_relevance(serp_results, query, location)
-                job_results = []
-                seen_links = set()
-                for item in serp_results:
-                    if self._is_generic_job_results_page(item):
-                        continue
-                    link_info = self._extract_serpapi_job_links(item)
-                    link = link_info["apply_link"] or link_info["source_url"] or item.get("job_id", "")
-                    if link and link in seen_links:
-                        continue
-                    if link:
-                        seen_links.add(link)
-                    posted_date = ((item.get("detected_extensions") or {}).get("posted_at"))
-                    employment_type = ((item.get("detected_extensions") or {}).get("schedule_type"))
-                    salary = ((item.get("detected_extensions") or {}).get("salary"))
-                    job_results.append({
-                        'title': item.get('title', ''),
-                        'description': item.get('description', ''),
-                        'link': link,
-                        'url': link,
-                        'source': 'serpapi_jobs',
-                        'provider': item.get('company_name', ''),
-                        'location': item.get('location', location or ''),
-                        'salary': salary,
-                        'posted_date': posted_date,
-                        'metadata': {
-                            'company': item.get('company_name', ''),
-                            'location': item.get('location', location or ''),
-                            'salary': salary,
-                            'employment_type': employment_type,
-                            'posted_date': posted_date,
-                            'source_url': link_info["source_url"],
-                            'apply_link': link_info["apply_link"],
-                            'external_id': item.get('job_id', ''),
-                        },
-                        'background_friendly': False
-                    })
-
-                # Fill with SerpAPI Google engine results if needed
-                if len(job_results) < per_page:
-                    job_query = (
-                        f"{query} jobs hiring career employment Los Angeles CA "
-                        "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
-                        "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
-                        "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
-                        "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com OR "
-                        "site:simplyhired.com OR site:jobcase.com OR site:jooble.org OR "
-                        "site:talent.com OR site:lensa.com OR site:adzuna.com OR "
-                        "site:myworkdayjobs.com OR site:icims.com OR site:lever.co OR "
-                        "site:greenhouse.io OR site:workforcenow.adp.com OR site:smartrecruiters.com "
-                        "-for rent -lease -commercial -real estate"
-                    )
-                    serp_fallback = self._serpapi_paginated_search(job_query, location, page, per_page)
-                    serp_items = self._filter_job_results(serp_fallback.get("results", []))
-                    serp_items = self._filter_job_results_by_location(serp_items, location, strict=False)
-                    serp_items = self._rank_job_results_for_exact_relevance(serp_items, query, location)
-                    for item in serp_items:
-                        if self._is_generic_job_results_page({
-                            "title": item.get("title", ""),
-                            "description": item.get("snippet", ""),
-                            "company_name": item.get("company_name", ""),
-                        }):
-                            continue
-                        link = item.get('link', '')
-                        if link and link in seen_links:
-                            continue
-                        if link:
-                            seen_links.add(link)
-                        job_results.append({
-                            'title': item.get('title', ''),
-                            'description': item.get('snippet', ''),
-                            'link': link,
-                            'source': 'serpapi',
-                            'background_friendly': False
-                        })
-                        if len(job_results) >= per_page:
-                            break
-
-                # If still low, expand to California-wide to increase volume
-                if len(job_results) < per_page:
-                    job_query = (
-                        f"{query} jobs hiring California "
-                        "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
-                        "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
-                        "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
-                        "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com OR "
-                        "site:simplyhired.com OR site:jobcase.com OR site:jooble.org OR "
-                        "site:talent.com OR site:lensa.com OR site:adzuna.com OR "
-                        "site:myworkdayjobs.com OR site:icims.com OR site:lever.co OR "
-                        "site:greenhouse.io OR site:workforcenow.adp.com OR site:smartrecruiters.com "
-                        "-for rent -lease -commercial -real estate"
-                    )
-                    serp_fallback = self._serpapi_paginated_search(job_query, "California", page, per_page)
-                    serp_items = self._filter_job_results(serp_fallback.get("results", []))
-                    serp_items = self._filter_job_results_by_location(serp_items, "CA", strict=False)
-                    serp_items = self._rank_job_results_for_exact_relevance(serp_items, query, location)
-                    for item in serp_items:
-                        if self._is_generic_job_results_page({
-                            "title": item.get("title", ""),
-                            "description": item.get("snippet", ""),
-                            "company_name": item.get("company_name", ""),
-                        }):
-                            continue
-                        link = item.get('link', '')
-                        if link and link in seen_links:
-                            continue
-                        if link:
-                            seen_links.add(link)
-                        job_results.append({
-                            'title': item.get('title', ''),
-                            'description': item.get('snippet', ''),
-                            'link': link,
-                            'source': 'serpapi',
-                            'background_friendly': False
-                        })
-                        if len(job_results) >= per_page:
-                            break
-
-                if job_results:
-                    total_results = max(serp_jobs.get("total_results", len(job_results)), len(job_results))
-                    has_next_page = serp_jobs.get("has_next_page", False)
-                    total_pages = max(page, ((total_results + per_page - 1) // per_page) if total_results else 1)
-                    return {
-                        "success": True,
-                        "query": query,
-                        "query_used": query,
-                        "location": location,
-                        "results": job_results[:per_page],
-                        "total_count": len(job_results[:per_page]),
-                        "source": "serpapi_jobs",
-                        "degraded": False,
-                        "warning": None if not serp_jobs.get("from_cache") else "Loaded from cached Google Jobs results.",
-                        "pagination": {
-                            "current_page": page,
-                            "per_page": per_page,
-                            "total_results": total_results,
-                            "total_pages": total_pages,
-                            "has_next_page": has_next_page,
-                            "has_prev_page": page > 1,
-                            "start_index": ((page - 1) * per_page) + 1 if job_results else 0,
-                            "end_index": min(page * per_page, total_results)
-                        }
-                    }
+            def has_results(response: Optional[Dict[str, Any]]) -> bool:
+                return bool(response and response.get("results"))
 
-                # Fallback to Google engine with strict job domains if jobs engine returns nothing
-                job_query = (
-                    f"{query} jobs hiring career employment "
-                    "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
-                    "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
-                    "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
-                    "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com "
-                    "-for rent -lease -commercial -real estate"
-                )
-                serper_payload = self._serpapi_paginated_search(job_query, location, page, per_page)
-                serper_results = self._filter_job_results(serper_payload.get("results", []))
-                serper_results = self._filter_job_results_by_location(serper_results, location, strict=False)
-                serper_results = self._rank_job_results_for_exact_relevance(serper_results, query, location)
-                if serper_results:
-                    job_results = []
-                    for item in serper_results:
-                        if self._is_generic_job_results_page({
-                            "title": item.get("title", ""),
-                            "description": item.get("snippet", ""),
-                            "company_name": item.get("company_name", ""),
-                        }):
-                            continue
-                        job_results.append({
-                            'title': item.get('title', ''),
-                            'description': item.get('snippet', ''),
-                            'link': item.get('link', ''),
-                            'source': 'serpapi',
-                            'background_friendly': False
-                        })
-                    return {
-                        "success": True,
-                        "query": query,
-                        "query_used": query,
-                        "location": location,
-                        "results": job_results,
-                        "total_count": len(job_results),
-                        "source": "serpapi",
-                        "degraded": True,
-                        "warning": "Google Jobs results were unavailable, so the search used a broader fallback source.",
-                        "pagination": {
-                            "current_page": page,
-                            "per_page": per_page,
-                            "total_results": len(job_results),
-                            "total_pages": 1,
-                            "has_next_page": False,
-                            "has_prev_page": False,
-                            "start_index": 1 if job_results else 0,
-                            "end_index": len(job_results)
-                        }
-                    }
-            
-            # Use the dedicated jobs CSE
             cse_id = self.google_jobs_cse_id
+            attempts = []
+            # Primary: SerpAPI when available
+            if self.serper_api_key:
+                attempts.append(ProviderAttempt(
+                    "serpapi", lambda: self._serpapi_jobs_response(query, location, page, per_page), has_results,
+                    name="serpapi_jobs",
+                ))
+            # Secondary: the dedicated jobs CSE
+            if self.google_api_key and cse_id:
+                attempts.append(ProviderAttempt(
+                    "google_cse", lambda: self._google_cse_jobs_response(query, location, page, per_page, cse_id), has_results,
+                    name="google_cse_jobs",
+                ))
+
+            outcome = await self.provider_engine.run(attempts)
+            if outcome.result is not None:
+                return outcome.result
             if not self.google_api_key or not cse_id:
                 return {
                     "success": False,
@@ -1691,82 +1431,290 @@ class SimpleSearchCoordinator:
                         "end_index": 0
                     }
                 }
-            
-            # Enhanced query for better job results
-            enhanced_query = query
-            if location and location.lower() not in query.lower():
-                enhanced_query = f"{query} {location}"
-            
-            # Add job-specific keywords to improve relevance
-            job_keywords = "employment career position hiring -for rent -lease -commercial -real estate"
-            enhanced_query = f"{enhanced_query} {job_keywords}"
-            
-            logger.info(f"Jobs search: '{enhanced_query}' using CSE: {cse_id} (page {page}, per_page {per_page})")
-            
-            # Perform paginated search with jobs CSE
-            paginated_results = await self._paginated_google_search(
-                query=enhanced_query,
-                cse_id=cse_id,
-                page=page,
-                per_page=per_page
+            raise RuntimeError("; ".join(f"{name}: {error}" for name, error in outcome.errors.items()) or "no results")
+
+        except Exception as e:
+            logger.error(f"Jobs search error: {e}")
+            # Fallback to original CSE if jobs CSE fails
+            return await self._fallback_jobs_search(query, location, page, per_page)
+
+    async def _serpapi_jobs_response(self, query: str, location: Optional[str], page: int, per_page: int) -> Optional[Dict[str, Any]]:
+        """SerpAPI Google Jobs results, topped up from organic SerpAPI searches; None when nothing usable."""
+        location_phrase = f" in {location}" if location else ""
+        job_query = f"{query} jobs hiring{location_phrase}"
+        serp_jobs = await asyncio.to_thread(self._serpapi_jobs_search, job_query, location, page, per_page)
+        serp_results = self._filter_job_results_by_location(serp_jobs.get("results", []), location, strict=False)
+        serp_results = self._rank_job_results_for_exact_relevance(serp_results, query, location)
+        job_results = []
+        seen_links = set()
+        for item in serp_results:
+            if self._is_generic_job_results_page(item):
+                continue
+            link_info = self._extract_serpapi_job_links(item)
+            link = link_info["apply_link"] or link_info["source_url"] or item.get("job_id", "")
+            if link and link in seen_links:
+                continue
+            if link:
+                seen_links.add(link)
+            posted_date = ((item.get("detected_extensions") or {}).get("posted_at"))
+            employment_type = ((item.get("detected_extensions") or {}).get("schedule_type"))
+            salary = ((item.get("detected_extensions") or {}).get("salary"))
+            job_results.append({
+                'title': item.get('title', ''),
+                'description': item.get('description', ''),
+                'link': link,
+                'url': link,
+                'source': 'serpapi_jobs',
+                'provider': item.get('company_name', ''),
+                'location': item.get('location', location or ''),
+                'salary': salary,
+                'posted_date': posted_date,
+                'metadata': {
+                    'company': item.get('company_name', ''),
+                    'location': item.get('location', location or ''),
+                    'salary': salary,
+                    'employment_type': employment_type,
+                    'posted_date': posted_date,
+                    'source_url': link_info["source_url"],
+                    'apply_link': link_info["apply_link"],
+                    'external_id': item.get('job_id', ''),
+                },
+                'background_friendly': False
+            })
+
+        # Fill with SerpAPI Google engine results if needed
+        if len(job_results) < per_page:
+            job_query = (
+                f"{query} jobs hiring career employment Los Angeles CA "
+                "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
+                "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
+                "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
+                "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com OR "
+                "site:simplyhired.com OR site:jobcase.com OR site:jooble.org OR "
+                "site:talent.com OR site:lensa.com OR site:adzuna.com OR "
+                "site:myworkdayjobs.com OR site:icims.com OR site:lever.co OR "
+                "site:greenhouse.io OR site:workforcenow.adp.com OR site:smartrecruiters.com "
+                "-for rent -lease -commercial -real estate"
             )
-            
-            # Format results for API compatibility
-            formatted_results = []
-            all_cse_items = paginated_results.get('items', [])
-            # Try domain-filtered results first; if the whitelist eliminates everything, use all CSE results
-            filtered_items = self._filter_job_results(all_cse_items)
-            if not filtered_items:
-                filtered_items = all_cse_items
-            filtered_items = self._filter_job_results_by_location(filtered_items, location, strict=False)
-            filtered_items = self._rank_job_results_for_exact_relevance(filtered_items, query, location)
-            for item in filtered_items:
+            serp_fallback = await asyncio.to_thread(self._serpapi_paginated_search, job_query, location, page, per_page)
+            serp_items = self._filter_job_results(serp_fallback.get("results", []))
+            serp_items = self._filter_job_results_by_location(serp_items, location, strict=False)
+            serp_items = self._rank_job_results_for_exact_relevance(serp_items, query, location)
+            for item in serp_items:
                 if self._is_generic_job_results_page({
                     "title": item.get("title", ""),
                     "description": item.get("snippet", ""),
                     "company_name": item.get("company_name", ""),
                 }):
                     continue
-                item_link = item.get('link', '')
-                formatted_results.append({
+                link = item.get('link', '')
+                if link and link in seen_links:
+                    continue
+                if link:
+                    seen_links.add(link)
+                job_results.append({
                     'title': item.get('title', ''),
                     'description': item.get('snippet', ''),
-                    'link': item_link,
-                    'url': item_link,
-                    'source': 'google_jobs_cse'
+                    'link': link,
+                    'source': 'serpapi',
+                    'background_friendly': False
                 })
-            
-            # Calculate pagination metadata
-            total_results = len(formatted_results)
-            total_pages = max(1, (total_results + per_page - 1) // per_page)  # Ceiling division
-            has_next_page = page < total_pages
-            has_prev_page = page > 1
-            
-            # Same formatting as integration script with pagination metadata
+                if len(job_results) >= per_page:
+                    break
+
+        # If still low, expand to California-wide to increase volume
+        if len(job_results) < per_page:
+            job_query = (
+                f"{query} jobs hiring California "
+                "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
+                "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
+                "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
+                "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com OR "
+                "site:simplyhired.com OR site:jobcase.com OR site:jooble.org OR "
+                "site:talent.com OR site:lensa.com OR site:adzuna.com OR "
+                "site:myworkdayjobs.com OR site:icims.com OR site:lever.co OR "
+                "site:greenhouse.io OR site:workforcenow.adp.com OR site:smartrecruiters.com "
+                "-for rent -lease -commercial -real estate"
+            )
+            serp_fallback = await asyncio.to_thread(self._serpapi_paginated_search, job_query, "California", page, per_page)
+            serp_items = self._filter_job_results(serp_fallback.get("results", []))
+            serp_items = self._filter_job_results_by_location(serp_items, "CA", strict=False)
+            serp_items = self._rank_job_results_for_exact_relevance(serp_items, query, location)
+            for item in serp_items:
+                if self._is_generic_job_results_page({
+                    "title": item.get("title", ""),
+                    "description": item.get("snippet", ""),
+                    "company_name": item.get("company_name", ""),
+                }):
+                    continue
+                link = item.get('link', '')
+                if link and link in seen_links:
+                    continue
+                if link:
+                    seen_links.add(link)
+                job_results.append({
+                    'title': item.get('title', ''),
+                    'description': item.get('snippet', ''),
+                    'link': link,
+                    'source': 'serpapi',
+                    'background_friendly': False
+                })
+                if len(job_results) >= per_page:
+                    break
+
+        if job_results:
+            total_results = max(serp_jobs.get("total_results", len(job_results)), len(job_results))
+            has_next_page = serp_jobs.get("has_next_page", False)
+            total_pages = max(page, ((total_results + per_page - 1) // per_page) if total_results else 1)
             return {
                 "success": True,
                 "query": query,
+                "query_used": query,
                 "location": location,
-                "results": formatted_results,
-                "source": "google_jobs_cse",
+                "results": job_results[:per_page],
+                "total_count": len(job_results[:per_page]),
+                "source": "serpapi_jobs",
                 "degraded": False,
-                "warning": None,
+                "warning": None if not serp_jobs.get("from_cache") else "Loaded from cached Google Jobs results.",
                 "pagination": {
                     "current_page": page,
                     "per_page": per_page,
                     "total_results": total_results,
                     "total_pages": total_pages,
                     "has_next_page": has_next_page,
-                    "has_prev_page": has_prev_page,
-                    "start_index": (page - 1) * per_page + 1,
+                    "has_prev_page": page > 1,
+                    "start_index": ((page - 1) * per_page) + 1 if job_results else 0,
                     "end_index": min(page * per_page, total_results)
                 }
             }
-            
-        except Exception as e:
-            logger.error(f"Jobs search error: {e}")
-            # Fallback to original CSE if jobs CSE fails
-            return await self._fallback_jobs_search(query, location, page, per_page)
+
+        # Fallback to Google engine with strict job domains if jobs engine returns nothing
+        job_query = (
+            f"{query} jobs hiring career employment "
+            "site:indeed.com OR site:linkedin.com/jobs OR site:glassdoor.com OR "
+            "site:ziprecruiter.com OR site:monster.com OR site:snagajob.com OR "
+            "site:craigslist.org OR site:governmentjobs.com OR site:usajobs.gov OR "
+            "site:caljobs.ca.gov OR site:builtin.com OR site:careerbuilder.com "
+            "-for rent -lease -commercial -real estate"
+        )
+        serper_payload = await asyncio.to_thread(self._serpapi_paginated_search, job_query, location, page, per_page)
+        serper_results = self._filter_job_results(serper_payload.get("results", []))
+        serper_results = self._filter_job_results_by_location(serper_results, location, strict=False)
+        serper_results = self._rank_job_results_for_exact_relevance(serper_results, query, location)
+        if serper_results:
+            job_results = []
+            for item in serper_results:
+                if self._is_generic_job_results_page({
+                    "title": item.get("title", ""),
+                    "description": item.get("snippet", ""),
+                    "company_name": item.get("company_name", ""),
+                }):
+                    continue
+                job_results.append({
+                    'title': item.get('title', ''),
+                    'description': item.get('snippet', ''),
+                    'link': item.get('link', ''),
+                    'source': 'serpapi',
+                    'background_friendly': False
+                })
+            return {
+                "success": True,
+                "query": query,
+                "query_used": query,
+                "location": location,
+                "results": job_results,
+                "total_count": len(job_results),
+                "source": "serpapi",
+                "degraded": True,
+                "warning": "Google Jobs results were unavailable, so the search used a broader fallback source.",
+                "pagination": {
+                    "current_page": page,
+                    "per_page": per_page,
+                    "total_results": len(job_results),
+                    "total_pages": 1,
+                    "has_next_page": False,
+                    "has_prev_page": False,
+                    "start_index": 1 if job_results else 0,
+                    "end_index": len(job_results)
+                }
+            }
+
+        return None
+
+    async def _google_cse_jobs_response(self, query: str, location: Optional[str], page: int, per_page: int, cse_id: str) -> Dict[str, Any]:
+        """Job results from the dedicated jobs CSE; raises when the CSE call errors."""
+        # Enhanced query for better job results
+        enhanced_query = query
+        if location and location.lower() not in query.lower():
+            enhanced_query = f"{query} {location}"
+
+        # Add job-specific keywords to improve relevance
+        job_keywords = "employment career position hiring -for rent -lease -commercial -real estate"
+        enhanced_query = f"{enhanced_query} {job_keywords}"
+
+        logger.info(f"Jobs search: '{enhanced_query}' using CSE: {cse_id} (page {page}, per_page {per_page})")
+
+        # Perform paginated search with jobs CSE
+        paginated_results = await self._paginated_google_search(
+            query=enhanced_query,
+            cse_id=cse_id,
+            page=page,
+            per_page=per_page
+        )
+        if paginated_results.get("error"):
+            raise RuntimeError(paginated_results["error"])
+
+        # Format results for API compatibility
+        formatted_results = []
+        all_cse_items = paginated_results.get('items', [])
+        # Try domain-filtered results first; if the whitelist eliminates everything, use all CSE results
+        filtered_items = self._filter_job_results(all_cse_items)
+        if not filtered_items:
+            filtered_items = all_cse_items
+        filtered_items = self._filter_job_results_by_location(filtered_items, location, strict=False)
+        filtered_items = self._rank_job_results_for_exact_relevance(filtered_items, query, location)
+        for item in filtered_items:
+            if self._is_generic_job_results_page({
+                "title": item.get("title", ""),
+                "description": item.get("snippet", ""),
+                "company_name": item.get("company_name", ""),
+            }):
+                continue
+            item_link = item.get('link', '')
+            formatted_results.append({
+                'title': item.get('title', ''),
+                'description': item.get('snippet', ''),
+                'link': item_link,
+                'url': item_link,
+                'source': 'google_jobs_cse'
+            })
+
+        # Calculate pagination metadata
+        total_results = len(formatted_results)
+        total_pages = max(1, (total_results + per_page - 1) // per_page)  # Ceiling division
+        has_next_page = page < total_pages
+        has_prev_page = page > 1
+
+        # Same formatting as integration script with pagination metadata
+        return {
+            "success": True,
+            "query": query,
+            "location": location,
+            "results": formatted_results,
+            "source": "google_jobs_cse",
+            "degraded": False,
+            "warning": None,
+            "pagination": {
+                "current_page": page,
+                "per_page": per_page,
+                "total_results": total_results,
+                "total_pages": total_pages,
+                "has_next_page": has_next_page,
+                "has_prev_page": has_prev_page,
+                "start_index": (page - 1) * per_page + 1,
+                "end_index": min(page * per_page, total_results)
+            }
+        }
     
     async def _fallback_jobs_search(self, query: str, location: str = None, page: int = 1, per_page: int = 10):
         """Fallback to original CSE if jobs CSE fails"""
@@ -1945,7 +1893,7 @@ class SimpleSearchCoordinator:
             cse_id = self.google_cse_id
             if not self.google_api_key or not cse_id:
                 if self.serper_api_key:
-                    serper_payload = self._serpapi_paginated_search(provider_query, location, page, per_page)
+                    serper_payload = await asyncio.to_thread(self._serpapi_paginated_search, provider_query, location, page, per_page)
                     serper_results = self._rank_service_results_for_direct_providers(
                         serper_payload.get("results", []),
                         query,
@@ -1987,7 +1935,8 @@ class SimpleSearchCoordinator:
                                 "end_index": len(formatted_results)
                             }
                         }
-                openai_fallback = build_openai_services_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_services_response,
                     "Search credentials are incomplete, so service results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2026,7 +1975,7 @@ class SimpleSearchCoordinator:
             # If Google errored, fallback to SerpAPI
             if not paginated_results or paginated_results.get("error"):
                 if self.serper_api_key:
-                    serper_payload = self._serpapi_paginated_search(provider_query, location, page, per_page)
+                    serper_payload = await asyncio.to_thread(self._serpapi_paginated_search, provider_query, location, page, per_page)
                     serper_results = self._rank_service_results_for_direct_providers(
                         serper_payload.get("results", []),
                         query,
@@ -2064,7 +2013,8 @@ class SimpleSearchCoordinator:
                             "end_index": len(formatted_results)
                         }
                     }
-                openai_fallback = build_openai_services_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_services_response,
                     "Primary service search failed, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2120,7 +2070,7 @@ class SimpleSearchCoordinator:
             
         except Exception as e:
             logger.error(f"Services search error: {e}")
-            openai_fallback = self._openai_web_search(self._build_service_search_query(query, location), location, "services", per_page)
+            openai_fallback = await asyncio.to_thread(self._openai_web_search, self._build_service_search_query(query, location), location, "services", per_page)
             openai_results = openai_fallback.get("results", [])[:per_page]
             if openai_results:
                 formatted_results = []
@@ -2316,7 +2266,7 @@ class SimpleSearchCoordinator:
             housing_cse_id = self.google_housing_cse_id or self.google_cse_id
             if not self.google_api_key or not housing_cse_id:
                 if self.serper_api_key:
-                    serper = self._serpapi_paginated_search(self._personal_housing_query(query, location), location, page, per_page)
+                    serper = await asyncio.to_thread(self._serpapi_paginated_search, self._personal_housing_query(query, location), location, page, per_page)
                     serper_items = self._rank_housing_results_for_direct_listings(serper.get("results", []))
                     serper_items = self._filter_housing_results_by_location(serper_items, location)
                     housing_listings = [
@@ -2349,7 +2299,8 @@ class SimpleSearchCoordinator:
                             "end_index": len(housing_listings)
                         }
                     }
-                openai_fallback = build_openai_housing_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_housing_response,
                     "Housing search credentials are incomplete, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2381,7 +2332,7 @@ class SimpleSearchCoordinator:
                     "Skipping blocked Google housing CSE and using fallback provider"
                 )
                 if self.serper_api_key:
-                    serper = self._serpapi_paginated_search(self._personal_housing_query(query, location), location, page, per_page)
+                    serper = await asyncio.to_thread(self._serpapi_paginated_search, self._personal_housing_query(query, location), location, page, per_page)
                     serper_items = self._rank_housing_results_for_direct_listings(serper.get("results", []))
                     serper_items = self._filter_housing_results_by_location(serper_items, location)
                     housing_listings = [
@@ -2415,7 +2366,8 @@ class SimpleSearchCoordinator:
                             "end_index": total_results
                         }
                     }
-                openai_fallback = build_openai_housing_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_housing_response,
                     "Google Custom Search is blocked for the configured housing CSE, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2465,7 +2417,7 @@ class SimpleSearchCoordinator:
                 error_detail = paginated_results.get("error", "Unknown error")
                 logger.error(f"Housing search failed: {error_detail}")
                 if self.serper_api_key:
-                    serper = self._serpapi_paginated_search(self._personal_housing_query(query, location), location, page, per_page)
+                    serper = await asyncio.to_thread(self._serpapi_paginated_search, self._personal_housing_query(query, location), location, page, per_page)
                     serper_items = self._rank_housing_results_for_direct_listings(serper.get("results", []))
                     serper_items = self._filter_housing_results_by_location(serper_items, location)
                     housing_listings = [
@@ -2503,7 +2455,8 @@ class SimpleSearchCoordinator:
                             "end_index": total_results
                         }
                     }
-                openai_fallback = build_openai_housing_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_housing_response,
                     "Primary housing search failed, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2531,7 +2484,8 @@ class SimpleSearchCoordinator:
                 }
             if 'items' not in paginated_results:
                 logger.error(f"Paginated search returned unexpected structure: {paginated_results}")
-                openai_fallback = build_openai_housing_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_housing_response,
                     "Primary housing search returned an unexpected response, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2552,7 +2506,7 @@ class SimpleSearchCoordinator:
                 })
             
             if not housing_listings and self.serper_api_key:
-                serper = self._serpapi_paginated_search(self._personal_housing_query(query, location), location, page, per_page)
+                serper = await asyncio.to_thread(self._serpapi_paginated_search, self._personal_housing_query(query, location), location, page, per_page)
                 serper_items = self._rank_housing_results_for_direct_listings(serper.get("results", []))
                 serper_items = self._filter_housing_results_by_location(serper_items, location)
                 housing_listings = [
@@ -2587,7 +2541,8 @@ class SimpleSearchCoordinator:
                         }
                     }
             if not housing_listings:
-                openai_fallback = build_openai_housing_response(
+                openai_fallback = await asyncio.to_thread(
+                    build_openai_housing_response,
                     "Housing search returned no listings from the primary source, so results are coming from OpenAI web search."
                 )
                 if openai_fallback:
@@ -2618,7 +2573,7 @@ class SimpleSearchCoordinator:
             
         except Exception as e:
             logger.error(f"Housing search error: {e}")
-            openai_fallback = self._openai_web_search(query, location, "housing", per_page)
+            openai_fallback = await asyncio.to_thread(self._openai_web_search, query, location, "housing", per_page)
             openai_results = self._filter_housing_results_by_location(openai_fallback.get("results", []), location)[:per_page]
             if openai_results:
                 housing_listings = []
@@ -2777,6 +2732,14 @@ class SimpleSearchCoordinator:
         if not self.serper_api_key:
             return {"results": [], "error": "SerpAPI key not configured"}
 
+        return self.search_cache.get_or_fetch(
+            "serpapi",
+            search_cache_key("serpapi", query, location, max_results, max(0, start)),
+            lambda: self._fetch_serper_search(query, location, max_results, start),
+            cacheable=self._payload_cacheable,
+        )
+
+    def _fetch_serper_search(self, query: str, location: Optional[str], max_results: int, start: int = 0) -> Dict[str, Any]:
         try:
             search_query = query.strip()
             if location:
@@ -2792,7 +2755,7 @@ class SimpleSearchCoordinator:
                 "api_key": self.serper_api_key
             }
 
-            response = requests.get("https://serpapi.com/search.json", params=params, timeout=5)
+            response = self.http_pool.get("serpapi", "https://serpapi.com/search.json", params=params, timeout=5)
             response.raise_for_status()
             data = response.json()
             return {"results": data.get("organic_results", []), "error": None}
@@ -2918,66 +2881,22 @@ class SimpleSearchCoordinator:
             return {"results": [], "error": str(e)}
 
     def _serpapi_jobs_search(self, query: str, location: Optional[str], page: int, per_page: int) -> Dict[str, Any]:
-        """Use SerpAPI Google Jobs engine with paging tokens and in-memory cache."""
+        """Use SerpAPI Google Jobs engine with paging tokens; listings are cached per query/location."""
         if not self.serper_api_key:
             return {"results": [], "error": "SerpAPI key not configured"}
 
         try:
             page = max(1, page)
             per_page = min(max(1, per_page), 40)
-            cache_key = self._generate_job_search_cache_key(query, location)
-            cached_results = self._get_cached_job_search_results(cache_key)
-            if cached_results is not None:
-                start_index = (page - 1) * per_page
-                end_index = start_index + per_page
-                page_results = cached_results[start_index:end_index]
-                return {
-                    "results": page_results,
-                    "total_results": len(cached_results),
-                    "has_next_page": end_index < len(cached_results),
-                    "error": None,
-                    "from_cache": True,
-                }
-
-            requested_limit = min(per_page * 2, 20)
-            listings: List[Dict[str, Any]] = []
-            seen_ids = set()
-            next_page_token = None
-
-            while len(listings) < requested_limit:
-                params = {
-                    "engine": "google_jobs",
-                    "q": query.strip(),
-                    "location": location or "",
-                    "hl": "en",
-                    "gl": "us",
-                    "api_key": self.serper_api_key
-                }
-                if next_page_token:
-                    params["next_page_token"] = next_page_token
-
-                response = requests.get("https://serpapi.com/search.json", params=params, timeout=5)
-                response.raise_for_status()
-                data = response.json()
-                page_results = data.get("jobs_results", []) or []
-                next_page_token = ((data.get("serpapi_pagination") or {}).get("next_page_token"))
-
-                if not page_results:
-                    break
-
-                for job in page_results:
-                    stable_id = job.get("job_id") or f"{job.get('title', '')}-{job.get('company_name', '')}-{job.get('location', '')}"
-                    if stable_id in seen_ids:
-                        continue
-                    seen_ids.add(stable_id)
-                    listings.append(job)
-                    if len(listings) >= requested_limit:
-                        break
-
-                if not next_page_token:
-                    break
-
-            self._set_cached_job_search_results(cache_key, listings)
+            # The first request for a query fetches up to 20 listings; later pages
+            # (and repeat searches) are sliced from the cached set.
+            cached, cache_state = self.search_cache.get_or_fetch_with_state(
+                "serpapi_jobs",
+                search_cache_key("serpapi_jobs", query, location),
+                lambda: self._fetch_serpapi_job_listings(query, location, min(per_page * 2, 20)),
+            )
+            fetched = cache_state not in ("fresh", "stale")
+            listings = cached["listings"]
 
             start_index = (page - 1) * per_page
             end_index = start_index + per_page
@@ -2985,21 +2904,71 @@ class SimpleSearchCoordinator:
             return {
                 "results": page_results,
                 "total_results": len(listings),
-                "has_next_page": end_index < len(listings) or bool(next_page_token),
+                "has_next_page": end_index < len(listings) or (fetched and cached["more_available"]),
                 "error": None,
-                "from_cache": False,
+                "from_cache": not fetched,
             }
         except Exception as e:
             logger.error(f"SerpAPI jobs search error: {e}")
             return {"results": [], "error": str(e)}
+
+    def _fetch_serpapi_job_listings(self, query: str, location: Optional[str], requested_limit: int) -> Dict[str, Any]:
+        """Page through SerpAPI Google Jobs until ``requested_limit`` unique listings are collected."""
+        listings: List[Dict[str, Any]] = []
+        seen_ids = set()
+        next_page_token = None
+
+        while len(listings) < requested_limit:
+            params = {
+                "engine": "google_jobs",
+                "q": query.strip(),
+                "location": location or "",
+                "hl": "en",
+                "gl": "us",
+                "api_key": self.serper_api_key
+            }
+            if next_page_token:
+                params["next_page_token"] = next_page_token
+
+            response = self.http_pool.get("serpapi", "https://serpapi.com/search.json", params=params, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+            page_results = data.get("jobs_results", []) or []
+            next_page_token = ((data.get("serpapi_pagination") or {}).get("next_page_token"))
+
+            if not page_results:
+                break
+
+            for job in page_results:
+                stable_id = job.get("job_id") or f"{job.get('title', '')}-{job.get('company_name', '')}-{job.get('location', '')}"
+                if stable_id in seen_ids:
+                    continue
+                seen_ids.add(stable_id)
+                listings.append(job)
+                if len(listings) >= requested_limit:
+                    break
+
+            if not next_page_token:
+                break
+
+        return {"listings": listings, "more_available": bool(next_page_token)}
     
     async def _paginated_google_search(self, query: str, cse_id: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+        """
+        Paginated Google Custom Search results, served from the search cache when available
+        """
+        return await self.search_cache.aget_or_fetch(
+            "google_cse",
+            search_cache_key("google_cse", query, cse_id, page, per_page),
+            lambda: self._fetch_paginated_google_search(query, cse_id, page, per_page),
+            cacheable=self._payload_cacheable,
+        )
+
+    async def _fetch_paginated_google_search(self, query: str, cse_id: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
         """
         Perform paginated Google Custom Search API calls with robust error handling
         """
         try:
-            import requests
-            
             # Validate parameters
             page = max(1, page)
             per_page = min(max(1, per_page), 40)
@@ -3030,25 +2999,31 @@ class SimpleSearchCoordinator:
             
             logger.info(f"Paginated search: page {page}, per_page {per_page}, start_index {start_index}")
             
-            for call_num in range(calls_needed):
-                api_start = start_index + (call_num * 10)
-                
-                if api_start > 100:
-                    logger.warning(f"Reached Google CSE limit (start={api_start})")
-                    break
-                
-                url = "https://www.googleapis.com/customsearch/v1"
-                params = {
-                    'key': self.google_api_key,
-                    'cx': cse_id,
-                    'q': query,
-                    'start': api_start,
-                    'num': 10
-                }
-                
-                logger.info(f"API call {call_num + 1}/{calls_needed}: start={api_start}")
-
-                response = requests.get(url, params=params, timeout=5)
+            api_starts = [start_index + (call_num * 10) for call_num in range(calls_needed)]
+            if api_starts and api_starts[-1] > 100:
+                logger.warning(f"Reached Google CSE limit (start={api_starts[-1]})")
+                api_starts = [api_start for api_start in api_starts if api_start <= 100]
+            
+            url = "https://www.googleapis.com/customsearch/v1"
+            # The up-to-3 page calls run concurrently, so latency is the slowest
+            # page rather than the sum of all pages.
+            responses = await asyncio.gather(*[
+                self.http_pool.aget(
+                    "google_cse",
+                    url,
+                    params={
+                        'key': self.google_api_key,
+                        'cx': cse_id,
+                        'q': query,
+                        'start': api_start,
+                        'num': 10
+                    },
+                    timeout=5,
+                )
+                for api_start in api_starts
+            ])
+            
+            for call_num, response in enumerate(responses):
                 if response.status_code == 403:
                     data = response.json()
                     if self._is_google_permission_block(response=response, payload=data):
@@ -3092,7 +3067,7 @@ class SimpleSearchCoordinator:
                 'actual_returned': len(trimmed_items)
             }
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API request error in paginated search: {e}")
             status_code = getattr(getattr(e, "response", None), "status_code", None)
             error_message = "API request failed"
@@ -3106,6 +3081,8 @@ class SimpleSearchCoordinator:
             if self._is_google_permission_block(response=response, payload=payload):
                 self._mark_google_cse_blocked(cse_id, payload.get("error", {}).get("message", "permission denied"))
                 error_message = self._google_cse_error_message(cse_id)
+            elif isinstance(e, ProviderUnavailable):
+                error_message = str(e)
             elif status_code:
                 error_message = f"API request failed: HTTP {status_code}"
             return {
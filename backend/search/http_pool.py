@@ -0,0 +1,244 @@
+"""Shared HTTP client pool for the search providers.
+
+SimpleSearchCoordinator used to open a fresh ``requests`` connection for every
+SerpAPI, Google CSE, Places and OpenAI call, including from inside its
+``async def`` search paths where the blocking call pinned the event loop. All
+provider traffic now goes through one ``SearchHTTPPool``:
+
+* **Async clients** - one ``httpx.AsyncClient`` per running event loop
+  (clients cannot be shared across loops), keep-alive enabled and HTTP/2 when
+  the optional ``h2`` package is installed.
+* **Sync client** - one ``httpx.Client`` for the synchronous ``search()`` path
+  and for provider helpers that run in worker threads.
+* **Per-provider concurrency** - a semaphore per provider bounds in-flight
+  calls (``PROVIDER_CONCURRENCY``, overridable with
+  ``CMSX_SEARCH_HTTP_CONCURRENCY_<PROVIDER>``), so a burst of searches cannot
+  exhaust a provider's rate limit or the connection pool.
+* **Timeouts** - separate connect (``CMSX_SEARCH_HTTP_CONNECT_TIMEOUT_S``) and
+  per-call read timeouts.
+* **Provider health** - with an engine attached, every call is admitted by the
+  provider's circuit breaker / quota and its latency and outcome recorded
+  (see ``provider_engine``). Sync calls made from an attempt the engine has
+  cancelled fail fast with ``ProviderUnavailable`` instead of reaching the
+  provider.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from backend.search.provider_engine import (
+    ProviderExecutionEngine,
+    ProviderUnavailable,
+    attempt_cancelled,
+    get_provider_engine,
+)
+from backend.shared.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Maximum in-flight requests per provider, per event loop (async) or process (sync).
+PROVIDER_CONCURRENCY: Dict[str, int] = {
+    "google_cse": 8,
+    "google_places": 4,
+    "serpapi": 4,
+    "openai": 2,
+}
+DEFAULT_CONCURRENCY = 4
+DEFAULT_READ_TIMEOUT_S = 5.0
+
+
+def _is_failure(response: httpx.Response) -> bool:
+    """Server errors and rate limiting count against a provider's health; other 4xx do not."""
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _LoopState:
+    """The async client and provider semaphores bound to one event loop."""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+class SearchHTTPPool:
+    """Keep-alive HTTP clients with per-provider concurrency limits."""
+
+    def __init__(self, transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None,
+                 engine: Optional[ProviderExecutionEngine] = None) -> None:
+        self.engine = engine
+        self.connect_timeout = env_float("CMSX_SEARCH_HTTP_CONNECT_TIMEOUT_S", 3.0)
+        self.limits = httpx.Limits(
+            max_connections=env_int("CMSX_SEARCH_HTTP_MAX_CONNECTIONS", 32),
+            max_keepalive_connections=env_int("CMSX_SEARCH_HTTP_MAX_KEEPALIVE", 16),
+            keepalive_expiry=env_float("CMSX_SEARCH_HTTP_KEEPALIVE_S", 30.0),
+        )
+        self.http2 = http2_available()
+        self._transport = transport
+        self._async_transport = async_transport
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def concurrency(provider: str) -> int:
+        default = PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY)
+        return max(1, env_int(f"CMSX_SEARCH_HTTP_CONCURRENCY_{provider.upper()}", default))
+
+    def _timeout(self, read_timeout: Optional[float]) -> httpx.Timeout:
+        return httpx.Timeout(read_timeout or DEFAULT_READ_TIMEOUT_S, connect=self.connect_timeout)
+
+    # ── Async requests ──────────────────────────────────────────────────────
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self._timeout(None),
+                transport=self._async_transport,
+            )
+            state = self._loops[loop] = _LoopState(client)
+        return state
+
+    async def arequest(self, provider: str, method: str, url: str, *,
+                       timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        state = self._loop_state()
+        semaphore = state.semaphores.get(provider)
+        if semaphore is None:
+            semaphore = state.semaphores[provider] = asyncio.Semaphore(self.concurrency(provider))
+        async with semaphore:
+            if self.engine is not None:
+                self.engine.admit(provider)
+            started = time.perf_counter()
+            try:
+                response = await state.client.request(method, url, timeout=self._timeout(timeout), **kwargs)
+            except asyncio.CancelledError:
+                if self.engine is not None:
+                    self.engine.release(provider)
+                raise
+            except Exception:
+                self._record(provider, started, error=True)
+                raise
+        self._record(provider, started, error=_is_failure(response))
+        return response
+
+    async def aget(self, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.arequest(provider, "GET", url, **kwargs)
+
+    async def apost(self, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.arequest(provider, "POST", url, **kwargs)
+
+    # ── Sync requests ───────────────────────────────────────────────────────
+
+    def _client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self._timeout(None),
+                    transport=self._transport,
+                )
+            return self._sync_client
+
+    def request(self, provider: str, method: str, url: str, *,
+                timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        client = self._client()
+        with self._lock:
+            semaphore = self._sync_semaphores.get(provider)
+            if semaphore is None:
+                semaphore = self._sync_semaphores[provider] = threading.BoundedSemaphore(self.concurrency(provider))
+        with semaphore:
+            if attempt_cancelled():
+                raise ProviderUnavailable(f"{provider} attempt cancelled")
+            if self.engine is not None:
+                self.engine.admit(provider)
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, timeout=self._timeout(timeout), **kwargs)
+            except Exception:
+                self._record(provider, started, error=True)
+                raise
+        self._record(provider, started, error=_is_failure(response))
+        return response
+
+    def get(self, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request(provider, "GET", url, **kwargs)
+
+    def post(self, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request(provider, "POST", url, **kwargs)
+
+    # ── Lifecycle / observability ───────────────────────────────────────────
+
+    async def aclose(self) -> None:
+        """Close the current loop's async client and the sync client."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+        with self._lock:
+            client, self._sync_client = self._sync_client, None
+        if client is not None:
+            client.close()
+
+    def _record(self, provider: str, started: float, error: bool) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.engine is not None:
+            self.engine.record(provider, elapsed_ms, ok=not error)
+        with self._lock:
+            stats = self._metrics.setdefault(provider, {"requests": 0, "errors": 0, "total_ms": 0.0})
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["total_ms"] += elapsed_ms
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {
+                name: {
+                    "requests": int(stats["requests"]),
+                    "errors": int(stats["errors"]),
+                    "avg_ms": round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else 0.0,
+                    "concurrency": self.concurrency(name),
+                }
+                for name, stats in self._metrics.items()
+            }
+            return {
+                "http2": self.http2,
+                "event_loops": len(self._loops),
+                "max_connections": self.limits.max_connections,
+                "providers": providers,
+            }
+
+
+_pool: Optional[SearchHTTPPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_search_http_pool() -> SearchHTTPPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SearchHTTPPool(engine=get_provider_engine())
+        return _pool
@@ -0,0 +1,470 @@
+"""Provider execution engine for the search coordinator.
+
+Tracks the health of every upstream search provider (SerpAPI, Google CSE,
+Places, OpenAI) and schedules multi-provider lookups:
+
+* **Circuit breakers** - ``CMSX_SEARCH_BREAKER_FAILURES`` consecutive failures
+  open a provider's circuit for ``CMSX_SEARCH_BREAKER_RESET_S``; afterwards a
+  single half-open probe decides whether it closes again. Calls to an open
+  provider fail immediately with ``ProviderUnavailable``.
+* **Rolling latency/error windows** - the last ``WINDOW_SIZE`` calls per
+  provider give p50/p95 latency and the error rate.
+* **Quota budgets** - ``CMSX_SEARCH_QUOTA_<PROVIDER>`` calls per
+  ``CMSX_SEARCH_QUOTA_<PROVIDER>_WINDOW_S`` (default one day); unset means
+  unlimited.
+* **Hedged / raced execution** - ``run()`` takes provider attempts in
+  priority order and returns the first sufficient result. In ``hedge`` mode
+  the next provider starts when the current attempt has not answered within
+  its p95 latency (or answered with nothing usable); ``race`` starts all at
+  once; ``sequential`` only moves on once a provider has finished. An attempt
+  may chain several upstream calls, so hedging uses the latency of whole
+  attempts, kept per attempt name, not the per-call provider windows. A losing
+  attempt is cancelled, and ``attempt_cancelled()`` lets its ``to_thread``
+  work (the sync pool checks it before every request) stop instead of running
+  on.
+
+``SearchHTTPPool`` reports every provider HTTP call here, so breakers and
+latency windows reflect real upstream behaviour; ``call()`` does the same for
+callables that do not go through the pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from backend.shared.env import env_int
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SIZE = 200
+# p95 needs this many samples before it replaces the configured hedge delay.
+MIN_HEDGE_SAMPLES = 20
+EXECUTION_MODES = ("hedge", "race", "sequential")
+
+# Set while a ``run()`` attempt is in flight; copied into its ``to_thread`` workers.
+_attempt_token: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "search_provider_attempt", default=None
+)
+
+
+def attempt_cancelled() -> bool:
+    """True inside an attempt that ``run()`` has already cancelled (a hedge or race loser)."""
+    token = _attempt_token.get()
+    return token is not None and token.is_set()
+
+
+class ProviderUnavailable(httpx.HTTPError):
+    """Raised instead of calling a provider whose circuit is open or whose quota is spent.
+
+    It is an ``httpx.HTTPError`` so provider helpers treat it like any other
+    failed request and fall through to their next source.
+    """
+
+
+# ── Health primitives ───────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open probe -> closed/open."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.times_opened = 0
+
+    def available(self) -> bool:
+        """Whether a call would be admitted right now (without claiming the probe)."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return self._clock() - self.opened_at >= self.reset_seconds
+        return not self.probe_in_flight
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if self._clock() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = "half_open"
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = self._clock()
+        self.probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back an admitted call that never reached the provider (e.g. cancelled)."""
+        self.probe_in_flight = False
+
+
+class LatencyWindow:
+    """Latency and outcome of a provider's most recent calls."""
+
+    def __init__(self, size: int = WINDOW_SIZE) -> None:
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=size)
+
+    def add(self, latency_ms: float, ok: bool) -> None:
+        self.samples.append((latency_ms, ok))
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(latency for latency, _ in self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+
+class QuotaBudget:
+    """Sliding-window call budget; ``limit=None`` never runs out."""
+
+    def __init__(self, limit: Optional[int], window_seconds: float,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._calls: Deque[float] = deque()
+
+    def _trim(self) -> None:
+        cutoff = self._clock() - self.window_seconds
+        while self._calls and self._calls[0] <= cutoff:
+            self._calls.popleft()
+
+    def remaining(self) -> Optional[int]:
+        if self.limit is None:
+            return None
+        self._trim()
+        return max(0, self.limit - len(self._calls))
+
+    def try_acquire(self) -> bool:
+        if self.limit is None:
+            return True
+        self._trim()
+        if len(self._calls) >= self.limit:
+            return False
+        self._calls.append(self._clock())
+        return True
+
+
+@dataclass
+class _ProviderHealth:
+    breaker: CircuitBreaker
+    window: LatencyWindow
+    budget: QuotaBudget
+    calls: int = 0
+    rejected: int = 0
+
+
+# ── Scheduling ──────────────────────────────────────────────────────────────
+
+@dataclass
+class ProviderAttempt:
+    """One provider in a ``run()``: ``call`` produces its result set."""
+
+    provider: str
+    call: Callable[[], Awaitable[Any]]
+    sufficient: Callable[[Any], bool] = bool
+    # Whole-attempt latency (and so the hedge delay) is tracked under this name.
+    name: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return self.name or self.provider
+
+
+@dataclass
+class ProviderOutcome:
+    provider: Optional[str] = None
+    result: Any = None
+    sufficient: bool = False
+    launched: List[str] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    hedged: bool = False
+
+
+class ProviderExecutionEngine:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._providers: Dict[str, _ProviderHealth] = {}
+        self._attempts: Dict[str, LatencyWindow] = {}
+        self._runs = {"runs": 0, "hedges": 0, "wins_by_fallback": 0, "exhausted": 0}
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def execution_mode() -> str:
+        mode = os.environ.get("CMSX_SEARCH_PROVIDER_MODE", "hedge").strip().lower()
+        return mode if mode in EXECUTION_MODES else "hedge"
+
+    def _health(self, provider: str) -> _ProviderHealth:
+        health = self._providers.get(provider)
+        if health is None:
+            name = provider.upper()
+            quota = env_int(f"CMSX_SEARCH_QUOTA_{name}", 0)
+            health = self._providers[provider] = _ProviderHealth(
+                breaker=CircuitBreaker(
+                    env_int("CMSX_SEARCH_BREAKER_FAILURES", 5),
+                    env_int("CMSX_SEARCH_BREAKER_RESET_S", 30),
+                    clock=self._clock,
+                ),
+                window=LatencyWindow(),
+                budget=QuotaBudget(
+                    quota or None,
+                    env_int(f"CMSX_SEARCH_QUOTA_{name}_WINDOW_S", 24 * 60 * 60),
+                    clock=self._clock,
+                ),
+            )
+        return health
+
+    # ── Health tracking ─────────────────────────────────────────────────────
+
+    def available(self, provider: str) -> Optional[str]:
+        """``None`` if ``provider`` could be called now, otherwise the reason it is skipped."""
+        with self._lock:
+            health = self._health(provider)
+            if not health.breaker.available():
+                return f"{provider} circuit open"
+            if health.budget.remaining() == 0:
+                return f"{provider} quota exhausted"
+            return None
+
+    def admit(self, provider: str) -> None:
+        """Claim a call slot (breaker + quota) or raise ``ProviderUnavailable``."""
+        with self._lock:
+            health = self._health(provider)
+            if not health.breaker.allow():
+                health.rejected += 1
+                raise ProviderUnavailable(f"{provider} circuit open")
+            if not health.budget.try_acquire():
+                health.breaker.release()
+                health.rejected += 1
+                raise ProviderUnavailable(f"{provider} quota exhausted")
+            health.calls += 1
+
+    def record(self, provider: str, latency_ms: float, ok: bool) -> None:
+        with self._lock:
+            health = self._health(provider)
+            health.window.add(latency_ms, ok)
+            if ok:
+                health.breaker.record_success()
+            else:
+                was_open = health.breaker.state == "open"
+                health.breaker.record_failure()
+                if not was_open and health.breaker.state == "open":
+                    logger.warning("Search provider %s circuit opened", provider)
+
+    def release(self, provider: str) -> None:
+        with self._lock:
+            self._health(provider).breaker.release()
+
+    async def call(self, provider: str, fn: Callable[[], Awaitable[Any]],
+                   failed: Callable[[Any], bool] = lambda result: False) -> Any:
+        """Run ``fn`` under ``provider``'s breaker and quota, recording its latency."""
+        self.admit(provider)
+        started = time.perf_counter()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.release(provider)
+            raise
+        except Exception:
+            self.record(provider, (time.perf_counter() - started) * 1000, ok=False)
+            raise
+        self.record(provider, (time.perf_counter() - started) * 1000, ok=not failed(result))
+        return result
+
+    def record_attempt(self, name: str, latency_ms: float, ok: bool) -> None:
+        """Record how long a whole ``run()`` attempt took, however many calls it made."""
+        with self._lock:
+            window = self._attempts.get(name)
+            if window is None:
+                window = self._attempts[name] = LatencyWindow()
+            window.add(latency_ms, ok)
+
+    def hedge_delay(self, name: str) -> float:
+        """Seconds to wait on the attempt ``name`` before starting the next one."""
+        default_ms = env_int("CMSX_SEARCH_HEDGE_DELAY_MS", 1500)
+        floor_ms = env_int("CMSX_SEARCH_HEDGE_MIN_MS", 250)
+        ceiling_ms = env_int("CMSX_SEARCH_HEDGE_MAX_MS", 4000)
+        with self._lock:
+            window = self._attempts.get(name)
+            p95 = window.percentile(95) if window and len(window.samples) >= MIN_HEDGE_SAMPLES else None
+        delay_ms = default_ms if p95 is None else p95
+        return min(max(delay_ms, floor_ms), ceiling_ms) / 1000
+
+    # ── Execution ───────────────────────────────────────────────────────────
+
+    async def _attempt(self, attempt: ProviderAttempt) -> Any:
+        token = threading.Event()
+        _attempt_token.set(token)
+        started = time.perf_counter()
+        try:
+            result = await attempt.call()
+        except asyncio.CancelledError:
+            # Unfinished, so not a latency sample; stop any work left in threads.
+            token.set()
+            raise
+        except Exception:
+            self.record_attempt(attempt.key, (time.perf_counter() - started) * 1000, ok=False)
+            raise
+        self.record_attempt(attempt.key, (time.perf_counter() - started) * 1000, ok=True)
+        return result
+
+    async def run(self, attempts: List[ProviderAttempt], mode: Optional[str] = None) -> ProviderOutcome:
+        """First sufficient result across ``attempts`` (priority order) under ``mode``.
+
+        When no provider is sufficient the outcome carries the highest-priority
+        result that did not raise, with ``sufficient=False``.
+        """
+        mode = mode or self.execution_mode()
+        outcome = ProviderOutcome()
+        queue = list(enumerate(attempts))
+        running: Dict[asyncio.Task, Tuple[int, ProviderAttempt]] = {}
+        fallbacks: Dict[int, Tuple[ProviderAttempt, Any]] = {}
+        with self._lock:
+            self._runs["runs"] += 1
+
+        def launch_next() -> bool:
+            while queue:
+                index, attempt = queue.pop(0)
+                reason = self.available(attempt.provider)
+                if reason:
+                    outcome.skipped[attempt.provider] = reason
+                    continue
+                outcome.launched.append(attempt.provider)
+                running[asyncio.ensure_future(self._attempt(attempt))] = (index, attempt)
+                return True
+            return False
+
+        try:
+            launch_next()
+            if mode == "race":
+                while launch_next():
+                    pass
+            while running:
+                timeout = None
+                if mode == "hedge" and queue:
+                    newest = max(running.values(), key=lambda item: item[0])[1]
+                    timeout = self.hedge_delay(newest.key)
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch_next():
+                        outcome.hedged = True
+                        with self._lock:
+                            self._runs["hedges"] += 1
+                    continue
+
+                winners = []
+                for task in done:
+                    index, attempt = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as exc:
+                        outcome.errors[attempt.provider] = str(exc) or type(exc).__name__
+                        continue
+                    if attempt.sufficient(result):
+                        winners.append((index, attempt, result))
+                    elif result is not None:
+                        fallbacks[index] = (attempt, result)
+                if winners:
+                    index, attempt, result = min(winners, key=lambda item: item[0])
+                    outcome.provider, outcome.result, outcome.sufficient = attempt.provider, result, True
+                    if index > 0:
+                        with self._lock:
+                            self._runs["wins_by_fallback"] += 1
+                    return outcome
+                # A provider came back empty or failed: hedging moves on at once,
+                # sequential once nothing else is in flight.
+                if mode == "hedge" or (mode == "sequential" and not running):
+                    launch_next()
+        finally:
+            for task in running:
+                task.cancel()
+
+        with self._lock:
+            self._runs["exhausted"] += 1
+        if fallbacks:
+            attempt, result = fallbacks[min(fallbacks)]
+            outcome.provider, outcome.result = attempt.provider, result
+        return outcome
+
+    # ── Observability ───────────────────────────────────────────────────────
+
+    def reset(self) -> None:
+        with self._lock:
+            self._providers = {}
+            self._attempts = {}
+            self._runs = {key: 0 for key in self._runs}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {}
+            for name, health in self._providers.items():
+                p50 = health.window.percentile(50)
+                p95 = health.window.percentile(95)
+                providers[name] = {
+                    "state": health.breaker.state,
+                    "consecutive_failures": health.breaker.consecutive_failures,
+                    "times_opened": health.breaker.times_opened,
+                    "calls": health.calls,
+                    "rejected": health.rejected,
+                    "p50_ms": round(p50, 2) if p50 is not None else None,
+                    "p95_ms": round(p95, 2) if p95 is not None else None,
+                    "error_rate": round(health.window.error_rate(), 4),
+                    "quota_remaining": health.budget.remaining(),
+                }
+            attempts = {}
+            for name, window in self._attempts.items():
+                p50, p95 = window.percentile(50), window.percentile(95)
+                attempts[name] = {
+                    "samples": len(window.samples),
+                    "p50_ms": round(p50, 2) if p50 is not None else None,
+                    "p95_ms": round(p95, 2) if p95 is not None else None,
+                }
+            return {"mode": self.execution_mode(), **self._runs, "providers": providers, "attempts": attempts}
+
+
+_engine: Optional[ProviderExecutionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_provider_engine() -> ProviderExecutionEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ProviderExecutionEngine()
+        return _engine
@@ -6,9 +6,11 @@ Simple Search API Routes - Unified search endpoints
 from fastapi import APIRouter, HTTPException, Query, Body
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
+from datetime import datetime
 import logging
 
 from .coordinator import get_coordinator, SearchType
+from .search_cache import VERTICAL_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -219,19 +221,15 @@ async def search_health():
         }
 
 @router.get("/cache/clear")
-async def clear_search_cache():
-    """Clear search cache (admin endpoint)"""
+async def clear_search_cache(vertical: Optional[str] = None):
+    """Clear search cache, optionally for one vertical (admin endpoint)"""
     try:
-        import sqlite3
-        conn = sqlite3.connect(get_coordinator().cache_db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM search_cache")
-        conn.commit()
-        conn.close()
+        removed = get_coordinator().search_cache.clear(vertical)
         
         return {
             "success": True,
-            "message": "Search cache cleared successfully"
+            "message": "Search cache cleared successfully",
+            "entries_removed": removed
         }
     except Exception as e:
         logger.error(f"Cache clear error: {e}")
@@ -241,37 +239,19 @@ async def clear_search_cache():
 async def get_cache_stats():
     """Get search cache statistics"""
     try:
-        import sqlite3
-        conn = sqlite3.connect(get_coordinator().cache_db_path)
-        cursor = conn.cursor()
-        
-        # Get total cache entries
-        cursor.execute("SELECT COUNT(*) FROM search_cache")
-        total_entries = cursor.fetchone()[0]
-        
-        # Get cache entries by type
-        cursor.execute("""
-            SELECT search_type, COUNT(*) 
-            FROM search_cache 
-            GROUP BY search_type
-        """)
-        entries_by_type = dict(cursor.fetchall())
-        
-        # Get oldest and newest entries
-        cursor.execute("""
-            SELECT MIN(timestamp), MAX(timestamp) 
-            FROM search_cache
-        """)
-        oldest, newest = cursor.fetchone()
-        
-        conn.close()
+        search_cache = get_coordinator().search_cache
+        entries_by_vertical = search_cache.disk_stats()
+        oldest_at = [row["oldest_at"] for row in entries_by_vertical.values()]
+        newest_at = [row["newest_at"] for row in entries_by_vertical.values()]
         
         return {
-            "total_entries": total_entries,
-            "entries_by_type": entries_by_type,
-            "oldest_entry": oldest,
-            "newest_entry": newest,
-            "cache_ttl_hours": get_coordinator().cache_ttl_hours
+            "total_entries": sum(row["entries"] for row in entries_by_vertical.values()),
+            "entries_by_type": {vertical: row["entries"] for vertical, row in entries_by_vertical.items()},
+            "oldest_entry": datetime.fromtimestamp(min(oldest_at)).isoformat() if oldest_at else None,
+            "newest_entry": datetime.fromtimestamp(max(newest_at)).isoformat() if newest_at else None,
+            "ttl_seconds_by_type": {vertical: search_cache.ttl_seconds(vertical) for vertical in VERTICAL_TTL_SECONDS},
+            "cache_ttl_hours": get_coordinator().cache_ttl_hours,
+            "metrics": search_cache.metrics()
         }
     except Exception as e:
         logger.error(f"Cache stats error: {e}")
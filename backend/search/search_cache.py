@@ -0,0 +1,498 @@
+"""Two-tier result cache for SimpleSearchCoordinator.
+
+Every paid upstream call the coordinator makes (SerpAPI organic + Google Jobs,
+Google Custom Search pages) and the unified ``search()`` results go through one
+``SearchCache`` instead of an unbounded dict plus a fresh sqlite connection per
+lookup:
+
+* **Memory tier** - an LRU bounded both by entry count
+  (``CMSX_SEARCH_CACHE_SIZE``) and by the JSON size of the cached payloads
+  (``CMSX_SEARCH_CACHE_MAX_BYTES``). Hits return a deep copy so callers can
+  decorate results freely.
+* **SQLite tier** - ``search_cache_entries`` in ``search_cache.db`` through the
+  pooled WAL connection, so cached results survive restarts and are shared by
+  workers.
+* **TTL per vertical** - ``VERTICAL_TTL_SECONDS``, each overridable with
+  ``CMSX_SEARCH_CACHE_TTL_<VERTICAL>_S``.
+* **Stale-while-revalidate** - for ``CMSX_SEARCH_CACHE_STALE_S`` past its TTL an
+  entry is still served, and a single background refresh replaces it.
+* **Request coalescing** - identical concurrent lookups (threads via
+  ``get_or_fetch``, coroutines via ``aget_or_fetch``) share one upstream call.
+
+``CMSX_SEARCH_CACHE=0`` disables caching; every lookup goes straight upstream.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+
+# Fresh lifetime per vertical. Paid provider pages live longest; unified search
+# results are rebuilt from those pages, so a shorter TTL costs no upstream calls.
+VERTICAL_TTL_SECONDS: Dict[str, int] = {
+    "jobs": 30 * 60,
+    "housing": 30 * 60,
+    "services": 6 * 60 * 60,
+    "general": 6 * 60 * 60,
+    "serpapi": 60 * 60,
+    "serpapi_jobs": 24 * 60 * 60,
+    "google_cse": 60 * 60,
+}
+DEFAULT_TTL_SECONDS = 60 * 60
+# Expired rows are purged from disk once every this many writes.
+PURGE_EVERY_WRITES = 200
+
+
+def search_cache_key(vertical: str, *parts: Any) -> str:
+    """Stable key for a lookup; strings are trimmed and lower-cased."""
+    normalized = [part.strip().lower() if isinstance(part, str) else part for part in parts]
+    payload = json.dumps([vertical, normalized], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class _Flight:
+    """One in-progress upstream fetch that followers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchCache:
+    """Bounded LRU in front of a WAL SQLite tier, with SWR and coalescing."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        stale_seconds: Optional[int] = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries or env_int("CMSX_SEARCH_CACHE_SIZE", 1024)
+        self.max_bytes = max_bytes or env_int("CMSX_SEARCH_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        self.stale_seconds = (
+            stale_seconds if stale_seconds is not None else env_int("CMSX_SEARCH_CACHE_STALE_S", 60 * 60)
+        )
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._refreshing: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._writes = 0
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_SEARCH_CACHE", True)
+
+    @staticmethod
+    def ttl_seconds(vertical: str) -> int:
+        default = VERTICAL_TTL_SECONDS.get(vertical, DEFAULT_TTL_SECONDS)
+        return env_int(f"CMSX_SEARCH_CACHE_TTL_{vertical.upper()}_S", default)
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    def lookup(self, vertical: str, key: str) -> Tuple[Any, Optional[str]]:
+        """``(value, "fresh" | "stale")`` from memory, then disk; ``(None, None)`` on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                state = self._state(entry, now)
+                if state is None:
+                    self._drop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self._metrics["hits"] += 1
+                    self._metrics["memory_hits"] += 1
+                    if state == "stale":
+                        self._metrics["stale_hits"] += 1
+                    return copy.deepcopy(entry["value"]), state
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            state = self._state(entry, now)
+            if state is not None:
+                self._memory_put(key, entry)
+                with self._lock:
+                    self._metrics["hits"] += 1
+                    self._metrics["disk_hits"] += 1
+                    if state == "stale":
+                        self._metrics["stale_hits"] += 1
+                return copy.deepcopy(entry["value"]), state
+
+        with self._lock:
+            self._metrics["misses"] += 1
+        return None, None
+
+    def store(self, vertical: str, key: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError) as exc:
+            logger.warning("Search cache skipped unserializable %s value: %s", vertical, exc)
+            return
+        now = time.time()
+        entry = {
+            "vertical": vertical,
+            "value": json.loads(payload),
+            "size": len(payload),
+            "stored_at": now,
+            "expires_at": now + self.ttl_seconds(vertical),
+        }
+        self._memory_put(key, entry)
+        self._disk_put(key, entry, payload)
+
+    def get_or_fetch(
+        self,
+        vertical: str,
+        key: str,
+        fetch: Callable[[], Any],
+        *,
+        force_refresh: bool = False,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Cached value for ``key``, or the result of one coalesced ``fetch()`` call.
+
+        ``cacheable`` can veto storing a result (error payloads, empty pages) so a
+        transient upstream failure is not served from cache.
+        """
+        return self.get_or_fetch_with_state(
+            vertical, key, fetch, force_refresh=force_refresh, cacheable=cacheable
+        )[0]
+
+    def get_or_fetch_with_state(
+        self,
+        vertical: str,
+        key: str,
+        fetch: Callable[[], Any],
+        *,
+        force_refresh: bool = False,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, str]:
+        """``get_or_fetch`` plus where the value came from.
+
+        The state is ``"fresh"`` or ``"stale"`` for a cache hit, ``"fetched"`` when
+        this call went upstream and ``"coalesced"`` when it shared another
+        caller's in-flight fetch. A stale hit's background refresh does not
+        change it.
+        """
+        if not self.enabled():
+            return fetch(), "fetched"
+        if not force_refresh:
+            value, state = self.lookup(vertical, key)
+            if state == "stale":
+                self._refresh_in_thread(vertical, key, fetch, cacheable)
+            if state is not None:
+                return value, state
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._metrics["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value), "coalesced"
+
+        try:
+            flight.value = self._fetch_and_store(vertical, key, fetch, cacheable)
+            return flight.value, "fetched"
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_fetch(
+        self,
+        vertical: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        force_refresh: bool = False,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Async ``get_or_fetch``: concurrent coroutines for one key await a single fetch."""
+        if not self.enabled():
+            return await fetch()
+        if not force_refresh:
+            value, state = self.lookup(vertical, key)
+            if state == "stale":
+                self._refresh_in_task(vertical, key, fetch, cacheable)
+            if state is not None:
+                return value
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        flight = self._async_flights.get(flight_key)
+        leader = flight is None
+        if leader:
+            # The fetch runs in its own task that every caller shields, so a
+            # cancelled leader (a losing hedge, a client disconnect) does not
+            # cancel it for the followers waiting on the same key.
+            flight = loop.create_task(self._afetch_and_store(vertical, key, fetch, cacheable))
+            self._async_flights[flight_key] = flight
+            flight.add_done_callback(lambda task: self._finish_async_flight(flight_key, task))
+        else:
+            with self._lock:
+                self._metrics["coalesced"] += 1
+        value = await asyncio.shield(flight)
+        return value if leader else copy.deepcopy(value)
+
+    def _finish_async_flight(self, flight_key: Tuple[int, str], task: asyncio.Task) -> None:
+        if self._async_flights.get(flight_key) is task:
+            del self._async_flights[flight_key]
+        # Waiters re-raise a failure; if they were all cancelled, nobody else will retrieve it.
+        if not task.cancelled():
+            task.exception()
+
+    def _fetch_and_store(self, vertical, key, fetch, cacheable) -> Any:
+        with self._lock:
+            self._metrics["upstream_calls"] += 1
+        value = fetch()
+        self._maybe_store(vertical, key, value, cacheable)
+        return value
+
+    async def _afetch_and_store(self, vertical, key, fetch, cacheable) -> Any:
+        with self._lock:
+            self._metrics["upstream_calls"] += 1
+        value = await fetch()
+        self._maybe_store(vertical, key, value, cacheable)
+        return value
+
+    def _maybe_store(self, vertical, key, value, cacheable) -> None:
+        if cacheable is not None and not cacheable(value):
+            with self._lock:
+                self._metrics["uncacheable"] += 1
+            return
+        self.store(vertical, key, value)
+
+    # ── Stale-while-revalidate ──────────────────────────────────────────────
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._metrics["background_refreshes"] += 1
+            return True
+
+    def _refresh_in_thread(self, vertical, key, fetch, cacheable) -> None:
+        if not self._claim_refresh(key):
+            return
+
+        def run() -> None:
+            try:
+                self._fetch_and_store(vertical, key, fetch, cacheable)
+            except Exception as exc:
+                logger.warning("Background %s cache refresh failed: %s", vertical, exc)
+                with self._lock:
+                    self._metrics["refresh_errors"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"search-cache-refresh-{vertical}", daemon=True).start()
+
+    def _refresh_in_task(self, vertical, key, fetch, cacheable) -> None:
+        if not self._claim_refresh(key):
+            return
+
+        async def run() -> None:
+            try:
+                await self._afetch_and_store(vertical, key, fetch, cacheable)
+            except Exception as exc:
+                logger.warning("Background %s cache refresh failed: %s", vertical, exc)
+                with self._lock:
+                    self._metrics["refresh_errors"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    # ── Memory tier ─────────────────────────────────────────────────────────
+
+    def _state(self, entry: Dict[str, Any], now: float) -> Optional[str]:
+        if now < entry["expires_at"]:
+            return "fresh"
+        if now < entry["expires_at"] + self.stale_seconds:
+            return "stale"
+        return None
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def _memory_put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._drop(key)
+            if entry["size"] > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry["size"]
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= old["size"]
+                self._metrics["evictions"] += 1
+
+    # ── SQLite tier ─────────────────────────────────────────────────────────
+
+    def _ensure_schema(self, conn) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                vertical TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_entries_expiry ON search_cache_entries(expires_at)"
+        )
+
+    def _connect(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        return get_connection(self.db_path, on_open=self._ensure_schema)
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT vertical, payload_json, size_bytes, stored_at, expires_at
+                    FROM search_cache_entries WHERE cache_key = ?
+                    """,
+                    (key,),
+                ).fetchone()
+        except Exception as exc:
+            logger.warning("Search cache disk read failed: %s", exc)
+            return None
+        if not row:
+            return None
+        return {
+            "vertical": row[0],
+            "value": json.loads(row[1]),
+            "size": row[2],
+            "stored_at": row[3],
+            "expires_at": row[4],
+        }
+
+    def _disk_put(self, key: str, entry: Dict[str, Any], payload: str) -> None:
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % PURGE_EVERY_WRITES == 0
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO search_cache_entries
+                        (cache_key, vertical, payload_json, size_bytes, stored_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, entry["vertical"], payload, entry["size"], entry["stored_at"], entry["expires_at"]),
+                )
+                if purge:
+                    conn.execute(
+                        "DELETE FROM search_cache_entries WHERE expires_at < ?",
+                        (time.time() - self.stale_seconds,),
+                    )
+        except Exception as exc:
+            logger.warning("Search cache disk write failed: %s", exc)
+
+    # ── Maintenance / observability ─────────────────────────────────────────
+
+    def clear(self, vertical: Optional[str] = None) -> int:
+        """Drop cached entries (all, or one vertical) from both tiers; returns disk rows removed."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if vertical is None or e["vertical"] == vertical]:
+                self._drop(key)
+        try:
+            with self._connect() as conn:
+                if vertical is None:
+                    cursor = conn.execute("DELETE FROM search_cache_entries")
+                else:
+                    cursor = conn.execute("DELETE FROM search_cache_entries WHERE vertical = ?", (vertical,))
+                return cursor.rowcount
+        except Exception as exc:
+            logger.warning("Search cache clear failed: %s", exc)
+            return 0
+
+    def disk_stats(self) -> Dict[str, Any]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT vertical, COUNT(*), COALESCE(SUM(size_bytes), 0), MIN(stored_at), MAX(stored_at)
+                    FROM search_cache_entries GROUP BY vertical
+                    """
+                ).fetchall()
+        except Exception as exc:
+            logger.warning("Search cache stats failed: %s", exc)
+            return {}
+        return {
+            row[0]: {"entries": row[1], "bytes": row[2], "oldest_at": row[3], "newest_at": row[4]}
+            for row in rows
+        }
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "hits": 0,
+                "memory_hits": 0,
+                "disk_hits": 0,
+                "stale_hits": 0,
+                "misses": 0,
+                "coalesced": 0,
+                "upstream_calls": 0,
+                "uncacheable": 0,
+                "background_refreshes": 0,
+                "refresh_errors": 0,
+                "evictions": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["entries"] = len(self._entries)
+            snapshot["bytes"] = self._bytes
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["max_entries"] = self.max_entries
+        snapshot["max_bytes"] = self.max_bytes
+        snapshot["enabled"] = self.enabled()
+        return snapshot
@@ -0,0 +1,263 @@
+"""Response and tool-result cache for the AI assistants.
+
+Repeated questions ("sober living in Van Nuys for couples") used to re-run the
+same resource lookups and the same model calls. ``ai_response_cache`` keeps
+their results in process memory:
+
+* **Kinds** - ``tool`` (read-only resource tools called by the model),
+  ``context`` (grounding blocks such as the crisis-support ranking) and
+  ``completion`` (model calls). Completions are only cached when the request is
+  deterministic enough to replay: temperature at or below
+  ``MAX_CACHEABLE_TEMPERATURE``.
+* **Keys** - the kind, the org scope and the normalized prompt / tool arguments
+  (whitespace collapsed; case folded except for completions) go through
+  HMAC-SHA256 with a per-process secret (``CMSX_AI_CACHE_SECRET`` to share one
+  across workers). Keys never contain client text, and short PHI such as a name
+  cannot be recovered by hashing guesses.
+* **Per-entry TTL** - ``KIND_TTL_SECONDS``, each overridable with
+  ``CMSX_AI_CACHE_TTL_<KIND>_S``, or a ``ttl`` passed per call.
+* **Bounded LRU** - by entry count (``CMSX_AI_CACHE_SIZE``) and by the JSON size
+  of the cached values (``CMSX_AI_CACHE_MAX_BYTES``). There is deliberately no
+  disk tier: cached completions contain client details.
+
+Each entry remembers what producing it cost (wall-clock ms and model tokens), so
+a hit reports what it saved; callers collect that per request in a
+``CacheSavings`` and return it as response metadata.
+
+``CMSX_AI_CACHE=0`` bypasses the cache; every call goes upstream.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+
+KIND_TTL_SECONDS: Dict[str, int] = {
+    "tool": 15 * 60,
+    "context": 15 * 60,
+    "completion": 60 * 60,
+}
+DEFAULT_TTL_SECONDS = 15 * 60
+MAX_CACHEABLE_TEMPERATURE = 0.2
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any, fold_case: bool) -> Any:
+    if isinstance(value, str):
+        text = _WHITESPACE.sub(" ", value).strip()
+        return text.casefold() if fold_case else text
+    if isinstance(value, dict):
+        return {str(key): _normalize(item, fold_case) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item, fold_case) for item in value]
+    return value
+
+
+@dataclass
+class CacheSavings:
+    """What cache hits saved during one request."""
+
+    hits: int = 0
+    misses: int = 0
+    saved_ms: float = 0.0
+    saved_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_tokens": self.saved_tokens,
+            "saved_ms": round(self.saved_ms, 1),
+        }
+
+
+class AIResponseCache:
+    """Bounded in-memory LRU of tool results, grounding contexts and completions."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        secret: Optional[bytes] = None,
+    ) -> None:
+        self.max_entries = max_entries or env_int("CMSX_AI_CACHE_SIZE", 512)
+        self.max_bytes = max_bytes or env_int("CMSX_AI_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+        configured = os.environ.get("CMSX_AI_CACHE_SECRET", "").strip()
+        self._secret = secret or (configured.encode() if configured else os.urandom(32))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._metrics: Dict[str, float] = {}
+        self.reset_metrics()
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_AI_CACHE", True)
+
+    @staticmethod
+    def ttl_seconds(kind: str) -> int:
+        return env_int(f"CMSX_AI_CACHE_TTL_{kind.upper()}_S", KIND_TTL_SECONDS.get(kind, DEFAULT_TTL_SECONDS))
+
+    @staticmethod
+    def cacheable_temperature(temperature: Optional[float]) -> bool:
+        return temperature is not None and temperature <= MAX_CACHEABLE_TEMPERATURE
+
+    def key(self, kind: str, scope: Optional[str], *parts: Any) -> str:
+        """HMAC of the normalized request; completions keep their case, lookups fold it."""
+        normalized = _normalize(list(parts), fold_case=kind != "completion")
+        payload = json.dumps([kind, scope or "", normalized], sort_keys=True, default=str)
+        return hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """The live entry for ``key`` (value deep-copied), or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() >= entry["expires_at"]:
+                self._drop(key)
+                self._metrics["expired"] += 1
+                entry = None
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            self._metrics["saved_ms"] += entry["cost_ms"]
+            self._metrics["saved_tokens"] += entry["tokens"]
+            return {**entry, "value": copy.deepcopy(entry["value"])}
+
+    def store(
+        self,
+        kind: str,
+        key: str,
+        value: Any,
+        *,
+        cost_ms: float = 0.0,
+        tokens: int = 0,
+        ttl: Optional[int] = None,
+    ) -> None:
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError) as exc:
+            logger.warning("AI cache skipped unserializable %s value: %s", kind, exc)
+            return
+        now = time.time()
+        entry = {
+            "kind": kind,
+            "value": json.loads(payload),
+            "size": len(payload),
+            "cost_ms": cost_ms,
+            "tokens": tokens,
+            "expires_at": now + (ttl if ttl is not None else self.ttl_seconds(kind)),
+        }
+        with self._lock:
+            self._drop(key)
+            if entry["size"] > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry["size"]
+            self._metrics["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old["size"]
+                self._metrics["evictions"] += 1
+
+    async def aget_or_compute(
+        self,
+        kind: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        savings: Optional[CacheSavings] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        tokens: Optional[Callable[[Any], int]] = None,
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """Cached value for ``key``, or ``await compute()`` stored with its cost.
+
+        ``cacheable`` can veto storing a result (failed lookups, empty contexts);
+        ``tokens`` reads the model tokens a result cost so hits can report them.
+        """
+        if not self.enabled():
+            return await compute()
+        entry = self.lookup(key)
+        if entry is not None:
+            if savings is not None:
+                savings.hits += 1
+                savings.saved_ms += entry["cost_ms"]
+                savings.saved_tokens += entry["tokens"]
+            return entry["value"]
+
+        if savings is not None:
+            savings.misses += 1
+        started = time.perf_counter()
+        value = await compute()
+        cost_ms = (time.perf_counter() - started) * 1000
+        if cacheable is not None and not cacheable(value):
+            with self._lock:
+                self._metrics["uncacheable"] += 1
+            return value
+        self.store(kind, key, value, cost_ms=cost_ms, tokens=tokens(value) if tokens else 0, ttl=ttl)
+        return value
+
+    # ── Maintenance / observability ─────────────────────────────────────────
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def clear(self, kind: Optional[str] = None) -> int:
+        """Drop cached entries (all, or one kind); returns how many were removed."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if kind is None or entry["kind"] == kind]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "hits": 0,
+                "misses": 0,
+                "expired": 0,
+                "stores": 0,
+                "uncacheable": 0,
+                "evictions": 0,
+                "saved_ms": 0.0,
+                "saved_tokens": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["entries"] = len(self._entries)
+            snapshot["bytes"] = self._bytes
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["saved_ms"] = round(snapshot["saved_ms"], 1)
+        snapshot["max_entries"] = self.max_entries
+        snapshot["max_bytes"] = self.max_bytes
+        snapshot["enabled"] = self.enabled()
+        return snapshot
+
+
+ai_response_cache = AIResponseCache()
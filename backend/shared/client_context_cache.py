@@ -0,0 +1,380 @@
+"""Versioned per-client cache for the client operational context.
+
+``load_client_operational_context`` fans out to a dozen module stores. The
+result only changes when one of those stores is written for that client, so
+instead of a TTL the cache is invalidated by *generation*:
+
+* Every client has a generation counter. Writers that feed the context
+  (``WorkspaceStore``, the reminders repository, the FMLA/UR stores, legal
+  records, benefits applications, medical referrals, core client updates) call
+  ``invalidate_client_context`` after committing, which bumps the counter.
+* A cached entry is served only while the generation it was built at is still
+  current. The generation is read *before* the build starts, so a write that
+  lands mid-build leaves the new entry already stale rather than hiding it.
+* Entries are keyed by (DB dir, org id, client id). Keying on the DB dir keeps
+  the SaaS harness / tests, which repoint ``DB_DIR`` per run, fully isolated.
+* Deadlines in the context are relative to "today", so an entry built on an
+  earlier date is never served. ``CMSX_CONTEXT_CACHE_MAX_AGE_S`` (default 15
+  minutes) is a backstop for stores that do not report writes yet (admissions,
+  groups, saved jobs, social services, case_management.db).
+
+The memory tier is an LRU bounded by ``CMSX_CONTEXT_CACHE_SIZE`` entries. The
+optional on-disk tier (``CMSX_CONTEXT_CACHE_DISK=1``) stores entries *and* the
+generation counters in ``context_cache.db`` under ``DB_DIR``, so a restart does
+not cold-start every client and several workers share invalidations.
+``CMSX_CONTEXT_CACHE=0`` disables caching entirely.
+
+``add_invalidation_listener`` lets derived stores (the Smart Daily priority
+index) follow the same generation bumps without this module importing them.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import backend.shared.db_path as db_path_mod
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+DISK_DB_FILENAME = "context_cache.db"
+
+CacheKey = Tuple[str, str, str]
+
+
+def _scope() -> str:
+    return str(Path(db_path_mod.DB_DIR).resolve())
+
+
+class ClientContextCache:
+    """Generation-checked LRU (plus optional SQLite tier) for per-client context."""
+
+    def __init__(self, max_entries: Optional[int] = None, max_age_seconds: Optional[int] = None) -> None:
+        self.max_entries = max_entries or env_int("CMSX_CONTEXT_CACHE_SIZE", 512)
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None
+            else env_int("CMSX_CONTEXT_CACHE_MAX_AGE_S", 900)
+        )
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._epoch = uuid.uuid4().hex
+        self._disk_ready: Dict[str, bool] = {}
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_CONTEXT_CACHE", True)
+
+    @staticmethod
+    def disk_enabled() -> bool:
+        return env_bool("CMSX_CONTEXT_CACHE_DISK", False)
+
+    # ── Generations ─────────────────────────────────────────────────────────
+
+    def generation(self, client_id: str) -> int:
+        scope = _scope()
+        if self.disk_enabled():
+            try:
+                with self._disk_connect(scope) as conn:
+                    row = conn.execute(
+                        "SELECT generation FROM client_generations WHERE client_id = ?",
+                        (client_id,),
+                    ).fetchone()
+                return int(row[0]) if row else 0
+            except Exception as exc:
+                logger.warning("Context cache disk generation read failed: %s", exc)
+        with self._lock:
+            return self._generations.get((scope, client_id), 0)
+
+    def generations(self, client_ids: Iterable[str]) -> Dict[str, int]:
+        """Bulk ``generation`` for many clients (one query per 500 ids on the disk tier)."""
+        ids = list(dict.fromkeys(client_ids))
+        scope = _scope()
+        if self.disk_enabled():
+            try:
+                found: Dict[str, int] = {}
+                with self._disk_connect(scope) as conn:
+                    for start in range(0, len(ids), 500):
+                        chunk = ids[start:start + 500]
+                        rows = conn.execute(
+                            f"SELECT client_id, generation FROM client_generations"
+                            f" WHERE client_id IN ({','.join('?' * len(chunk))})",
+                            chunk,
+                        ).fetchall()
+                        found.update({row[0]: int(row[1]) for row in rows})
+                return {client_id: found.get(client_id, 0) for client_id in ids}
+            except Exception as exc:
+                logger.warning("Context cache disk generation read failed: %s", exc)
+        with self._lock:
+            return {client_id: self._generations.get((scope, client_id), 0) for client_id in ids}
+
+    def epoch(self) -> str:
+        """Identifies the counter space: generations are only comparable within one epoch.
+
+        In-memory counters restart from zero with the process (and on ``clear``);
+        the disk tier keeps them across restarts and workers.
+        """
+        return "disk" if self.disk_enabled() else self._epoch
+
+    def invalidate(self, client_id: str) -> None:
+        scope = _scope()
+        with self._lock:
+            key = (scope, client_id)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._metrics["invalidations"] += 1
+            for cache_key in [k for k in self._entries if k[0] == scope and k[2] == client_id]:
+                del self._entries[cache_key]
+        if self.disk_enabled():
+            try:
+                with self._disk_connect(scope) as conn:
+                    conn.execute(
+                        """
+                        INSERT INTO client_generations (client_id, generation, bumped_at)
+                        VALUES (?, 1, ?)
+                        ON CONFLICT(client_id) DO UPDATE SET
+                            generation = generation + 1,
+                            bumped_at = excluded.bumped_at
+                        """,
+                        (client_id, time.time()),
+                    )
+            except Exception as exc:
+                logger.warning("Context cache disk invalidation failed for %s: %s", client_id, exc)
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    def get_or_build(
+        self,
+        client_id: str,
+        org_id: Optional[str],
+        builder: Callable[[], Dict[str, Any]],
+        cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Return a cached context for the client or build (and cache) a new one.
+
+        ``cacheable`` can veto storing a freshly built value (e.g. a degraded
+        context where a source was unavailable), so a transient failure is not
+        served until the next write.
+        """
+        if not self.enabled():
+            return builder()
+
+        key: CacheKey = (_scope(), org_id or "", client_id)
+        generation = self.generation(client_id)
+        today = date.today().isoformat()
+
+        value = self._memory_get(key, generation, today)
+        if value is None and self.disk_enabled():
+            value = self._disk_get(key, generation, today)
+        if value is not None:
+            return value
+
+        with self._lock:
+            self._metrics["misses"] += 1
+        started = time.perf_counter()
+        value = builder()
+        build_ms = (time.perf_counter() - started) * 1000.0
+        if cacheable is not None and not cacheable(value):
+            with self._lock:
+                self._metrics["uncacheable"] += 1
+            return value
+        entry = {
+            "generation": generation,
+            "built_on": today,
+            "built_at": time.time(),
+            "build_ms": build_ms,
+            "value": copy.deepcopy(value),
+        }
+        self._memory_put(key, entry)
+        if self.disk_enabled():
+            self._disk_put(key, entry)
+        return value
+
+    def _fresh(self, entry: Dict[str, Any], generation: int, today: str) -> bool:
+        if entry["generation"] != generation or entry["built_on"] != today:
+            return False
+        if self.max_age_seconds > 0 and time.time() - entry["built_at"] > self.max_age_seconds:
+            return False
+        return True
+
+    def _memory_get(self, key: CacheKey, generation: int, today: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._fresh(entry, generation, today):
+                del self._entries[key]
+                self._metrics["stale"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            self._metrics["memory_hits"] += 1
+            self._metrics["saved_build_ms"] += int(entry["build_ms"])
+            value = entry["value"]
+        return copy.deepcopy(value)
+
+    def _memory_put(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    # ── Disk tier ───────────────────────────────────────────────────────────
+
+    def _ensure_disk_schema(self, conn) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS client_generations (
+                client_id TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL DEFAULT 0,
+                bumped_at REAL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS client_context_entries (
+                org_id TEXT NOT NULL,
+                client_id TEXT NOT NULL,
+                generation INTEGER NOT NULL,
+                built_on TEXT NOT NULL,
+                built_at REAL NOT NULL,
+                build_ms REAL NOT NULL DEFAULT 0,
+                payload_json TEXT NOT NULL,
+                PRIMARY KEY (org_id, client_id)
+            )
+            """
+        )
+
+    def _disk_connect(self, scope: str):
+        path = Path(scope) / DISK_DB_FILENAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return get_connection(path, on_open=self._ensure_disk_schema)
+
+    def _disk_get(self, key: CacheKey, generation: int, today: str) -> Optional[Dict[str, Any]]:
+        scope, org_id, client_id = key
+        try:
+            with self._disk_connect(scope) as conn:
+                row = conn.execute(
+                    """
+                    SELECT generation, built_on, built_at, build_ms, payload_json
+                    FROM client_context_entries WHERE org_id = ? AND client_id = ?
+                    """,
+                    (org_id, client_id),
+                ).fetchone()
+        except Exception as exc:
+            logger.warning("Context cache disk read failed for %s: %s", client_id, exc)
+            return None
+        if not row:
+            return None
+        entry = {
+            "generation": row[0],
+            "built_on": row[1],
+            "built_at": row[2],
+            "build_ms": row[3],
+            "value": None,
+        }
+        if not self._fresh(entry, generation, today):
+            with self._lock:
+                self._metrics["stale"] += 1
+            return None
+        entry["value"] = json.loads(row[4])
+        self._memory_put(key, entry)
+        with self._lock:
+            self._metrics["hits"] += 1
+            self._metrics["disk_hits"] += 1
+            self._metrics["saved_build_ms"] += int(entry["build_ms"])
+        return copy.deepcopy(entry["value"])
+
+    def _disk_put(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        scope, org_id, client_id = key
+        try:
+            payload = json.dumps(entry["value"], default=str)
+            with self._disk_connect(scope) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO client_context_entries
+                        (org_id, client_id, generation, built_on, built_at, build_ms, payload_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        org_id, client_id, entry["generation"], entry["built_on"],
+                        entry["built_at"], entry["build_ms"], payload,
+                    ),
+                )
+        except Exception as exc:
+            logger.warning("Context cache disk write failed for %s: %s", client_id, exc)
+
+    # ── Maintenance / observability ─────────────────────────────────────────
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch = uuid.uuid4().hex
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "hits": 0,
+                "memory_hits": 0,
+                "disk_hits": 0,
+                "misses": 0,
+                "stale": 0,
+                "uncacheable": 0,
+                "evictions": 0,
+                "invalidations": 0,
+                "saved_build_ms": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["max_entries"] = self.max_entries
+        snapshot["enabled"] = self.enabled()
+        snapshot["disk_tier"] = self.disk_enabled()
+        return snapshot
+
+
+client_context_cache = ClientContextCache()
+
+_invalidation_listeners: List[Callable[[str], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[str], None]) -> None:
+    """Call ``listener(client_id)`` after every generation bump (e.g. to refresh derived indexes)."""
+    if listener not in _invalidation_listeners:
+        _invalidation_listeners.append(listener)
+
+
+def invalidate_client_context(*client_ids: Optional[str]) -> None:
+    """Bump the generation for each (non-empty, de-duplicated) client id."""
+    for client_id in dict.fromkeys(str(cid).strip() for cid in client_ids if cid):
+        if client_id:
+            client_context_cache.invalidate(client_id)
+            for listener in _invalidation_listeners:
+                try:
+                    listener(client_id)
+                except Exception as exc:
+                    logger.warning("Context invalidation listener failed for %s: %s", client_id, exc)
+
+
+def get_client_context_cache_metrics() -> Dict[str, Any]:
+    return client_context_cache.metrics()
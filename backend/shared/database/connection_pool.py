@@ -0,0 +1,330 @@
+"""Shared SQLite connection provider (per-thread pooled connections).
+
+Every store used to open a brand-new ``sqlite3.connect()`` per call in the
+default rollback-journal mode. Under concurrent case-manager load that meant a
+connection-setup cost on every query and frequent "database is locked" errors.
+
+``get_connection(path)`` hands out a connection for the given DB file instead:
+
+* Connections are pooled per thread and keyed by the absolute DB file path, so a
+  request worker thread reuses its own warm connections (and their prepared
+  statement cache) rather than reconnecting.
+* WAL, ``synchronous=NORMAL``, ``busy_timeout`` and ``mmap_size`` are applied
+  once, when the physical connection is opened.
+* Checkouts are exclusive. A connection goes back to the idle pool when the
+  caller's ``with conn:`` block exits (after the usual commit/rollback) or when
+  the caller calls ``conn.close()``; uncommitted work is rolled back on
+  ``close()`` exactly as it was with a real close.
+* A pooled connection is only reused if the file on disk is still the one it was
+  opened against (same inode), so tests that delete/recreate a DB, or repoint
+  ``DB_DIR``, never see a stale handle.
+
+Existing call sites keep the ``with self._connect() as conn:`` idiom unchanged.
+Pooling can be disabled with ``CMSX_SQLITE_POOL=0`` (e.g. on Windows dev boxes
+where an open handle blocks deleting a tmp dir); the pragmas still apply.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from backend.shared.env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+RowFactory = Optional[Callable[[sqlite3.Cursor, Tuple[Any, ...]], Any]]
+OnOpen = Optional[Callable[[sqlite3.Connection], None]]
+
+
+def pooling_enabled() -> bool:
+    """Re-read on every checkout so tests can monkeypatch the env freely."""
+    return env_bool("CMSX_SQLITE_POOL", True)
+
+
+BUSY_TIMEOUT_MS = env_int("CMSX_SQLITE_BUSY_TIMEOUT_MS", 5000)
+MMAP_SIZE_BYTES = env_int("CMSX_SQLITE_MMAP_SIZE", 64 * 1024 * 1024)
+STATEMENT_CACHE_SIZE = env_int("CMSX_SQLITE_STATEMENT_CACHE", 256)
+# Idle connections kept per worker thread, across all DB files. The oldest idle
+# connection is closed once the cap is exceeded.
+MAX_IDLE_PER_THREAD = env_int("CMSX_SQLITE_POOL_MAX_IDLE", 16)
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class PooledConnection(sqlite3.Connection):
+    """``sqlite3.Connection`` that returns itself to the pool instead of closing."""
+
+    _pool: Optional["SQLiteConnectionPool"] = None
+    _pool_key: str = ""
+    _pool_identity: Optional[Tuple[int, int]] = None
+    _pool_generation: int = 0
+    _checked_out: bool = False
+
+    def __enter__(self) -> "PooledConnection":
+        if self._pool is not None and not self._checked_out:
+            # ``conn = get_connection(...); with conn: ...; with conn: ...`` —
+            # re-entering a released connection takes it back out of the pool.
+            self._pool._reclaim(self)
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return super().__exit__(exc_type, exc, tb)
+        finally:
+            if self._pool is not None:
+                self._pool.release(self)
+
+    def close(self) -> None:
+        if self._pool is None:
+            super().close()
+            return
+        self._pool.release(self)
+
+    def _close_physical(self) -> None:
+        self._pool = None
+        try:
+            super().close()
+        except sqlite3.Error:
+            pass
+
+
+class SQLiteConnectionPool:
+    """Per-thread pool of configured SQLite connections keyed by DB file."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._all: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+        self._metrics: Dict[str, float] = {}
+        self.reset_metrics()
+
+    # ── Checkout / release ──────────────────────────────────────────────────
+
+    def get_connection(
+        self,
+        db_path: PathLike,
+        *,
+        row_factory: RowFactory = None,
+        on_open: OnOpen = None,
+    ) -> sqlite3.Connection:
+        """Return a configured connection for ``db_path``.
+
+        ``on_open`` runs once per *physical* connection (e.g. idempotent
+        ``CREATE TABLE IF NOT EXISTS`` schema setup) instead of on every call.
+        """
+        started = time.perf_counter()
+        key = os.path.abspath(os.fspath(db_path))
+        pooled = pooling_enabled() and key != os.path.abspath(":memory:")
+
+        conn: Optional[PooledConnection] = None
+        if pooled:
+            conn = self._take_idle(key)
+        reused = conn is not None
+        if conn is None:
+            conn = self._open(key, pooled=pooled)
+            if on_open is not None:
+                try:
+                    on_open(conn)
+                    if conn.in_transaction:
+                        conn.commit()
+                except Exception:
+                    conn._close_physical()
+                    raise
+
+        conn.row_factory = row_factory
+        conn.text_factory = str
+        conn.isolation_level = ""
+        conn._checked_out = pooled
+
+        waited_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            self._metrics["reuses" if reused else "opens"] += 1
+            self._metrics["checkouts"] += 1
+            if pooled:
+                self._metrics["checked_out"] += 1
+            self._metrics["wait_ms_total"] += waited_ms
+            if waited_ms > self._metrics["wait_ms_max"]:
+                self._metrics["wait_ms_max"] = waited_ms
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        if not conn._checked_out:
+            return
+        conn._checked_out = False
+        with self._lock:
+            self._metrics["releases"] += 1
+            self._metrics["checked_out"] = max(0, self._metrics["checked_out"] - 1)
+
+        if conn.in_transaction:
+            # Same contract as a real close(): uncommitted work is discarded.
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+        if conn._pool_generation != self._generation or not pooling_enabled():
+            self._discard(conn)
+            return
+
+        idle = self._idle()
+        bucket = idle.setdefault(conn._pool_key, [])
+        bucket.append(conn)
+        idle.move_to_end(conn._pool_key)
+        self._trim(idle)
+
+    def _reclaim(self, conn: PooledConnection) -> None:
+        bucket = self._idle().get(conn._pool_key)
+        if bucket and conn in bucket:
+            bucket.remove(conn)
+        conn._checked_out = True
+        with self._lock:
+            self._metrics["checked_out"] += 1
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _idle(self) -> "OrderedDict[str, List[PooledConnection]]":
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = OrderedDict()
+            self._local.idle = idle
+        return idle
+
+    def _take_idle(self, key: str) -> Optional[PooledConnection]:
+        idle = self._idle()
+        bucket = idle.get(key)
+        if not bucket:
+            return None
+        identity = _file_identity(key)
+        while bucket:
+            conn = bucket.pop()
+            if conn._pool_generation == self._generation and conn._pool_identity == identity:
+                idle.move_to_end(key)
+                return conn
+            # DB file was deleted/replaced (or close_all() ran) since this
+            # connection was opened — never hand out a handle to a dead inode.
+            self._discard(conn, stale=True)
+        idle.pop(key, None)
+        return None
+
+    def _trim(self, idle: "OrderedDict[str, List[PooledConnection]]") -> None:
+        total = sum(len(bucket) for bucket in idle.values())
+        while total > MAX_IDLE_PER_THREAD and idle:
+            oldest_key = next(iter(idle))
+            bucket = idle[oldest_key]
+            if bucket:
+                self._discard(bucket.pop(0))
+                total -= 1
+            if not bucket:
+                idle.pop(oldest_key, None)
+
+    def _open(self, key: str, *, pooled: bool) -> PooledConnection:
+        conn = sqlite3.connect(
+            key,
+            timeout=BUSY_TIMEOUT_MS / 1000.0,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=PooledConnection,
+        )
+        configure_connection(conn)
+        conn._pool_key = key
+        conn._pool_identity = _file_identity(key)
+        conn._pool_generation = self._generation
+        if pooled:
+            conn._pool = self
+            with self._lock:
+                self._all.add(conn)
+        return conn
+
+    def _discard(self, conn: PooledConnection, *, stale: bool = False) -> None:
+        conn._close_physical()
+        with self._lock:
+            self._metrics["stale_discards" if stale else "closes"] += 1
+
+    # ── Maintenance / observability ─────────────────────────────────────────
+
+    def close_all(self) -> None:
+        """Close every idle pooled connection and retire the rest.
+
+        Connections currently checked out stay usable; they are closed (rather
+        than pooled) when their holder releases them.
+        """
+        with self._lock:
+            self._generation += 1
+            conns = list(self._all)
+        for conn in conns:
+            if not conn._checked_out:
+                conn._close_physical()
+        self._local = threading.local()
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "opens": 0,
+                "reuses": 0,
+                "checkouts": 0,
+                "releases": 0,
+                "checked_out": 0,
+                "closes": 0,
+                "stale_discards": 0,
+                "wait_ms_total": 0.0,
+                "wait_ms_max": 0.0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._metrics)
+            live = sum(1 for conn in self._all if conn._pool is not None)
+        checkouts = snapshot["checkouts"] or 0
+        snapshot["live_connections"] = live
+        snapshot["reuse_ratio"] = round(snapshot["reuses"] / checkouts, 4) if checkouts else 0.0
+        snapshot["wait_ms_avg"] = round(snapshot["wait_ms_total"] / checkouts, 4) if checkouts else 0.0
+        snapshot["wait_ms_total"] = round(snapshot["wait_ms_total"], 3)
+        snapshot["wait_ms_max"] = round(snapshot["wait_ms_max"], 3)
+        snapshot["pooling_enabled"] = pooling_enabled()
+        return snapshot
+
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply the shared per-connection pragmas (safe to call on any connection)."""
+    conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_MS)}")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        # Read-only volumes / a writer holding the DB mid-switch: keep the
+        # existing journal mode rather than failing the request.
+        logger.debug("Could not enable WAL on %s", getattr(conn, "_pool_key", "?"))
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if MMAP_SIZE_BYTES > 0:
+        conn.execute(f"PRAGMA mmap_size = {int(MMAP_SIZE_BYTES)}")
+
+
+sqlite_pool = SQLiteConnectionPool()
+
+
+def get_connection(
+    db_path: PathLike,
+    *,
+    row_factory: RowFactory = None,
+    on_open: OnOpen = None,
+) -> sqlite3.Connection:
+    """Module-level shortcut for ``sqlite_pool.get_connection``."""
+    return sqlite_pool.get_connection(db_path, row_factory=row_factory, on_open=on_open)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    return sqlite_pool.metrics()
@@ -23,24 +23,28 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union, Tuple
 from contextlib import contextmanager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/db_integrity.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("db_integrity_manager")
 
 # Project root and database paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 DATABASES_DIR = PROJECT_ROOT / "databases"
 
-# Ensure logs directory exists
-logs_dir = PROJECT_ROOT / "logs"
-logs_dir.mkdir(exist_ok=True)
+# Relative to the working directory unless the manager is given a log_path;
+# the file is only opened when the manager is first constructed.
+DEFAULT_LOG_PATH = Path("logs") / "db_integrity.log"
+
+
+def _attach_log_file(log_path: Path):
+    """Add a file handler for ``log_path`` to the integrity logger, once per path"""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    resolved = str(log_path.resolve())
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == resolved:
+            return
+    handler = logging.FileHandler(resolved)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
 
 class DatabaseIntegrityManager:
     """
@@ -113,8 +117,9 @@ class DatabaseIntegrityManager:
         }
     }
     
-    def __init__(self):
+    def __init__(self, log_path: Optional[Union[str, Path]] = None):
         """Initialize the database integrity manager"""
+        _attach_log_file(Path(log_path) if log_path is not None else DEFAULT_LOG_PATH)
         self.last_check_time = None
         self.integrity_status = {}
         self.sync_status = {}
@@ -944,9 +949,12 @@ class DatabaseIntegrityManager:
         
         return report
 
-# Create singleton instance
-db_integrity_manager = DatabaseIntegrityManager()
+# Singleton instance, created on first use
+db_integrity_manager: Optional[DatabaseIntegrityManager] = None
 
 def get_integrity_manager():
     """Get the database integrity manager instance"""
+    global db_integrity_manager
+    if db_integrity_manager is None:
+        db_integrity_manager = DatabaseIntegrityManager()
     return db_integrity_manager
\ No newline at end of file
@@ -12,7 +12,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from backend.shared.client_context_cache import invalidate_client_context
+from backend.shared.database.connection_pool import get_connection
 from backend.shared.db_path import DB_DIR
+from backend.shared.reconciliation_queue import mark_deadlines_dirty
 from backend.shared.tenancy import DEFAULT_ORG_ID
 
 logger = logging.getLogger(__name__)
@@ -61,9 +64,7 @@ class WorkspaceStore:
         # Ensure the parent dir exists for whatever db_path is currently set
         # (volume path in prod, tmp dir under tests), mirroring the other stores.
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_connection(self.db_path, row_factory=sqlite3.Row)
 
     def _initialize(self) -> None:
         with self._connect() as conn:
@@ -364,6 +365,12 @@ class WorkspaceStore:
     def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
         return dict(row)
 
+    @staticmethod
+    def _client_id_for(conn: sqlite3.Connection, table: str, id_column: str, item_id: str) -> Optional[str]:
+        """Owning client of a row addressed by its own id (for cache invalidation)."""
+        row = conn.execute(f"SELECT client_id FROM {table} WHERE {id_column} = ?", (item_id,)).fetchone()
+        return row["client_id"] if row else None
+
     @staticmethod
     def _json_dumps(value: Any, fallback: Any) -> str:
         if value in (None, ""):
@@ -494,6 +501,8 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
+        mark_deadlines_dirty("treatment_plan", client_id)
         return plan
 
     def update_treatment_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -531,6 +540,8 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(existing["client_id"])
+        mark_deadlines_dirty("treatment_plan", existing["client_id"])
         return self.get_treatment_plan(plan_id)
 
     def approve_treatment_plan(self, plan_id: str, approved_by: str) -> Optional[Dict[str, Any]]:
@@ -556,6 +567,8 @@ class WorkspaceStore:
                 (approved_by or "", now, now, plan_id),
             )
             conn.commit()
+            invalidate_client_context(existing["client_id"])
+        mark_deadlines_dirty("treatment_plan", existing["client_id"])
         return self.get_treatment_plan(plan_id)
 
     @staticmethod
@@ -639,6 +652,7 @@ class WorkspaceStore:
                     ),
                 )
                 conn.commit()
+                invalidate_client_context(client_id)
                 row = conn.execute(
                     "SELECT * FROM client_operational_needs WHERE need_id = ?",
                     (existing["need_id"],),
@@ -673,6 +687,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
             row = conn.execute("SELECT * FROM client_operational_needs WHERE need_id = ?", (need_id,)).fetchone()
             return self._need_row_to_dict(row)
 
@@ -791,6 +806,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount
 
     def list_client_notes(self, client_id: str) -> List[Dict[str, Any]]:
@@ -842,6 +858,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
         return note
 
     def update_client_note(
@@ -876,6 +893,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(existing["client_id"])
             row = conn.execute("SELECT * FROM client_notes WHERE note_id = ?", (note_id,)).fetchone()
         return self._row_to_dict(row) if row else None
 
@@ -886,8 +904,10 @@ class WorkspaceStore:
 
     def delete_client_note(self, note_id: str) -> bool:
         with self._connect() as conn:
+            client_id = self._client_id_for(conn, "client_notes", "note_id", note_id)
             cursor = conn.execute("DELETE FROM client_notes WHERE note_id = ?", (note_id,))
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount > 0
 
     def list_client_tasks(self, client_id: str) -> List[Dict[str, Any]]:
@@ -957,6 +977,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
         return task
 
     def update_client_task(self, task_id: str, task_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -994,6 +1015,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(existing["client_id"])
             row = conn.execute("SELECT * FROM client_tasks WHERE task_id = ?", (task_id,)).fetchone()
         return self._row_to_dict(row) if row else None
 
@@ -1004,8 +1026,10 @@ class WorkspaceStore:
 
     def delete_client_task(self, task_id: str) -> bool:
         with self._connect() as conn:
+            client_id = self._client_id_for(conn, "client_tasks", "task_id", task_id)
             cursor = conn.execute("DELETE FROM client_tasks WHERE task_id = ?", (task_id,))
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount > 0
 
     def list_dashboard_items(self, table: str, case_manager_id: str, org_id: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -1454,6 +1478,8 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
+        mark_deadlines_dirty("medical", client_id)
         return item
 
     def update_client_appointment(self, apt_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -1474,15 +1500,20 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            client_id = self._client_id_for(conn, "client_appointments", "apt_id", apt_id)
+            invalidate_client_context(client_id)
             if cursor.rowcount == 0:
                 return None
             row = conn.execute("SELECT * FROM client_appointments WHERE apt_id=?", (apt_id,)).fetchone()
+        mark_deadlines_dirty("medical", client_id)
         return self._row_to_dict(row) if row else None
 
     def delete_client_appointment(self, apt_id: str) -> bool:
         with self._connect() as conn:
+            client_id = self._client_id_for(conn, "client_appointments", "apt_id", apt_id)
             cursor = conn.execute("DELETE FROM client_appointments WHERE apt_id=?", (apt_id,))
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount > 0
 
     # ── Client Service Referrals ─────────────────────────────────────────────
@@ -1532,6 +1563,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
         return item
 
     def update_client_service_referral(self, ref_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -1554,6 +1586,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(self._client_id_for(conn, "client_service_referrals", "ref_id", ref_id))
             if cursor.rowcount == 0:
                 return None
             row = conn.execute("SELECT * FROM client_service_referrals WHERE ref_id=?", (ref_id,)).fetchone()
@@ -1561,8 +1594,10 @@ class WorkspaceStore:
 
     def delete_client_service_referral(self, ref_id: str) -> bool:
         with self._connect() as conn:
+            client_id = self._client_id_for(conn, "client_service_referrals", "ref_id", ref_id)
             cursor = conn.execute("DELETE FROM client_service_referrals WHERE ref_id=?", (ref_id,))
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount > 0
 
     # ── Client Documents ─────────────────────────────────────────────────────
@@ -1604,6 +1639,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
         return item
 
     def get_client_document(self, client_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
@@ -1621,6 +1657,7 @@ class WorkspaceStore:
                 (client_id, doc_id),
             )
             conn.commit()
+            invalidate_client_context(client_id)
             return cursor.rowcount > 0
 
     # ── Client ROI Records (Phase 1) ──────────────────────────────────────────
@@ -1764,6 +1801,7 @@ class WorkspaceStore:
                 ),
             )
             conn.commit()
+            invalidate_client_context(client_id)
             row = conn.execute(
                 "SELECT * FROM roi_records WHERE roi_id=?", (roi_id,)
             ).fetchone()
@@ -1827,6 +1865,7 @@ class WorkspaceStore:
                 values,
             )
             conn.commit()
+            invalidate_client_context(self._client_id_for(conn, "roi_records", "roi_id", roi_id))
             if cursor.rowcount == 0:
                 return None
             row = conn.execute(
@@ -0,0 +1,68 @@
+"""Environment-variable parsing for the ``CMSX_*`` tuning knobs.
+
+Every tunable module reads its sizes, TTLs and feature flags through these
+helpers so a malformed value behaves the same everywhere: it is logged once
+and the default is used. ``minimum``/``maximum`` clamp the parsed (or default)
+value when given.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+_Number = TypeVar("_Number", int, float)
+
+
+def _clamp(value: _Number, minimum: Optional[_Number], maximum: Optional[_Number]) -> _Number:
+    if minimum is not None:
+        value = max(minimum, value)
+    if maximum is not None:
+        value = min(maximum, value)
+    return value
+
+
+def env_int(
+    name: str,
+    default: int,
+    *,
+    minimum: Optional[int] = None,
+    maximum: Optional[int] = None,
+) -> int:
+    raw = os.environ.get(name, "").strip()
+    value = default
+    if raw:
+        try:
+            value = int(raw)
+        except ValueError:
+            logger.warning("Ignoring non-integer %s=%r", name, raw)
+    return _clamp(value, minimum, maximum)
+
+
+def env_float(
+    name: str,
+    default: float,
+    *,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+) -> float:
+    raw = os.environ.get(name, "").strip()
+    value = default
+    if raw:
+        try:
+            value = float(raw)
+        except ValueError:
+            logger.warning("Ignoring non-numeric %s=%r", name, raw)
+    return _clamp(value, minimum, maximum)
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Unset means ``default``; any other value is true only if in ``TRUE_VALUES``."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in TRUE_VALUES
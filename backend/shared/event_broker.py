@@ -0,0 +1,458 @@
+"""Per-user push events for the server-sent-events channel.
+
+The messaging and reminder UIs used to poll for new activity, once per open
+tab. ``event_broker`` lets module code publish an event for a user (or a whole
+org) and delivers it to every open ``/api/events/stream`` connection of that
+user instead:
+
+* **Channels** - ``(org, user_id)``; ``user_id == "*"`` reaches everyone in the
+  org (announcements). Org keys follow ``resolve_org_id``: with multi-tenancy
+  off every channel lives in the default org.
+* **Replay** - each event gets an increasing id. A reconnecting stream sends
+  ``Last-Event-ID`` and receives what it missed from the last
+  ``CMSX_PUSH_REPLAY_SIZE`` events per channel. When the gap cannot be replayed
+  (trimmed history, a restarted worker) it gets one ``resync`` event and should
+  refetch its state.
+* **Backpressure** - each subscriber buffers at most ``CMSX_PUSH_QUEUE_SIZE``
+  events. A consumer that falls further behind has its buffer replaced by a
+  single ``resync`` event rather than growing without bound.
+* **Outbox** - with ``CMSX_PUSH_OUTBOX=1`` events are also appended to
+  ``push_outbox.db`` under ``DB_DIR``. Outbox row ids become event ids, and every
+  uvicorn worker tails the outbox (``CMSX_PUSH_OUTBOX_POLL_MS``, default 500), so
+  a user connected to one worker sees events published on another. Replay then
+  reads the outbox. Rows older than ``CMSX_PUSH_OUTBOX_RETENTION_S`` are purged.
+* **Sweeps** - modules can register periodic checks for connected users (see
+  ``backend.modules.reminders.push``). The worker runs them every
+  ``CMSX_PUSH_SWEEP_S`` seconds while anyone is connected.
+
+``CMSX_PUSH=0`` turns publishing off; the stream endpoint then only sends
+heartbeats and clients fall back to polling.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import backend.shared.db_path as db_path_mod
+from backend.shared.database.connection_pool import get_connection
+from backend.shared.env import env_bool, env_int
+from backend.shared.tenancy import DEFAULT_ORG_ID, multi_tenant_enabled
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DB_FILENAME = "push_outbox.db"
+BROADCAST = "*"
+RESYNC_EVENT = "resync"
+
+Channel = Tuple[str, str]
+Sweep = Callable[["EventBroker", List[Channel]], None]
+
+
+def channel_org(org_id: Optional[str]) -> str:
+    if not multi_tenant_enabled():
+        return DEFAULT_ORG_ID
+    return (org_id or "").strip() or DEFAULT_ORG_ID
+
+
+@dataclass
+class PushEvent:
+    # None when the outbox write failed: delivered, but clients keep their resume point.
+    id: Optional[int]
+    event: str
+    data: Dict[str, Any]
+    channel: Channel
+
+
+class Subscription:
+    """One open stream: a bounded buffer fed from any thread via the stream's event loop."""
+
+    def __init__(self, broker: "EventBroker", channels: Tuple[Channel, ...], max_queue: int) -> None:
+        self.broker = broker
+        self.channels = channels
+        self.max_queue = max_queue
+        self.loop = asyncio.get_running_loop()
+        self._buffer: Deque[PushEvent] = deque()
+        self._ready = asyncio.Event()
+        self.closed = False
+
+    def offer(self, event: PushEvent) -> None:
+        """Queue ``event`` (thread-safe)."""
+        try:
+            self.loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            # The stream's loop is gone; the connection is already dead.
+            self.broker.unsubscribe(self)
+
+    def _offer(self, event: PushEvent) -> None:
+        if self.closed:
+            return
+        if len(self._buffer) >= self.max_queue:
+            self.broker._record("overflows")
+            self.broker._record("dropped", len(self._buffer))
+            resync_id = next((queued.id for queued in reversed(self._buffer) if queued.id is not None), None)
+            self._buffer.clear()
+            self._buffer.append(PushEvent(resync_id, RESYNC_EVENT, {"reason": "backpressure"}, event.channel))
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[PushEvent]:
+        """The next event, or ``None`` when ``timeout`` passes first (time for a heartbeat)."""
+        if not self._buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._buffer.popleft() if self._buffer else None
+
+    def close(self) -> None:
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """In-process pub/sub for push events, optionally fanned out across workers via a SQLite outbox."""
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        replay_size: Optional[int] = None,
+        outbox_poll_ms: Optional[int] = None,
+        sweep_seconds: Optional[int] = None,
+    ) -> None:
+        self.queue_size = queue_size or env_int("CMSX_PUSH_QUEUE_SIZE", 100)
+        self.replay_size = replay_size or env_int("CMSX_PUSH_REPLAY_SIZE", 200)
+        self.outbox_poll_seconds = (outbox_poll_ms or env_int("CMSX_PUSH_OUTBOX_POLL_MS", 500)) / 1000
+        self.sweep_seconds = sweep_seconds if sweep_seconds is not None else env_int("CMSX_PUSH_SWEEP_S", 60)
+        self.outbox_retention_seconds = env_int("CMSX_PUSH_OUTBOX_RETENTION_S", 3600)
+        self.worker_id = uuid.uuid4().hex
+        # Ids start at the wall clock so a restarted worker never reuses ids a client has seen.
+        self._first_id = int(time.time() * 1000)
+        self._ids = itertools.count(self._first_id)
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Channel, Set[Subscription]] = {}
+        self._recent: Dict[Channel, Deque[PushEvent]] = {}
+        self._trimmed_through: Dict[Channel, int] = {}
+        self._outbox_cursor: Optional[int] = None
+        self._sweeps: Dict[str, Sweep] = {}
+        self._last_sweep = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
+
+    # ── Configuration ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def enabled() -> bool:
+        return env_bool("CMSX_PUSH", True)
+
+    @staticmethod
+    def outbox_enabled() -> bool:
+        return env_bool("CMSX_PUSH_OUTBOX", False)
+
+    def register_sweep(self, name: str, sweep: Sweep) -> None:
+        self._sweeps[name] = sweep
+
+    # ── Publishing ──────────────────────────────────────────────────────────
+
+    def publish(self, user_id: str, event: str, data: Dict[str, Any], org_id: Optional[str] = None) -> Optional[int]:
+        """Deliver ``event`` to ``user_id``'s open streams (``"*"``: the whole org); returns its id."""
+        if not self.enabled() or not user_id:
+            return None
+        channel = (channel_org(org_id), user_id)
+        try:
+            payload = json.loads(json.dumps(data, default=str))
+        except (TypeError, ValueError) as exc:
+            logger.warning("Push event %s skipped: %s", event, exc)
+            return None
+        if self.outbox_enabled():
+            event_id = self._outbox_append(channel, event, payload)
+        else:
+            with self._lock:
+                event_id = next(self._ids)
+        self._dispatch(PushEvent(event_id, event, payload, channel))
+        return event_id
+
+    def publish_many(
+        self, user_ids: Iterable[str], event: str, data: Dict[str, Any], org_id: Optional[str] = None
+    ) -> None:
+        for user_id in dict.fromkeys(user_ids):
+            self.publish(user_id, event, data, org_id=org_id)
+
+    def _dispatch(self, event: PushEvent) -> None:
+        with self._lock:
+            if not self.outbox_enabled():
+                recent = self._recent.setdefault(event.channel, deque())
+                recent.append(event)
+                while len(recent) > self.replay_size:
+                    self._trimmed_through[event.channel] = recent.popleft().id
+            subscribers = list(self._subscribers.get(event.channel, ()))
+            self._metrics["published"] += 1
+            self._metrics["delivered"] += len(subscribers)
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    # ── Subscribing ─────────────────────────────────────────────────────────
+
+    def subscribe(
+        self, user_id: str, org_id: Optional[str] = None, last_event_id: Optional[int] = None
+    ) -> Subscription:
+        """Open a subscription for ``user_id`` (plus org broadcasts), replaying after ``last_event_id``.
+
+        Must be called from the event loop that will consume the subscription.
+        """
+        org = channel_org(org_id)
+        channels = ((org, user_id), (org, BROADCAST))
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            self._metrics["subscriptions"] += 1
+        if last_event_id is not None:
+            for event in self._replay(channels, last_event_id):
+                subscription._offer(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def has_subscribers(self, user_id: str, org_id: Optional[str] = None) -> bool:
+        """Whether an event published for ``user_id`` could reach an open stream.
+
+        With the outbox on, streams held by other workers are not visible here,
+        so every user counts as possibly connected.
+        """
+        if not self.enabled() or not user_id:
+            return False
+        if self.outbox_enabled():
+            return True
+        with self._lock:
+            return (channel_org(org_id), user_id) in self._subscribers
+
+    def connected_channels(self) -> List[Channel]:
+        """User channels with at least one open stream (broadcast channels excluded)."""
+        with self._lock:
+            return [channel for channel in self._subscribers if channel[1] != BROADCAST]
+
+    def _replay(self, channels: Tuple[Channel, ...], last_event_id: int) -> List[PushEvent]:
+        if self.outbox_enabled():
+            replayed = self._outbox_replay(channels, last_event_id)
+            if replayed is not None:
+                self._record("replayed", len(replayed))
+                return replayed
+        else:
+            with self._lock:
+                gap = last_event_id < self._first_id - 1 or any(
+                    last_event_id < self._trimmed_through.get(channel, 0) for channel in channels
+                )
+                replayed = [] if gap else sorted(
+                    (event for channel in channels for event in self._recent.get(channel, ()) if event.id > last_event_id),
+                    key=lambda event: event.id,
+                )
+            if not gap:
+                self._record("replayed", len(replayed))
+                return replayed
+        self._record("resyncs")
+        return [PushEvent(last_event_id, RESYNC_EVENT, {"reason": "replay_unavailable"}, channels[0])]
+
+    # ── Outbox ──────────────────────────────────────────────────────────────
+
+    def _ensure_schema(self, conn) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS push_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                org_key TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                event TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_push_outbox_channel ON push_outbox (org_key, user_id, id)")
+
+    def _connect(self):
+        path = Path(db_path_mod.DB_DIR) / OUTBOX_DB_FILENAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return get_connection(path, on_open=self._ensure_schema)
+
+    def _outbox_append(self, channel: Channel, event: str, data: Dict[str, Any]) -> Optional[int]:
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO push_outbox (org_key, user_id, event, data_json, origin, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (channel[0], channel[1], event, json.dumps(data), self.worker_id, time.time()),
+                )
+                return int(cursor.lastrowid)
+        except Exception as exc:
+            logger.warning("Push outbox write failed, delivering locally only: %s", exc)
+            return None
+
+    def _outbox_replay(self, channels: Tuple[Channel, ...], last_event_id: int) -> Optional[List[PushEvent]]:
+        try:
+            with self._connect() as conn:
+                oldest = conn.execute("SELECT MIN(id) FROM push_outbox").fetchone()[0]
+                if oldest is not None and last_event_id < oldest - 1:
+                    return None
+                rows = conn.execute(
+                    f"""
+                    SELECT id, org_key, user_id, event, data_json FROM push_outbox
+                    WHERE id > ? AND ({" OR ".join("(org_key = ? AND user_id = ?)" for _ in channels)})
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    (last_event_id, *[part for channel in channels for part in channel], self.replay_size + 1),
+                ).fetchall()
+        except Exception as exc:
+            logger.warning("Push outbox replay failed: %s", exc)
+            return None
+        if len(rows) > self.replay_size:
+            # More was missed than a replay may carry; a partial replay would
+            # silently skip the rest, so ask for a resync instead.
+            return None
+        return [PushEvent(row[0], row[3], json.loads(row[4]), (row[1], row[2])) for row in rows]
+
+    def poll_outbox(self) -> int:
+        """Dispatch events other workers appended since the last poll; returns how many."""
+        try:
+            with self._connect() as conn:
+                if self._outbox_cursor is None:
+                    self._outbox_cursor = conn.execute("SELECT COALESCE(MAX(id), 0) FROM push_outbox").fetchone()[0]
+                    return 0
+                rows = conn.execute(
+                    "SELECT id, org_key, user_id, event, data_json, origin FROM push_outbox WHERE id > ? ORDER BY id",
+                    (self._outbox_cursor,),
+                ).fetchall()
+                if self.outbox_retention_seconds > 0:
+                    conn.execute(
+                        "DELETE FROM push_outbox WHERE created_at < ?",
+                        (time.time() - self.outbox_retention_seconds,),
+                    )
+        except Exception as exc:
+            logger.warning("Push outbox poll failed: %s", exc)
+            return 0
+        dispatched = 0
+        for row in rows:
+            self._outbox_cursor = row[0]
+            if row[5] == self.worker_id:
+                continue
+            self._dispatch(PushEvent(row[0], row[3], json.loads(row[4]), (row[1], row[2])))
+            dispatched += 1
+        self._record("outbox_received", dispatched)
+        return dispatched
+
+    # ── Worker ──────────────────────────────────────────────────────────────
+
+    def run_sweeps(self) -> None:
+        channels = self.connected_channels()
+        self._last_sweep = time.monotonic()
+        if not channels:
+            return
+        for name, sweep in list(self._sweeps.items()):
+            try:
+                sweep(self, channels)
+            except Exception:
+                logger.exception("Push sweep %s failed", name)
+        self._record("sweeps")
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="push-events", daemon=True)
+            self._thread.start()
+        logger.info("Push event worker started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        self._stop.set()
+        self._wake.set()
+        if thread and thread.is_alive():
+            thread.join(timeout=timeout)
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            if self.outbox_enabled():
+                self.poll_outbox()
+            if self.sweep_seconds > 0 and time.monotonic() - self._last_sweep >= self.sweep_seconds:
+                self.run_sweeps()
+            wait = self.outbox_poll_seconds if self.outbox_enabled() else max(self.sweep_seconds, 1)
+            self._wake.wait(timeout=wait)
+
+    # ── Observability ───────────────────────────────────────────────────────
+
+    def _record(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._metrics[name] += amount
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "published": 0,
+                "delivered": 0,
+                "subscriptions": 0,
+                "replayed": 0,
+                "resyncs": 0,
+                "overflows": 0,
+                "dropped": 0,
+                "outbox_received": 0,
+                "sweeps": 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["open_streams"] = len({sub for subs in self._subscribers.values() for sub in subs})
+            snapshot["connected_users"] = len([c for c in self._subscribers if c[1] != BROADCAST])
+        snapshot["enabled"] = self.enabled()
+        snapshot["outbox"] = self.outbox_enabled()
+        snapshot["running"] = self.is_running
+        snapshot["queue_size"] = self.queue_size
+        return snapshot
+
+
+event_broker = EventBroker()
+
+
+def publish_user_event(user_id: str, event: str, data: Dict[str, Any], org_id: Optional[str] = None) -> None:
+    """Publish a push event without letting delivery problems reach the caller's request."""
+    try:
+        event_broker.publish(user_id, event, data, org_id=org_id)
+    except Exception as exc:
+        logger.warning("Could not publish %s push event: %s", event, exc)
+
+
+def user_has_subscribers(user_id: str, org_id: Optional[str] = None) -> bool:
+    """Whether it is worth building a push payload for ``user_id`` at all."""
+    return event_broker.has_subscribers(user_id, org_id=org_id)
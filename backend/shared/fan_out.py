@@ -0,0 +1,195 @@
+"""Bounded concurrent fan-out for independent, blocking module loaders.
+
+The client operational context and unified client view each pull from a dozen
+module stores (benefits, legal, services, groups, FMLA, UR, workspace, ...) that
+do not depend on one another. Run serially, every page load paid the *sum* of
+their latencies, so one slow module (e.g. FMLA on Postgres) slowed every client
+page. ``run_fan_out`` runs them on a shared bounded thread pool instead, so a
+load costs roughly the slowest source, and each source gets its own timeout after
+which its fallback is used.
+
+A source's timeout is measured from when a worker actually starts it, so
+time spent queued behind other requests' loaders does not count against it.
+Queue wait is bounded separately (``CMSX_FANOUT_QUEUE_TIMEOUT_S``, default: the
+source's own timeout); a source still queued past that bound is cancelled
+before it runs, so abandoned loaders never pile up on the pool.
+
+Results are always returned in the order the sources were declared, so callers
+that report ``unavailable_sources`` stay deterministic. Loader threads inherit
+the caller's ``contextvars``. A fan-out issued from inside a fan-out worker runs
+inline to avoid starving the bounded pool.
+
+``CMSX_FANOUT=0`` runs every source inline (serially) for debugging.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.shared.env import env_bool, env_float
+
+logger = logging.getLogger(__name__)
+
+
+MAX_WORKERS = max(1, int(env_float("CMSX_FANOUT_MAX_WORKERS", 16)))
+DEFAULT_SOURCE_TIMEOUT_S = env_float("CMSX_FANOUT_SOURCE_TIMEOUT_S", 5.0)
+# 0 (the default) means "same as the source's own timeout".
+QUEUE_TIMEOUT_S = env_float("CMSX_FANOUT_QUEUE_TIMEOUT_S", 0.0)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def fan_out_enabled() -> bool:
+    return env_bool("CMSX_FANOUT", True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS,
+                    thread_name_prefix="cmsx-fanout",
+                )
+    return _executor
+
+
+@dataclass
+class FanOutSource:
+    """One independent loader. ``timeout`` (seconds) overrides the default."""
+
+    name: str
+    loader: Callable[[], Any]
+    fallback: Any = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class FanOutResult:
+    values: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    def failed(self, name: str) -> bool:
+        return name in self.errors or name in self.timed_out
+
+    def first_error(self, names: Sequence[str]) -> Optional[BaseException]:
+        for name in names:
+            if name in self.errors:
+                return self.errors[name]
+        return None
+
+    def metadata(self) -> Dict[str, Any]:
+        """JSON-safe latency report for response ``metadata`` blocks."""
+        return {
+            "source_latency_ms": dict(self.latency_ms),
+            "timed_out_sources": list(self.timed_out),
+            "load_ms": self.total_ms,
+        }
+
+
+class _Attempt:
+    """Start signal for one submitted source; set by the worker that runs it."""
+
+    __slots__ = ("started", "started_at")
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.started_at = 0.0
+
+
+def _run_timed(loader: Callable[[], Any], attempt: _Attempt) -> Tuple[Any, float]:
+    _worker_state.active = True
+    attempt.started_at = time.perf_counter()
+    attempt.started.set()
+    try:
+        return loader(), (time.perf_counter() - attempt.started_at) * 1000.0
+    finally:
+        _worker_state.active = False
+
+
+def run_fan_out(
+    sources: Sequence[FanOutSource],
+    *,
+    default_timeout: Optional[float] = None,
+) -> FanOutResult:
+    """Run ``sources`` concurrently and collect values, errors and latencies.
+
+    A source that raises gets its fallback and is recorded in ``errors``; one
+    that exceeds its timeout (counted from its own start) gets its fallback and
+    is recorded in ``timed_out``; its thread is left to finish in the background,
+    as Python threads cannot be interrupted. A source that never leaves the queue
+    within the queue bound is cancelled and also recorded in ``timed_out``.
+    Loaders must not rely on running on the caller's thread.
+    """
+    started = time.perf_counter()
+    timeout_default = DEFAULT_SOURCE_TIMEOUT_S if default_timeout is None else default_timeout
+    result = FanOutResult()
+
+    if not fan_out_enabled() or getattr(_worker_state, "active", False) or len(sources) <= 1:
+        for source in sources:
+            source_started = time.perf_counter()
+            try:
+                result.values[source.name] = source.loader()
+            except Exception as exc:
+                result.values[source.name] = source.fallback
+                result.errors[source.name] = exc
+            result.latency_ms[source.name] = round((time.perf_counter() - source_started) * 1000.0, 3)
+        result.total_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        return result
+
+    executor = _get_executor()
+    futures: List[Tuple[FanOutSource, _Attempt, Future]] = []
+    for source in sources:
+        ctx = contextvars.copy_context()
+        attempt = _Attempt()
+        futures.append((source, attempt, executor.submit(ctx.run, _run_timed, source.loader, attempt)))
+
+    for source, attempt, future in futures:
+        timeout = source.timeout if source.timeout is not None else timeout_default
+        if timeout is None or timeout <= 0:
+            timeout = None
+        queue_timeout = QUEUE_TIMEOUT_S if QUEUE_TIMEOUT_S > 0 else timeout
+
+        if queue_timeout is not None:
+            queue_remaining = max(0.0, started + queue_timeout - time.perf_counter())
+            if not attempt.started.wait(queue_remaining) and future.cancel():
+                result.values[source.name] = source.fallback
+                result.timed_out.append(source.name)
+                result.latency_ms[source.name] = round((time.perf_counter() - started) * 1000.0, 3)
+                logger.warning("Fan-out source %s cancelled after %.2fs queued", source.name, queue_timeout)
+                continue
+
+        remaining = None
+        if timeout is not None:
+            # cancel() failed, so a worker has picked the source up and is
+            # about to set the start signal.
+            attempt.started.wait()
+            remaining = max(0.0, attempt.started_at + timeout - time.perf_counter())
+        try:
+            value, elapsed_ms = future.result(timeout=remaining)
+            result.values[source.name] = value
+            result.latency_ms[source.name] = round(elapsed_ms, 3)
+        except FutureTimeoutError:
+            result.values[source.name] = source.fallback
+            result.timed_out.append(source.name)
+            result.latency_ms[source.name] = round((time.perf_counter() - attempt.started_at) * 1000.0, 3)
+            logger.warning("Fan-out source %s timed out after %.2fs", source.name, timeout)
+        except Exception as exc:
+            result.values[source.name] = source.fallback
+            result.errors[source.name] = exc
+            result.latency_ms[source.name] = round((time.perf_counter() - attempt.started_at) * 1000.0, 3)
+
+    result.total_ms = round((time.perf_counter() - started) * 1000.0, 3)
+    return result
@@ -16,24 +16,48 @@ import time
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any, Set
+from typing import Dict, List, Tuple, Optional, Any, Set, Union
 from backend.shared.db_path import DB_DIR
+from backend.shared.env import env_int
 from contextlib import contextmanager
 import hashlib
 from dataclasses import dataclass, asdict
 from enum import Enum
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('phase_3b_data_consistency.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Relative to the working directory unless the engine is given a log_path.
+DEFAULT_LOG_PATH = Path('phase_3b_data_consistency.log')
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Incremental checks re-compare rows stamped this long before the stored
+# high-water mark, so a row whose updated_at was set before the last check but
+# committed after it (a long writer transaction) is still picked up.
+WATERMARK_OVERLAP = timedelta(seconds=env_int('CMSX_CONSISTENCY_WATERMARK_OVERLAP_S', 300, minimum=0))
+
+
+def _attach_log_file(log_path: Path):
+    """Add a file handler for ``log_path`` to this module's logger, once per path"""
+    
+    resolved = str(log_path.resolve())
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == resolved:
+            return
+    handler = logging.FileHandler(resolved)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def _rewind_watermark(watermark: str) -> str:
+    """Move a stored ``updated_at`` mark back by ``WATERMARK_OVERLAP``, keeping its format"""
+    
+    try:
+        parsed = datetime.fromisoformat(watermark)
+    except (TypeError, ValueError):
+        return watermark
+    return (parsed - WATERMARK_OVERLAP).isoformat(sep=' ' if ' ' in watermark else 'T')
+
 class ConsistencyStatus(Enum):
     CONSISTENT = "consistent"
     INCONSISTENT = "inconsistent"
@@ -77,9 +101,10 @@ class TransactionRecord:
 class DataConsistencyEngine:
     """Phase 3B: Comprehensive Data Consistency Engine"""
     
-    def __init__(self):
+    def __init__(self, log_path: Optional[Union[str, Path]] = None):
         self.db_dir = DB_DIR
         self.lock = threading.RLock()
+        _attach_log_file(Path(log_path) if log_path is not None else DEFAULT_LOG_PATH)
         
         # Module configuration
         self.modules = {
@@ -295,6 +320,15 @@ class DataConsistencyEngine:
                 )
             ''')
             
+            # Incremental check high-water marks
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS consistency_watermarks (
+                    module_name TEXT PRIMARY KEY,
+                    high_water_mark TEXT,
+                    checked_at TEXT NOT NULL
+                )
+            ''')
+            
             # Transaction log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS transaction_log (
@@ -337,7 +371,8 @@ class DataConsistencyEngine:
                 'status': 'completed',
                 'initial_check': consistency_report,
                 'features': [
-                    'Cross-module field comparison',
+                    'Set-based cross-module field comparison',
+                    'Incremental checks from updated_at high-water marks',
                     'Critical field validation',
                     'Severity classification',
                     'Detailed issue tracking'
@@ -351,23 +386,59 @@ class DataConsistencyEngine:
                 'error': str(e)
             }
     
-    def run_consistency_check(self) -> Dict[str, Any]:
-        """Run comprehensive consistency check across all modules"""
+    def run_consistency_check(self, incremental: bool = False) -> Dict[str, Any]:
+        """Run a set-based consistency check of every module against the master.
+        
+        Each module database is ATTACHed once to a read-only connection on the
+        master, and one join over the shared sync fields returns only the
+        clients that are missing from the module or differ from the master.
+        With ``incremental=True`` only rows whose ``updated_at`` is past the
+        module's high-water mark from the previous run (less
+        ``WATERMARK_OVERLAP``) are compared; records deleted from a module are
+        picked up by the next full run.
+        """
         
         start_time = time.time()
         report_id = str(uuid.uuid4())
+        mode = 'incremental' if incremental else 'full'
         
-        logger.info("Starting consistency check across all modules")
-        
-        # Get all clients from master module
-        master_clients = self._get_all_clients_from_master()
+        logger.info(f"Starting {mode} consistency check across all modules")
         
-        total_clients = len(master_clients)
+        watermarks = self._get_watermarks() if incremental else {}
         issues_found = []
+        changed_clients: Optional[Set[str]] = set()
+        new_watermarks = {}
         
-        for client_id, master_data in master_clients.items():
-            client_issues = self._check_client_consistency(client_id, master_data)
-            issues_found.extend(client_issues)
+        with self._master_connection() as conn:
+            total_clients = conn.execute("SELECT COUNT(*) FROM main.clients").fetchone()[0]
+            
+            for module_name in self.modules:
+                if module_name == 'core_clients':  # Skip master module
+                    continue
+                
+                try:
+                    module_issues, module_changed, watermark = self._check_module_consistency(
+                        conn, module_name, watermarks.get(module_name)
+                    )
+                except sqlite3.Error as e:
+                    logger.error(f"Error checking consistency in {module_name}: {e}")
+                    issues_found.append(ConsistencyIssue(
+                        client_id='*',
+                        field_name='module_access',
+                        module_name=module_name,
+                        expected_value='accessible',
+                        actual_value=f'error: {str(e)}',
+                        severity='critical',
+                        detected_at=datetime.now().isoformat()
+                    ))
+                    continue
+                
+                issues_found.extend(module_issues)
+                if module_changed is None:
+                    changed_clients = None
+                elif changed_clients is not None:
+                    changed_clients.update(module_changed)
+                new_watermarks[module_name] = watermark
         
         # Classify issues by severity
         critical_issues = len([i for i in issues_found if i.severity == 'critical'])
@@ -378,12 +449,14 @@ class DataConsistencyEngine:
         
         # Store issues in database
         self._store_consistency_issues(issues_found)
+        self._store_watermarks(new_watermarks)
         
         # Create report
         report = {
             'report_id': report_id,
             'report_date': datetime.now().isoformat(),
-            'total_clients_checked': total_clients,
+            'mode': mode,
+            'total_clients_checked': total_clients if changed_clients is None else len(changed_clients),
             'total_issues_found': len(issues_found),
             'critical_issues': critical_issues,
             'warning_issues': warning_issues,
@@ -401,6 +474,154 @@ class DataConsistencyEngine:
         
         return report
     
+    @contextmanager
+    def _master_connection(self):
+        """Read-only connection on the master database for module databases to be ATTACHed to"""
+        
+        master_path = (self.db_dir / self.modules['core_clients']['db_file']).resolve()
+        conn = sqlite3.connect(f"{master_path.as_uri()}?mode=ro", uri=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def _check_module_consistency(
+        self, conn: sqlite3.Connection, module_name: str, since: Optional[str]
+    ) -> Tuple[List[ConsistencyIssue], Optional[Set[str]], Optional[str]]:
+        """Diff one module against the master in a single pass.
+        
+        Returns the issues found, the client ids changed since ``since`` (None
+        for a full comparison) and the newest ``updated_at`` seen on either
+        side, which becomes the module's next high-water mark. The mark and the
+        diff are read in one read transaction, so the mark never covers rows
+        the diff did not see.
+        """
+        
+        module_info = self.modules[module_name]
+        module_path = (self.db_dir / module_info['db_file']).resolve()
+        master_columns = {row[1] for row in conn.execute("PRAGMA main.table_info(clients)")}
+        
+        # A module database that does not exist yet is checked as an empty one
+        # rather than created by the ATTACH.
+        attached = module_path.exists()
+        if attached:
+            conn.execute("ATTACH DATABASE ? AS module_db", (f"{module_path.as_uri()}?mode=ro",))
+        conn.execute("BEGIN")
+        try:
+            module_columns = set()
+            if attached:
+                module_columns = {row[1] for row in conn.execute("PRAGMA module_db.table_info(clients)")}
+            fields = sorted(module_info['sync_fields'] & master_columns & module_columns)
+            stamped = [side for side, columns in (('m', master_columns), ('s', module_columns))
+                       if 'updated_at' in columns]
+            
+            if module_columns:
+                source = "main.clients m LEFT JOIN module_db.clients s ON s.client_id = m.client_id"
+            else:
+                source = "main.clients m"
+            
+            watermark = None
+            if stamped:
+                tables = {'m': 'main.clients', 's': 'module_db.clients'}
+                watermark = conn.execute("SELECT MAX(v) FROM ({})".format(" UNION ALL ".join(
+                    f"SELECT MAX(updated_at) AS v FROM {tables[side]}" for side in stamped
+                ))).fetchone()[0]
+            
+            # Incremental scope: rows touched on either side since the last run
+            scope, params = "", []
+            if since is not None and stamped:
+                scope = "(" + " OR ".join(f"{side}.updated_at > ?" for side in stamped) + ")"
+                params = [_rewind_watermark(since)] * len(stamped)
+            
+            if module_columns:
+                differs = ["s.client_id IS NULL"] + [f"m.{field} IS NOT s.{field}" for field in fields]
+                columns = ["m.client_id", "s.client_id IS NOT NULL"]
+                columns += [f"m.{field}" for field in fields] + [f"s.{field}" for field in fields]
+            else:
+                differs, columns = ["1"], ["m.client_id", "0"]
+            where = "(" + " OR ".join(differs) + ")"
+            if scope:
+                where = f"{scope} AND {where}"
+            rows = conn.execute(f"SELECT {', '.join(columns)} FROM {source} WHERE {where}", params).fetchall()
+            
+            changed = None
+            if scope:
+                changed = {row[0] for row in conn.execute(f"SELECT m.client_id FROM {source} WHERE {scope}", params)}
+        finally:
+            conn.execute("COMMIT")
+            if attached:
+                conn.execute("DETACH DATABASE module_db")
+        
+        issues = []
+        detected_at = datetime.now().isoformat()
+        
+        for row in rows:
+            client_id = row[0]
+            
+            if not row[1]:
+                # Client missing from module
+                issues.append(ConsistencyIssue(
+                    client_id=client_id,
+                    field_name='client_record',
+                    module_name=module_name,
+                    expected_value='exists',
+                    actual_value='missing',
+                    severity='critical',
+                    detected_at=detected_at
+                ))
+                continue
+            
+            master_values = row[2:2 + len(fields)]
+            module_values = row[2 + len(fields):]
+            for field, master_value, module_value in zip(fields, master_values, module_values):
+                if master_value != module_value:
+                    severity = 'critical' if field in module_info['critical_fields'] else 'warning'
+                    
+                    issues.append(ConsistencyIssue(
+                        client_id=client_id,
+                        field_name=field,
+                        module_name=module_name,
+                        expected_value=master_value,
+                        actual_value=module_value,
+                        severity=severity,
+                        detected_at=detected_at
+                    ))
+        
+        return issues, changed, watermark
+    
+    def _get_watermarks(self) -> Dict[str, str]:
+        """Get the per-module ``updated_at`` high-water marks left by the last check"""
+        
+        consistency_db_path = self.db_dir / 'data_consistency.db'
+        
+        with sqlite3.connect(consistency_db_path) as conn:
+            rows = conn.execute('''
+                SELECT module_name, high_water_mark FROM consistency_watermarks
+                WHERE high_water_mark IS NOT NULL
+            ''').fetchall()
+        
+        return dict(rows)
+    
+    def _store_watermarks(self, watermarks: Dict[str, Optional[str]]):
+        """Store the newest ``updated_at`` each module has been checked up to"""
+        
+        if not watermarks:
+            return
+        
+        consistency_db_path = self.db_dir / 'data_consistency.db'
+        checked_at = datetime.now().isoformat()
+        
+        with sqlite3.connect(consistency_db_path) as conn:
+            conn.executemany('''
+                INSERT INTO consistency_watermarks (module_name, high_water_mark, checked_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(module_name) DO UPDATE SET
+                    high_water_mark = COALESCE(excluded.high_water_mark, high_water_mark),
+                    checked_at = excluded.checked_at
+            ''', [(name, watermark, checked_at) for name, watermark in watermarks.items()])
+            
+            conn.commit()
+    
     def _get_all_clients_from_master(self) -> Dict[str, Dict[str, Any]]:
         """Get all clients from master module (core_clients)"""
         
@@ -422,65 +643,6 @@ class DataConsistencyEngine:
         
         return clients
     
-    def _check_client_consistency(self, client_id: str, master_data: Dict[str, Any]) -> List[ConsistencyIssue]:
-        """Check consistency for a single client across all modules"""
-        
-        issues = []
-        
-        for module_name, module_info in self.modules.items():
-            if module_name == 'core_clients':  # Skip master module
-                continue
-            
-            try:
-                # Get client data from this module
-                module_data = self._get_client_from_module(client_id, module_name)
-                
-                if not module_data:
-                    # Client missing from module
-                    issues.append(ConsistencyIssue(
-                        client_id=client_id,
-                        field_name='client_record',
-                        module_name=module_name,
-                        expected_value='exists',
-                        actual_value='missing',
-                        severity='critical',
-                        detected_at=datetime.now().isoformat()
-                    ))
-                    continue
-                
-                # Check sync fields
-                for field in module_info['sync_fields']:
-                    if field in master_data and field in module_data:
-                        master_value = master_data[field]
-                        module_value = module_data[field]
-                        
-                        if master_value != module_value:
-                            severity = 'critical' if field in module_info['critical_fields'] else 'warning'
-                            
-                            issues.append(ConsistencyIssue(
-                                client_id=client_id,
-                                field_name=field,
-                                module_name=module_name,
-                                expected_value=master_value,
-                                actual_value=module_value,
-                                severity=severity,
-                                detected_at=datetime.now().isoformat()
-                            ))
-                
-            except Exception as e:
-                logger.error(f"Error checking consistency for client {client_id} in {module_name}: {e}")
-                issues.append(ConsistencyIssue(
-                    client_id=client_id,
-                    field_name='module_access',
-                    module_name=module_name,
-                    expected_value='accessible',
-                    actual_value=f'error: {str(e)}',
-                    severity='critical',
-                    detected_at=datetime.now().isoformat()
-                ))
-        
-        return issues
-    
     def _get_client_from_module(self, client_id: str, module_name: str) -> Optional[Dict[str, Any]]:
         """Get client data from specific module"""
         
@@ -1230,8 +1392,13 @@ class DataConsistencyEngine:
         logger.info("Starting scheduled daily consistency check")
         
         try:
-            # Run consistency check
-            report = self.run_consistency_check()
+            # Nightly runs only compare rows changed since the last check;
+            # the weekly comprehensive check stays a full pass. An issue left
+            # unresolved by an earlier run is therefore not re-reported (or
+            # alerted on) here unless its row changed again. It stays
+            # unrepaired in consistency_issues, is retried whenever a nightly
+            # run finds new issues, and the weekly full check reports it.
+            report = self.run_consistency_check(incremental=True)
             
             # Run automated repair
             if report['total_issues_found'] > 0:
@@ -7,6 +7,18 @@ Phase 4A: Unified Client View
 - Add real-time data freshness indicators
 - Cross-module navigation system
 - Breadcrumb navigation
+
+Views are built without a process-wide lock: requests for the same client (and
+org) hash to one of ``CMSX_UNIFIED_VIEW_LOCK_STRIPES`` lock stripes, and
+concurrent requests for a view that is being built wait for that build instead
+of starting their own. Each module section remembers the version of its source
+database file (mtime and size of the file and its WAL) and is re-read only when
+that changed or its TTL (``CMSX_UNIFIED_VIEW_TTL_S``, default 3600, or a
+module's ``section_ttl``) passed. A cached view is kept as long as its
+longest-lived section, so a ``section_ttl`` above the default still takes
+effect; shorter-lived sections are refreshed individually. Whole views are serialized to
+``unified_view_cache`` and read back on a memory miss, so a restarted worker
+reuses the sections that are still current.
 """
 
 import sqlite3
@@ -17,8 +29,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from backend.shared.db_path import DB_DIR
+from backend.shared.env import env_int
 from backend.shared.tenancy import DEFAULT_ORG_ID, multi_tenant_enabled
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import hashlib
 import logging
@@ -34,6 +47,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the serialized view layout changes; older rows are ignored.
+CACHE_FORMAT_VERSION = 2
+
+
 class DataFreshness(Enum):
     FRESH = "fresh"          # < 5 minutes
     RECENT = "recent"        # 5-30 minutes
@@ -55,6 +72,9 @@ class ModuleData:
     status: ModuleStatus
     record_count: int = 0
     error_message: Optional[str] = None
+    # Source database version the section was read at, and when (epoch seconds).
+    source_version: Optional[str] = None
+    fetched_at: float = 0.0
 
 @dataclass
 class NavigationContext:
@@ -76,6 +96,13 @@ class UnifiedClientView:
     last_aggregated: str
     total_records: int
 
+class _ViewFlight:
+    """A view build in progress; concurrent requests for the same view wait on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.view: Optional[UnifiedClientView] = None
+
 class UnifiedClientViewEngine:
     """Phase 4A: Unified Client View Engine"""
     
@@ -84,11 +111,18 @@ class UnifiedClientViewEngine:
         self.cache_dir = Path('cache')
         self.cache_dir.mkdir(exist_ok=True)
         
-        # Thread safety
-        self.lock = threading.RLock()
+        # Thread safety: per-view lock stripes guard the in-flight builds; no
+        # lock is held while module databases are read.
+        stripes = max(1, env_int('CMSX_UNIFIED_VIEW_LOCK_STRIPES', 64))
+        self._lock_stripes = [threading.Lock() for _ in range(stripes)]
+        self._inflight: List[Dict[str, _ViewFlight]] = [{} for _ in range(stripes)]
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, int] = {}
+        self.reset_metrics()
         
-        # Cache configuration
-        self.cache_ttl = 300  # 5 minutes
+        # Cache configuration. Sections are also invalidated by source changes,
+        # so the TTL is only a backstop.
+        self.cache_ttl = env_int('CMSX_UNIFIED_VIEW_TTL_S', 3600)
         self.cache_storage = {}
         self.cache_timestamps = {}
         
@@ -396,93 +430,211 @@ class UnifiedClientViewEngine:
     
     def get_unified_client_view(self, client_id: str, session_id: str = None,
                                current_module: str = 'core_clients',
-                               org_id: Optional[str] = None) -> Optional[UnifiedClientView]:
-        """Get comprehensive unified client view"""
+                               org_id: Optional[str] = None,
+                               force_refresh: bool = False) -> Optional[UnifiedClientView]:
+        """Get comprehensive unified client view
+
+        Served from cache when every section is current; otherwise one caller
+        rebuilds the stale sections while concurrent callers for the same view
+        wait for its result.
+        """
 
         start_time = time.time()
+        cache_key = self._generate_cache_key(client_id, org_id)
 
-        with self.lock:
-            try:
-                # Check cache first (org-scoped when MT enabled)
-                cached_view = self._get_cached_view(client_id, org_id)
-                if cached_view:
-                    logger.info(f"Returning cached unified view for client {client_id}")
-                    return cached_view
-                
-                # Aggregate data from all modules
-                modules_data = {}
-                core_profile = {}
-                total_records = 0
-                freshness_summary = {'fresh': 0, 'recent': 0, 'stale': 0, 'unknown': 0}
-                
-                for module_name, module_config in self.modules.items():
-                    try:
-                        module_data = self._get_module_data(client_id, module_name, module_config)
-                        modules_data[module_name] = module_data
-                        total_records += module_data.record_count
-                        
-                        # Track freshness
-                        freshness_summary[module_data.freshness.value] += 1
-                        
-                        # Store core profile
-                        if module_name == 'core_clients' and module_data.data:
-                            core_profile = module_data.data
-                            
-                    except Exception as e:
-                        logger.error(f"Error getting data from {module_name}: {e}")
-                        modules_data[module_name] = ModuleData(
-                            module_name=module_name,
-                            data={},
-                            last_updated='unknown',
-                            freshness=DataFreshness.UNKNOWN,
-                            status=ModuleStatus.ERROR,
-                            error_message=str(e)
-                        )
-                
-                # Create navigation context
-                if not session_id:
-                    session_id = self._generate_session_id()
-                
-                navigation_context = NavigationContext(
+        if force_refresh:
+            self.invalidate_cached_view(client_id, org_id)
+        else:
+            cached_view, source = self._cached_entry(client_id, org_id)
+            if cached_view and not self._stale_sections(cached_view):
+                self._record(f'{source}_hits')
+                logger.info(f"Returning cached unified view for client {client_id}")
+                return self._for_request(cached_view, session_id, current_module,
+                                         {'cached': True, 'cache_hit': True, 'cache_source': source})
+
+        stripe = hash(cache_key) % len(self._lock_stripes)
+        with self._lock_stripes[stripe]:
+            flight = self._inflight[stripe].get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = _ViewFlight()
+                self._inflight[stripe][cache_key] = flight
+
+        if not leader:
+            self._record('coalesced')
+            flight.done.wait()
+            if flight.view is None:
+                return None
+            return self._for_request(flight.view, session_id, current_module,
+                                     {'cached': False, 'coalesced': True})
+
+        view = None
+        try:
+            view = self._build_view(client_id, org_id, cache_key, start_time, reuse=not force_refresh)
+        finally:
+            with self._lock_stripes[stripe]:
+                self._inflight[stripe].pop(cache_key, None)
+            flight.view = view
+            flight.done.set()
+        if view is None:
+            return None
+
+        if not session_id:
+            session_id = self._generate_session_id()
+        self._log_module_access(client_id, 'unified_view', session_id,
+                                int((time.time() - start_time) * 1000), False)
+        return self._for_request(view, session_id, current_module, {'cached': False})
+
+    def _build_view(self, client_id: str, org_id: Optional[str], cache_key: str,
+                    start_time: float, reuse: bool = True) -> Optional[UnifiedClientView]:
+        """Aggregate all modules, re-reading only sections that are missing or stale"""
+
+        try:
+            previous = self._cached_entry(client_id, org_id)[0] if reuse else None
+            previous_modules = previous.modules if previous else {}
+            modules_data = {}
+            refreshed = 0
+
+            for module_name, module_config in self.modules.items():
+                section = previous_modules.get(module_name)
+                if section is None or self._section_is_stale(section, module_config):
+                    section = self._load_section(client_id, module_name, module_config)
+                    refreshed += 1
+                modules_data[module_name] = section
+
+            core_section = modules_data.get('core_clients')
+            unified_view = UnifiedClientView(
+                client_id=client_id,
+                core_profile=core_section.data if core_section and core_section.data else {},
+                modules=modules_data,
+                navigation_context=NavigationContext(
                     client_id=client_id,
-                    current_module=current_module,
+                    current_module='core_clients',
                     previous_module=None,
-                    breadcrumbs=self._generate_initial_breadcrumbs(client_id, current_module),
-                    session_id=session_id,
+                    breadcrumbs=[],
+                    session_id='',
                     timestamp=datetime.now().isoformat()
-                )
-                
-                # Create unified view
-                unified_view = UnifiedClientView(
-                    client_id=client_id,
-                    core_profile=core_profile,
-                    modules=modules_data,
-                    navigation_context=navigation_context,
-                    cache_info={
-                        'cached': False,
-                        'cache_key': self._generate_cache_key(client_id, org_id),
-                        'ttl_seconds': self.cache_ttl,
-                        'generation_time_ms': int((time.time() - start_time) * 1000)
-                    },
-                    data_freshness_summary=freshness_summary,
-                    last_aggregated=datetime.now().isoformat(),
-                    total_records=total_records
-                )
-                
-                # Cache the view (org-scoped when MT enabled)
-                self._cache_view(client_id, unified_view, org_id)
-                
-                # Log access
-                self._log_module_access(client_id, 'unified_view', session_id, 
-                                      int((time.time() - start_time) * 1000), False)
-                
-                logger.info(f"Generated unified view for client {client_id} in {(time.time() - start_time)*1000:.1f}ms")
-                
-                return unified_view
-                
-            except Exception as e:
-                logger.error(f"Error generating unified client view: {e}")
-                return None
+                ),
+                cache_info={
+                    'cached': False,
+                    'cache_key': cache_key,
+                    'ttl_seconds': self.cache_ttl,
+                    'generation_time_ms': int((time.time() - start_time) * 1000),
+                    'sections_refreshed': refreshed,
+                    'sections_reused': len(modules_data) - refreshed
+                },
+                data_freshness_summary=self._freshness_summary(modules_data),
+                last_aggregated=datetime.now().isoformat(),
+                total_records=sum(section.record_count for section in modules_data.values())
+            )
+
+            # Cache the view (org-scoped when MT enabled)
+            self._cache_view(client_id, unified_view, org_id)
+            self._record('builds')
+            self._record('sections_refreshed', refreshed)
+            self._record('sections_reused', len(modules_data) - refreshed)
+
+            logger.info(f"Generated unified view for client {client_id} in {(time.time() - start_time)*1000:.1f}ms "
+                        f"({refreshed}/{len(modules_data)} sections refreshed)")
+
+            return unified_view
+
+        except Exception as e:
+            logger.error(f"Error generating unified client view: {e}")
+            return None
+
+    def _load_section(self, client_id: str, module_name: str, module_config: Dict[str, Any]) -> ModuleData:
+        """Read one module section, stamped with the source version it was read at"""
+
+        # Versioned before the read, so a write racing the read marks the section stale.
+        source_version = self._source_version(module_config)
+        fetched_at = time.time()
+        try:
+            section = self._get_module_data(client_id, module_name, module_config)
+        except Exception as e:
+            logger.error(f"Error getting data from {module_name}: {e}")
+            section = ModuleData(
+                module_name=module_name,
+                data={},
+                last_updated='unknown',
+                freshness=DataFreshness.UNKNOWN,
+                status=ModuleStatus.ERROR,
+                error_message=str(e)
+            )
+        if section.status == ModuleStatus.ERROR:
+            # Errors are never reused.
+            return section
+        return replace(section, source_version=source_version, fetched_at=fetched_at)
+
+    def _source_version(self, module_config: Dict[str, Any]) -> str:
+        """Cheap change marker for a module database: mtime and size of the file and its WAL"""
+
+        db_path = self.db_dir / module_config.get('db_file', '')
+        parts = []
+        for path in (db_path, Path(f"{db_path}-wal")):
+            try:
+                stat = path.stat()
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                parts.append('-')
+        return '/'.join(parts)
+
+    def _view_ttl(self) -> int:
+        """How long a whole cached view is kept: the longest section TTL"""
+
+        return max(
+            [self.cache_ttl]
+            + [module_config.get('section_ttl', self.cache_ttl) for module_config in self.modules.values()]
+        )
+
+    def _section_is_stale(self, section: ModuleData, module_config: Dict[str, Any]) -> bool:
+        if section.status == ModuleStatus.ERROR or not section.source_version:
+            return True
+        if time.time() - section.fetched_at >= module_config.get('section_ttl', self.cache_ttl):
+            return True
+        return section.source_version != self._source_version(module_config)
+
+    def _stale_sections(self, view: UnifiedClientView) -> List[str]:
+        """Configured modules whose cached section is missing or stale"""
+
+        return [
+            module_name for module_name, module_config in self.modules.items()
+            if module_name not in view.modules
+            or self._section_is_stale(view.modules[module_name], module_config)
+        ]
+
+    def _for_request(self, view: UnifiedClientView, session_id: Optional[str],
+                     current_module: str, cache_info: Dict[str, Any]) -> UnifiedClientView:
+        """Copy of a shared view with this request's navigation context and current freshness"""
+
+        if not session_id:
+            session_id = self._generate_session_id()
+        modules = {
+            module_name: replace(section, freshness=self._determine_data_freshness(section.last_updated))
+            if section.status == ModuleStatus.ACTIVE else section
+            for module_name, section in view.modules.items()
+        }
+        return replace(
+            view,
+            modules=modules,
+            navigation_context=NavigationContext(
+                client_id=view.client_id,
+                current_module=current_module,
+                previous_module=None,
+                breadcrumbs=self._generate_initial_breadcrumbs(view.client_id, current_module),
+                session_id=session_id,
+                timestamp=datetime.now().isoformat()
+            ),
+            cache_info={**view.cache_info, **cache_info},
+            data_freshness_summary=self._freshness_summary(modules)
+        )
+
+    @staticmethod
+    def _freshness_summary(modules: Dict[str, ModuleData]) -> Dict[str, int]:
+        summary = {'fresh': 0, 'recent': 0, 'stale': 0, 'unknown': 0}
+        for section in modules.values():
+            summary[section.freshness.value] += 1
+        return summary
     
     def _get_module_data(self, client_id: str, module_name: str, module_config: Dict[str, Any]) -> ModuleData:
         """Get data from a specific module"""
@@ -567,27 +719,30 @@ class UnifiedClientViewEngine:
             return DataFreshness.UNKNOWN
     
     def _get_cached_view(self, client_id: str, org_id: Optional[str] = None) -> Optional[UnifiedClientView]:
-        """Get cached unified view if available and valid"""
+        """Get cached unified view if available and every section is still current"""
+
+        cached_view, _ = self._cached_entry(client_id, org_id)
+        if cached_view and not self._stale_sections(cached_view):
+            return cached_view
+        return None
+
+    def _cached_entry(self, client_id: str, org_id: Optional[str] = None) -> Tuple[Optional[UnifiedClientView], str]:
+        """Last cached view (sections possibly stale) and where it came from: memory or database"""
 
         try:
             # Check memory cache first
             cache_key = self._generate_cache_key(client_id, org_id)
-            
-            if cache_key in self.cache_storage:
-                cached_data, timestamp = self.cache_storage[cache_key]
-                
-                if time.time() - timestamp < self.cache_ttl:
-                    # Update cache info
-                    cached_data.cache_info['cached'] = True
-                    cached_data.cache_info['cache_hit'] = True
-                    return cached_data
-                else:
-                    # Cache expired
-                    del self.cache_storage[cache_key]
-                    if cache_key in self.cache_timestamps:
-                        del self.cache_timestamps[cache_key]
-            
-            # Check database cache
+            entry = self.cache_storage.get(cache_key)
+
+            if entry is not None:
+                cached_data, timestamp = entry
+                if time.time() - timestamp < self._view_ttl():
+                    return cached_data, 'memory'
+                # Cache expired: every section in it is past its TTL too
+                self.cache_storage.pop(cache_key, None)
+                self.cache_timestamps.pop(cache_key, None)
+
+            # Read through to the database cache (shared across workers and restarts)
             unified_db_path = self.db_dir / 'unified_client_view.db'
 
             with sqlite3.connect(unified_db_path) as conn:
@@ -609,15 +764,73 @@ class UnifiedClientViewEngine:
 
                 result = cursor.fetchone()
 
-                if result:
-                    # Reconstruct UnifiedClientView object
-                    # Simplified reconstruction — skip for now, memory cache is authoritative
-                    return None  # For now, skip database cache reconstruction
+            if result:
+                cached_view = self._deserialize_view(result[0])
+                if cached_view is not None:
+                    timestamp = datetime.fromisoformat(result[1]).timestamp()
+                    self.cache_storage[cache_key] = (cached_view, timestamp)
+                    self.cache_timestamps[cache_key] = timestamp
+                    return cached_view, 'database'
 
-            return None
+            return None, 'memory'
             
         except Exception as e:
             logger.error(f"Error retrieving cached view: {e}")
+            return None, 'memory'
+
+    def invalidate_cached_view(self, client_id: str, org_id: Optional[str] = None) -> bool:
+        """Drop a client's cached view from memory and the database cache"""
+
+        cache_key = self._generate_cache_key(client_id, org_id)
+        cleared = self.cache_storage.pop(cache_key, None) is not None
+        self.cache_timestamps.pop(cache_key, None)
+        try:
+            with sqlite3.connect(self.db_dir / 'unified_client_view.db') as conn:
+                if org_id and multi_tenant_enabled():
+                    cursor = conn.execute(
+                        "DELETE FROM unified_view_cache WHERE client_id = ? AND org_id = ?", (client_id, org_id)
+                    )
+                else:
+                    cursor = conn.execute("DELETE FROM unified_view_cache WHERE client_id = ?", (client_id,))
+                cleared = cleared or cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error clearing cached view: {e}")
+        return cleared
+
+    @staticmethod
+    def _serialize_view(unified_view: UnifiedClientView) -> str:
+        payload = asdict(unified_view)
+        payload['format_version'] = CACHE_FORMAT_VERSION
+        return json.dumps(payload, default=lambda value: value.value if isinstance(value, Enum) else str(value))
+
+    @staticmethod
+    def _deserialize_view(cached_data: str) -> Optional[UnifiedClientView]:
+        """Rebuild a cached view; None for rows written in an older layout"""
+
+        try:
+            payload = json.loads(cached_data)
+            if payload.get('format_version') != CACHE_FORMAT_VERSION:
+                return None
+            modules = {
+                module_name: ModuleData(**{
+                    **section,
+                    'freshness': DataFreshness(section['freshness']),
+                    'status': ModuleStatus(section['status']),
+                })
+                for module_name, section in payload['modules'].items()
+            }
+            return UnifiedClientView(
+                client_id=payload['client_id'],
+                core_profile=payload['core_profile'],
+                modules=modules,
+                navigation_context=NavigationContext(**payload['navigation_context']),
+                cache_info=payload['cache_info'],
+                data_freshness_summary=payload['data_freshness_summary'],
+                last_aggregated=payload['last_aggregated'],
+                total_records=payload['total_records'],
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached unified view: {e}")
             return None
     
     def _cache_view(self, client_id: str, unified_view: UnifiedClientView, org_id: Optional[str] = None):
@@ -637,15 +850,10 @@ class UnifiedClientViewEngine:
             with sqlite3.connect(unified_db_path) as conn:
                 cursor = conn.cursor()
 
-                cached_json = json.dumps({
-                    'client_id': unified_view.client_id,
-                    'last_aggregated': unified_view.last_aggregated,
-                    'total_records': unified_view.total_records,
-                    'modules_count': len(unified_view.modules)
-                })
+                cached_json = self._serialize_view(unified_view)
 
                 data_hash = hashlib.md5(cached_json.encode()).hexdigest()
-                expiry_time = datetime.now() + timedelta(seconds=self.cache_ttl)
+                expiry_time = datetime.now() + timedelta(seconds=self._view_ttl())
                 stamp_org = org_id if (org_id and multi_tenant_enabled()) else DEFAULT_ORG_ID
 
                 cursor.execute(
@@ -676,6 +884,29 @@ class UnifiedClientViewEngine:
             return f"unified_view_{org_id}_{client_id}"
         return f"unified_view_{client_id}"
     
+    def _record(self, name: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[name] = self._metrics.get(name, 0) + amount
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._metrics = {
+                'memory_hits': 0,
+                'database_hits': 0,
+                'builds': 0,
+                'coalesced': 0,
+                'sections_refreshed': 0,
+                'sections_reused': 0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+        snapshot['cached_views'] = len(self.cache_storage)
+        snapshot['builds_in_flight'] = sum(len(flights) for flights in self._inflight)
+        snapshot['lock_stripes'] = len(self._lock_stripes)
+        return snapshot
+    
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
         return f"session_{int(time.time())}_{hash(threading.current_thread().ident) % 10000}"
@@ -801,9 +1032,7 @@ class UnifiedClientViewEngine:
             
             if test_client_id:
                 # Clear any existing cache
-                cache_key = self._generate_cache_key(test_client_id)
-                if cache_key in self.cache_storage:
-                    del self.cache_storage[cache_key]
+                self.invalidate_cached_view(test_client_id)
                 
                 # First request (no cache)
                 start_time = time.time()
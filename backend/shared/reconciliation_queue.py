@@ -0,0 +1,327 @@
+"""Debounced dirty-set queue for Smart Daily deadline reconciliation.
+
+Smart Daily shows reminders projected from other modules' deadlines (UR and
+FMLA cases, medical and workspace appointments, treatment plan reviews).
+Rather than re-projecting a whole caseload on every Smart Daily read, the
+module stores report what changed and a background worker resyncs only that:
+
+* Writers call ``mark_deadlines_dirty(kind, key, ...)`` after committing. Keys
+  (a case id for ``ur`` / ``fmla``, a client id for ``medical`` /
+  ``treatment_plan``, ``*`` for a whole ``caseload``) collect in one dirty set
+  per (case manager, org), so repeated writes to the same case coalesce into a
+  single resync. Client-keyed writers that do not know the case manager (the
+  workspace store) file under an empty case manager; handlers resolve it.
+* The worker processes a case manager's set once it has been quiet for
+  ``CMSX_RECONCILE_DEBOUNCE_MS`` (default 500), or at the latest
+  ``CMSX_RECONCILE_MAX_DELAY_MS`` (default 5000) after its first mark, so a
+  steady stream of writes cannot starve it.
+* ``ensure_caseload`` queues a full caseload pass for a case manager the first
+  time Smart Daily reads it in this process and again every
+  ``CMSX_RECONCILE_SWEEP_S`` (default 3600). This backfills records that
+  predate the change events or were written by stores that do not report yet.
+* The ``priority_index`` kind refreshes Smart Daily priority indexes (see
+  ``backend.modules.reminders.priority_index``) off the request path: client
+  ids after a context invalidation, ``*`` when a read finds a case manager's
+  index missing or past its max age. It runs last, after the projections.
+* Handlers are registered per kind by ``backend.modules.reminders.reconciliation``;
+  this module only owns the bookkeeping, so stores under ``backend/shared`` can
+  report changes without importing module code. A handler returns the keys it
+  failed to sync (or raises); those are retried up to ``MAX_ATTEMPTS`` times.
+
+``flush()`` processes pending work synchronously (tests, admin tooling).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import backend.shared.db_path as db_path_mod
+from backend.shared.env import env_int
+
+logger = logging.getLogger(__name__)
+
+CASELOAD_KEY = "*"
+# Processing order within one dirty set; the caseload pass goes first so the
+# targeted resyncs that follow see its projections, and the priority index is
+# refreshed after all of them.
+KINDS = ("caseload", "ur", "fmla", "medical", "treatment_plan", "priority_index")
+MAX_ATTEMPTS = 3
+IDLE_WAIT_SECONDS = 30.0
+
+ScopeKey = Tuple[str, str]
+Handler = Callable[[str, Optional[str], Dict[str, Optional[Dict[str, Any]]]], Optional[Iterable[str]]]
+
+
+@dataclass
+class DirtySet:
+    first_marked: float
+    last_marked: float
+    attempts: int = 0
+    # kind -> {key: last known record, kept so deleted cases can be closed out}
+    items: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = field(default_factory=dict)
+
+    def size(self) -> int:
+        return sum(len(keys) for keys in self.items.values())
+
+
+class ReconciliationQueue:
+    """Per-case-manager dirty sets drained by one debounced worker thread."""
+
+    def __init__(self, debounce_ms: Optional[int] = None, max_delay_ms: Optional[int] = None,
+                 sweep_seconds: Optional[int] = None) -> None:
+        self.debounce_seconds = (
+            debounce_ms if debounce_ms is not None else env_int("CMSX_RECONCILE_DEBOUNCE_MS", 500)
+        ) / 1000
+        self.max_delay_seconds = (
+            max_delay_ms if max_delay_ms is not None else env_int("CMSX_RECONCILE_MAX_DELAY_MS", 5000)
+        ) / 1000
+        self.sweep_seconds = (
+            sweep_seconds if sweep_seconds is not None else env_int("CMSX_RECONCILE_SWEEP_S", 3600)
+        )
+        self._lock = threading.Lock()
+        self._process_lock = threading.Lock()
+        self._dirty: Dict[ScopeKey, DirtySet] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._caseload_marked: Dict[Tuple[str, str, str], float] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, float] = {}
+        self.reset_metrics()
+
+    # ── Registration / events ───────────────────────────────────────────────
+
+    def register(self, kind: str, handler: Handler) -> None:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown reconciliation kind: {kind}")
+        self._handlers[kind] = handler
+
+    def mark_dirty(
+        self,
+        kind: str,
+        key: Optional[str],
+        *,
+        case_manager_id: Optional[str] = None,
+        org_id: Optional[str] = None,
+        snapshot: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        key = str(key or "").strip()
+        if kind not in KINDS or not key:
+            return
+        scope: ScopeKey = (str(case_manager_id or "").strip(), str(org_id or ""))
+        now = time.monotonic()
+        with self._lock:
+            dirty = self._dirty.get(scope)
+            if dirty is None:
+                dirty = self._dirty[scope] = DirtySet(first_marked=now, last_marked=now)
+            dirty.last_marked = now
+            keys = dirty.items.setdefault(kind, {})
+            if key in keys:
+                self._metrics["coalesced"] += 1
+            if snapshot is not None or key not in keys:
+                keys[key] = snapshot
+            self._metrics["marks"] += 1
+        self._wake.set()
+
+    def ensure_caseload(self, case_manager_id: str, org_id: Optional[str] = None) -> bool:
+        """Queue a caseload pass if this case manager has not had one within the sweep interval."""
+        if not case_manager_id:
+            return False
+        marker = (str(Path(db_path_mod.DB_DIR).resolve()), case_manager_id, org_id or "")
+        now = time.monotonic()
+        with self._lock:
+            marked_at = self._caseload_marked.get(marker)
+            if marked_at is not None and now - marked_at < self.sweep_seconds:
+                return False
+            self._caseload_marked[marker] = now
+        self.mark_dirty("caseload", CASELOAD_KEY, case_manager_id=case_manager_id, org_id=org_id)
+        return True
+
+    # ── Processing ──────────────────────────────────────────────────────────
+
+    def _due(self, dirty: DirtySet, now: float) -> bool:
+        return (
+            now - dirty.last_marked >= self.debounce_seconds
+            or now - dirty.first_marked >= self.max_delay_seconds
+        )
+
+    def process_due(self, *, force: bool = False, case_manager_id: Optional[str] = None) -> Optional[float]:
+        """Process every ready dirty set; return seconds until the next one is due (None if idle)."""
+        with self._process_lock:
+            now = time.monotonic()
+            with self._lock:
+                ready = [
+                    scope for scope, dirty in self._dirty.items()
+                    if (case_manager_id is None or scope[0] == case_manager_id)
+                    and (force or self._due(dirty, now))
+                ]
+                batches = [(scope, self._dirty.pop(scope)) for scope in ready]
+            for scope, dirty in batches:
+                self._process(scope, dirty)
+            return self._next_delay()
+
+    def flush(self, case_manager_id: Optional[str] = None) -> None:
+        self.process_due(force=True, case_manager_id=case_manager_id)
+
+    def _process(self, scope: ScopeKey, dirty: DirtySet) -> None:
+        case_manager_id, org_id = scope
+        started = time.perf_counter()
+        retry: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        for kind in KINDS:
+            keys = dirty.items.get(kind)
+            if not keys:
+                continue
+            handler = self._handlers.get(kind)
+            if handler is None:
+                logger.warning("No reconciliation handler registered for %s; dropping %d keys", kind, len(keys))
+                with self._lock:
+                    self._metrics["dropped"] += len(keys)
+                continue
+            try:
+                failed = set(handler(case_manager_id, org_id or None, dict(keys)) or ())
+            except Exception as exc:
+                logger.warning("Deadline reconciliation (%s) failed for %s: %s", kind, case_manager_id or "-", exc)
+                failed = set(keys)
+            if failed:
+                retry[kind] = {key: keys[key] for key in failed if key in keys}
+            with self._lock:
+                self._metrics["units_processed"] += len(keys) - len(failed)
+                self._metrics["failures"] += len(failed)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._metrics["sets_processed"] += 1
+            self._metrics["process_ms"] += elapsed_ms
+            self._metrics["last_process_ms"] = elapsed_ms
+        if retry:
+            self._requeue(scope, dirty.attempts + 1, retry)
+
+    def _requeue(self, scope: ScopeKey, attempts: int, items: Dict[str, Dict[str, Optional[Dict[str, Any]]]]) -> None:
+        if attempts >= MAX_ATTEMPTS:
+            with self._lock:
+                self._metrics["dropped"] += sum(len(keys) for keys in items.values())
+            logger.error("Giving up on deadline reconciliation for %s after %d attempts", scope[0] or "-", attempts)
+            return
+        now = time.monotonic()
+        with self._lock:
+            dirty = self._dirty.get(scope)
+            if dirty is None:
+                dirty = self._dirty[scope] = DirtySet(first_marked=now, last_marked=now)
+            dirty.attempts = max(dirty.attempts, attempts)
+            for kind, keys in items.items():
+                for key, snapshot in keys.items():
+                    dirty.items.setdefault(kind, {}).setdefault(key, snapshot)
+            self._metrics["retries"] += 1
+
+    def _next_delay(self) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty:
+                return None
+            return max(0.0, min(
+                min(dirty.last_marked + self.debounce_seconds, dirty.first_marked + self.max_delay_seconds) - now
+                for dirty in self._dirty.values()
+            ))
+
+    # ── Worker ──────────────────────────────────────────────────────────────
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="deadline-reconciliation", daemon=True)
+            self._thread.start()
+        logger.info("Deadline reconciliation worker started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        self._stop.set()
+        self._wake.set()
+        if thread and thread.is_alive():
+            thread.join(timeout=timeout)
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                delay = self.process_due()
+            except Exception:
+                logger.exception("Deadline reconciliation pass failed")
+                delay = IDLE_WAIT_SECONDS
+            self._wake.wait(timeout=IDLE_WAIT_SECONDS if delay is None else delay)
+
+    # ── Maintenance / observability ─────────────────────────────────────────
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dirty.clear()
+            self._caseload_marked.clear()
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "case_manager_id": scope[0],
+                    "org_id": scope[1] or None,
+                    "attempts": dirty.attempts,
+                    "kinds": {kind: sorted(keys) for kind, keys in dirty.items.items() if keys},
+                }
+                for scope, dirty in self._dirty.items()
+            ]
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {
+                "marks": 0,
+                "coalesced": 0,
+                "sets_processed": 0,
+                "units_processed": 0,
+                "failures": 0,
+                "retries": 0,
+                "dropped": 0,
+                "process_ms": 0.0,
+                "last_process_ms": 0.0,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["pending_sets"] = len(self._dirty)
+            snapshot["pending_units"] = sum(dirty.size() for dirty in self._dirty.values())
+        snapshot["process_ms"] = round(snapshot["process_ms"], 2)
+        snapshot["last_process_ms"] = round(snapshot["last_process_ms"], 2)
+        snapshot["running"] = self.is_running
+        snapshot["debounce_ms"] = int(self.debounce_seconds * 1000)
+        snapshot["max_delay_ms"] = int(self.max_delay_seconds * 1000)
+        return snapshot
+
+
+reconciliation_queue = ReconciliationQueue()
+
+
+def mark_deadlines_dirty(
+    kind: str,
+    key: Optional[str],
+    *,
+    case_manager_id: Optional[str] = None,
+    org_id: Optional[str] = None,
+    snapshot: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Report a committed write that may change Smart Daily deadline reminders."""
+    try:
+        reconciliation_queue.mark_dirty(
+            kind, key, case_manager_id=case_manager_id, org_id=org_id, snapshot=snapshot,
+        )
+    except Exception as exc:
+        logger.warning("Could not queue deadline reconciliation for %s %s: %s", kind, key, exc)
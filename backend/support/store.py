@@ -26,6 +26,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import backend.shared.db_path as db_path_mod
+from backend.shared.database.connection_pool import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -225,10 +226,9 @@ class SupportStore:
     def _connect(self) -> sqlite3.Connection:
         path = self._db_path()
         path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
-        conn.row_factory = sqlite3.Row
-        self._ensure_schema(conn)
-        return conn
+        # Schema setup is idempotent; the pool runs it once per physical
+        # connection rather than on every call.
+        return get_connection(path, row_factory=sqlite3.Row, on_open=self._ensure_schema)
 
     def _ensure_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
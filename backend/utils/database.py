@@ -7,6 +7,8 @@ import logging
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 
+from backend.shared.database.connection_pool import get_connection as get_pooled_connection
+
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
@@ -20,8 +22,7 @@ class DatabaseManager:
         """Get database connection with proper row factory"""
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
+            conn = get_pooled_connection(self.db_path, row_factory=sqlite3.Row)
             yield conn
         except Exception as e:
             logger.error(f"Database connection error: {e}")
@@ -98,6 +98,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize search coordinator: {e}")
 
+    try:
+        from backend.modules.reminders.reconciliation import start_reconciliation_worker
+        start_reconciliation_worker()
+    except Exception as e:
+        logger.error(f"Failed to start deadline reconciliation worker: {e}")
+
+    try:
+        from backend.modules.reminders.push import start_push_worker
+        start_push_worker()
+    except Exception as e:
+        logger.error(f"Failed to start push event worker: {e}")
+
+    try:
+        from backend.analytics.store import start_analytics_writer
+        start_analytics_writer()
+    except Exception as e:
+        logger.error(f"Failed to start analytics event writer: {e}")
+
     # Seed: base Resource Library (idempotent — only runs when DB is empty)
     try:
         from backend.modules.resource_library.seed_data import run_seed as _rl_seed
@@ -129,7 +147,27 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown (if needed)
+    # Shutdown
+    try:
+        from backend.modules.reminders.reconciliation import stop_reconciliation_worker
+        stop_reconciliation_worker()
+    except Exception as e:
+        logger.error(f"Failed to stop deadline reconciliation worker: {e}")
+    try:
+        from backend.modules.reminders.push import stop_push_worker
+        stop_push_worker()
+    except Exception as e:
+        logger.error(f"Failed to stop push event worker: {e}")
+    try:
+        from backend.analytics.store import stop_analytics_writer
+        stop_analytics_writer()
+    except Exception as e:
+        logger.error(f"Failed to stop analytics event writer: {e}")
+    try:
+        from backend.search.http_pool import get_search_http_pool
+        await get_search_http_pool().aclose()
+    except Exception as e:
+        logger.error(f"Failed to close search HTTP pool: {e}")
     logger.info("Application shutting down")
 
 # Create FastAPI app with lifespan
@@ -193,8 +231,7 @@ async def firebase_auth_middleware(request, call_next):
             if auth_service.is_test_auth_enabled():
                 request.state.auth_user = auth_service.test_user_from_request(request)
             else:
-                decoded = auth_service.verify_bearer_token(request.headers.get("Authorization"))
-                request.state.auth_user = auth_service.upsert_profile_from_token(decoded)
+                request.state.auth_user = auth_service.authenticate_bearer(request.headers.get("Authorization"))
         except HTTPException as exc:
             return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
@@ -481,6 +518,15 @@ except Exception as e:
     loaded_modules["unified_client"] = f"error: {e}"
     logger.warning(f"Unified Client API not loaded: {e}")
 
+try:
+    from backend.api.push_events import router as push_events_router
+    app.include_router(push_events_router)
+    loaded_modules["push_events"] = "loaded"
+    logger.info("Push events stream loaded successfully")
+except Exception as e:
+    loaded_modules["push_events"] = f"error: {e}"
+    logger.warning(f"Push events stream not loaded: {e}")
+
 # Include the system health endpoints
 try:
     from backend.api.system_health import router as health_router
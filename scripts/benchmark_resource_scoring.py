@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark ResourceRetrievalEngine scoring on a synthetic provider corpus.
+
+Compares the per-provider scorers (CMSX_RESOURCE_VECTOR_SCORING=0) with the
+compiled ProviderMatrix path and checks both return the same ranking.
+
+    python scripts/benchmark_resource_scoring.py --providers 10000 --repeat 5
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.modules.resources.knowledge_loader import KnowledgeLoader, Provider  # noqa: E402
+from backend.modules.resources.location_intelligence import LA_NEIGHBORHOODS  # noqa: E402
+from backend.modules.resources.retrieval_engine import ResourceRetrievalEngine  # noqa: E402
+
+SUBTYPES = {
+    "treatment": ["detox", "residential", "sober_living", "outpatient", "mat"],
+    "housing": ["emergency_shelter", "bridge_housing", "transitional", "permanent_supportive"],
+    "medical": ["urgent_care", "primary_care", "dental", "emergency_room"],
+    "food": ["emergency_food", "meal_program", "groceries"],
+    "legal": ["expungement", "eviction_defense"],
+}
+NAMES = ["Muse Treatment", "CRI-Help", "Hope of the Valley", "Midnight Mission", "Findhelp Directory",
+         "Valley Clinic", "Harbor House", "Community Center", "Family Services"]
+SPECIALIZATIONS = ["dual_diagnosis", "lgbtq", "veterans", "women", "men", "youth", "seniors", "families"]
+INSURANCE = ["medi_cal", "medicare", "uninsured", "private", "all"]
+SERVICES = ["counseling", "case management", "meals", "showers", "mat", "detox", "legal aid", "job training"]
+
+QUERIES = [
+    "need detox tonight in van nuys, medi-cal",
+    "residential treatment for veterans with dual diagnosis",
+    "sober living for women in north hollywood",
+    "emergency shelter near downtown, homeless tonight",
+    "urgent care today in burbank medicare",
+    "food pantry with meals near hollywood",
+    "expungement lawyer in pasadena",
+    "mat suboxone clinic in 91405",
+]
+
+
+def synthetic_providers(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    neighborhoods = list(LA_NEIGHBORHOODS)
+    providers = []
+    for i in range(count):
+        service_type = rng.choice(list(SUBTYPES))
+        neighborhood = rng.choice(neighborhoods + [None])
+        lat, lon = LA_NEIGHBORHOODS.get(neighborhood or "", (34.05, -118.25))
+        located = rng.random() < 0.7
+        providers.append(Provider(
+            name=f"{rng.choice(NAMES)} {i}",
+            service_type=service_type,
+            service_subtypes=rng.sample(SUBTYPES[service_type], rng.randint(0, 2)),
+            website=rng.choice([None, "https://example.org", "https://findhelp.org/listing"]),
+            neighborhood=neighborhood.title() if neighborhood else None,
+            city=rng.choice([None, "Los Angeles", "Burbank", "Glendale", "Pasadena"]),
+            latitude=lat + rng.uniform(-0.15, 0.15) if located else None,
+            longitude=lon + rng.uniform(-0.15, 0.15) if located else None,
+            services_offered=rng.sample(SERVICES, rng.randint(0, 3)),
+            specializations=rng.sample(SPECIALIZATIONS, rng.randint(0, 2)),
+            insurance_accepted=rng.sample(INSURANCE, rng.randint(0, 2)),
+            income_requirement=rng.choice([None, "free", "sliding_scale", "market"]),
+            internal_rating=rng.choice([0.0, 0.0, 0.6, 0.8]),
+            is_verified=rng.random() < 0.3,
+        ))
+    return providers
+
+
+def time_queries(engine, repeat: int, limit: int):
+    timings, rankings = [], {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for query in QUERIES:
+            rankings[query] = [sp.provider.name for sp in engine.search(query, limit=limit)]
+        timings.append((time.perf_counter() - started) * 1000 / len(QUERIES))
+    return statistics.median(timings), rankings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    loader = KnowledgeLoader(PROJECT_ROOT / "knowledge files")
+    loader.providers = synthetic_providers(args.providers)
+    loader._build_index()
+    engine = ResourceRetrievalEngine()
+    engine.knowledge_loader = loader
+
+    os.environ["CMSX_RESOURCE_VECTOR_SCORING"] = "0"
+    scalar_ms, scalar_rankings = time_queries(engine, args.repeat, args.limit)
+
+    os.environ["CMSX_RESOURCE_VECTOR_SCORING"] = "1"
+    started = time.perf_counter()
+    engine.get_provider_matrix()
+    compile_ms = (time.perf_counter() - started) * 1000
+    vector_ms, vector_rankings = time_queries(engine, args.repeat, args.limit)
+
+    print(f"providers:           {args.providers}")
+    print(f"per-provider scoring {scalar_ms:9.2f} ms/query")
+    print(f"matrix compile       {compile_ms:9.2f} ms (once per corpus load)")
+    print(f"vectorized scoring   {vector_ms:9.2f} ms/query")
+    print(f"speedup              {scalar_ms / vector_ms:9.1f}x")
+    print(f"rankings identical   {scalar_rankings == vector_rankings}")
+    return 0 if scalar_rankings == vector_rankings else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Suite-wide fixtures.
+
+Stores that resolve their file from ``backend.shared.db_path.DB_DIR`` at call
+time (the Smart Daily priority index, context cache disk tier, push outbox,
+supervisor snapshots, knowledge index) would otherwise create databases in
+the tracked ``databases/`` directory. Every test gets its own DB_DIR instead;
+tests that need a specific layout still override it themselves.
+"""
+import pytest
+
+import backend.shared.db_path as db_path_mod
+
+
+@pytest.fixture(autouse=True)
+def isolated_db_dir(tmp_path_factory, monkeypatch):
+    db_dir = tmp_path_factory.mktemp("databases")
+    monkeypatch.setattr(db_path_mod, "DB_DIR", db_dir)
+    return db_dir
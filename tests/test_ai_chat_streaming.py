@@ -0,0 +1,231 @@
+"""Unified AI chat streaming tests.
+
+A local fake OpenAI server (``OPENAI_BASE_URL``) streams chat-completion
+chunks so the real client is exercised end to end: tokens arrive as events
+before the turn completes, tool calls surface as status events between the two
+model passes, history is written only once the turn is done, and closing the
+stream early aborts the upstream request.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.auth import authorization as authz
+from backend.auth.service import AuthenticatedUser
+from backend.modules.ai_unified import unified_routes
+from backend.modules.ai_unified.unified_service import UnifiedAIService
+from backend.shared import db_path as db_path_mod
+
+
+class FakeOpenAI:
+    """Serves scripted streamed completions: ``{"tokens": [...], "tool_calls": [...], "delay": s}``."""
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.requests = []
+        self.chunks_sent = []
+        self.disconnects = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server.lock:
+                    server.requests.append(body)
+                    script = server.scripts.pop(0)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                deltas = [{"content": token} for token in script.get("tokens", [])]
+                deltas += [
+                    {"tool_calls": [{"index": n, "id": call_id, "type": "function",
+                                     "function": {"name": name, "arguments": arguments}}]}
+                    for n, (call_id, name, arguments) in enumerate(script.get("tool_calls", []))
+                ]
+                sent = 0
+                try:
+                    for delta in deltas:
+                        chunk = {"id": "chunk", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+                                 "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                        sent += 1
+                        time.sleep(script.get("delay", 0))
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with server.lock:
+                        server.disconnects += 1
+                finally:
+                    with server.lock:
+                        server.chunks_sent.append(sent)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    servers = []
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.setattr(authz, "AUTH_DB", tmp_path / "auth.db")
+    monkeypatch.setattr(authz, "CORE_CLIENTS_DB", tmp_path / "core_clients.db")
+
+    def make(scripts):
+        server = FakeOpenAI(scripts)
+        servers.append(server)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        service = UnifiedAIService()
+
+        async def no_context(*args, **kwargs):
+            return None
+
+        for name in (
+            "_maybe_build_crisis_support_context",
+            "_maybe_build_case_manager_resource_context",
+            "_maybe_build_internal_resource_context",
+        ):
+            monkeypatch.setattr(service, name, no_context)
+        return service, server
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def _history(tmp_path):
+    with sqlite3.connect(tmp_path / "ai_assistant.db") as conn:
+        return [tuple(row) for row in conn.execute("SELECT role, content FROM conversations ORDER BY id")]
+
+
+async def _collect(events):
+    collected = []
+    async for event in events:
+        collected.append((time.perf_counter(), event))
+    return collected
+
+
+def test_tokens_stream_before_the_turn_completes(make_service, tmp_path):
+    service, server = make_service([{"tokens": ["Call ", "the ", "clinic ", "first", "."], "delay": 0.15}])
+
+    started = time.perf_counter()
+    events = asyncio.run(_collect(service.stream_message("Who should I call?", "cm-1")))
+
+    tokens = [(at, event["data"]["text"]) for at, event in events if event["event"] == "token"]
+    done = events[-1][1]
+    assert "".join(text for _, text in tokens) == "Call the clinic first."
+    assert tokens[0][0] - started < 0.5
+    assert events[-1][0] - started >= 0.6
+    assert done == {"event": "done", "data": {
+        "success": True, "response": "Call the clinic first.", "function_called": "",
+        "first_token_ms": done["data"]["first_token_ms"], "total_ms": done["data"]["total_ms"],
+        "cache": {"hits": 0, "misses": 3, "saved_tokens": 0, "saved_ms": 0.0},
+    }}
+    assert done["data"]["first_token_ms"] < done["data"]["total_ms"] / 2
+    assert server.requests[0]["stream"] is True
+    assert _history(tmp_path) == [("user", "Who should I call?"), ("assistant", "Call the clinic first.")]
+
+
+def test_tool_calls_stream_status_events_between_passes(make_service, tmp_path):
+    service, server = make_service([
+        {"tool_calls": [("call-1", "get_dashboard_stats", '{"case_manager_id": "someone-else"}')]},
+        {"tokens": ["You have ", "3 clients."]},
+    ])
+    calls = []
+
+    async def fake_stats(**params):
+        calls.append(params)
+        return {"total_clients": 3}
+
+    service._function_map["get_dashboard_stats"] = fake_stats
+    events = [event for _, event in asyncio.run(_collect(service.stream_message("How many clients?", "cm-1")))]
+
+    assert [(event["event"], event["data"].get("status") or event["data"].get("text")) for event in events[:-1]] == [
+        ("tool", "running"), ("tool", "completed"), ("token", "You have "), ("token", "3 clients."),
+    ]
+    assert events[-1]["data"]["function_called"] == "get_dashboard_stats"
+    assert calls == [{"case_manager_id": "cm-1"}]
+    tool_message = server.requests[1]["messages"][-1]
+    assert (tool_message["role"], tool_message["tool_call_id"]) == ("tool", "call-1")
+    assert json.loads(tool_message["content"]) == {"total_clients": 3}
+    assert _history(tmp_path)[-1] == ("assistant", "You have 3 clients.")
+
+
+def test_grounded_answers_replace_the_first_draft(make_service, monkeypatch):
+    service, server = make_service([
+        {"tokens": ["Try a clinic."]},
+        {"tokens": ["Call Valley ", "Dental first."]},
+    ])
+
+    async def verified(*args, **kwargs):
+        return "Verified: Valley Dental, 555-0100"
+
+    monkeypatch.setattr(service, "_maybe_build_case_manager_resource_context", verified)
+    events = [event for _, event in asyncio.run(_collect(service.stream_message("Dental clinic near 91401?", "cm-1")))]
+
+    assert [event["event"] for event in events] == ["status", "token", "token", "done"]
+    assert events[-1]["data"]["response"] == "Call Valley Dental first."
+    assert "Verified: Valley Dental" in server.requests[1]["messages"][-1]["content"]
+
+
+def test_closing_the_stream_aborts_the_upstream_request(make_service, tmp_path):
+    service, server = make_service([{"tokens": [f"token{n} " for n in range(40)], "delay": 0.05}])
+
+    async def read_one_token():
+        events = service.stream_message("Draft a long note", "cm-1")
+        async for event in events:
+            if event["event"] == "token":
+                break
+        await events.aclose()
+
+    asyncio.run(read_one_token())
+    deadline = time.monotonic() + 3
+    while not server.chunks_sent and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert server.disconnects == 1
+    assert server.chunks_sent[0] < 40
+    assert _history(tmp_path) == []
+
+
+def test_chat_stream_route_emits_server_sent_events(make_service, monkeypatch):
+    service, _ = make_service([{"tokens": ["Hello", " there."]}])
+    user = AuthenticatedUser(
+        firebase_uid="uid-cm-1", email="cm-1@example.test", full_name="CM 1", role="case_manager",
+        case_manager_id="cm-1", auth_provider="test", is_active=True, org_id="org_a", org_role="member",
+    )
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def inject_auth(request, call_next):
+        request.state.auth_user = user
+        return await call_next(request)
+
+    app.include_router(unified_routes.router, prefix="/api/ai")
+    monkeypatch.setattr(unified_routes, "unified_ai", service)
+    response = TestClient(app).post("/api/ai/chat/stream", json={"message": "Say hello"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame.split("\n", 1) for frame in response.text.strip().split("\n\n")]
+    parsed = [(name[len("event: "):], json.loads(data[len("data: "):])) for name, data in frames]
+    assert parsed[:2] == [("token", {"text": "Hello"}), ("token", {"text": " there."})]
+    assert parsed[-1][0] == "done" and parsed[-1][1]["response"] == "Hello there."
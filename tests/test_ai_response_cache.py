@@ -0,0 +1,196 @@
+"""AI response and tool-result cache tests.
+
+Keys are HMACs of the normalized request and org scope; entries expire on
+their own TTL and are evicted by count and size. Repeated questions in the
+unified assistant are answered without re-running grounding lookups, resource
+tools or deterministic model calls, and the savings are reported on the
+response. ``CMSX_AI_CACHE=0`` sends everything upstream.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import backend.shared.ai_response_cache as cache_mod
+from backend.auth import authorization as authz
+from backend.modules.ai_unified.unified_service import UnifiedAIService
+from backend.shared import db_path as db_path_mod
+from backend.shared.ai_response_cache import AIResponseCache, CacheSavings
+
+
+class FakeOpenAI:
+    """Answers every chat completion with ``reply`` and a fixed token usage."""
+
+    def __init__(self, reply, tokens=120):
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                server.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                time.sleep(0.05)
+                body = json.dumps({
+                    "id": "completion", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": reply}}],
+                    "usage": {"prompt_tokens": tokens - 20, "completion_tokens": 20, "total_tokens": tokens},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.delenv("CMSX_AI_CACHE", raising=False)
+    fresh = AIResponseCache()
+    monkeypatch.setattr(cache_mod, "ai_response_cache", fresh)
+    return fresh
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, cache):
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.setattr(authz, "AUTH_DB", tmp_path / "auth.db")
+    monkeypatch.setattr(authz, "CORE_CLIENTS_DB", tmp_path / "core_clients.db")
+    server = FakeOpenAI("Call Valley Sober Living first.")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    service = UnifiedAIService()
+    service.context_builds = []
+
+    async def resource_context(message, history):
+        service.context_builds.append(message)
+        await asyncio.sleep(0.02)
+        return "Verified: Valley Sober Living (couples), 555-0100"
+
+    async def no_context(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(service, "_maybe_build_crisis_support_context", no_context)
+    monkeypatch.setattr(service, "_maybe_build_case_manager_resource_context", resource_context)
+    monkeypatch.setattr(service, "_maybe_build_internal_resource_context", no_context)
+    service.server = server
+    yield service
+    server.close()
+
+
+def test_keys_are_normalized_scoped_and_keyed_by_a_secret():
+    cache = AIResponseCache(secret=b"one")
+    key = cache.key("context", "org_a", "Sober living  in Van Nuys\nfor couples")
+
+    assert key == cache.key("context", "org_a", "sober living in van nuys for couples ")
+    assert key != cache.key("context", "org_b", "sober living in van nuys for couples")
+    assert key != AIResponseCache(secret=b"two").key("context", "org_a", "sober living in van nuys for couples")
+    assert "van nuys" not in key and len(key) == 64
+    # Completions keep case: a differently-cased prompt is a different prompt.
+    assert cache.key("completion", "org_a", "Draft for John") != cache.key("completion", "org_a", "draft for john")
+    assert AIResponseCache.cacheable_temperature(0.2) and not AIResponseCache.cacheable_temperature(0.4)
+
+
+def test_entries_expire_on_their_own_ttl_and_evict_by_count_and_size(cache):
+    cache.store("tool", "short", {"services": []}, ttl=0)
+    cache.store("tool", "long", {"services": ["a"]}, cost_ms=40.0, tokens=0)
+    assert cache.lookup("short") is None
+    assert cache.lookup("long")["value"] == {"services": ["a"]}
+
+    small = AIResponseCache(max_entries=2, max_bytes=60)
+    small.store("tool", "a", "x" * 10)
+    small.store("tool", "b", "y" * 10)
+    small.lookup("a")
+    small.store("tool", "c", "z" * 10)
+    assert (small.lookup("b"), small.lookup("a")["value"]) == (None, "x" * 10)
+    small.store("tool", "big", "w" * 50)
+    assert small.lookup("a") is None and small.lookup("c") is None
+    small.store("tool", "huge", "v" * 100)
+    assert small.lookup("huge") is None
+    metrics = cache.metrics()
+    assert (metrics["expired"], metrics["hits"], metrics["saved_ms"]) == (1, 1, 40.0)
+    assert small.metrics()["evictions"] == 3
+
+
+def test_repeated_questions_reuse_context_and_completions_and_report_savings(service, cache):
+    question = "Sober living in Van Nuys for couples?"
+    first = asyncio.run(service.process_message(question, "cm-1", org_id="org_a"))
+    second = asyncio.run(service.process_message(question, "cm-2", org_id="org_a"))
+
+    assert first["response"] == second["response"] == "Call Valley Sober Living first."
+    assert first["cache"] == {"hits": 0, "misses": 4, "saved_tokens": 0, "saved_ms": 0.0}
+    assert (second["cache"]["hits"], second["cache"]["saved_tokens"]) == (3, 240)
+    assert second["cache"]["saved_ms"] >= 50
+    assert service.context_builds == [question]
+    assert len(service.server.requests) == 2  # draft + grounded pass, once
+
+    # Another org never shares entries; cm-1's next turn carries history, so it is a new prompt.
+    asyncio.run(service.process_message(question, "cm-3", org_id="org_b"))
+    asyncio.run(service.process_message(question, "cm-1", org_id="org_a"))
+    assert len(service.server.requests) == 6
+    assert cache.metrics()["saved_tokens"] == 240
+
+
+def test_resource_tools_are_cached_per_org_but_client_data_tools_are_not(service, cache):
+    calls = []
+
+    async def internal_search(**params):
+        calls.append(("internal", params))
+        return {"success": True, "services": [{"title": "Valley Sober Living"}]}
+
+    async def failing_search(**params):
+        calls.append(("housing", params))
+        return {"success": False, "error": "upstream timeout"}
+
+    async def insurance(**params):
+        calls.append(("insurance", params))
+        return {"client_id": params["client_id"], "insurance": "Medi-Cal"}
+
+    service._function_map.update({
+        "search_internal_resources": internal_search,
+        "search_housing": failing_search,
+        "get_client_insurance": insurance,
+    })
+    allowed = set(service._function_map)
+
+    def call(name, arguments, case_manager_id="cm-1", org_id="org_a", savings=None):
+        tool_call = {"id": "call-1", "name": name, "arguments": json.dumps(arguments)}
+        return asyncio.run(service._call_tool(tool_call, case_manager_id, org_id, allowed, savings))
+
+    savings = CacheSavings()
+    first = call("search_internal_resources", {"query": "sober living", "location": "Van Nuys, CA"})
+    again = call("search_internal_resources", {"query": "Sober Living ", "location": "van nuys, ca"},
+                 case_manager_id="cm-2", savings=savings)
+    call("search_internal_resources", {"query": "sober living", "location": "Van Nuys, CA"}, org_id="org_b")
+    for _ in range(2):
+        call("search_housing", {"query": "shelter"})
+        call("get_client_insurance", {"client_id": "client-1"})
+
+    assert again["content"] == first["content"]
+    assert savings.hits == 1
+    assert [name for name, _ in calls] == ["internal", "internal", "housing", "insurance", "housing", "insurance"]
+
+
+def test_bypass_flag_sends_every_call_upstream(service, cache, monkeypatch):
+    monkeypatch.setenv("CMSX_AI_CACHE", "0")
+    question = "Sober living in Van Nuys for couples?"
+    for case_manager_id in ("cm-1", "cm-2"):
+        result = asyncio.run(service.process_message(question, case_manager_id, org_id="org_a"))
+        assert result["cache"]["hits"] == 0
+
+    assert len(service.server.requests) == 4
+    assert len(service.context_builds) == 2
+    assert cache.metrics()["entries"] == 0
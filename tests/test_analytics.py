@@ -153,6 +153,7 @@ def test_event_creation_persists_and_derives_identity(env):
     assert r.status_code == 200
     body = r.json()
     assert body["success"] is True and body["event_id"] >= 1
+    assert (body["queued"], body["dropped"]) == (False, False)
 
     # Identity derived from token, not the body.
     with sqlite3.connect(env["store"]._db_path()) as conn:
@@ -163,6 +164,24 @@ def test_event_creation_persists_and_derives_identity(env):
     assert row["case_manager_id"] == env["svc"].get_profile_by_uid("admin_a").case_manager_id
 
 
+def test_event_response_reports_queued_and_dropped_events(env):
+    c = env["client"]
+    env["as_user"]("admin_a")
+    store = env["store"]
+    store.queue_size, store.batch_size, store.flush_seconds = 1, 100, 60
+    store.total_events()
+    store.start()
+    try:
+        queued = c.post("/api/analytics/event", json={"event_type": "module_view"}).json()
+        dropped = c.post("/api/analytics/event", json={"event_type": "module_view"}).json()
+    finally:
+        store.stop()
+
+    assert queued == {"success": True, "event_id": None, "queued": True, "dropped": False}
+    assert dropped == {"success": False, "event_id": None, "queued": False, "dropped": True}
+    assert store.total_events() == 1
+
+
 def test_event_rejects_unknown_event_name(env):
     c = env["client"]
     env["as_user"]("admin_a")
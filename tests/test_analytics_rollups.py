@@ -0,0 +1,202 @@
+"""Analytics buffered writer and rollup tests.
+
+Events recorded while the writer runs are queued off the request path and
+written in batches (by size, interval, on read, or at shutdown); a full queue
+drops or writes inline per policy. Aggregate reads come from the hourly / daily
+rollups and must match a scan of the raw events exactly for every window,
+including after direct edits and on databases that predate the rollups.
+"""
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import backend.shared.db_path as db_path_mod
+from backend.analytics.store import AnalyticsStore
+
+MODULES = ("dashboard", "housing", "fmla", None)
+SOURCES = ("google", "meta", None)
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    for name in ("CMSX_ANALYTICS_BUFFER", "CMSX_ANALYTICS_OVERFLOW"):
+        monkeypatch.delenv(name, raising=False)
+    stores = []
+
+    def make(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        store = AnalyticsStore()
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.stop()
+
+
+def _raw(store, sql, params=()):
+    with sqlite3.connect(store._db_path()) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def _seed(store, count=400):
+    now = datetime.utcnow()
+    rows = []
+    for n in range(count):
+        created = now - timedelta(hours=n * 2.3, minutes=n * 7 % 60)
+        rows.append((
+            "module_view" if n % 3 else "page_view",
+            MODULES[n % len(MODULES)],
+            f"org_{n % 4}" if n % 5 else None,
+            f"cm_{n % 9}",
+            SOURCES[n % len(SOURCES)],
+            created.isoformat(),
+        ))
+    store.total_events()  # creates the schema and triggers
+    with sqlite3.connect(store._db_path()) as conn:
+        conn.executemany(
+            "INSERT INTO analytics_events (event_type, module, org_id, case_manager_id, source, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _scan(store, since_days):
+    """The aggregates computed the old way, straight from the raw events."""
+    where, params = "", []
+    if since_days:
+        where, params = " WHERE created_at >= ?", [(datetime.utcnow() - timedelta(days=since_days)).isoformat()]
+    and_where = where.replace(" WHERE", " AND")
+    modules = dict(_raw(store, "SELECT module, COUNT(*) FROM analytics_events WHERE module != ''"
+                               + and_where + " GROUP BY module", params))
+    return {
+        "total": _raw(store, "SELECT COUNT(*) FROM analytics_events" + where, params)[0][0],
+        "modules": {module: count for module, count in modules.items()},
+        "sources": dict(_raw(store, "SELECT source, COUNT(*) FROM analytics_events WHERE source != ''"
+                                    + and_where + " GROUP BY source", params)),
+        "orgs": _raw(store, "SELECT COUNT(DISTINCT org_id) FROM analytics_events WHERE org_id != ''"
+                            + and_where, params)[0][0],
+        "days": [list(row) for row in _raw(
+            store, "SELECT substr(created_at, 1, 10) d, COUNT(*) FROM analytics_events" + where
+                   + " GROUP BY d ORDER BY d DESC LIMIT 14", params)],
+    }
+
+
+def _aggregates(store, since_days):
+    usage = store.module_usage(since_days=since_days)
+    return {
+        "total": store.total_events(since_days=since_days),
+        "modules": {module: count for module, count in usage.items() if count},
+        "sources": store.marketing_source_breakdown(since_days=since_days),
+        "orgs": store.active_identity_counts(since_days=since_days)["active_event_orgs"],
+        "days": [[day["day"], day["count"]] for day in store.recent_activity_by_day(since_days=since_days)],
+    }
+
+
+def test_rollup_reads_match_a_raw_scan_for_every_window(make_store):
+    store = make_store()
+    _seed(store)
+
+    for since_days in (None, 7, 30, 3):
+        assert _aggregates(store, since_days) == _scan(store, since_days)
+
+    # Direct corrections flow through the rollups too.
+    with sqlite3.connect(store._db_path()) as conn:
+        conn.execute("UPDATE analytics_events SET module = 'benefits' WHERE module = 'fmla'")
+        conn.execute("DELETE FROM analytics_events WHERE source = 'meta'")
+        conn.execute("UPDATE analytics_events SET created_at = ? WHERE id % 7 = 0",
+                     ((datetime.utcnow() - timedelta(days=60)).isoformat(),))
+    for since_days in (None, 7, 30):
+        assert _aggregates(store, since_days) == _scan(store, since_days)
+    assert _raw(store, "SELECT COUNT(*) FROM analytics_rollup_daily WHERE event_count <= 0") == [(0,)]
+
+
+def test_all_time_reads_never_scan_raw_events(make_store):
+    store = make_store()
+    _seed(store, count=50)
+    statements = []
+    with store._connect() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        store.module_usage()
+        store.active_identity_counts()
+        store.marketing_attribution()
+        store.recent_activity_by_day()
+        store.total_events(since_days=7)
+    finally:
+        with store._connect() as conn:
+            conn.set_trace_callback(None)
+
+    all_time, windowed = statements[:-1], statements[-1]
+    assert all_time and not any("analytics_events" in sql for sql in all_time)
+    # A window reads raw rows only inside the cutoff hour.
+    assert windowed.count("analytics_events") == 1 and "created_at < " in windowed
+
+
+def test_existing_event_logs_are_rolled_up_once(tmp_path, make_store):
+    path = tmp_path / "analytics.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE analytics_events (id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL,"
+                     " route TEXT, module TEXT, org_id TEXT, case_manager_id TEXT, source TEXT, medium TEXT,"
+                     " campaign TEXT, referrer TEXT, metadata_json TEXT, created_at TEXT NOT NULL)")
+        conn.executemany("INSERT INTO analytics_events (event_type, module, created_at) VALUES (?, ?, ?)",
+                         [("module_view", "housing", datetime.utcnow().isoformat())] * 3)
+
+    store = make_store()
+    store.record_event(event_type="module_view", module="housing")
+
+    assert store.module_usage()["housing"] == 4
+    assert make_store().module_usage()["housing"] == 4
+
+
+def test_buffered_writer_batches_off_the_request_path(make_store):
+    store = make_store(CMSX_ANALYTICS_BATCH_SIZE=5, CMSX_ANALYTICS_FLUSH_MS=60_000)
+    store.total_events()
+    store.start()
+
+    results = [store.record_event(event_type="module_view", module="housing", metadata={"note": "x"})
+               for _ in range(3)]
+    assert results[0] == {"event_id": None, "dropped_metadata_keys": ["note"], "queued": True, "dropped": False}
+    assert _raw(store, "SELECT COUNT(*) FROM analytics_events") == [(0,)]
+
+    for _ in range(2):
+        store.record_event(event_type="module_view", module="dashboard")
+    deadline = time.monotonic() + 3
+    while _raw(store, "SELECT COUNT(*) FROM analytics_events") != [(5,)] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _raw(store, "SELECT COUNT(*) FROM analytics_events") == [(5,)]
+
+    store.record_event(event_type="module_view", module="fmla")
+    assert store.module_usage()["fmla"] == 1  # reads flush first
+    store.record_event(event_type="module_view", module="benefits")
+    store.stop()
+    assert _raw(store, "SELECT COUNT(*) FROM analytics_events") == [(7,)]
+    metrics = store.metrics()
+    assert (metrics["queued"], metrics["written"], metrics["pending"], metrics["running"]) == (7, 7, 0, False)
+    assert metrics["batches"] == 3
+
+    # Stopped writer: back to inline writes with real ids.
+    assert store.record_event(event_type="module_view", module="owner")["event_id"] == 8
+
+
+def test_full_queue_drops_or_writes_inline_per_policy(make_store):
+    store = make_store(CMSX_ANALYTICS_QUEUE_SIZE=2, CMSX_ANALYTICS_BATCH_SIZE=100, CMSX_ANALYTICS_FLUSH_MS=60_000)
+    store.total_events()
+    store.start()
+    outcomes = [store.record_event(event_type="page_view") for _ in range(3)]
+    assert [(result["queued"], result["dropped"]) for result in outcomes] == [
+        (True, False), (True, False), (False, True),
+    ]
+    assert store.metrics()["dropped"] == 1
+
+    inline = make_store(CMSX_ANALYTICS_OVERFLOW="inline")
+    inline.queue_size = 2
+    inline.start()
+    results = [inline.record_event(event_type="page_view") for _ in range(3)]
+    assert [result["event_id"] for result in results[:2]] == [None, None]
+    assert results[2]["event_id"] is not None
+    assert inline.total_events() == 3
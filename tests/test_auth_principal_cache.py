@@ -0,0 +1,169 @@
+"""Authenticated-principal cache tests.
+
+The service is pointed at a tmp auth.db and ``verify_bearer_token`` is replaced
+with a counting fake, so the tests can assert that a cache hit skips both token
+verification and the profile upsert, that entries expire at the token ``exp``,
+that profile writes (org assignment, staff disable) drop cached principals,
+and that unchanged logins no longer write ``user_profiles`` on every request.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.auth.service import ORG_MEMBER_ROLE, FirebaseAuthService
+
+HEADER = "Bearer token-a"
+
+
+def _claims(uid="u1", email="u1@a.test", name="User One", exp=None):
+    return {"uid": uid, "email": email, "name": name, "exp": exp or time.time() + 3600}
+
+
+@pytest.fixture
+def svc(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_AUTH_PRINCIPAL_CACHE", raising=False)
+    service = FirebaseAuthService(db_path=tmp_path / "auth.db")
+    service.verified = []
+    service.tokens = {HEADER: _claims()}
+
+    def fake_verify(header):
+        service.verified.append(header)
+        return dict(service.tokens[header])
+
+    monkeypatch.setattr(service, "verify_bearer_token", fake_verify)
+    return service
+
+
+def _last_login(service, uid="u1"):
+    with sqlite3.connect(service.db_path) as conn:
+        return conn.execute("SELECT last_login_at FROM user_profiles WHERE firebase_uid = ?", (uid,)).fetchone()[0]
+
+
+def test_repeat_request_skips_verification_and_upsert(svc, monkeypatch):
+    first = svc.authenticate_bearer(HEADER)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("cached principal should not touch auth.db")
+
+    monkeypatch.setattr(svc, "upsert_profile_from_token", fail)
+    second = svc.authenticate_bearer(HEADER)
+
+    assert second == first
+    assert second is not first
+    assert svc.verified == [HEADER]
+    metrics = svc.principal_cache.metrics()
+    assert metrics["hits"] == 1
+    assert metrics["hit_ratio"] == 0.5
+
+
+def test_entry_never_outlives_token_exp(svc):
+    svc.tokens[HEADER] = _claims(exp=time.time() + 0.05)
+    svc.authenticate_bearer(HEADER)
+    time.sleep(0.1)
+    svc.tokens[HEADER] = _claims()
+    svc.authenticate_bearer(HEADER)
+
+    assert len(svc.verified) == 2
+    assert svc.principal_cache.metrics()["expired"] == 1
+
+
+def test_org_assignment_invalidates_cached_principal(svc):
+    before = svc.authenticate_bearer(HEADER)
+    org_id = svc.create_organization("u1", "Org One", "case_management_agency").org_id
+
+    after = svc.authenticate_bearer(HEADER)
+
+    assert before.org_id != org_id
+    assert after.org_id == org_id
+    assert len(svc.verified) == 2
+
+
+def test_request_racing_org_assignment_cannot_recache_the_old_principal(svc, monkeypatch):
+    svc.authenticate_bearer(HEADER)
+    assign = svc._assign_user_to_org
+
+    def assign_then_race(*args, **kwargs):
+        assign(*args, **kwargs)
+        # Another request authenticates after the UPDATE but before the commit.
+        racer = threading.Thread(target=svc.authenticate_bearer, args=(HEADER,))
+        racer.start()
+        racer.join()
+
+    monkeypatch.setattr(svc, "_assign_user_to_org", assign_then_race)
+    org_id = svc.create_organization("u1", "Org One", "case_management_agency").org_id
+
+    assert svc.authenticate_bearer(HEADER).org_id == org_id
+
+
+def test_disabled_staff_is_not_served_from_cache(svc):
+    svc.upsert_profile_from_token(_claims("owner", "owner@a.test", "Owner"))
+    org_id = svc.create_organization("owner", "Org One", "case_management_agency").org_id
+    svc.authenticate_bearer(HEADER)
+    invite = svc.create_invite(org_id, "u1@a.test", ORG_MEMBER_ROLE, invited_by="owner")
+    svc.accept_invite("u1", invite["token"])
+    assert svc.authenticate_bearer(HEADER).org_id == org_id
+
+    svc.disable_staff(org_id, "u1")
+
+    assert svc.authenticate_bearer(HEADER).is_active is False
+    assert svc.principal_cache.metrics()["invalidations"] >= 2
+
+
+def test_unchanged_login_skips_profile_write(svc):
+    svc.upsert_profile_from_token(_claims())
+    stamp = _last_login(svc)
+
+    user = svc.upsert_profile_from_token(_claims())
+
+    assert _last_login(svc) == stamp
+    assert user.email == "u1@a.test"
+    assert svc.principal_cache.metrics()["profile_writes_skipped"] == 1
+
+
+def test_stale_last_login_is_refreshed_alone(svc):
+    svc.upsert_profile_from_token(_claims())
+    old = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    with sqlite3.connect(svc.db_path) as conn:
+        conn.execute("UPDATE user_profiles SET last_login_at = ?", (old,))
+
+    svc.upsert_profile_from_token(_claims())
+
+    assert _last_login(svc) > old
+    assert svc.principal_cache.metrics()["last_login_updates"] == 1
+
+
+def test_changed_claims_update_profile_and_drop_cache(svc):
+    svc.authenticate_bearer(HEADER)
+
+    updated = svc.upsert_profile_from_token(_claims(name="Renamed User"))
+    again = svc.authenticate_bearer(HEADER)
+
+    assert updated.full_name == "Renamed User"
+    assert len(svc.verified) == 2
+    # The token still carries the old name, so the next login writes it back.
+    assert again.full_name == "User One"
+    assert svc.principal_cache.metrics()["profile_updates"] == 2
+
+
+def test_cache_is_lru_bounded(svc):
+    svc.principal_cache.max_entries = 2
+    for index in range(4):
+        header = f"Bearer token-{index}"
+        svc.tokens[header] = _claims(uid=f"u{index}", email=f"u{index}@a.test")
+        svc.authenticate_bearer(header)
+
+    metrics = svc.principal_cache.metrics()
+    assert metrics["entries"] == 2
+    assert metrics["evictions"] == 2
+
+
+def test_cache_can_be_disabled(svc, monkeypatch):
+    monkeypatch.setenv("CMSX_AUTH_PRINCIPAL_CACHE", "0")
+    svc.authenticate_bearer(HEADER)
+    svc.authenticate_bearer(HEADER)
+
+    assert len(svc.verified) == 2
+    assert svc.principal_cache.metrics()["entries"] == 0
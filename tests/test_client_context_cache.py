@@ -0,0 +1,166 @@
+"""Client operational-context cache tests.
+
+Covers generation-based invalidation (direct and through a real WorkspaceStore
+write), org keying, the DB_DIR scope, the "today"/max-age freshness rules, the
+``cacheable`` veto, LRU eviction, the optional SQLite tier surviving a restart,
+and the disable flag. A private cache instance is patched in so the process-wide
+metrics are untouched.
+"""
+import pytest
+
+import backend.shared.client_context_cache as cache_mod
+import backend.shared.db_path as db_path_mod
+from backend.shared.client_context_cache import ClientContextCache, invalidate_client_context
+from backend.shared.database.workspace_store import WorkspaceStore
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.delenv("CMSX_CONTEXT_CACHE", raising=False)
+    monkeypatch.delenv("CMSX_CONTEXT_CACHE_DISK", raising=False)
+    instance = ClientContextCache(max_entries=8, max_age_seconds=900)
+    monkeypatch.setattr(cache_mod, "client_context_cache", instance)
+    return instance
+
+
+def _counting_builder(calls, value=None):
+    def build():
+        calls.append(1)
+        return dict(value or {"client": {"n": len(calls)}})
+    return build
+
+
+def test_second_lookup_is_served_from_cache(cache):
+    calls = []
+    first = cache.get_or_build("client-1", None, _counting_builder(calls))
+    second = cache.get_or_build("client-1", None, _counting_builder(calls))
+
+    assert first == second
+    assert len(calls) == 1
+    metrics = cache.metrics()
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 1
+    assert metrics["hit_ratio"] == 0.5
+
+
+def test_cached_value_is_isolated_from_caller_mutation(cache):
+    value = cache.get_or_build("client-1", None, lambda: {"tasks": ["a"]})
+    value["tasks"].append("mutated")
+
+    assert cache.get_or_build("client-1", None, lambda: {"tasks": []}) == {"tasks": ["a"]}
+
+
+def test_invalidation_forces_rebuild_for_that_client_only(cache):
+    calls = []
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    cache.get_or_build("client-2", None, _counting_builder(calls))
+
+    invalidate_client_context("client-1")
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    cache.get_or_build("client-2", None, _counting_builder(calls))
+
+    assert len(calls) == 3
+    assert cache.metrics()["invalidations"] == 1
+
+
+def test_write_during_build_leaves_entry_stale(cache):
+    def build_with_concurrent_write():
+        invalidate_client_context("client-1")
+        return {"client": "old"}
+
+    cache.get_or_build("client-1", None, build_with_concurrent_write)
+    calls = []
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    assert len(calls) == 1
+
+
+def test_workspace_write_invalidates_client(cache, tmp_path):
+    store = WorkspaceStore.__new__(WorkspaceStore)
+    store.db_path = tmp_path / "workspace_content.db"
+    store._initialize()
+
+    calls = []
+    cache.get_or_build("client-ws", None, _counting_builder(calls))
+    task = store.create_client_task("client-ws", {"title": "Call probation officer"})
+    cache.get_or_build("client-ws", None, _counting_builder(calls))
+    assert len(calls) == 2
+
+    # Deletes are addressed by task id; the owning client is resolved first.
+    assert store.delete_client_task(task["task_id"]) is True
+    cache.get_or_build("client-ws", None, _counting_builder(calls))
+    assert len(calls) == 3
+
+
+def test_entries_are_keyed_by_org_and_db_dir(cache, tmp_path, monkeypatch):
+    calls = []
+    cache.get_or_build("client-1", "org-a", _counting_builder(calls))
+    cache.get_or_build("client-1", "org-b", _counting_builder(calls))
+    assert len(calls) == 2
+
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path / "other")
+    cache.get_or_build("client-1", "org-a", _counting_builder(calls))
+    assert len(calls) == 3
+
+
+def test_entries_from_another_day_or_past_max_age_are_stale(cache, monkeypatch):
+    calls = []
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    key = next(iter(cache._entries))
+
+    cache._entries[key]["built_on"] = "2000-01-01"
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    assert len(calls) == 2
+
+    cache._entries[key]["built_at"] -= cache.max_age_seconds + 1
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    assert len(calls) == 3
+    assert cache.metrics()["stale"] == 2
+
+
+def test_cacheable_veto_skips_storing(cache):
+    calls = []
+    degraded = {"metadata": {"complete": False}}
+    is_complete = lambda ctx: ctx["metadata"]["complete"]  # noqa: E731
+    cache.get_or_build("client-1", None, _counting_builder(calls, degraded), cacheable=is_complete)
+    cache.get_or_build("client-1", None, _counting_builder(calls, degraded), cacheable=is_complete)
+
+    assert len(calls) == 2
+    assert cache.metrics()["uncacheable"] == 2
+
+
+def test_lru_eviction_is_bounded(cache):
+    for index in range(cache.max_entries + 3):
+        cache.get_or_build(f"client-{index}", None, lambda: {"ok": True})
+
+    metrics = cache.metrics()
+    assert metrics["entries"] == cache.max_entries
+    assert metrics["evictions"] == 3
+
+
+def test_disk_tier_survives_restart_and_shares_generations(cache, tmp_path, monkeypatch):
+    monkeypatch.setenv("CMSX_CONTEXT_CACHE_DISK", "1")
+    calls = []
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    assert (tmp_path / "context_cache.db").exists()
+
+    restarted = ClientContextCache(max_entries=8)
+    value = restarted.get_or_build("client-1", None, _counting_builder(calls))
+    assert len(calls) == 1
+    assert value == {"client": {"n": 1}}
+    assert restarted.metrics()["disk_hits"] == 1
+
+    # A write reported through one instance is seen by the other.
+    cache.invalidate("client-1")
+    restarted.get_or_build("client-1", None, _counting_builder(calls))
+    assert len(calls) == 2
+
+
+def test_cache_can_be_disabled(cache, monkeypatch):
+    monkeypatch.setenv("CMSX_CONTEXT_CACHE", "0")
+    calls = []
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+    cache.get_or_build("client-1", None, _counting_builder(calls))
+
+    assert len(calls) == 2
+    assert cache.metrics()["entries"] == 0
@@ -1,4 +1,5 @@
 import json
+import time
 from datetime import datetime
 
 from fastapi import FastAPI
@@ -259,6 +260,8 @@ def test_operational_context_isolates_optional_source_failure(tmp_path, monkeypa
     assert context["module_context"]["groups"] == {}
     assert context["metadata"]["complete"] is False
     assert context["metadata"]["unavailable_sources"] == ["groups"]
+    assert "groups" in context["metadata"]["source_latency_ms"]
+    assert context["metadata"]["timed_out_sources"] == []
 
 
 def test_unified_view_merges_medical_referrals_into_existing_services_path(tmp_path, monkeypatch):
@@ -353,6 +356,40 @@ def test_unified_view_merges_medical_referrals_into_existing_services_path(tmp_p
     assert payload["client_data"]["services"]["total_referrals"] == 3
 
 
+def test_unified_view_fails_when_a_required_source_times_out(tmp_path, monkeypatch):
+    from backend.shared import fan_out as fan_out_module
+
+    monkeypatch.chdir(tmp_path)
+    client_id = _seed_core_client("client-unified-timeout")
+    client = TestClient(_test_app(tmp_path))
+
+    def slow_legal_summary(_client_id):
+        time.sleep(0.5)
+        return {"cases": [{"case_id": "case-1"}], "active_cases": 1}
+
+    monkeypatch.setattr(fan_out_module, "DEFAULT_SOURCE_TIMEOUT_S", 0.1)
+    monkeypatch.setattr(clients_api, "get_client_data_integrator", lambda: _StubClientDataIntegrator())
+    monkeypatch.setattr(clients_api, "get_client_benefits_summary", lambda _client_id: {})
+    monkeypatch.setattr(clients_api, "get_client_legal_summary", slow_legal_summary)
+    monkeypatch.setattr(clients_api, "get_client_services_summary", lambda _client_id: {})
+    monkeypatch.setattr(clients_api, "get_client_medical_referrals_summary", lambda _client_id: [])
+    monkeypatch.setattr(workspace_store, "list_client_service_referrals", lambda _client_id: [])
+    monkeypatch.setattr(workspace_store, "list_client_appointments", lambda _client_id: [])
+    monkeypatch.setattr(workspace_store, "list_client_documents", lambda _client_id: [])
+
+    response = client.get(
+        f"/api/clients/{client_id}/unified-view",
+        headers={
+            "X-Test-Auth-Email": "case.manager@example.test",
+            "X-Test-Auth-Case-Manager-Id": "cm_test",
+            "X-Test-Auth-Role": "case_manager",
+        },
+    )
+
+    assert response.status_code == 504
+    assert "legal" in response.json()["detail"]
+
+
 def test_unified_view_surfaces_saved_jobs_in_employment(tmp_path, monkeypatch):
     from backend.modules.jobs import routes as jobs_routes
 
@@ -0,0 +1,128 @@
+"""Set-based data consistency check tests.
+
+A full check diffs every module against the master in one pass per module and
+must report exactly what a client-by-client comparison would: records missing
+from a module and sync fields that differ. Incremental runs only compare rows
+changed since the last run's ``updated_at`` high-water mark.
+"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+
+from backend.shared import phase_3b_data_consistency_engine as consistency_engine
+
+MODULES = ("core_clients", "housing", "benefits", "legal")
+COLUMNS = ("client_id", "first_name", "last_name", "email", "phone", "address", "updated_at")
+
+
+def _write_clients(db_dir, module, rows):
+    with sqlite3.connect(db_dir / f"{module}.db") as conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS clients ({', '.join(COLUMNS)}, PRIMARY KEY (client_id))")
+        conn.executemany(f"INSERT OR REPLACE INTO clients VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+
+
+def _client(n, stamp="2024-01-01T00:00:00", **fields):
+    row = {
+        "client_id": f"client-{n}", "first_name": f"First{n}", "last_name": f"Last{n}",
+        "email": f"c{n}@example.org", "phone": None if n % 4 == 0 else f"555-{n:04d}",
+        "address": f"{n} Main St", "updated_at": stamp,
+    }
+    row.update(fields)
+    return tuple(row[column] for column in COLUMNS)
+
+
+def _issues(report_engine):
+    return sorted(
+        (issue.module_name, issue.client_id, issue.field_name, issue.expected_value, issue.actual_value, issue.severity)
+        for issue in report_engine.consistency_issues
+    )
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(consistency_engine, "DB_DIR", tmp_path)
+    master = [_client(n) for n in range(200)]
+    _write_clients(tmp_path, "core_clients", master)
+    housing = [_client(n, address="Shelter") if n == 7 else row for n, row in enumerate(master) if n != 3]
+    _write_clients(tmp_path, "housing", housing)
+    benefits = [_client(n, first_name="Frist9", phone=None) if n == 9 else row for n, row in enumerate(master)]
+    _write_clients(tmp_path, "benefits", benefits)
+
+    engine = consistency_engine.DataConsistencyEngine(log_path=tmp_path / "consistency.log")
+    engine.modules = {name: config for name, config in engine.modules.items() if name in MODULES}
+    engine.db_dir = tmp_path
+    return engine
+
+
+def test_full_check_reports_missing_and_divergent_records_in_one_pass(engine, tmp_path):
+    attached = []
+    original = engine._master_connection
+
+    @contextmanager
+    def tracing():
+        with original() as conn:
+            conn.set_trace_callback(lambda sql: attached.append(sql) if sql.startswith("ATTACH") else None)
+            yield conn
+
+    engine._master_connection = tracing
+    report = engine.run_consistency_check()
+
+    assert (report["mode"], report["total_clients_checked"]) == ("full", 200)
+    expected = [
+        ("benefits", "client-9", "first_name", "First9", "Frist9", "critical"),
+        ("benefits", "client-9", "phone", "555-0009", None, "warning"),
+        ("housing", "client-3", "client_record", "exists", "missing", "critical"),
+        ("housing", "client-7", "address", "7 Main St", "Shelter", "warning"),
+    ] + sorted(("legal", f"client-{n}", "client_record", "exists", "missing", "critical") for n in range(200))
+    assert _issues(engine) == sorted(expected)
+    assert (report["critical_issues"], report["warning_issues"]) == (202, 2)
+    # One ATTACH per module that exists; a missing module database is not created.
+    assert len(attached) == 2
+    assert not (tmp_path / "legal.db").exists()
+
+
+def test_incremental_check_compares_only_rows_changed_since_the_last_run(engine, tmp_path, monkeypatch):
+    # Every seeded row shares the first run's mark; without an overlap window
+    # only the rows written below are past it.
+    monkeypatch.setattr(consistency_engine, "WATERMARK_OVERLAP", timedelta(0))
+    engine.modules.pop("legal")
+    engine.run_consistency_check()
+    engine.consistency_issues.clear()
+
+    _write_clients(tmp_path, "benefits", [_client(20, stamp="2024-02-01T00:00:00", email="new@example.org")])
+    _write_clients(tmp_path, "core_clients", [_client(30, stamp="2024-02-01T00:00:00", last_name="Renamed")])
+    with sqlite3.connect(tmp_path / "housing.db") as conn:
+        conn.execute("DELETE FROM clients WHERE client_id = 'client-40'")
+
+    report = engine.run_consistency_check(incremental=True)
+
+    assert (report["mode"], report["total_clients_checked"]) == ("incremental", 2)
+    assert _issues(engine) == [
+        ("benefits", "client-20", "email", "c20@example.org", "new@example.org", "warning"),
+        ("benefits", "client-30", "last_name", "Renamed", "Last30", "critical"),
+        ("housing", "client-30", "last_name", "Renamed", "Last30", "critical"),
+    ]
+
+    # Nothing changed since: the next incremental run has nothing to compare,
+    # while a full run still catches the deleted housing record.
+    engine.consistency_issues.clear()
+    assert engine.run_consistency_check(incremental=True)["total_issues_found"] == 0
+    engine.run_consistency_check()
+    assert ("housing", "client-40", "client_record", "exists", "missing", "critical") in _issues(engine)
+
+
+def test_incremental_check_catches_rows_committed_after_the_mark_was_read(engine, tmp_path):
+    engine.modules.pop("legal")
+    _write_clients(tmp_path, "core_clients", [_client(1, stamp="2024-02-01T12:00:00")])
+    engine.run_consistency_check()
+    engine.consistency_issues.clear()
+
+    # Stamped a minute before the stored mark, but only visible now, as if a
+    # long writer transaction committed after the previous check.
+    _write_clients(tmp_path, "housing", [_client(5, stamp="2024-02-01T11:59:00", phone="555-9999")])
+
+    engine.run_consistency_check(incremental=True)
+
+    assert ("housing", "client-5", "phone", "555-0005", "555-9999", "warning") in _issues(engine)
@@ -0,0 +1,142 @@
+"""Smart Daily deadline reconciliation tests.
+
+Smart Daily reads only queue a caseload backfill; module stores report changed
+cases / clients into per-case-manager dirty sets that the worker drains after
+a debounce, resyncing just those keys (deleted cases close out their
+reminders), and failed keys are retried a bounded number of times.
+"""
+import time
+
+import pytest
+
+import backend.shared.reconciliation_queue as queue_mod
+from backend.modules.reminders import reconciliation, repository
+from backend.modules.ur.store import URStore
+from backend.shared.reconciliation_queue import ReconciliationQueue
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    # Keep Smart Daily priority index refreshes out of these dirty sets.
+    monkeypatch.setenv("CMSX_TASK_INDEX", "0")
+    fresh = ReconciliationQueue(debounce_ms=0, max_delay_ms=0, sweep_seconds=3600)
+    monkeypatch.setattr(queue_mod, "reconciliation_queue", fresh)
+    monkeypatch.setattr(repository, "reconciliation_queue", fresh)
+    yield fresh
+    fresh.stop()
+
+
+def _ur_case(**overrides):
+    case = {
+        "client_id": "client-1",
+        "client_name": "John Collins",
+        "assigned_case_manager": "cm-1",
+        "status": "approved",
+        "next_review_date": "2026-08-01",
+    }
+    case.update(overrides)
+    return case
+
+
+def test_smart_daily_read_only_queues_a_caseload_backfill(queue, monkeypatch):
+    reconciled = []
+    monkeypatch.setattr(repository, "reconcile_operational_deadlines", lambda *a, **k: reconciled.append(a))
+    monkeypatch.setattr(repository, "list_tasks_for_case_manager", lambda *a, **k: [])
+    monkeypatch.setattr(repository, "get_active_reminders_for_case_manager", lambda *a, **k: [])
+    monkeypatch.setattr(repository, "get_clients_for_case_manager", lambda *a, **k: ([], {}))
+    caseloads = []
+    queue.register("caseload", lambda cm, org, keys: caseloads.append((cm, org)))
+
+    repository.get_prioritized_tasks("cm-1", org_id="org-1")
+    repository.get_prioritized_tasks("cm-1", org_id="org-1")
+
+    assert reconciled == []
+    assert queue.pending() == [{"case_manager_id": "cm-1", "org_id": "org-1", "attempts": 0, "kinds": {"caseload": ["*"]}}]
+    queue.flush()
+    repository.get_prioritized_tasks("cm-1", org_id="org-1")
+    assert caseloads == [("cm-1", "org-1")]
+    assert queue.pending() == []
+
+
+def test_ur_writes_coalesce_and_resync_only_touched_cases(queue, tmp_path, monkeypatch):
+    store = URStore(db_path=str(tmp_path / "ur.db"))
+    synced = []
+    monkeypatch.setattr("backend.modules.ur.store_factory.get_ur_store", lambda: store)
+    monkeypatch.setattr("backend.modules.ur.work_items.sync_ur_deadline_reminders", synced.append)
+    queue.register("ur", reconciliation.reconcile_ur_cases)
+
+    kept = store.create_case(_ur_case())
+    for review_date in ("2026-08-02", "2026-08-03", "2026-08-04"):
+        store.update_case(kept["case_id"], {"next_review_date": review_date})
+    removed = store.create_case(_ur_case(client_id="client-2", assigned_case_manager="cm-2"))
+    store.delete_case(removed["case_id"])
+    store.create_case(_ur_case(client_id="client-3", assigned_case_manager="cm-3"))
+
+    queue.flush(case_manager_id="cm-1")
+    assert [(case["case_id"], case["next_review_date"]) for case in synced] == [(kept["case_id"], "2026-08-04")]
+
+    queue.flush()
+    closed = next(case for case in synced if case["case_id"] == removed["case_id"])
+    assert closed["status"] == "closed"
+    assert len(synced) == 3
+    metrics = queue.metrics()
+    assert (metrics["coalesced"], metrics["units_processed"], metrics["pending_units"]) == (4, 3, 0)
+
+
+def test_worker_debounces_bursts_and_caps_the_delay(monkeypatch):
+    queue = ReconciliationQueue(debounce_ms=150, max_delay_ms=400)
+    batches = []
+    queue.register("fmla", lambda cm, org, keys: batches.append((time.monotonic(), sorted(keys))))
+    queue.start()
+    try:
+        started = time.monotonic()
+        for _ in range(5):
+            queue.mark_dirty("fmla", "case-1", case_manager_id="cm-1")
+            time.sleep(0.03)
+        time.sleep(0.4)
+        assert [keys for _, keys in batches] == [["case-1"]]
+        assert batches[0][0] - started >= 0.15
+
+        batches.clear()
+        started = time.monotonic()
+        while time.monotonic() - started < 0.8:
+            queue.mark_dirty("fmla", "case-2", case_manager_id="cm-1")
+            time.sleep(0.05)
+        assert batches and batches[0][0] - started < 0.7
+    finally:
+        queue.stop()
+    assert not queue.is_running
+
+
+def test_failed_keys_are_retried_then_dropped(queue):
+    attempts = []
+
+    def flaky(cm, org, keys):
+        attempts.append(sorted(keys))
+        return ["bad-client"]
+
+    queue.register("medical", flaky)
+    queue.mark_dirty("medical", "good-client", case_manager_id="cm-1")
+    queue.mark_dirty("medical", "bad-client", case_manager_id="cm-1")
+
+    for _ in range(3):
+        queue.flush()
+
+    assert attempts == [["bad-client", "good-client"], ["bad-client"], ["bad-client"]]
+    assert queue.pending() == []
+    assert (queue.metrics()["retries"], queue.metrics()["dropped"]) == (2, 1)
+
+
+def test_client_events_resolve_the_assigned_case_manager(queue, monkeypatch):
+    synced = []
+    monkeypatch.setattr(reconciliation, "get_client_case_manager_id", lambda client_id: "cm-9")
+    monkeypatch.setattr(
+        "backend.modules.medical.work_items.sync_client_medical_appointment_reminders",
+        lambda client_id, **kwargs: synced.append((client_id, kwargs)),
+    )
+    queue.register("medical", reconciliation.reconcile_client_appointments)
+
+    queue_mod.mark_deadlines_dirty("medical", "client-7")
+    queue.flush()
+
+    assert synced == [("client-7", {"case_manager_id": "cm-9", "org_id": None})]
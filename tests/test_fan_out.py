@@ -0,0 +1,130 @@
+"""Bounded fan-out executor tests (concurrency, timeouts, error isolation)."""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.shared import fan_out as fan_out_module
+from backend.shared.fan_out import FanOutSource, run_fan_out
+
+_request_marker = contextvars.ContextVar("_request_marker", default=None)
+
+
+def _sleepy(value, delay):
+    def loader():
+        time.sleep(delay)
+        return value
+    return loader
+
+
+def test_sources_run_concurrently_and_keep_declared_order():
+    sources = [FanOutSource(f"s{i}", _sleepy(i, 0.2), None) for i in range(5)]
+
+    started = time.perf_counter()
+    result = run_fan_out(sources)
+    elapsed = time.perf_counter() - started
+
+    assert list(result.values) == ["s0", "s1", "s2", "s3", "s4"]
+    assert [result.values[f"s{i}"] for i in range(5)] == [0, 1, 2, 3, 4]
+    # Serially this would take ~1s.
+    assert elapsed < 0.8
+    assert set(result.latency_ms) == {"s0", "s1", "s2", "s3", "s4"}
+    assert result.latency_ms["s0"] >= 150
+
+
+def test_slow_source_times_out_to_fallback():
+    result = run_fan_out([
+        FanOutSource("fast", _sleepy("ok", 0), None),
+        FanOutSource("slow", _sleepy("late", 1.0), {"fallback": True}, timeout=0.1),
+    ])
+
+    assert result.values["fast"] == "ok"
+    assert result.values["slow"] == {"fallback": True}
+    assert result.timed_out == ["slow"]
+    assert result.failed("slow") and not result.failed("fast")
+    assert result.metadata()["timed_out_sources"] == ["slow"]
+
+
+@pytest.fixture
+def single_worker_pool(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(fan_out_module, "_executor", pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_timeout_counts_from_source_start_not_queue_entry(single_worker_pool):
+    # "second" waits ~0.3s for the only worker, then needs 0.2s: it would miss
+    # a 0.4s deadline measured from fan-out start, but not from its own start.
+    result = run_fan_out([
+        FanOutSource("first", _sleepy("a", 0.3), None, timeout=0.4),
+        FanOutSource("second", _sleepy("b", 0.2), None, timeout=0.4),
+    ])
+
+    assert result.values == {"first": "a", "second": "b"}
+    assert result.timed_out == []
+
+
+def test_sources_stuck_in_queue_are_cancelled(single_worker_pool):
+    release = threading.Event()
+    single_worker_pool.submit(release.wait)
+    ran = []
+
+    try:
+        result = run_fan_out([
+            FanOutSource("a", lambda: ran.append("a"), "fallback-a", timeout=0.1),
+            FanOutSource("b", lambda: ran.append("b"), "fallback-b", timeout=0.1),
+        ])
+    finally:
+        release.set()
+    single_worker_pool.shutdown(wait=True)
+
+    assert result.values == {"a": "fallback-a", "b": "fallback-b"}
+    assert result.timed_out == ["a", "b"]
+    assert ran == []
+
+
+def test_errors_are_isolated_per_source():
+    def boom():
+        raise RuntimeError("module offline")
+
+    result = run_fan_out([
+        FanOutSource("a", lambda: 1, 0),
+        FanOutSource("b", boom, []),
+        FanOutSource("c", lambda: 3, 0),
+    ])
+
+    assert result.values == {"a": 1, "b": [], "c": 3}
+    assert isinstance(result.errors["b"], RuntimeError)
+    assert result.first_error(["a", "b", "c"]) is result.errors["b"]
+
+
+def test_loaders_inherit_context_and_nested_fan_out_runs_inline():
+    _request_marker.set("req-1")
+
+    def nested():
+        inner = run_fan_out([
+            FanOutSource("x", lambda: _request_marker.get(), None),
+            FanOutSource("y", lambda: 2, None),
+        ])
+        return inner.values
+
+    result = run_fan_out([
+        FanOutSource("marker", lambda: _request_marker.get(), None),
+        FanOutSource("nested", nested, None),
+    ])
+
+    assert result.values["marker"] == "req-1"
+    assert result.values["nested"] == {"x": "req-1", "y": 2}
+
+
+def test_fan_out_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("CMSX_FANOUT", "0")
+    result = run_fan_out([
+        FanOutSource("a", lambda: 1, None),
+        FanOutSource("b", lambda: 2, None),
+    ])
+    assert result.values == {"a": 1, "b": 2}
+    assert result.timed_out == []
@@ -0,0 +1,224 @@
+"""Firebase signing-key store tests.
+
+Tokens are minted with a throwaway RSA key. The offline tests point the store
+(and ``FirebaseAuthService``) at a local JWKS file; the remote tests replace
+``_fetch_document`` so Cache-Control handling, background refresh, forced
+refetch on an unknown ``kid`` and stale-on-error behave without the network.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from fastapi import HTTPException
+from jwt.algorithms import RSAAlgorithm
+
+from backend.auth.firebase_keys import FirebaseKeyStore, cache_max_age
+from backend.auth.service import FirebaseAuthService
+
+PROJECT = "cmsx-test"
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwks(private_key, kid="k1"):
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return {"keys": [jwk]}
+
+
+def _x509_map(private_key, kid="k1"):
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken")])
+    now = datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    return {kid: certificate.public_bytes(serialization.Encoding.PEM).decode()}
+
+
+def _token(private_key, kid="k1", project=PROJECT, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{project}",
+        "aud": project,
+        "sub": "uid-1",
+        "email": "u1@a.test",
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks_file(tmp_path, private_key):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(_jwks(private_key)))
+    return path
+
+
+@pytest.fixture
+def remote_store(private_key):
+    store = FirebaseKeyStore(certs_url="https://keys.invalid", refresh_margin_seconds=300)
+    store.fetched = []
+    store.document = _x509_map(private_key)
+    store.cache_control = "public, max-age=19000, must-revalidate"
+
+    def fake_fetch():
+        store.fetched.append(time.time())
+        if isinstance(store.document, Exception):
+            raise store.document
+        return store.document, store.cache_control
+
+    store._fetch_document = fake_fetch
+    return store
+
+
+def test_local_jwks_verifies_without_network(jwks_file, private_key):
+    store = FirebaseKeyStore(jwks_path=str(jwks_file))
+
+    claims = store.verify(_token(private_key), PROJECT)
+
+    assert claims["uid"] == "uid-1"
+    assert claims["email"] == "u1@a.test"
+    assert store.metrics()["source"] == "local"
+    assert store.metrics()["fetches"] == 0
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "other-project"},
+        {"iss": "https://securetoken.google.com/other-project"},
+        {"exp": int(time.time()) - 10},
+        {"sub": ""},
+        {"auth_time": int(time.time()) + 600},
+    ],
+)
+def test_invalid_claims_are_rejected(jwks_file, private_key, overrides):
+    store = FirebaseKeyStore(jwks_path=str(jwks_file))
+    with pytest.raises(jwt.InvalidTokenError):
+        store.verify(_token(private_key, **overrides), PROJECT)
+    assert store.metrics()["failures"] == 1
+
+
+def test_unknown_kid_and_foreign_signature_are_rejected(jwks_file, private_key):
+    store = FirebaseKeyStore(jwks_path=str(jwks_file))
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    with pytest.raises(jwt.InvalidTokenError):
+        store.verify(_token(private_key, kid="rotated"), PROJECT)
+    with pytest.raises(jwt.InvalidSignatureError):
+        store.verify(_token(other_key), PROJECT)
+
+
+def test_max_age_is_honoured(remote_store, private_key):
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store.verify(_token(private_key), PROJECT)
+    assert len(remote_store.fetched) == 1
+    assert remote_store.metrics()["expires_in_seconds"] > 18000
+
+    remote_store._expires_at = time.time() - 1
+    remote_store.verify(_token(private_key), PROJECT)
+    assert len(remote_store.fetched) == 2
+
+
+def test_near_expiry_refreshes_in_background(remote_store, private_key):
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store._expires_at = time.time() + 60
+
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store._refresh_thread.join(timeout=5)
+
+    assert len(remote_store.fetched) == 2
+    assert remote_store.metrics()["background_refreshes"] == 1
+
+
+def test_slow_background_refresh_does_not_block_verification(remote_store, private_key):
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store._expires_at = time.time() + 60
+    fetch = remote_store._fetch_document
+    release = threading.Event()
+
+    def slow_fetch():
+        release.wait(timeout=5)
+        return fetch()
+
+    remote_store._fetch_document = slow_fetch
+    remote_store.verify(_token(private_key), PROJECT)
+
+    started = time.monotonic()
+    for _ in range(3):
+        remote_store.verify(_token(private_key), PROJECT)
+    elapsed = time.monotonic() - started
+    release.set()
+    remote_store._refresh_thread.join(timeout=5)
+
+    assert elapsed < 1
+    assert remote_store.metrics()["background_refreshes"] == 1
+    assert remote_store.metrics()["fetches"] == 2
+
+
+def test_rotated_kid_forces_one_refetch(remote_store, private_key):
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store._last_fetch_at = 0
+    remote_store.document = _jwks(private_key, kid="k2")
+
+    claims = remote_store.verify(_token(private_key, kid="k2"), PROJECT)
+
+    assert claims["sub"] == "uid-1"
+    assert len(remote_store.fetched) == 2
+    # A second unknown kid straight after is not allowed to hammer the endpoint.
+    with pytest.raises(jwt.InvalidTokenError):
+        remote_store.verify(_token(private_key, kid="k3"), PROJECT)
+    assert len(remote_store.fetched) == 2
+
+
+def test_failed_refresh_keeps_cached_keys(remote_store, private_key):
+    remote_store.verify(_token(private_key), PROJECT)
+    remote_store._expires_at = time.time() - 1
+    remote_store.document = ConnectionError("offline")
+
+    assert remote_store.verify(_token(private_key), PROJECT)["uid"] == "uid-1"
+    assert remote_store.metrics()["fetch_errors"] == 1
+
+
+def test_cache_control_parsing():
+    assert cache_max_age("public, max-age=21039, must-revalidate, no-transform") == 21039
+    assert cache_max_age("no-cache") == 3600
+    assert cache_max_age(None, default=5) == 5
+
+
+def test_service_uses_local_jwks_instead_of_admin_sdk(tmp_path, jwks_file, private_key, monkeypatch):
+    monkeypatch.setenv("CMSX_FIREBASE_JWKS_PATH", str(jwks_file))
+    monkeypatch.setenv("FIREBASE_PROJECT_ID", PROJECT)
+    service = FirebaseAuthService(db_path=tmp_path / "auth.db")
+
+    def fail():
+        raise AssertionError("offline verification must not initialise Firebase Admin")
+
+    monkeypatch.setattr(service, "_get_firebase_app", fail)
+
+    decoded = service.verify_bearer_token(f"Bearer {_token(private_key)}")
+    assert decoded["uid"] == "uid-1"
+
+    with pytest.raises(HTTPException) as excinfo:
+        service.verify_bearer_token(f"Bearer {_token(private_key, aud='other-project')}")
+    assert excinfo.value.status_code == 401
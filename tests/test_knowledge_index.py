@@ -0,0 +1,130 @@
+"""Knowledge-file passage index tests.
+
+Builds the FTS5 index from text files in a tmp dir with a counting extractor,
+and checks the full-text passage hits (beyond the old 8,000-char cutoff), that
+unchanged files are not re-extracted, that edits and deletes are picked up,
+that results rank per document, and that UnifiedAIService serves
+knowledge-file search from the index once a full sync has finished.
+"""
+import os
+
+import pytest
+
+from backend.modules.ai_unified import knowledge_index as ki
+from backend.modules.ai_unified.knowledge_index import KnowledgeIndex, split_passages
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "knowledge_files"
+    docs.mkdir()
+    filler = "General orientation text about county programs. " * 400  # ~20k chars
+    (docs / "provider_directory.txt").write_text(
+        filler + " Dental clinic at Harbor UCLA accepts Medi-Cal patients on weekdays."
+    )
+    (docs / "shelter_list.txt").write_text("Winter shelter beds open nightly at the armory in Pasadena.")
+    (docs / "food_guide.md").write_text("Food pantry and grocery programs by service planning area.")
+    return docs
+
+
+def _entries(directory):
+    return [
+        {"path": path, "title": path.stem.replace("_", " "), "tags": [], "category": "", "sources": []}
+        for path in sorted(directory.iterdir())
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return KnowledgeIndex(tmp_path / "db" / "knowledge_index.db")
+
+
+def _extractor(calls):
+    def extract(path):
+        calls.append(path.name)
+        return path.read_text()
+    return extract
+
+
+def test_passages_overlap_and_cover_all_text():
+    text = " ".join(f"word{i}" for i in range(600))
+    passages = split_passages(text, size=200, overlap=50)
+
+    assert len(passages) > 1
+    assert passages[0].split()[0] == "word0"
+    assert passages[-1].split()[-1] == "word599"
+    assert passages[1].split()[0] in passages[0]  # windows overlap
+
+
+def test_full_text_is_searchable_past_the_old_truncation(index, corpus):
+    index.sync(_entries(corpus), _extractor([]))
+
+    hits = index.search(["dental", "medi-cal"], limit=3)
+
+    assert hits[0]["title"] == "provider directory"
+    assert "Harbor UCLA" in hits[0]["passage"]
+    assert index.ready()
+
+
+def test_unchanged_files_are_not_reextracted(index, corpus):
+    calls = []
+    index.sync(_entries(corpus), _extractor(calls))
+    stats = index.sync(_entries(corpus), _extractor(calls))
+
+    assert len(calls) == 3
+    assert stats == {"indexed": 0, "unchanged": 3, "removed": 0, "failed": 0}
+
+
+def test_changed_and_deleted_files_are_resynced(index, corpus):
+    calls = []
+    index.sync(_entries(corpus), _extractor(calls))
+
+    shelter = corpus / "shelter_list.txt"
+    shelter.write_text("Cooling center hours extended during heat waves.")
+    os.utime(shelter, (1, 1))
+    (corpus / "food_guide.md").unlink()
+    stats = index.sync(_entries(corpus), _extractor(calls))
+
+    assert stats["indexed"] == 1
+    assert stats["removed"] == 1
+    assert index.search(["winter"]) == []
+    assert index.search(["cooling"])[0]["title"] == "shelter list"
+    assert index.search(["pantry"]) == []
+
+
+def test_one_result_per_document(index, corpus):
+    (corpus / "shelter_list.txt").write_text("Shelter intake. " * 500)
+    index.sync(_entries(corpus), _extractor([]))
+
+    hits = index.search(["shelter"], limit=5)
+
+    assert [hit["title"] for hit in hits].count("shelter list") == 1
+
+
+def test_service_uses_index_once_built(tmp_path, corpus, monkeypatch):
+    from backend.modules.ai_unified.unified_service import UnifiedAIService
+    from backend.shared import db_path as db_path_mod
+
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path / "db")
+    monkeypatch.delenv("CMSX_KNOWLEDGE_INDEX", raising=False)
+    monkeypatch.setattr(ki, "_indexes", {})
+    svc = UnifiedAIService.__new__(UnifiedAIService)
+    svc.project_root = tmp_path
+    svc._knowledge_index_cache = None
+    svc._knowledge_snippet_cache = {}
+
+    stats = svc.build_knowledge_index()
+    assert stats["indexed"] == 3
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("indexed search should not extract files at request time")
+
+    monkeypatch.setattr(svc, "_extract_knowledge_text", fail)
+    monkeypatch.setattr(ki, "RESCAN_SECONDS", 10**9)
+    ki.get_knowledge_index()._last_scan = float("inf")
+
+    results = svc._search_local_knowledge_files("dental clinic", "Harbor")
+
+    assert results[0]["path"] == os.path.join("knowledge_files", "provider_directory.txt")
+    assert "Dental clinic" in results[0]["snippet"]
+    assert results[0]["source"] == "knowledge_files"
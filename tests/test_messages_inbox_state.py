@@ -0,0 +1,113 @@
+"""Messaging inbox state tests.
+
+Unread counters and the last-message pointer are maintained on send and
+mark-read, legacy databases are backfilled from the old recount rule, and
+inbox listing / badge polling run a fixed number of queries however many
+threads a user has.
+"""
+import sqlite3
+
+import pytest
+
+from backend.modules.messages.database import MessagesDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MessagesDatabase(tmp_path / "messages.db")
+
+
+def _thread(db, created_by="cm-1", participants=("cm-1", "cm-2"), thread_type="direct_message", body=None):
+    thread = db.create_thread(
+        thread_type=thread_type,
+        title="Check in",
+        created_by=created_by,
+        participants=[{"user_id": user_id} for user_id in participants],
+        initial_message={"body": body, "sender_name": created_by} if body else None,
+    )
+    return thread["id"]
+
+
+def _unread(db, user_id):
+    return {thread["id"]: thread["unread_count"] for thread in db.list_threads(user_id)}
+
+
+def _statements(db, action):
+    executed = []
+    original = db.connect
+
+    def traced():
+        conn = original()
+        conn.set_trace_callback(executed.append)
+        return conn
+
+    db.connect = traced
+    try:
+        action()
+    finally:
+        db.connect = original
+        with original() as conn:
+            conn.set_trace_callback(None)
+    return [sql for sql in executed if not sql.startswith(("BEGIN", "COMMIT"))]
+
+
+def test_counters_follow_sends_and_reads(db):
+    direct = _thread(db, body="Can you review this?")
+    announcement = _thread(db, participants=("cm-1",), thread_type="announcement", body="Staff meeting moved")
+
+    assert _unread(db, "cm-2") == {direct: 1, announcement: 1}
+    db.add_message(direct, "cm-1", "CM 1", "Adding the follow-up note.")
+    db.add_message(announcement, "cm-1", "CM 1", "Now in room 4")
+    assert _unread(db, "cm-2") == {direct: 2, announcement: 2}
+    assert db.unread_count("cm-2") == 4
+
+    db.mark_read(announcement, "cm-2", "CM 2")
+    db.add_message(direct, "cm-2", "CM 2", "Reviewed.")
+    assert _unread(db, "cm-2") == {direct: 0, announcement: 0}
+    assert _unread(db, "cm-1") == {direct: 1, announcement: 0}
+    db.add_message(announcement, "cm-1", "CM 1", "Bring the intake packet")
+    assert (db.unread_count("cm-2"), db.unread_count("cm-3")) == (1, 3)
+    assert db.unread_count("cm-3", include_announcements=False) == 0
+
+    thread = db.get_thread_for_user(direct, "cm-1")
+    assert thread["last_message"]["body"] == "Reviewed."
+    assert thread["last_message"]["sender_name"] == "CM 2"
+    assert [p["user_id"] for p in thread["participants"]] == ["cm-1", "cm-2"]
+    assert "last_message_id" not in thread
+    assert db.get_thread_for_user(direct, "cm-3") is None
+
+
+def test_legacy_databases_are_backfilled_with_the_recount_rule(tmp_path):
+    path = tmp_path / "messages.db"
+    legacy = MessagesDatabase(path)
+    thread_id = _thread(legacy, body="First")
+    legacy.add_message(thread_id, "cm-1", "CM 1", "Second")
+    legacy.mark_read(thread_id, "cm-2", "CM 2")
+    legacy.add_message(thread_id, "cm-1", "CM 1", "Third")
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE thread_read_state")
+        conn.execute("ALTER TABLE message_threads DROP COLUMN last_message_id")
+
+    migrated = MessagesDatabase(path)
+
+    assert _unread(migrated, "cm-2") == {thread_id: 1}
+    assert _unread(migrated, "cm-1") == {thread_id: 0}
+    assert migrated.get_thread_for_user(thread_id, "cm-2")["last_message"]["body"] == "Third"
+
+
+def test_inbox_listing_and_badge_are_constant_query(db):
+    def measure():
+        return (
+            len(_statements(db, lambda: db.list_threads("cm-2"))),
+            len(_statements(db, lambda: db.unread_count("cm-2"))),
+        )
+
+    for _ in range(3):
+        _thread(db, body="Hello")
+    small = measure()
+    for _ in range(40):
+        thread_id = _thread(db, body="Hello")
+        db.add_message(thread_id, "cm-1", "CM 1", "Following up")
+
+    assert measure() == small == (2, 1)
+    assert db.unread_count("cm-2") == 3 + 40 * 2
@@ -0,0 +1,282 @@
+"""Search provider engine tests.
+
+Uses local fake providers (coroutines with fixed delays/results) and an httpx
+mock transport to cover circuit breaker open / half-open / close transitions,
+quota budgets, hedge delays from whole-attempt p95 latency, cancelled attempts
+stopping their thread work, hedged / raced / sequential execution,
+and the coordinator's jobs search hedging past a slow primary provider.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.search import coordinator as coordinator_mod
+from backend.search.http_pool import SearchHTTPPool
+from backend.search.provider_engine import (
+    ProviderAttempt,
+    ProviderExecutionEngine,
+    ProviderUnavailable,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_provider(result, delay=0.0, calls=None, error=None):
+    async def call():
+        if calls is not None:
+            calls.append(result)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return result
+    return call
+
+
+@pytest.fixture
+def fast_hedging(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_HEDGE_DELAY_MS", "50")
+    monkeypatch.setenv("CMSX_SEARCH_HEDGE_MIN_MS", "10")
+
+
+def test_breaker_opens_probes_and_closes(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_BREAKER_FAILURES", "3")
+    monkeypatch.setenv("CMSX_SEARCH_BREAKER_RESET_S", "30")
+    clock = FakeClock()
+    engine = ProviderExecutionEngine(clock=clock)
+
+    for _ in range(3):
+        engine.admit("serpapi")
+        engine.record("serpapi", 100, ok=False)
+    with pytest.raises(ProviderUnavailable):
+        engine.admit("serpapi")
+    assert engine.available("serpapi") == "serpapi circuit open"
+
+    clock.now += 31
+    engine.admit("serpapi")  # half-open probe
+    with pytest.raises(ProviderUnavailable):
+        engine.admit("serpapi")  # only one probe at a time
+    engine.record("serpapi", 100, ok=False)
+    assert engine.metrics()["providers"]["serpapi"]["state"] == "open"
+
+    clock.now += 31
+    engine.admit("serpapi")
+    engine.record("serpapi", 100, ok=True)
+    stats = engine.metrics()["providers"]["serpapi"]
+    assert (stats["state"], stats["times_opened"], stats["rejected"]) == ("closed", 2, 2)
+
+
+def test_quota_budget_window(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_QUOTA_OPENAI", "2")
+    monkeypatch.setenv("CMSX_SEARCH_QUOTA_OPENAI_WINDOW_S", "60")
+    clock = FakeClock()
+    engine = ProviderExecutionEngine(clock=clock)
+
+    engine.admit("openai")
+    engine.admit("openai")
+    with pytest.raises(ProviderUnavailable, match="quota"):
+        engine.admit("openai")
+
+    clock.now += 61
+    engine.admit("openai")
+    assert engine.metrics()["providers"]["openai"]["quota_remaining"] == 1
+
+
+def test_hedge_delay_follows_whole_attempt_p95(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_HEDGE_DELAY_MS", "1500")
+    engine = ProviderExecutionEngine()
+    assert engine.hedge_delay("serpapi_jobs") == 1.5
+
+    # Fast single calls do not shorten the hedge for an attempt that chains them.
+    for latency in range(1, 101):
+        engine.record("serpapi", latency, ok=True)
+        engine.record_attempt("serpapi_jobs", latency * 10, ok=True)
+
+    assert engine.hedge_delay("serpapi_jobs") == pytest.approx(0.95)
+
+
+def test_run_times_whole_attempts_and_stops_cancelled_thread_work(fast_hedging):
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        time.sleep(0.05)
+        return httpx.Response(200, json={})
+
+    engine = ProviderExecutionEngine()
+    pool = SearchHTTPPool(transport=httpx.MockTransport(handler), engine=engine)
+
+    def chained_calls():
+        for _ in range(6):
+            try:
+                pool.get("serpapi", "https://serpapi.test/search")
+            except ProviderUnavailable:
+                break
+        return ["serp"]
+
+    async def slow_chain():
+        return await asyncio.to_thread(chained_calls)
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("serpapi", slow_chain, name="serpapi_jobs"),
+        ProviderAttempt("google_cse", fake_provider(["cse"], delay=0.01), name="google_cse_jobs"),
+    ]))
+    time.sleep(0.3)
+
+    assert (outcome.provider, outcome.hedged) == ("google_cse", True)
+    # The losing chain stops at its next call instead of running to the end.
+    assert len(hits) < 6
+    attempts = engine.metrics()["attempts"]
+    assert set(attempts) == {"google_cse_jobs"}
+    assert attempts["google_cse_jobs"]["samples"] == 1
+
+    asyncio.run(engine.run([ProviderAttempt("serpapi", slow_chain, name="serpapi_jobs")]))
+    assert engine.metrics()["attempts"]["serpapi_jobs"]["p50_ms"] >= 6 * 50
+
+
+def test_fast_primary_never_launches_secondary(fast_hedging):
+    engine = ProviderExecutionEngine()
+    calls = []
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider(["a"], calls=calls)),
+        ProviderAttempt("secondary", fake_provider(["b"], calls=calls)),
+    ]))
+
+    assert (outcome.provider, outcome.result, outcome.hedged) == ("primary", ["a"], False)
+    assert calls == [["a"]]
+
+
+def test_slow_primary_is_hedged(fast_hedging):
+    engine = ProviderExecutionEngine()
+
+    started = time.perf_counter()
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider(["slow"], delay=1.0)),
+        ProviderAttempt("secondary", fake_provider(["fast"], delay=0.01)),
+    ]))
+
+    assert time.perf_counter() - started < 0.5
+    assert (outcome.provider, outcome.result, outcome.hedged) == ("secondary", ["fast"], True)
+    assert engine.metrics()["hedges"] == 1
+
+
+def test_empty_or_failed_primary_moves_on_immediately(fast_hedging):
+    engine = ProviderExecutionEngine()
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider(None, error=RuntimeError("boom"))),
+        ProviderAttempt("secondary", fake_provider([], delay=0.01)),
+        ProviderAttempt("tertiary", fake_provider(["c"])),
+    ]))
+
+    assert (outcome.provider, outcome.result) == ("tertiary", ["c"])
+    assert outcome.errors == {"primary": "boom"}
+    assert outcome.launched == ["primary", "secondary", "tertiary"]
+
+
+def test_no_sufficient_result_returns_best_fallback():
+    engine = ProviderExecutionEngine()
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider([])),
+        ProviderAttempt("secondary", fake_provider([])),
+    ], mode="sequential"))
+
+    assert (outcome.provider, outcome.result, outcome.sufficient) == ("primary", [], False)
+    assert engine.metrics()["exhausted"] == 1
+
+
+def test_race_starts_everything_and_takes_first_sufficient():
+    engine = ProviderExecutionEngine()
+    calls = []
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider(["a"], delay=0.2, calls=calls)),
+        ProviderAttempt("secondary", fake_provider(["b"], delay=0.01, calls=calls)),
+    ], mode="race"))
+
+    assert outcome.provider == "secondary"
+    assert len(calls) == 2
+
+
+def test_open_circuit_is_skipped(monkeypatch, fast_hedging):
+    monkeypatch.setenv("CMSX_SEARCH_BREAKER_FAILURES", "1")
+    engine = ProviderExecutionEngine()
+    engine.record("primary", 10, ok=False)
+    calls = []
+
+    outcome = asyncio.run(engine.run([
+        ProviderAttempt("primary", fake_provider(["a"], calls=calls)),
+        ProviderAttempt("secondary", fake_provider(["b"], calls=calls)),
+    ]))
+
+    assert outcome.provider == "secondary"
+    assert outcome.skipped == {"primary": "primary circuit open"}
+    assert calls == [["b"]]
+
+
+def test_engine_call_records_outcomes():
+    engine = ProviderExecutionEngine()
+
+    async def run():
+        await engine.call("places", fake_provider({"ok": True}))
+        await engine.call("places", fake_provider({"error": "x"}), failed=lambda r: "error" in r)
+        with pytest.raises(RuntimeError):
+            await engine.call("places", fake_provider(None, error=RuntimeError("down")))
+
+    asyncio.run(run())
+
+    stats = engine.metrics()["providers"]["places"]
+    assert stats["calls"] == 3
+    assert stats["error_rate"] == 0.6667
+
+
+def test_pool_trips_breaker_on_server_errors(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_BREAKER_FAILURES", "2")
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        return httpx.Response(503)
+
+    engine = ProviderExecutionEngine()
+    pool = SearchHTTPPool(transport=httpx.MockTransport(handler), engine=engine)
+
+    for _ in range(2):
+        assert pool.get("serpapi", "https://serpapi.test/search").status_code == 503
+    with pytest.raises(ProviderUnavailable):
+        pool.get("serpapi", "https://serpapi.test/search")
+
+    assert len(hits) == 2
+
+
+def test_jobs_search_hedges_past_slow_serpapi(monkeypatch, fast_hedging):
+    coordinator = coordinator_mod.SimpleSearchCoordinator.__new__(coordinator_mod.SimpleSearchCoordinator)
+    coordinator.provider_engine = ProviderExecutionEngine()
+    coordinator.serper_api_key = "serp"
+    coordinator.google_api_key = "google"
+    coordinator.google_jobs_cse_id = "jobs-cse"
+
+    async def slow_serpapi(query, location, page, per_page):
+        await asyncio.sleep(3)
+        return {"results": [{"title": "serp"}], "source": "serpapi_jobs"}
+
+    async def fast_cse(query, location, page, per_page, cse_id):
+        return {"success": True, "results": [{"title": "cse"}], "source": "google_jobs_cse"}
+
+    monkeypatch.setattr(coordinator, "_serpapi_jobs_response", slow_serpapi, raising=False)
+    monkeypatch.setattr(coordinator, "_google_cse_jobs_response", fast_cse, raising=False)
+
+    started = time.perf_counter()
+    response = asyncio.run(coordinator.search_jobs("cook", "Los Angeles"))
+
+    assert time.perf_counter() - started < 1
+    assert response["source"] == "google_jobs_cse"
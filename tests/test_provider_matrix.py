@@ -0,0 +1,145 @@
+"""Vectorized resource scoring tests.
+
+Builds a seeded synthetic provider corpus (coordinates, neighborhood-only and
+location-less rows, trusted / aggregator names, mixed subtypes and insurance)
+and checks that the ProviderMatrix path of ResourceRetrievalEngine.search ranks
+and scores exactly like the per-provider scorers it replaces.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from backend.modules.resources.knowledge_loader import KnowledgeLoader, Provider
+from backend.modules.resources.location_intelligence import LA_NEIGHBORHOODS, LocationContext
+from backend.modules.resources.retrieval_engine import ResourceRetrievalEngine, ResourceQuery
+
+SUBTYPES = {
+    "treatment": ["detox", "residential", "sober_living", "outpatient", "mat"],
+    "housing": ["emergency_shelter", "bridge_housing", "transitional"],
+    "medical": ["urgent_care", "primary_care", "dental", "emergency_room"],
+    "food": ["emergency_food", "meal_program"],
+}
+NAMES = ["Muse Treatment", "CRI-Help", "Hope of the Valley", "Findhelp Directory", "Valley Clinic", "Harbor House"]
+SPECIALIZATIONS = ["dual_diagnosis", "lgbtq", "veterans", "women", "youth", "families"]
+INSURANCE = ["medi_cal", "medicare", "uninsured", "private", "all"]
+SERVICES = ["counseling", "case management", "meals", "showers", "MAT", "detox"]
+
+
+def synthetic_providers(count, seed=7):
+    rng = random.Random(seed)
+    neighborhoods = list(LA_NEIGHBORHOODS)
+    providers = []
+    for i in range(count):
+        service_type = rng.choice(list(SUBTYPES))
+        neighborhood = rng.choice(neighborhoods + [None, "Unknown Hills"])
+        located = rng.random() < 0.5
+        base = LA_NEIGHBORHOODS.get(neighborhood or "", (34.05, -118.25))
+        providers.append(Provider(
+            name=f"{rng.choice(NAMES)} {i}",
+            service_type=service_type,
+            service_subtypes=rng.sample(SUBTYPES[service_type], rng.randint(0, 2)),
+            website=rng.choice([None, "https://findhelp.org/x", "https://example.org"]),
+            neighborhood=neighborhood.title() if neighborhood else None,
+            city=rng.choice([None, "Los Angeles", "Burbank", "Glendale"]),
+            latitude=base[0] + rng.uniform(-0.2, 0.2) if located else None,
+            longitude=base[1] + rng.uniform(-0.2, 0.2) if located else None,
+            services_offered=rng.sample(SERVICES, rng.randint(0, 3)),
+            specializations=rng.sample(SPECIALIZATIONS, rng.randint(0, 2)),
+            insurance_accepted=rng.sample(INSURANCE, rng.randint(0, 2)),
+            income_requirement=rng.choice([None, "free", "sliding_scale", "market"]),
+            internal_rating=rng.choice([0.0, 0.0, 0.6, 0.9]),
+            is_verified=rng.random() < 0.3,
+        ))
+    return providers
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_RESOURCE_VECTOR_SCORING", raising=False)
+    loader = KnowledgeLoader(tmp_path)
+    loader.providers = synthetic_providers(600)
+    loader._build_index()
+    engine = ResourceRetrievalEngine()
+    engine.knowledge_loader = loader
+    return engine
+
+
+QUERIES = [
+    "need detox tonight in van nuys, medi-cal",
+    "residential treatment for veterans with dual diagnosis",
+    "sober living for women in north hollywood",
+    "emergency shelter near downtown, homeless tonight",
+    "bridge housing in glendale for families",
+    "urgent care today in burbank medicare",
+    "primary care doctor in pasadena, uninsured",
+    "food pantry with meals near hollywood",
+    "counseling and case management services",
+    "mat suboxone clinic in 91405",
+]
+
+
+def _ranked(results):
+    return [(sp.provider.name, sp.total_score, sp.location_score, sp.service_score,
+             sp.quality_score, sp.eligibility_score) for sp in results]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_vectorized_ranking_matches_scalar_scorers(engine, monkeypatch, query):
+    vectorized = _ranked(engine.search(query, limit=15))
+    monkeypatch.setenv("CMSX_RESOURCE_VECTOR_SCORING", "0")
+    scalar = _ranked(engine.search(query, limit=15))
+
+    assert [row[0] for row in vectorized] == [row[0] for row in scalar]
+    assert np.allclose([row[1:] for row in vectorized], [row[1:] for row in scalar], atol=1e-12)
+
+
+def test_component_scores_match_for_every_provider(engine):
+    matrix = engine.get_provider_matrix()
+    query = ResourceQuery(
+        query_text="detox for women veterans",
+        service_type="treatment",
+        service_subtypes=["detox"],
+        location_context=LocationContext(neighborhood="Sherman Oaks", latitude=34.1508, longitude=-118.4490),
+        insurance="medi_cal",
+    )
+    scores = matrix.score(query)
+    scalar = engine._score_providers(matrix.providers, query)
+
+    assert np.allclose(scores["total"], [sp.total_score for sp in scalar], atol=1e-12)
+    assert np.allclose(scores["location"], [sp.location_score for sp in scalar], atol=1e-12)
+    assert np.allclose(scores["quality"], [sp.quality_score for sp in scalar])
+
+
+def test_matrix_recompiles_when_trust_lists_change(engine):
+    first = engine.get_provider_matrix()
+    assert engine.get_provider_matrix() is first
+
+    engine.quality_scorer.add_avoid_provider("Harbor House", -0.5)
+    try:
+        rebuilt = engine.get_provider_matrix()
+        assert rebuilt is not first
+        harbor = [i for i, p in enumerate(rebuilt.providers) if p.name.startswith("Harbor House")]
+        assert rebuilt.quality[harbor].sum() < first.quality[harbor].sum()
+    finally:
+        engine.quality_scorer.avoid_providers.pop("harbor_house", None)
+        engine.quality_scorer.revision += 1
+
+
+def test_aggregators_only_used_as_fallback(engine):
+    matrix = engine.get_provider_matrix()
+
+    candidates = matrix.candidate_indices("treatment")
+    assert not matrix.is_aggregator[candidates].any()
+    assert len(matrix.candidate_indices("legal")) == 0
+
+
+def test_ties_keep_corpus_order(engine):
+    matrix = engine.get_provider_matrix()
+    candidates = np.arange(matrix.size)
+    flat = {"total": np.full(matrix.size, 0.5)}
+
+    rows, count = matrix.top_k(candidates, flat, 5, 0.2)
+
+    assert rows.tolist() == [0, 1, 2, 3, 4]
+    assert count == matrix.size
@@ -0,0 +1,288 @@
+"""Push event channel tests.
+
+Events published for a user reach each of that user's open streams (and org
+broadcasts reach everyone in the org). A reconnect replays what was missed
+after ``Last-Event-ID`` or asks for a resync, slow consumers are capped
+instead of buffering forever, the SQLite outbox carries events between
+workers, and messages / due reminders are pushed instead of polled.
+"""
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.modules.messages.routes as messages_routes
+import backend.shared.event_broker as broker_mod
+from backend.api import push_events
+from backend.modules.messages.database import MessagesDatabase
+from backend.modules.messages.routes import get_messages_db
+from backend.modules.reminders import push as reminder_push
+from backend.shared import db_path as db_path_mod
+from backend.shared.event_broker import BROADCAST, EventBroker
+from tests.auth_helpers import make_test_user
+
+
+@pytest.fixture(autouse=True)
+def push_env(monkeypatch):
+    for name in ("CMSX_PUSH", "CMSX_PUSH_OUTBOX", "MULTI_TENANT_ENABLED"):
+        monkeypatch.delenv(name, raising=False)
+
+
+async def _drain(subscription, timeout=0.05):
+    events = []
+    while (event := await subscription.next(timeout)) is not None:
+        events.append((event.event, event.data))
+    return events
+
+
+def test_events_reach_every_open_stream_of_the_user_and_org_broadcasts():
+    broker = EventBroker()
+
+    async def scenario():
+        tab_one, tab_two = broker.subscribe("cm-1"), broker.subscribe("cm-1")
+        other = broker.subscribe("cm-2")
+        broker.publish("cm-1", "unread_count", {"unread_count": 3})
+        broker.publish(BROADCAST, "message", {"title": "Staff meeting"})
+        second_tab = await _drain(tab_two)
+        tab_two.close()
+        broker.publish("cm-1", "unread_count", {"unread_count": 4})
+        return await _drain(tab_one), second_tab + await _drain(tab_two), await _drain(other)
+
+    one, two, other = asyncio.run(scenario())
+
+    assert one == [
+        ("unread_count", {"unread_count": 3}),
+        ("message", {"title": "Staff meeting"}),
+        ("unread_count", {"unread_count": 4}),
+    ]
+    assert two == one[:2]
+    assert other == [("message", {"title": "Staff meeting"})]
+    assert sorted(broker.connected_channels()) == [("org_default", "cm-1"), ("org_default", "cm-2")]
+    assert broker.metrics()["open_streams"] == 2
+
+
+def test_reconnects_replay_missed_events_or_ask_for_a_resync():
+    broker = EventBroker(replay_size=3)
+    ids = [broker.publish("cm-1", "message", {"n": n}) for n in range(5)]
+
+    async def reconnect(last_event_id):
+        return await _drain(broker.subscribe("cm-1", last_event_id=last_event_id))
+
+    assert asyncio.run(reconnect(ids[2])) == [("message", {"n": 3}), ("message", {"n": 4})]
+    assert asyncio.run(reconnect(ids[4])) == []
+    # ids[0] is older than the replay window; so is an id from before this worker started.
+    assert asyncio.run(reconnect(ids[0])) == [("resync", {"reason": "replay_unavailable"})]
+    assert asyncio.run(reconnect(ids[0] - 10_000)) == [("resync", {"reason": "replay_unavailable"})]
+    assert broker.metrics()["resyncs"] == 2
+
+
+def test_slow_consumers_are_capped_with_a_resync():
+    broker = EventBroker(queue_size=3)
+
+    async def scenario():
+        subscription = broker.subscribe("cm-1")
+        for n in range(5):
+            broker.publish("cm-1", "message", {"n": n})
+        await asyncio.sleep(0)
+        return subscription, await _drain(subscription)
+
+    subscription, events = asyncio.run(scenario())
+
+    assert events == [("resync", {"reason": "backpressure"}), ("message", {"n": 3}), ("message", {"n": 4})]
+    assert (broker.metrics()["overflows"], broker.metrics()["dropped"]) == (1, 3)
+
+
+def test_the_outbox_carries_events_between_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.setenv("CMSX_PUSH_OUTBOX", "1")
+    publisher, listener = EventBroker(), EventBroker()
+    listener.poll_outbox()
+
+    async def scenario():
+        subscription = listener.subscribe("cm-1")
+        first = publisher.publish("cm-1", "message", {"n": 1})
+        publisher.publish("cm-2", "message", {"n": 2})
+        assert listener.poll_outbox() == 2
+        assert publisher.poll_outbox() == 0 and publisher.poll_outbox() == 0
+        delivered = await _drain(subscription)
+        publisher.publish("cm-1", "message", {"n": 3})
+        replayed = await _drain(listener.subscribe("cm-1", last_event_id=first))
+        return delivered, replayed
+
+    delivered, replayed = asyncio.run(scenario())
+
+    assert delivered == [("message", {"n": 1})]
+    assert replayed == [("message", {"n": 3})]
+    assert listener.metrics()["outbox_received"] == 2
+
+
+def test_outbox_gaps_longer_than_the_replay_window_ask_for_a_resync(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.setenv("CMSX_PUSH_OUTBOX", "1")
+    broker = EventBroker(replay_size=3)
+    ids = [broker.publish("cm-1", "message", {"n": n}) for n in range(5)]
+    broker.publish("cm-2", "message", {"n": 99})
+
+    async def reconnect(last_event_id):
+        return await _drain(broker.subscribe("cm-1", last_event_id=last_event_id))
+
+    # Four missed events do not fit in a replay of three: no partial replay.
+    assert asyncio.run(reconnect(ids[0])) == [("resync", {"reason": "replay_unavailable"})]
+    assert asyncio.run(reconnect(ids[1])) == [("message", {"n": n}) for n in (2, 3, 4)]
+    assert broker.metrics()["resyncs"] == 1
+
+
+def test_push_can_be_switched_off(monkeypatch):
+    monkeypatch.setenv("CMSX_PUSH", "0")
+    broker = EventBroker()
+
+    async def scenario():
+        subscription = broker.subscribe("cm-1")
+        assert broker.publish("cm-1", "message", {"n": 1}) is None
+        return await _drain(subscription)
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_due_reminders_are_announced_once_per_connected_user(monkeypatch):
+    today = date.today()
+    reminders = {
+        "cm-1": [
+            {"reminder_id": "r-1", "client_id": "c-1", "due_date": (today - timedelta(days=1)).isoformat(),
+             "message": "Renew ID", "priority": "High", "reminder_type": "document"},
+            {"reminder_id": "r-2", "client_id": "c-1", "due_date": (today + timedelta(days=3)).isoformat()},
+        ],
+    }
+    loaded = []
+
+    def active_reminders(case_manager_id, org_id=None):
+        loaded.append(case_manager_id)
+        return reminders.get(case_manager_id, [])
+
+    monkeypatch.setattr(reminder_push.repository, "get_active_reminders_for_case_manager", active_reminders)
+    broker = EventBroker(sweep_seconds=0)
+    broker.register_sweep("reminders_due", reminder_push.ReminderDueNotifier().sweep)
+    broker.run_sweeps()
+
+    async def scenario():
+        subscription = broker.subscribe("cm-1")
+        broker.run_sweeps()
+        broker.run_sweeps()
+        return await _drain(subscription)
+
+    events = asyncio.run(scenario())
+
+    assert loaded == ["cm-1", "cm-1"]
+    assert [(name, data["reminder_id"], data["overdue"]) for name, data in events] == [("reminder_due", "r-1", True)]
+
+
+@pytest.fixture
+def push_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("CMSX_PUSH_HEARTBEAT_S", "0.05")
+    monkeypatch.setattr(messages_routes, "DB_DIR", tmp_path)
+    broker = EventBroker()
+    monkeypatch.setattr(broker_mod, "event_broker", broker)
+    monkeypatch.setattr(push_events, "event_broker", broker)
+    db = MessagesDatabase(tmp_path / "messages.db")
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def inject_auth(request, call_next):
+        case_manager_id = request.headers.get("X-Test-Case-Manager-Id", "cm-1")
+        request.state.auth_user = make_test_user(
+            firebase_uid=f"uid-{case_manager_id}", case_manager_id=case_manager_id, role="admin"
+        )
+        return await call_next(request)
+
+    app.include_router(messages_routes.router, prefix="/api/messages")
+    app.include_router(push_events.router)
+    app.dependency_overrides[get_messages_db] = lambda: db
+    return TestClient(app), broker
+
+
+async def _frames(app, headers, count):
+    """Read ``count`` SSE frames from the stream, then disconnect like a closing tab."""
+    frames, buffered, started, enough = [], "", {}, asyncio.Event()
+
+    async def receive():
+        if not started:
+            started["request"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await enough.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal buffered
+        if message["type"] == "http.response.start":
+            started["headers"] = dict(message["headers"])
+            return
+        buffered += message.get("body", b"").decode()
+        while "\n\n" in buffered:
+            frame, buffered = buffered.split("\n\n", 1)
+            frames.append(frame)
+        if len(frames) >= count:
+            enough.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/events/stream", "raw_path": b"/api/events/stream", "query_string": b"", "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    assert started["headers"][b"content-type"].startswith(b"text/event-stream")
+    return frames[:count]
+
+
+def test_stream_route_replays_sent_messages_and_heartbeats(push_app):
+    client, broker = push_app
+    thread = client.post("/api/messages/threads", json={
+        "thread_type": "direct_message", "title": "Check in",
+        "participants": [{"user_id": "cm-2"}], "initial_message": "Can you review this?",
+    }).json()["thread"]
+    client.post(f"/api/messages/threads/{thread['id']}/messages", json={"body": "Following up"})
+
+    frames = asyncio.run(_frames(client.app, {"X-Test-Case-Manager-Id": "cm-2", "Last-Event-ID": str(broker._first_id - 1)}, 4))
+
+    # cm-2 had no open stream while the messages were sent, so no unread
+    # counts were computed for them; the badge is fetched on page load.
+    assert frames[0] == "retry: 3000"
+    events = [dict(line.split(": ", 1) for line in frame.split("\n")) for frame in frames[1:3]]
+    assert [event["event"] for event in events] == ["message", "message"]
+    assert json.loads(events[1]["data"])["message"]["body"] == "Following up"
+    assert int(events[0]["id"]) < int(events[1]["id"])
+    assert frames[3] == ": heartbeat"
+    assert broker.metrics()["open_streams"] == 0
+
+
+def test_unread_counts_are_only_computed_for_connected_recipients(push_app, monkeypatch):
+    client, broker = push_app
+    db = client.app.dependency_overrides[get_messages_db]()
+    counted = []
+    unread_count = db.unread_count
+
+    def counting_unread_count(user_id, **kwargs):
+        counted.append(user_id)
+        return unread_count(user_id, **kwargs)
+
+    monkeypatch.setattr(db, "unread_count", counting_unread_count)
+    thread = client.post("/api/messages/threads", json={
+        "thread_type": "direct_message", "title": "Check in",
+        "participants": [{"user_id": "cm-2"}], "initial_message": "Can you review this?",
+    }).json()["thread"]
+    assert counted == []
+
+    async def scenario():
+        subscription = broker.subscribe("cm-2")
+        client.post(f"/api/messages/threads/{thread['id']}/messages", json={"body": "Following up"})
+        events = await _drain(subscription)
+        subscription.close()
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert counted == ["cm-2"]
+    assert [(name, data.get("unread_count")) for name, data in events] == [("message", None), ("unread_count", 2)]
@@ -0,0 +1,242 @@
+"""Search cache tests.
+
+Covers the two-tier ``SearchCache`` (byte-bounded LRU, SQLite tier surviving a
+new instance, per-vertical TTL with stale-while-revalidate, thread and asyncio
+request coalescing that survives a cancelled leader, uncacheable payloads), the
+coordinator's Google CSE page lookups going through it, and stale hits keeping
+their cache label while a refresh runs.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.search import coordinator as coordinator_mod
+from backend.search.search_cache import SearchCache, search_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_SEARCH_CACHE", raising=False)
+    return SearchCache(str(tmp_path / "search_cache.db"))
+
+
+def test_key_normalizes_strings():
+    assert search_cache_key("jobs", " Cook ", "Los Angeles") == search_cache_key("jobs", "cook", "los angeles")
+    assert search_cache_key("jobs", "cook") != search_cache_key("housing", "cook")
+
+
+def test_memory_tier_evicts_by_bytes(tmp_path):
+    cache = SearchCache(str(tmp_path / "c.db"), max_entries=100, max_bytes=250)
+    for i in range(5):
+        cache.store("general", f"k{i}", {"blob": "x" * 80})
+
+    metrics = cache.metrics()
+    assert metrics["bytes"] <= 250
+    assert metrics["evictions"] == 5 - metrics["entries"]
+    # Evicted entries are still served from disk.
+    value, state = cache.lookup("general", "k0")
+    assert value == {"blob": "x" * 80} and state == "fresh"
+    assert cache.metrics()["disk_hits"] == 1
+
+
+def test_disk_tier_survives_new_instance(cache):
+    cache.store("services", "key", [{"title": "Clinic"}])
+
+    reopened = SearchCache(str(cache.db_path))
+
+    assert reopened.lookup("services", "key") == ([{"title": "Clinic"}], "fresh")
+    assert reopened.disk_stats()["services"]["entries"] == 1
+
+
+def test_hits_are_copies(cache):
+    cache.store("general", "key", {"items": [1]})
+    value, _ = cache.lookup("general", "key")
+    value["items"].append(2)
+
+    assert cache.lookup("general", "key")[0] == {"items": [1]}
+
+
+def test_expired_entries_miss(cache, monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_CACHE_TTL_JOBS_S", "10")
+    cache.stale_seconds = 0
+    cache.store("jobs", "key", ["a"])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+
+    assert cache.lookup("jobs", "key") == (None, None)
+
+
+def test_stale_entry_served_then_refreshed(cache, monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_CACHE_TTL_HOUSING_S", "10")
+    cache.store("housing", "key", ["old"])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return ["new"]
+
+    assert cache.get_or_fetch("housing", "key", fetch) == ["old"]
+    assert refreshed.wait(2)
+    for _ in range(100):
+        if cache.lookup("housing", "key")[0] == ["new"]:
+            break
+        time.sleep(0.01)
+    assert cache.lookup("housing", "key") == (["new"], "fresh")
+    assert cache.metrics()["stale_hits"] >= 1
+
+
+def test_concurrent_threads_share_one_upstream_call(cache):
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"items": ["a"]}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("general", "key", fetch)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"items": ["a"]}] * 8
+    assert cache.metrics()["coalesced"] == 7
+
+
+def test_concurrent_coroutines_share_one_upstream_call(cache):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"items": ["a"]}
+
+    async def run():
+        return await asyncio.gather(*[cache.aget_or_fetch("google_cse", "key", fetch) for _ in range(5)])
+
+    assert asyncio.run(run()) == [{"items": ["a"]}] * 5
+    assert len(calls) == 1
+
+
+def test_cancelled_leader_does_not_cancel_followers(cache):
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return {"items": ["a"]}
+
+    async def run():
+        leader = asyncio.create_task(cache.aget_or_fetch("google_cse", "key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.aget_or_fetch("google_cse", "key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == {"items": ["a"]}
+    assert len(calls) == 1
+    assert cache.lookup("google_cse", "key") == ({"items": ["a"]}, "fresh")
+
+
+def test_uncacheable_results_are_not_stored(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"results": [], "error": "quota"}
+
+    for _ in range(2):
+        cache.get_or_fetch("serpapi", "key", fetch, cacheable=lambda payload: not payload.get("error"))
+
+    assert len(calls) == 2
+    assert cache.metrics()["uncacheable"] == 2
+
+
+def test_disabled_cache_always_fetches(cache, monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_CACHE", "0")
+    calls = []
+    for _ in range(2):
+        cache.get_or_fetch("general", "key", lambda: calls.append(1) or ["a"])
+
+    assert len(calls) == 2
+
+
+def test_coordinator_google_pages_are_cached(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_SEARCH_CACHE", raising=False)
+    coordinator = coordinator_mod.SimpleSearchCoordinator.__new__(coordinator_mod.SimpleSearchCoordinator)
+    coordinator.search_cache = SearchCache(str(tmp_path / "search_cache.db"))
+    calls = []
+
+    async def fake_fetch(query, cse_id, page=1, per_page=10):
+        calls.append(page)
+        if page == 3:
+            return {"items": [], "error": "rate limited"}
+        return {"items": [{"title": f"{query} {page}"}], "total_results": 1}
+
+    monkeypatch.setattr(coordinator, "_fetch_paginated_google_search", fake_fetch, raising=False)
+
+    async def run():
+        first = await coordinator._paginated_google_search("Shelter", "cse", page=1)
+        again = await coordinator._paginated_google_search("shelter", "cse", page=1)
+        await coordinator._paginated_google_search("shelter", "cse", page=3)
+        await coordinator._paginated_google_search("shelter", "cse", page=3)
+        return first, again
+
+    first, again = asyncio.run(run())
+
+    assert first == again == {"items": [{"title": "Shelter 1"}], "total_results": 1}
+    assert calls == [1, 3, 3]
+
+
+def test_stale_hit_stays_labelled_cached_while_it_refreshes(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_SEARCH_CACHE", raising=False)
+    monkeypatch.setenv("CMSX_SEARCH_CACHE_TTL_SERPAPI_JOBS_S", "10")
+    coordinator = coordinator_mod.SimpleSearchCoordinator.__new__(coordinator_mod.SimpleSearchCoordinator)
+    coordinator.serper_api_key = "key"
+    coordinator.search_cache = SearchCache(str(tmp_path / "search_cache.db"))
+    coordinator.search_cache.store(
+        "serpapi_jobs",
+        search_cache_key("serpapi_jobs", "cook", "LA"),
+        {"listings": [{"title": "Line cook"}], "more_available": True},
+    )
+    monkeypatch.setattr(
+        coordinator,
+        "_fetch_serpapi_job_listings",
+        lambda query, location, limit: {"listings": [{"title": "Prep cook"}], "more_available": True},
+        raising=False,
+    )
+    # Let the background refresh finish before the caller looks at its result.
+    monkeypatch.setattr(
+        coordinator.search_cache,
+        "_refresh_in_thread",
+        lambda vertical, key, fetch, cacheable: coordinator.search_cache.store(vertical, key, fetch()),
+    )
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+
+    page = coordinator._serpapi_jobs_search("cook", "LA", page=1, per_page=10)
+
+    assert page["results"] == [{"title": "Line cook"}]
+    assert page["from_cache"] is True
+    assert page["has_next_page"] is False
+    assert coordinator.search_cache.get_or_fetch_with_state(
+        "serpapi_jobs", search_cache_key("serpapi_jobs", "cook", "LA"), lambda: None
+    ) == ({"listings": [{"title": "Prep cook"}], "more_available": True}, "fresh")
@@ -0,0 +1,131 @@
+"""Search HTTP pool tests.
+
+Drives ``SearchHTTPPool`` through httpx mock transports to check per-provider
+concurrency limits, per-loop async clients and metrics, and checks that the
+coordinator's Google CSE multi-page fetch issues its page calls concurrently
+and still honours the permission-block handling.
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+
+from backend.search import coordinator as coordinator_mod
+from backend.search.http_pool import SearchHTTPPool
+
+
+def _async_pool(handler):
+    return SearchHTTPPool(async_transport=httpx.MockTransport(handler))
+
+
+def test_async_requests_respect_provider_concurrency(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_HTTP_CONCURRENCY_SERPAPI", "2")
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    pool = _async_pool(handler)
+
+    async def run():
+        return await asyncio.gather(*[pool.aget("serpapi", "https://serpapi.test/search") for _ in range(6)])
+
+    responses = asyncio.run(run())
+
+    assert [r.json() for r in responses] == [{"ok": True}] * 6
+    assert in_flight["max"] == 2
+    assert pool.metrics()["providers"]["serpapi"]["requests"] == 6
+
+
+def test_each_event_loop_gets_its_own_client():
+    async def handler(request):
+        return httpx.Response(200, json={"path": request.url.path})
+
+    pool = _async_pool(handler)
+
+    for _ in range(2):
+        response = asyncio.run(pool.aget("google_cse", "https://example.test/a"))
+        assert response.json() == {"path": "/a"}
+
+
+def test_sync_requests_share_client_and_limit(monkeypatch):
+    monkeypatch.setenv("CMSX_SEARCH_HTTP_CONCURRENCY_OPENAI", "1")
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def handler(request):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return httpx.Response(500 if request.url.path == "/fail" else 200)
+
+    pool = SearchHTTPPool(transport=httpx.MockTransport(handler))
+    threads = [threading.Thread(target=pool.post, args=("openai", "https://api.test/ok")) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.get("openai", "https://api.test/fail")
+
+    assert in_flight["max"] == 1
+    stats = pool.metrics()["providers"]["openai"]
+    assert (stats["requests"], stats["errors"], stats["concurrency"]) == (5, 1, 1)
+    assert stats["avg_ms"] >= 20
+
+
+def _coordinator(pool):
+    coordinator = coordinator_mod.SimpleSearchCoordinator.__new__(coordinator_mod.SimpleSearchCoordinator)
+    coordinator.http_pool = pool
+    coordinator.google_api_key = "key"
+    coordinator.google_cse_id = "cse"
+    coordinator.google_jobs_cse_id = None
+    coordinator.google_housing_cse_id = None
+    coordinator.blocked_google_cse_ids = {}
+    return coordinator
+
+
+def test_google_cse_pages_fetched_concurrently():
+    async def handler(request):
+        start = int(request.url.params["start"])
+        await asyncio.sleep(0.15)
+        return httpx.Response(200, json={
+            "items": [{"title": f"result {start + i}"} for i in range(10)],
+            "searchInformation": {"totalResults": "250"},
+        })
+
+    coordinator = _coordinator(_async_pool(handler))
+
+    started = time.perf_counter()
+    payload = asyncio.run(coordinator._fetch_paginated_google_search("shelter", "cse", page=2, per_page=25))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.4  # three 150 ms pages, fetched in parallel
+    assert payload["total_results"] == 250
+    assert [item["title"] for item in payload["items"]] == [f"result {n}" for n in range(26, 51)]
+
+
+def test_google_cse_short_page_stops_and_block_is_recorded():
+    async def short_handler(request):
+        start = int(request.url.params["start"])
+        count = 10 if start == 1 else 4
+        return httpx.Response(200, json={"items": [{"title": f"{start}-{i}"} for i in range(count)]})
+
+    coordinator = _coordinator(_async_pool(short_handler))
+    payload = asyncio.run(coordinator._fetch_paginated_google_search("shelter", "cse", page=1, per_page=30))
+    assert payload["actual_returned"] == 14
+
+    async def blocked_handler(request):
+        return httpx.Response(403, json={"error": {"status": "PERMISSION_DENIED", "message": "API blocked"}})
+
+    coordinator = _coordinator(_async_pool(blocked_handler))
+    payload = asyncio.run(coordinator._fetch_paginated_google_search("shelter", "cse"))
+    assert "blocked" in payload["error"]
+    assert coordinator._is_google_cse_blocked("cse")
@@ -0,0 +1,169 @@
+"""Sober living directory duplicate detection tests.
+
+Checks the indexed ``find_possible_duplicate`` and the per-run blocking index
+against the original full-scan rule (first listing in ``list_listings`` order
+sharing a phone, website or name+city), the lookup-key backfill for rows
+written before the columns existed, importer runs that match listings created
+earlier in the same file, and opt-in fuzzy name matching.
+"""
+import random
+import sqlite3
+import time
+
+import pytest
+
+from backend.modules.sober_living_directory.database import SoberLivingDirectoryDatabase
+from backend.modules.sober_living_directory.importer import SoberLivingDirectoryImporter
+from backend.modules.sober_living_directory.models import (
+    DiscoveryJobCreate,
+    SoberLivingDirectoryListingCreate,
+    SoberLivingDirectoryListingUpdate,
+    SoberLivingDirectorySourceCreate,
+)
+
+CITIES = ["Los Angeles", "Van Nuys", "Burbank", ""]
+STATUSES = ["approved", "pending_review", "use_caution", "archived"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SoberLivingDirectoryDatabase(db_path=str(tmp_path / "directory.db"))
+
+
+def _scan_duplicate(db, *, name, city, phone, website):
+    """The original O(N) rule find_possible_duplicate used to implement."""
+    normalized_name = db._normalize_lookup(name)
+    normalized_city = db._normalize_lookup(city)
+    normalized_phone = db._normalize_phone(phone)
+    normalized_website = db._normalize_website(website)
+    for candidate in db.list_listings():
+        if normalized_phone and normalized_phone == db._normalize_phone(candidate.get("phone")):
+            return candidate["listing_id"]
+        if normalized_website and normalized_website == db._normalize_website(candidate.get("website")):
+            return candidate["listing_id"]
+        if normalized_name == db._normalize_lookup(candidate.get("name")) and normalized_city \
+                and normalized_city == db._normalize_lookup(candidate.get("city")):
+            return candidate["listing_id"]
+    return None
+
+
+def _random_record(rng):
+    return {
+        "name": rng.choice(["Hope House", "hope house!", "Serenity Home", "Harbor Sober Living", "Oak Lodge"]),
+        "city": rng.choice(CITIES) or "Los Angeles",
+        "phone": rng.choice(["", "(818) 555-0101", "818-555-0102", "8185550103"]),
+        "website": rng.choice(["", "https://www.hope.example/", "http://hope.example", "serenity.example/la"]),
+    }
+
+
+def _seed_random_listings(db, rng, count):
+    for _ in range(count):
+        record = _random_record(rng)
+        db.create_listing(SoberLivingDirectoryListingCreate(status=rng.choice(STATUSES), **record))
+
+
+def _discovery_job(db):
+    source = db.create_source(SoberLivingDirectorySourceCreate(source_name="Test Source", source_type="manual"))
+    job = db.create_discovery_job(DiscoveryJobCreate(
+        source_id=source["source_id"], job_name="Test Job", job_type="manual_test", target_city="Los Angeles",
+    ))
+    return source["source_id"], job["job_id"]
+
+
+def test_indexed_lookup_matches_full_scan(db):
+    rng = random.Random(7)
+    _seed_random_listings(db, rng, 40)
+    index = db.build_duplicate_index()
+
+    for _ in range(200):
+        record = _random_record(rng)
+        record["city"] = rng.choice(CITIES)
+        expected = _scan_duplicate(db, **record)
+        via_sql = db.find_possible_duplicate(**record)
+        via_index = db.find_possible_duplicate(index=index, **record)
+        assert (via_sql or {}).get("listing_id") == expected
+        assert (via_index or {}).get("listing_id") == expected
+
+
+def test_lookup_keys_follow_updates_and_stay_internal(db):
+    listing = db.create_listing(SoberLivingDirectoryListingCreate(
+        name="Hope House", city="Van Nuys", phone="818-555-0101",
+    ))
+    assert "lookup_phone" not in listing
+
+    db.update_listing(listing["listing_id"], SoberLivingDirectoryListingUpdate(phone="(818) 555-0199"))
+
+    assert db.find_possible_duplicate(name="Other", city="", phone="8185550101", website=None) is None
+    match = db.find_possible_duplicate(name="Other", city="", phone="8185550199", website=None)
+    assert match["listing_id"] == listing["listing_id"]
+
+
+def test_existing_rows_are_backfilled(tmp_path):
+    path = str(tmp_path / "directory.db")
+    SoberLivingDirectoryDatabase(db_path=path)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO sober_living_directory_listings (listing_id, name, city, website, first_seen_at, last_seen_at,"
+            " created_at, updated_at) VALUES ('legacy', 'Legacy Home', 'Burbank', 'https://www.legacy.example/',"
+            " 'now', 'now', 'now', 'now')"
+        )
+
+    db = SoberLivingDirectoryDatabase(db_path=path)
+
+    match = db.find_possible_duplicate(name="x", city=None, phone=None, website="legacy.example")
+    assert match["listing_id"] == "legacy"
+    assert db.find_possible_duplicate(name="legacy home", city="BURBANK", phone=None, website=None)
+
+
+def test_importer_matches_rows_created_earlier_in_the_same_file(db):
+    content = (
+        "Name,Location,Phone,Website\n"
+        "Hope House,Los Angeles,818-555-0101,\n"
+        "Hope House LA,Los Angeles,(818) 555-0101,\n"
+        "Oak Lodge,Burbank,,https://oak.example\n"
+    ).encode()
+
+    stats = SoberLivingDirectoryImporter(db).import_file(
+        file_name="houses.csv", content=content, source_name="Spreadsheet",
+    )
+
+    assert (stats["listings_created"], stats["duplicates_detected"], stats["errors"]) == (2, 1, [])
+    candidate = db.get_duplicate_candidates()[0]
+    assert candidate["proposed_name"] == "Hope House LA"
+    assert candidate["existing_name"] == "Hope House"
+
+
+def test_fuzzy_name_matching_is_opt_in(db):
+    existing = db.create_listing(SoberLivingDirectoryListingCreate(name="Serenity Sober Living", city="Van Nuys"))
+    source_id, job_id = _discovery_job(db)
+    records = [{"name": "Serenity Sober Livings", "city": "Van Nuys"}]
+
+    exact_only = db.process_discovery_records(job_id=job_id, source_id=source_id, records=records)
+    assert exact_only["duplicates_detected"] == 0
+
+    fuzzy = db.process_discovery_records(job_id=job_id, source_id=source_id, records=records, fuzzy_names=True)
+    assert fuzzy["duplicates_detected"] == 1
+    candidate = db.get_duplicate_candidates()[0]
+    assert candidate["existing_listing_id"] == existing["listing_id"]
+    assert candidate["match_reasons_json"] == ["city_match", "similar_name"]
+    assert candidate["confidence_score"] == 35
+
+
+def test_discovery_run_scales_with_blocking_index(db):
+    rng = random.Random(3)
+    conn = db.connect()
+    conn.executemany(
+        "INSERT INTO sober_living_directory_listings (listing_id, name, city, phone, status, first_seen_at,"
+        " last_seen_at, created_at, updated_at) VALUES (?, ?, ?, ?, 'approved', 'now', 'now', 'now', 'now')",
+        [(f"bulk-{n}", f"House {n}", rng.choice(CITIES[:3]), f"555{n:07d}") for n in range(5000)],
+    )
+    db._backfill_lookup_columns(conn)
+    conn.commit()
+    source_id, job_id = _discovery_job(db)
+    records = [{"name": f"Found {n}", "city": "Burbank", "phone": f"555{n * 3:07d}"} for n in range(1000)]
+
+    started = time.perf_counter()
+    run = db.process_discovery_records(job_id=job_id, source_id=source_id, records=records)
+
+    assert run["duplicates_detected"] == 1000
+    assert time.perf_counter() - started < 15
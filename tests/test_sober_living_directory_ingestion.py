@@ -0,0 +1,146 @@
+"""Sober living directory bulk ingestion tests.
+
+Covers discovery runs and spreadsheet imports going through ``bulk_ingest``:
+bad records isolated by the chunk savepoints, per-stage timings on the run
+record, rollback of a failed run (also with other writers active on the shared
+connection), change-log rows for imported listings, and the vectorized
+duplicate scores matching ``score_duplicate_candidate``.
+"""
+import random
+import threading
+
+import pytest
+
+from backend.modules.sober_living_directory import database as database_mod
+from backend.modules.sober_living_directory.database import SoberLivingDirectoryDatabase
+from backend.modules.sober_living_directory.duplicate_index import lookup_keys
+from backend.modules.sober_living_directory.importer import SoberLivingDirectoryImporter
+from backend.modules.sober_living_directory.ingestion import score_duplicate_pairs
+from backend.modules.sober_living_directory.models import (
+    DiscoveryJobCreate,
+    SoberLivingDirectoryListingCreate,
+    SoberLivingDirectorySourceCreate,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SoberLivingDirectoryDatabase(db_path=str(tmp_path / "directory.db"))
+
+
+@pytest.fixture
+def job(db):
+    source = db.create_source(SoberLivingDirectorySourceCreate(source_name="Test Source", source_type="manual"))
+    created = db.create_discovery_job(DiscoveryJobCreate(
+        source_id=source["source_id"], job_name="Test Job", job_type="manual_test", target_city="Los Angeles",
+    ))
+    return {"job_id": created["job_id"], "source_id": source["source_id"]}
+
+
+def _count(db, table):
+    return db.connect().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_bad_record_does_not_abort_discovery_run(db, job, monkeypatch):
+    monkeypatch.setattr(database_mod, "INGEST_CHUNK_SIZE", 2)
+    db.create_listing(SoberLivingDirectoryListingCreate(name="Hope House", city="Van Nuys", phone="818-555-0101"))
+    records = [
+        {"name": "Harbor Home", "city": "Burbank"},
+        {"name": "Hope House Two", "city": "Van Nuys", "phone": "(818) 555-0101"},
+        {"name": {"not": "a string"}, "city": "Burbank"},
+        {"name": "Oak Lodge", "city": "Reseda"},
+    ]
+
+    run = db.process_discovery_records(records=records, **job)
+
+    assert run["status"] == "completed"
+    assert (run["records_found"], run["raw_records_created"], run["duplicates_detected"], run["errors_count"]) == (4, 3, 1, 1)
+    assert run["error_message"].startswith("record 3:")
+    assert set(run["stage_timings_json"]) == {"index", "match", "write", "score", "candidates"}
+    assert len(run["raw_records"]) == 3
+    candidate = db.get_duplicate_candidates()[0]
+    assert (candidate["confidence_score"], candidate["match_reasons_json"]) == (60, ["phone_match", "city_match"])
+
+
+def test_failed_run_rolls_back_staged_rows(db, job, monkeypatch):
+    db.create_listing(SoberLivingDirectoryListingCreate(name="Hope House", city="Van Nuys"))
+
+    def explode(*args, **kwargs):
+        raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(database_mod, "score_duplicate_pairs", explode)
+
+    with pytest.raises(RuntimeError):
+        db.process_discovery_records(records=[{"name": "Hope House", "city": "Van Nuys"}], **job)
+
+    assert _count(db, "sober_living_raw_listings") == 0
+    run = db.list_discovery_runs(job["job_id"])[0]
+    assert (run["status"], run["error_message"]) == ("failed", "scoring failed")
+    assert "write" in run["stage_timings_json"]
+
+
+def test_concurrent_writers_wait_for_an_open_ingest(db, job, monkeypatch):
+    db.create_listing(SoberLivingDirectoryListingCreate(name="Hope House", city="Van Nuys"))
+    staged, written = threading.Event(), threading.Event()
+
+    def explode(*args, **kwargs):
+        staged.set()
+        # A writer that did not wait for the ingest would commit its staged rows here.
+        written.wait(0.3)
+        raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(database_mod, "score_duplicate_pairs", explode)
+
+    def write_listing():
+        staged.wait()
+        db.create_listing(SoberLivingDirectoryListingCreate(name="Oak Lodge", city="Reseda"))
+        written.set()
+
+    writer = threading.Thread(target=write_listing)
+    writer.start()
+    with pytest.raises(RuntimeError):
+        db.process_discovery_records(records=[{"name": "Hope House", "city": "Van Nuys"}], **job)
+    writer.join()
+
+    assert written.is_set()
+    assert _count(db, "sober_living_raw_listings") == 0
+    assert _count(db, "sober_living_directory_listings") == 2
+
+
+def test_import_stages_listings_change_log_and_duplicates(db):
+    content = (
+        "Name,Location,Phone,Website\n"
+        "Hope House,Los Angeles,818-555-0101,\n"
+        "Oak Lodge,Burbank,,https://oak.example\n"
+        "Oak Lodge Annex,Burbank,,http://www.oak.example/\n"
+        "Missing City,,,\n"
+    ).encode()
+
+    stats = SoberLivingDirectoryImporter(db).import_file(
+        file_name="houses.csv", content=content, source_name="Spreadsheet",
+    )
+
+    assert (stats["raw_created"], stats["listings_created"], stats["duplicates_detected"]) == (3, 2, 1)
+    assert set(stats["stage_timings_ms"]) >= {"match", "write", "score"}
+    change_types = sorted(row[0] for row in db.connect().execute(
+        "SELECT change_type FROM sober_living_directory_change_log"
+    ))
+    assert change_types == ["imported_from_file"] * 2 + ["new_listing"] * 2
+    statuses = sorted(row[0] for row in db.connect().execute("SELECT review_status FROM sober_living_raw_listings"))
+    assert statuses == ["approved", "approved", "possible_duplicate"]
+    assert not db.connect().in_transaction
+
+
+def test_vectorized_scores_match_reference(db):
+    rng = random.Random(11)
+    names, cities = ["Hope House", "hope house", "Oak"], ["Van Nuys", "", "Burbank"]
+    phones, websites = ["", "818-555-0101", "8185550101"], ["", "oak.example", "https://oak.example/"]
+    incoming, existing, expected = [], [], []
+    for _ in range(200):
+        left = dict(name=rng.choice(names), city=rng.choice(cities), phone=rng.choice(phones), website=rng.choice(websites))
+        right = dict(name=rng.choice(names), city=rng.choice(cities), phone=rng.choice(phones), website=rng.choice(websites))
+        incoming.append(lookup_keys(**left))
+        existing.append(lookup_keys(**right))
+        expected.append(db.score_duplicate_candidate(existing_listing=right, **left))
+
+    assert score_duplicate_pairs(incoming, existing, [False] * 200) == [(score, reasons) for score, reasons in expected]
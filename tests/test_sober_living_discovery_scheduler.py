@@ -0,0 +1,217 @@
+"""Sober living discovery scheduler / fetcher tests.
+
+Serves the CCAPP fixture page from a local HTTP server to check conditional
+GETs (ETag, Last-Modified, identical bodies), per-host concurrency and
+politeness spacing, scheduler cycles running due jobs on the worker pool, and
+scheduled runs skipping pages that have not changed since the last fetch.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.modules.sober_living_directory.ccapp_connector_smoke import CCAPP_FIXTURE_HTML
+from backend.modules.sober_living_directory.database import SoberLivingDirectoryDatabase
+from backend.modules.sober_living_directory.discovery import SoberLivingDiscoveryService
+from backend.modules.sober_living_directory.fetcher import DirectoryFetcher
+from backend.modules.sober_living_directory.models import (
+    DiscoveryJobCreate,
+    DiscoveryJobUpdate,
+    SoberLivingDirectorySourceCreate,
+)
+from backend.modules.sober_living_directory.scheduler_worker import SoberLivingDiscoverySchedulerWorker
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class FixtureServer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.statuses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                host = self.headers["Host"].split(":")[0]
+                with server.lock:
+                    server.in_flight[host] = server.in_flight.get(host, 0) + 1
+                    server.max_in_flight[host] = max(server.max_in_flight.get(host, 0), server.in_flight[host])
+                try:
+                    time.sleep(server.delay)
+                    status, headers = 200, {}
+                    if self.path.startswith("/search"):
+                        headers["ETag"] = '"v1"'
+                        if self.headers.get("If-None-Match") == '"v1"':
+                            status = 304
+                    elif self.path == "/dated":
+                        headers["Last-Modified"] = LAST_MODIFIED
+                        if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                            status = 304
+                    body = b"" if status == 304 else CCAPP_FIXTURE_HTML.encode()
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    with server.lock:
+                        server.statuses.append(status)
+                finally:
+                    with server.lock:
+                        server.in_flight[host] -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path, host="127.0.0.1"):
+        return f"http://{host}:{self.port}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    fixture = FixtureServer()
+    yield fixture
+    fixture.close()
+
+
+@pytest.fixture(autouse=True)
+def no_politeness_delay(monkeypatch):
+    monkeypatch.setenv("SOBER_LIVING_DIRECTORY_FETCH_MIN_INTERVAL_MS", "0")
+
+
+def _fetcher(tmp_path):
+    return DirectoryFetcher(tmp_path / "cache.db", user_agent="test", timeout_seconds=5, max_response_bytes=1_000_000)
+
+
+def test_conditional_gets_report_unchanged_pages(tmp_path, server):
+    fetcher = _fetcher(tmp_path)
+
+    first = fetcher.fetch(server.url("/search/"))
+    second = fetcher.fetch(server.url("/search/"))
+    fetcher.fetch(server.url("/dated"))
+    dated = fetcher.fetch(server.url("/dated"))
+    fetcher.fetch(server.url("/plain"))
+    plain = fetcher.fetch(server.url("/plain"))
+
+    assert (first.status_code, first.not_modified) == (200, False)
+    assert (second.status_code, second.not_modified, second.text) == (304, True, first.text)
+    assert (dated.status_code, dated.not_modified) == (304, True)
+    assert (plain.status_code, plain.not_modified) == (200, True)
+    assert fetcher.metrics()["not_modified"] == 3
+
+
+def test_per_host_concurrency_and_politeness(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOBER_LIVING_DIRECTORY_FETCH_PER_HOST", "2")
+    server = FixtureServer(delay=0.1)
+    try:
+        fetcher = _fetcher(tmp_path)
+        threads = [
+            threading.Thread(target=fetcher.fetch, args=(server.url(f"/plain?{n}"),)) for n in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.max_in_flight["127.0.0.1"] == 2
+
+        monkeypatch.setenv("SOBER_LIVING_DIRECTORY_FETCH_MIN_INTERVAL_MS", "150")
+        polite = _fetcher(tmp_path)
+        started = time.perf_counter()
+        for n in range(3):
+            polite.fetch(server.url(f"/plain?polite-{n}"))
+        assert time.perf_counter() - started >= 0.3
+        assert polite.metrics()["politeness_wait_ms"] > 0
+    finally:
+        server.close()
+
+
+def _scheduled_ccapp_jobs(db, service, urls):
+    job_ids = []
+    for n, url in enumerate(urls):
+        source = db.create_source(SoberLivingDirectorySourceCreate(
+            source_name=f"CCAPP {n}", source_type="certification_directory", base_url=url, trust_level="high",
+        ))
+        job = db.create_discovery_job(DiscoveryJobCreate(
+            source_id=source["source_id"], job_name=f"CCAPP job {n}", job_type="scheduled_source_check",
+            target_city="Sacramento", target_state="CA", schedule_enabled=True, schedule_frequency="daily",
+            max_runs_per_day=5,
+        ))
+        job_ids.append(job["job_id"])
+    return job_ids
+
+
+def _make_due(db, job_ids):
+    for job_id in job_ids:
+        db.update_discovery_job(job_id, DiscoveryJobUpdate(next_scheduled_run_at="2000-01-01T00:00:00"))
+
+
+def test_scheduler_runs_due_jobs_concurrently_and_skips_unchanged_pages(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOBER_LIVING_DIRECTORY_FETCH_PER_HOST", "1")
+    monkeypatch.setenv("SOBER_LIVING_DIRECTORY_SCHEDULER_WORKERS", "4")
+    server = FixtureServer(delay=0.3)
+    try:
+        db = SoberLivingDirectoryDatabase(db_path=str(tmp_path / "directory.db"))
+        service = SoberLivingDiscoveryService(db)
+        service.SUPPORTED_CCAPP_HOSTS = {f"127.0.0.1:{server.port}", f"localhost:{server.port}"}
+        worker = SoberLivingDiscoverySchedulerWorker(db, service)
+        worker.max_jobs_per_cycle = 4
+        urls = [server.url(f"/search/?page={n}", host=host) for n, host in enumerate(["127.0.0.1", "localhost"] * 2)]
+        job_ids = _scheduled_ccapp_jobs(db, service, urls)
+        _make_due(db, job_ids)
+
+        started = time.perf_counter()
+        first = worker.run_once(trigger="test")["last_cycle_summary"]
+        elapsed = time.perf_counter() - started
+
+        assert first["executed_jobs"] == 4
+        assert elapsed < 1.0  # four 300 ms fetches, two hosts in parallel, one request per host at a time
+        assert server.max_in_flight == {"127.0.0.1": 1, "localhost": 1}
+        metrics = first["metrics"]
+        assert metrics["records"] == 4
+        assert all(run["fetch_ms"] >= 250 and run["records"] == 1 for run in metrics["runs"])
+        assert set(first["runs"][0]["stage_timings_json"]) >= {"fetch", "parse", "write"}
+
+        _make_due(db, job_ids)
+        second = worker.run_once(trigger="test")["last_cycle_summary"]
+
+        assert second["executed_jobs"] == 4
+        assert second["metrics"]["unchanged_sources"] == 4
+        assert all(run["records_found"] == 0 and "parsing skipped" in run["notes"] for run in second["runs"])
+        assert server.statuses.count(304) == 4
+
+        manual = service.run_job(job_ids[0])
+        assert (manual["records_found"], manual["source_unchanged"]) == (1, False)
+    finally:
+        server.close()
+
+
+def test_unchanged_pages_are_tracked_per_job_not_per_url(tmp_path, server):
+    db = SoberLivingDirectoryDatabase(db_path=str(tmp_path / "directory.db"))
+    service = SoberLivingDiscoveryService(db)
+    service.SUPPORTED_CCAPP_HOSTS = {f"127.0.0.1:{server.port}"}
+    first_job, second_job = _scheduled_ccapp_jobs(db, service, [server.url("/search/")] * 2)
+
+    assert service.run_job(first_job)["records_found"] == 1
+    # Another job reading the same page has not processed it yet.
+    run = service.run_job(second_job, trigger_type="scheduled")
+    assert (run["records_found"], run["source_unchanged"]) == (1, False)
+    run = service.run_job(second_job, trigger_type="scheduled")
+    assert (run["records_found"], run["source_unchanged"]) == (0, True)
+
+    # New filters mean the page has not been processed for them.
+    db.update_discovery_job(second_job, DiscoveryJobUpdate(target_city="Fresno"))
+    assert service.run_job(second_job, trigger_type="scheduled")["source_unchanged"] is False
+    assert service.run_job(second_job, trigger_type="scheduled")["source_unchanged"] is True
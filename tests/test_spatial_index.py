@@ -0,0 +1,176 @@
+"""Spatial grid index tests.
+
+Checks ``SpatialGridIndex.nearest`` against a brute-force haversine scan over
+random LA-area points (k, radius and kind filters), and builds the index from
+tmp Virgil St ``treatment_centers`` and sober-living tables to cover stored
+coordinates, centroid fallback and excluded rows. Proximity queries to
+ResourceRetrievalEngine.search score only the nearby candidates it returns.
+"""
+import math
+import random
+import sqlite3
+
+import pytest
+
+from backend.modules.resources import spatial_index as spatial_mod
+from backend.modules.resources.knowledge_loader import KnowledgeLoader, Provider
+from backend.modules.resources.location_intelligence import LA_NEIGHBORHOODS, LocationContext, LocationIntelligence
+from backend.modules.resources.retrieval_engine import ResourceRetrievalEngine
+from backend.modules.resources.spatial_index import SpatialGridIndex, SpatialPoint, build_spatial_index
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * math.asin(math.sqrt(a)) * 3956
+
+
+@pytest.fixture(scope="module")
+def random_points():
+    rng = random.Random(3)
+    return [
+        SpatialPoint(
+            source="knowledge",
+            key=str(i),
+            name=f"p{i}",
+            latitude=rng.uniform(33.7, 34.4),
+            longitude=rng.uniform(-118.7, -117.9),
+            kinds=frozenset({rng.choice(["detox", "residential", "sober_living"])}),
+        )
+        for i in range(2000)
+    ]
+
+
+@pytest.mark.parametrize("k,radius,kinds", [(1, None, None), (10, None, None), (25, 4.0, None), (5, None, ["detox"])])
+def test_nearest_matches_brute_force(random_points, k, radius, kinds):
+    index = SpatialGridIndex(random_points)
+    rng = random.Random(11)
+    for _ in range(30):
+        lat, lon = rng.uniform(33.6, 34.5), rng.uniform(-118.8, -117.8)
+        expected = sorted(
+            (_haversine(lat, lon, p.latitude, p.longitude), int(p.key))
+            for p in random_points
+            if not kinds or p.kinds & set(kinds)
+        )
+        if radius is not None:
+            expected = [row for row in expected if row[0] <= radius]
+
+        got = index.nearest(lat, lon, k=k, radius=radius, kinds=kinds)
+
+        assert [int(p.key) for p, _ in got] == [key for _, key in expected[:k]]
+        assert [d for _, d in got] == pytest.approx([d for d, _ in expected[:k]])
+
+
+def test_far_away_query_still_finds_points(random_points):
+    index = SpatialGridIndex(random_points)
+
+    got = index.nearest(40.7, -74.0, k=3)  # New York
+
+    assert len(got) == 3
+    assert all(distance > 2000 for _, distance in got)
+
+
+@pytest.fixture
+def source_dbs(tmp_path):
+    virgil = tmp_path / "virgil.db"
+    with sqlite3.connect(virgil) as conn:
+        conn.execute(
+            "CREATE TABLE treatment_centers (id INTEGER PRIMARY KEY, name TEXT, type TEXT, address TEXT, city TEXT,"
+            " zipCode TEXT, phone TEXT, latitude REAL, longitude REAL, isPublished INTEGER)"
+        )
+        conn.executemany(
+            "INSERT INTO treatment_centers (name, type, city, latitude, longitude, isPublished) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                ("Valley Detox", "detox", "Van Nuys", 34.1900, -118.4500, 1),
+                ("Centroid Residential", "residential", "Sherman Oaks", None, None, 1),
+                ("Unpublished Detox", "detox", "Van Nuys", 34.1894, -118.4514, 0),
+                ("Nowhere Rehab", "residential", "Atlantis", None, None, 1),
+            ],
+        )
+    sober = tmp_path / "sober.db"
+    with sqlite3.connect(sober) as conn:
+        conn.execute(
+            "CREATE TABLE sober_living_directory_listings (listing_id TEXT, name TEXT, address TEXT, city TEXT,"
+            " neighborhood TEXT, zip_code TEXT, phone TEXT, latitude REAL, longitude REAL, status TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO sober_living_directory_listings (listing_id, name, city, neighborhood, status)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                ("sl-1", "Reseda House", "Los Angeles", "Reseda", "active"),
+                ("sl-2", "Closed House", "Van Nuys", None, "archived"),
+            ],
+        )
+    return virgil, sober
+
+
+def test_index_built_from_all_sources(source_dbs):
+    virgil, sober = source_dbs
+    provider = Provider(name="Burbank Clinic", service_type="medical", service_subtypes=["primary_care"], city="Burbank")
+
+    index = build_spatial_index([provider], virgil, sober)
+
+    names = {point.name: point for point in index.points}
+    assert set(names) == {"Burbank Clinic", "Valley Detox", "Centroid Residential", "Reseda House"}
+    assert names["Valley Detox"].precise
+    assert not names["Centroid Residential"].precise
+
+    detox = index.nearest(34.1894, -118.4514, k=3, kinds=["detox"])
+    assert [point.name for point, _ in detox] == ["Valley Detox"]
+    assert detox[0][1] < 0.2
+
+
+def test_location_intelligence_nearest_to_context(source_dbs, monkeypatch):
+    virgil, sober = source_dbs
+    monkeypatch.setattr(spatial_mod, "_spatial_index", build_spatial_index([], virgil, sober))
+
+    results = LocationIntelligence().nearest_to_context(LocationContext(neighborhood="Van Nuys"), k=2, radius=10)
+
+    assert [row["name"] for row in results] == ["Valley Detox", "Centroid Residential"]
+    assert results[0]["source"] == "treatment_centers"
+    assert results[1]["approximate_location"] is True
+    assert results[0]["distance_miles"] <= results[1]["distance_miles"] <= 10
+
+
+def test_proximity_queries_score_only_nearby_candidates(tmp_path, monkeypatch):
+    # Per-provider scoring, so every score_location call is visible.
+    monkeypatch.setenv("CMSX_RESOURCE_VECTOR_SCORING", "0")
+    monkeypatch.setattr(spatial_mod, "_spatial_index", None)
+    monkeypatch.setattr(spatial_mod, "_spatial_index_providers", None)
+    monkeypatch.setattr(spatial_mod, "default_source_paths", lambda: (tmp_path / "none.db", tmp_path / "none.db"))
+    rng = random.Random(5)
+    neighborhoods = [name for name in LA_NEIGHBORHOODS if name != "van nuys"]
+    loader = KnowledgeLoader(tmp_path)
+    loader.providers = [
+        Provider(
+            name=f"Detox {i}",
+            service_type="treatment",
+            service_subtypes=["detox"] if i % 2 else ["outpatient"],
+            neighborhood=rng.choice(neighborhoods).title(),
+        )
+        for i in range(400)
+    ]
+    loader.providers.append(Provider(
+        name="Van Nuys Detox", service_type="treatment", service_subtypes=["detox"],
+        neighborhood="Van Nuys", latitude=34.1895, longitude=-118.4515,
+    ))
+    loader._build_index()
+    engine = ResourceRetrievalEngine()
+    engine.knowledge_loader = loader
+    scored = []
+    score_location = engine.location_intelligence.score_location
+    monkeypatch.setattr(
+        engine.location_intelligence,
+        "score_location",
+        lambda provider, context: scored.append(provider["name"]) or score_location(provider, context),
+    )
+
+    results = engine.search("closest detox near Van Nuys", limit=3)
+
+    assert results[0].provider.name == "Van Nuys Detox"
+    assert all("detox" in result.provider.service_subtypes for result in results)
+    assert len(scored) == 3 * 5
+
+    scored.clear()
+    engine.search("detox in Van Nuys", limit=3)
+    assert len(scored) == len(engine._without_aggregators(loader.get_by_service_type("treatment")))
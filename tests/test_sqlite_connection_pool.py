@@ -0,0 +1,148 @@
+"""Shared SQLite connection provider tests.
+
+Covers per-thread reuse keyed by DB file, the once-per-connection pragmas
+(WAL / synchronous / busy_timeout), exclusive checkouts, close() rollback
+semantics, stale-file detection, the ``on_open`` hook and the pool metrics.
+Every DB lives in a tmp dir; a private pool instance is used so the global
+metrics are untouched.
+"""
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from backend.shared.database.connection_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool():
+    p = SQLiteConnectionPool()
+    yield p
+    p.close_all()
+
+
+def test_connection_is_reused_within_thread(pool, tmp_path):
+    db = tmp_path / "a.db"
+    with pool.get_connection(db) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    first_id = id(conn)
+
+    with pool.get_connection(db) as conn2:
+        conn2.execute("INSERT INTO t VALUES (1)")
+    assert id(conn2) == first_id
+
+    metrics = pool.metrics()
+    assert metrics["opens"] == 1
+    assert metrics["reuses"] == 1
+    assert metrics["checked_out"] == 0
+    assert metrics["reuse_ratio"] == 0.5
+
+
+def test_pragmas_applied_once_per_connection(pool, tmp_path):
+    conn = pool.get_connection(tmp_path / "p.db")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        # synchronous=NORMAL is 1; busy_timeout is in ms.
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    finally:
+        conn.close()
+
+
+def test_nested_checkouts_are_exclusive(pool, tmp_path):
+    db = tmp_path / "n.db"
+    with pool.get_connection(db) as outer:
+        with pool.get_connection(db) as inner:
+            assert inner is not outer
+    assert pool.metrics()["opens"] == 2
+
+
+def test_row_factory_reset_on_checkout(pool, tmp_path):
+    db = tmp_path / "r.db"
+    with pool.get_connection(db, row_factory=sqlite3.Row) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (7)")
+        assert conn.execute("SELECT x FROM t").fetchone()["x"] == 7
+
+    with pool.get_connection(db) as conn:
+        assert conn.execute("SELECT x FROM t").fetchone() == (7,)
+
+
+def test_close_rolls_back_uncommitted_work(pool, tmp_path):
+    db = tmp_path / "c.db"
+    with pool.get_connection(db) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+
+    conn = pool.get_connection(db)
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+
+    with pool.get_connection(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        assert not conn.in_transaction
+
+
+def test_replaced_file_is_not_reused(pool, tmp_path):
+    db = tmp_path / "s.db"
+    with pool.get_connection(db) as conn:
+        conn.execute("CREATE TABLE old_table (x INTEGER)")
+
+    for suffix in ("", "-wal", "-shm"):
+        path = str(db) + suffix
+        if os.path.exists(path):
+            os.remove(path)
+
+    with pool.get_connection(db) as conn:
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    assert "old_table" not in tables
+    assert pool.metrics()["stale_discards"] == 1
+
+
+def test_on_open_runs_once_per_physical_connection(pool, tmp_path):
+    db = tmp_path / "o.db"
+    calls = []
+
+    def ensure_schema(conn):
+        calls.append(1)
+        conn.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+
+    for _ in range(3):
+        with pool.get_connection(db, on_open=ensure_schema) as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+    assert len(calls) == 1
+
+
+def test_threads_get_their_own_connections(pool, tmp_path):
+    db = tmp_path / "th.db"
+    with pool.get_connection(db) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    seen = []
+
+    def worker():
+        for _ in range(2):
+            with pool.get_connection(db) as c:
+                c.execute("INSERT INTO t VALUES (1)")
+                seen.append(id(c))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with pool.get_connection(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 6
+    assert pool.metrics()["reuses"] >= 3
+
+
+def test_pooling_can_be_disabled(pool, tmp_path, monkeypatch):
+    monkeypatch.setenv("CMSX_SQLITE_POOL", "0")
+    db = tmp_path / "d.db"
+    conn = pool.get_connection(db)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert pool.metrics()["live_connections"] == 0
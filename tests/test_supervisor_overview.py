@@ -0,0 +1,179 @@
+"""Supervisor overview engine tests.
+
+Seeds core clients plus the reminders / benefits / legal / FMLA module DBs in a
+tmp dir and checks the grouped per-source counts, org scoping, the daily
+snapshot being served without re-aggregation, and incremental refresh of only
+the source whose DB changed.
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.modules.dashboard import supervisor_overview as engine
+
+TODAY = datetime.now().date()
+YESTERDAY = (TODAY - timedelta(days=1)).isoformat()
+TOMORROW = (TODAY + timedelta(days=1)).isoformat()
+
+
+def _exec(path, statements):
+    with sqlite3.connect(path) as conn:
+        for sql, rows in statements:
+            if rows is None:
+                conn.execute(sql)
+            else:
+                conn.executemany(sql, rows)
+        conn.commit()
+
+
+@pytest.fixture
+def db_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_SUPERVISOR_SNAPSHOT", raising=False)
+    _exec(tmp_path / "core_clients.db", [
+        ("""CREATE TABLE clients (
+                client_id TEXT PRIMARY KEY, case_manager_id TEXT, org_id TEXT,
+                risk_level TEXT, created_at TEXT, barriers TEXT)""", None),
+        ("INSERT INTO clients VALUES (?,?,?,?,?,?)", [
+            ("a1", "cm_a", "org_a", "high", TODAY.isoformat(), "transport"),
+            ("a2", "cm_a", "org_a", "low", "2020-01-01", ""),
+            ("a3", "cm_a", "org_a", "low", "2020-01-01", ""),
+            ("b1", "cm_b", "org_b", "high", "2020-01-01", ""),
+            ("u1", "", "org_a", "low", "2020-01-01", ""),
+        ]),
+    ])
+    _exec(tmp_path / "reminders.db", [
+        ("CREATE TABLE active_reminders (reminder_id TEXT, case_manager_id TEXT, status TEXT, due_date TEXT)", None),
+        ("INSERT INTO active_reminders VALUES (?,?,?,?)", [
+            ("r1", "cm_a", "Active", YESTERDAY),
+            ("r2", "cm_a", "Active", TOMORROW),
+            ("r3", "cm_a", "Completed", YESTERDAY),
+            ("r4", "cm_b", "Active", YESTERDAY),
+        ]),
+    ])
+    _exec(tmp_path / "unified_platform.db", [
+        ("CREATE TABLE benefits_applications (application_id TEXT, client_id TEXT, status TEXT)", None),
+        ("INSERT INTO benefits_applications VALUES (?,?,?)", [
+            ("ba1", "a1", "submitted"),
+            ("ba2", "a2", "approved"),
+            ("ba3", "b1", "pending"),
+            ("ba4", "u1", None),
+        ]),
+    ])
+    _exec(tmp_path / "legal_cases.db", [
+        ("CREATE TABLE legal_cases (case_id TEXT, client_id TEXT, is_active INTEGER)", None),
+        ("INSERT INTO legal_cases VALUES (?,?,?)", [
+            ("l1", "a1", 1),
+            ("l2", "a2", None),
+            ("l3", "a3", 0),
+        ]),
+    ])
+    _exec(tmp_path / "fmla.db", [
+        ("CREATE TABLE fmla_cases (case_id TEXT, assigned_case_manager TEXT, status TEXT)", None),
+        ("INSERT INTO fmla_cases VALUES (?,?,?)", [
+            ("f1", "cm_a", "open"),
+            ("f2", "cm_a", "Closed"),
+            ("f3", "cm_b", "open"),
+        ]),
+    ])
+    return tmp_path
+
+
+def _by_manager(overview):
+    return {item["case_manager_id"]: item for item in overview["case_managers"]}
+
+
+def test_grouped_counts_match_per_manager_semantics(db_dir):
+    overview = engine.build_supervisor_overview(db_dir, None, {"cm_a": "Case Manager A"})
+    managers = _by_manager(overview)
+
+    assert [item["case_manager_id"] for item in overview["case_managers"]] == ["cm_a", "cm_b", "unassigned"]
+    cm_a = managers["cm_a"]
+    assert cm_a["case_manager_name"] == "Case Manager A"
+    assert cm_a["total_clients"] == 3
+    assert cm_a["high_risk_clients"] == 1
+    assert cm_a["recent_intakes"] == 1
+    assert cm_a["clients_with_barriers"] == 1
+    assert cm_a["overdue_reminders"] == 1
+    assert cm_a["open_benefits_applications"] == 1
+    assert cm_a["active_legal_cases"] == 2
+    assert cm_a["active_fmla_cases"] == 1
+    assert cm_a["completion_rate"] == 75
+    assert managers["unassigned"]["open_benefits_applications"] == 1
+    assert managers["cm_b"]["case_manager_name"] == "Cm B"
+
+    summary = overview["team_summary"]
+    assert summary["total_clients"] == 5
+    assert summary["overdue_reminders"] == 2
+    assert summary["active_fmla_cases"] == 2
+
+
+def test_org_scope_limits_managers_and_joined_counts(db_dir):
+    overview = engine.build_supervisor_overview(db_dir, "org_a", {})
+    managers = _by_manager(overview)
+
+    assert set(managers) == {"cm_a", "unassigned"}
+    assert overview["team_summary"]["total_clients"] == 4
+    assert overview["team_summary"]["open_benefits_applications"] == 2
+
+
+def test_unchanged_day_is_served_from_snapshot(db_dir, monkeypatch):
+    first = engine.build_supervisor_overview(db_dir, None, {})
+    assert set(first["snapshot"]["refreshed_sources"]) == set(engine.SOURCE_FILES)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("module DBs should not be re-aggregated")
+
+    monkeypatch.setattr(engine, "aggregate_sources", fail)
+    second = engine.build_supervisor_overview(db_dir, None, {})
+
+    assert second["snapshot"]["refreshed_sources"] == []
+    assert second["case_managers"] == first["case_managers"]
+
+
+def test_only_changed_source_is_refreshed(db_dir):
+    engine.build_supervisor_overview(db_dir, None, {})
+    _exec(db_dir / "fmla.db", [
+        ("INSERT INTO fmla_cases VALUES (?,?,?)", [("f4", "cm_a", "open")]),
+    ])
+
+    overview = engine.build_supervisor_overview(db_dir, None, {})
+
+    assert overview["snapshot"]["refreshed_sources"] == ["fmla"]
+    assert _by_manager(overview)["cm_a"]["active_fmla_cases"] == 2
+    assert _by_manager(overview)["cm_a"]["overdue_reminders"] == 1
+
+
+def test_core_change_refreshes_client_joined_sources(db_dir):
+    engine.build_supervisor_overview(db_dir, None, {})
+    _exec(db_dir / "core_clients.db", [
+        ("UPDATE clients SET case_manager_id = 'cm_b' WHERE client_id = 'a1'", None),
+    ])
+
+    overview = engine.build_supervisor_overview(db_dir, None, {})
+
+    assert set(overview["snapshot"]["refreshed_sources"]) == {"core", "benefits", "legal"}
+    assert _by_manager(overview)["cm_b"]["open_benefits_applications"] == 2
+
+
+def test_missing_module_dbs_count_as_zero(tmp_path):
+    _exec(tmp_path / "core_clients.db", [
+        ("CREATE TABLE clients (client_id TEXT, case_manager_id TEXT, org_id TEXT, risk_level TEXT, created_at TEXT, barriers TEXT)", None),
+        ("INSERT INTO clients VALUES (?,?,?,?,?,?)", [("c1", "cm_x", None, "high", None, None)]),
+    ])
+
+    overview = engine.build_supervisor_overview(tmp_path, None, {})
+
+    cm_x = _by_manager(overview)["cm_x"]
+    assert cm_x["overdue_reminders"] == 0
+    assert cm_x["active_legal_cases"] == 0
+    assert not (tmp_path / "reminders.db").exists()
+
+
+def test_snapshot_can_be_disabled(db_dir, monkeypatch):
+    monkeypatch.setenv("CMSX_SUPERVISOR_SNAPSHOT", "0")
+    overview = engine.build_supervisor_overview(db_dir, None, {})
+
+    assert overview["snapshot"]["enabled"] is False
+    assert not (db_dir / engine.SNAPSHOT_DB_FILENAME).exists()
+    assert _by_manager(overview)["cm_a"]["total_clients"] == 3
@@ -0,0 +1,302 @@
+"""Smart Daily priority index tests.
+
+Buckets served from the materialized index must match the Python scoring path
+across dates (rolling past midnight moves rows between buckets without any
+rebuild), appointment reminders stay deduped against their workspace task,
+and a write only rebuilds the touched client's rows - which is what keeps
+caseloads with thousands of open items cheap to read. Reads never write the
+index: a missing index is built by the (here: flushed by hand) reconciliation
+queue, and other stores' writes reach it through context invalidations.
+"""
+import itertools
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import backend.shared.client_context_cache as cache_mod
+import backend.shared.db_path as db_path_mod
+from backend.auth import authorization as authz
+from backend.modules.reminders import reconciliation, repository
+from backend.modules.reminders.priority_index import INDEX_DB_FILENAME, TaskPriorityIndex
+from backend.shared.client_context_cache import ClientContextCache, invalidate_client_context
+from backend.shared.reconciliation_queue import ReconciliationQueue
+
+TODAY = date(2026, 8, 10)
+_created = itertools.count()
+
+
+def _day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    core_db = tmp_path / "core_clients.db"
+    reminders_db = tmp_path / "reminders.db"
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.delenv("CMSX_TASK_INDEX", raising=False)
+    monkeypatch.setattr(db_path_mod, "DB_DIR", tmp_path)
+    monkeypatch.setattr(authz, "CORE_CLIENTS_DB", core_db)
+    monkeypatch.setattr(authz, "AUTH_DB", tmp_path / "auth.db")
+    monkeypatch.setattr(repository, "_SQLITE_CORE_CLIENTS_PATH", str(core_db))
+    monkeypatch.setattr(repository, "_SQLITE_REMINDERS_PATH", str(reminders_db))
+    monkeypatch.setattr(repository, "_sqlite_tenancy_ready", False)
+    monkeypatch.setattr(cache_mod, "client_context_cache", ClientContextCache())
+    index = TaskPriorityIndex(max_age_seconds=900)
+    monkeypatch.setattr(repository, "task_priority_index", index)
+    queue = ReconciliationQueue(debounce_ms=0, max_delay_ms=0)
+    queue.register("priority_index", reconciliation.reconcile_priority_index)
+    monkeypatch.setattr(queue, "ensure_caseload", lambda *args, **kwargs: None)
+    monkeypatch.setattr(repository, "reconciliation_queue", queue)
+
+    workspace = {"tasks": {}, "appointments": {}}
+    monkeypatch.setattr(repository.workspace_store, "list_client_tasks", lambda cid: workspace["tasks"].get(cid, []))
+    monkeypatch.setattr(
+        repository.workspace_store, "list_client_appointments", lambda cid: workspace["appointments"].get(cid, [])
+    )
+
+    with sqlite3.connect(core_db) as conn:
+        conn.execute(
+            "CREATE TABLE clients (client_id TEXT PRIMARY KEY, first_name TEXT, last_name TEXT,"
+            " case_manager_id TEXT, org_id TEXT)"
+        )
+    with sqlite3.connect(reminders_db) as conn:
+        conn.execute(
+            """
+            CREATE TABLE intelligent_tasks (
+                id TEXT PRIMARY KEY, client_id TEXT NOT NULL, case_manager_id TEXT, task_type TEXT,
+                title TEXT, description TEXT, priority TEXT, status TEXT, estimated_minutes INTEGER,
+                due_date TEXT, completed_at TEXT, created_at TEXT, is_demo INTEGER DEFAULT 0, org_id TEXT
+            )
+            """
+        )
+    repository._ensure_sqlite_active_reminders_table()
+    return {"core_db": core_db, "index": index, "queue": queue, "workspace": workspace}
+
+
+def _add_clients(env, count, case_manager_id="cm-1"):
+    rows = [(f"client-{n}", "Client", str(n), case_manager_id, None) for n in range(count)]
+    with sqlite3.connect(env["core_db"]) as conn:
+        conn.executemany("INSERT INTO clients VALUES (?,?,?,?,?)", rows)
+    return [row[0] for row in rows]
+
+
+def _seed_tasks(client_id, specs):
+    repository.create_intelligent_tasks(
+        client_id,
+        [
+            {"task_id": f"{client_id}-task-{n}", "title": title, "priority": priority, "due_date": due,
+             "created_at": f"2026-01-01T00:00:00.{next(_created):06d}"}
+            for n, (title, priority, due) in enumerate(specs)
+        ],
+        case_manager_id="cm-1",
+    )
+
+
+def _build(env, case_manager_id="cm-1"):
+    """First read queues the build; the worker's pass is run inline."""
+    repository.get_prioritized_tasks(case_manager_id, client_date=TODAY.isoformat())
+    env["queue"].flush()
+
+
+def _ids(result):
+    return {
+        bucket: [(item["task_id"], item["priority_score"]) for item in items]
+        for bucket, items in result["buckets"].items()
+    }
+
+
+def _python_result(monkeypatch, client_date):
+    monkeypatch.setenv("CMSX_TASK_INDEX", "0")
+    try:
+        return repository.get_prioritized_tasks("cm-1", client_date=client_date)
+    finally:
+        monkeypatch.delenv("CMSX_TASK_INDEX")
+
+
+def test_index_matches_python_scoring_and_rolls_past_midnight_without_rebuilding(env, monkeypatch):
+    client_a, client_b, client_c = _add_clients(env, 3)
+    _seed_tasks(client_a, [
+        ("Court filing", "high", _day(-2)),
+        ("Housing packet", "medium", _day(0)),
+        ("Resume review", "low", _day(1)),
+        ("Call landlord", "medium", _day(3)),
+        ("Benefits renewal", "critical", _day(4)),
+        ("Bus pass", "low", _day(30)),
+        ("Open high item", "high", None),
+        ("Open medium item", "medium", None),  # not shown: undated medium
+    ])
+    _seed_tasks(client_b, [("Medication pickup", "medium", _day(7)), ("Job fair", "medium", _day(8))])
+    env["workspace"]["tasks"][client_c] = [{
+        "task_id": "plan-task", "client_id": client_c, "title": "Dental follow-up", "priority": "high",
+        "source": "treatment_plan", "module": "medical", "need_key": "dental", "status": "open",
+    }]
+    env["workspace"]["appointments"][client_c] = [{
+        "apt_id": "apt-1", "client_id": client_c, "title": "Primary care", "appointment_date": _day(2),
+        "status": "scheduled",
+    }]
+    appointment_task_id = repository.list_workspace_appointment_tasks_for_case_manager("cm-1")[0]["task_id"]
+    with sqlite3.connect(repository._SQLITE_REMINDERS_PATH) as conn:
+        conn.execute(
+            "INSERT INTO active_reminders (reminder_id, client_id, case_manager_id, reminder_type, message,"
+            " priority, due_date, status, created_at) VALUES (?, ?, 'cm-1', 'medical', 'Primary care', 'High', ?,"
+            " 'Active', '2026-01-01')",
+            (appointment_task_id, client_c, _day(2)),
+        )
+    repository.create_active_reminder(client_b, "cm-1", "Manual", "Check in", priority="High", due_date=_day(-1))
+    repository.create_active_reminder(client_b, "cm-1", "Manual", "Undated urgent", priority="Critical")
+    repository.create_active_reminder("client-elsewhere", "cm-1", "Manual", "Transferred", due_date=_day(5))
+
+    _build(env)
+    refreshes = env["index"].metrics()["refreshes"]
+    for offset in range(0, 10):
+        client_date = _day(offset)
+        indexed = repository.get_prioritized_tasks("cm-1", client_date=client_date)
+        expected = _python_result(monkeypatch, client_date)
+        assert _ids(indexed) == _ids(expected), client_date
+        assert (indexed["counts"], indexed["ai_summary"]) == (expected["counts"], expected["ai_summary"])
+
+    first_day = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+    assert first_day["buckets"]["overdue"][0]["priority_reason"] == "Overdue by 2 days."
+    assert [item["source"] for item in first_day["buckets"]["next_3_days"] if item["client_id"] == client_c] == [
+        "workspace_appointment"
+    ]
+    metrics = env["index"].metrics()
+    assert metrics["refreshes"] == refreshes  # reads never refresh
+    assert metrics["units_rebuilt"] == 4  # three caseload clients + the transferred reminder's client
+
+
+def test_writes_rebuild_only_the_touched_client(env):
+    clients = _add_clients(env, 5)
+    for client_id in clients:
+        _seed_tasks(client_id, [("Intake follow-up", "high", _day(1)), ("Paperwork", "medium", _day(9))])
+    _build(env)
+    index = env["index"]
+    assert index.metrics()["units_rebuilt"] == 5
+
+    reminder_id = repository.create_active_reminder(clients[2], "cm-1", "Manual", "Court date", "High", _day(0))
+    result = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+    assert [item["task_id"] for item in result["buckets"]["today"]] == [reminder_id]
+    assert index.metrics()["units_rebuilt"] == 6
+
+    repository.complete_active_reminder(reminder_id)
+    repository.update_task_status(f"{clients[4]}-task-0", "completed")
+    result = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+    assert result["counts"]["today"] == 0
+    assert [item["client_id"] for item in result["buckets"]["next_3_days"]] == clients[:4]
+    assert index.metrics()["units_rebuilt"] == 8
+
+    # Other stores (here: a raw workspace change) only invalidate the client;
+    # the queued background refresh picks the change up.
+    env["workspace"]["tasks"][clients[0]] = [{
+        "task_id": "ws-1", "client_id": clients[0], "title": "Sign release", "priority": "critical",
+        "due_date": _day(-1), "status": "open",
+    }]
+    invalidate_client_context(clients[0])
+    assert repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())["counts"]["overdue"] == 0
+    env["queue"].flush()
+    assert repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())["counts"]["overdue"] == 1
+    assert index.metrics()["units_rebuilt"] == 9
+
+
+def test_clients_leaving_the_caseload_drop_out_of_the_index(env):
+    clients = _add_clients(env, 3)
+    for client_id in clients:
+        _seed_tasks(client_id, [("Follow-up", "high", _day(2))])
+    _build(env)
+    assert repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())["counts"]["next_3_days"] == 3
+
+    with sqlite3.connect(env["core_db"]) as conn:
+        conn.execute("UPDATE clients SET case_manager_id = 'cm-2' WHERE client_id = ?", (clients[1],))
+    invalidate_client_context(clients[1])
+    env["queue"].flush()
+    result = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+
+    assert [item["client_id"] for item in result["buckets"]["next_3_days"]] == [clients[0], clients[2]]
+    assert env["index"].metrics()["units_removed"] == 1
+
+
+def test_large_caseload_is_read_from_the_index(env, monkeypatch):
+    clients = _add_clients(env, 300)
+    priorities = ["critical", "high", "medium", "low"]
+    for n, client_id in enumerate(clients):
+        _seed_tasks(client_id, [
+            (f"Task {k}", priorities[(n + k) % 4], _day((n + k) % 20 - 5)) for k in range(10)
+        ])
+    _build(env)
+
+    first = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+    assert sum(first["counts"].values()) == 3000
+    assert _ids(first) == _ids(_python_result(monkeypatch, TODAY.isoformat()))
+
+    fetched = []
+    original = repository.list_tasks_for_case_manager
+    monkeypatch.setattr(
+        repository, "list_tasks_for_case_manager",
+        lambda *args, **kwargs: fetched.append(kwargs.get("client_ids")) or original(*args, **kwargs),
+    )
+    repository.get_prioritized_tasks("cm-1", client_date=_day(1))
+    repository.update_task_status(f"{clients[7]}-task-3", "completed")
+    second = repository.get_prioritized_tasks("cm-1", client_date=_day(1))
+
+    assert fetched == [[clients[7]]]
+    assert sum(second["counts"].values()) == 2999
+    assert env["index"].metrics()["rows_read"] == 3000 * 2 + 2999
+
+
+def test_read_order_comes_off_the_index_without_a_sort(env, monkeypatch):
+    clients = _add_clients(env, 3)
+    for client_id in clients:
+        _seed_tasks(client_id, [("Dated", "high", _day(2)), ("Undated", "high", None)])
+    _build(env)
+
+    index, statements, traced = env["index"], [], []
+    connect = index._connect
+
+    def tracing_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        traced.append(conn)
+        return conn
+
+    monkeypatch.setattr(index, "_connect", tracing_connect)
+    list(index.read("cm-1", "", TODAY.toordinal()))
+    for conn in traced:
+        conn.set_trace_callback(None)
+    read_sql = next(sql for sql in statements if "ORDER BY" in sql)
+    with connect() as conn:
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {read_sql}")]
+
+    assert any("USING INDEX idx_task_priority_sort" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+def test_reads_never_write_the_index(env, monkeypatch):
+    clients = _add_clients(env, 2)
+    _seed_tasks(clients[0], [("Follow-up", "high", _day(1))])
+    env["queue"].flush()
+    index_db = db_path_mod.DB_DIR / INDEX_DB_FILENAME
+
+    cold = repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())
+    assert cold["counts"]["next_3_days"] == 1  # scored in Python
+    assert not index_db.exists()
+    assert env["queue"].pending() == [
+        {"case_manager_id": "cm-1", "org_id": None, "attempts": 0, "kinds": {"priority_index": ["*"]}}
+    ]
+
+    env["queue"].flush()
+    index = env["index"]
+    monkeypatch.setattr(index, "replace_units", lambda *args, **kwargs: pytest.fail("read wrote the index"))
+    for offset in range(3):
+        repository.get_prioritized_tasks("cm-1", client_date=_day(offset))
+    assert index.metrics()["reads"] == 3
+    assert env["queue"].pending() == []
+
+    # Past the max age the index is still served, and a refresh is queued as a backstop.
+    index.max_age_seconds = 1
+    with sqlite3.connect(index_db) as conn:
+        conn.execute("UPDATE task_priority_index_scopes SET refreshed_at = refreshed_at - 60")
+    assert repository.get_prioritized_tasks("cm-1", client_date=TODAY.isoformat())["counts"]["next_3_days"] == 1
+    assert index.metrics()["refreshes_queued"] == 2
+    assert env["queue"].pending()[0]["kinds"] == {"priority_index": ["*"]}
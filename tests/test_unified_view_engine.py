@@ -0,0 +1,147 @@
+"""Unified client view engine concurrency and caching tests.
+
+Concurrent requests for one client share a single build while other clients
+build in parallel; only module sections whose source database changed are
+re-read; and a new engine (a restarted worker) reads whole views back from the
+database cache instead of starting cold.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.shared import phase_4a_unified_client_view as mod
+
+MODULES = ("core_clients", "housing", "benefits")
+
+
+def _write_client(db_dir, module, client_id, **fields):
+    with sqlite3.connect(db_dir / f"{module}.db") as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS clients (client_id TEXT PRIMARY KEY, status TEXT, updated_at TEXT)")
+        conn.execute(
+            "INSERT OR REPLACE INTO clients VALUES (?, ?, ?)",
+            (client_id, fields.get("status", "active"), datetime.now().isoformat()),
+        )
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "DB_DIR", tmp_path)
+    for client_id in ("client-1", "client-2"):
+        for module in MODULES:
+            _write_client(tmp_path, module, client_id)
+    reads = []
+
+    def make(delay=0.0):
+        engine = mod.UnifiedClientViewEngine()
+        engine.modules = {name: config for name, config in engine.modules.items() if name in MODULES}
+        original = engine._get_module_data
+
+        def counted(client_id, module_name, module_config):
+            reads.append((client_id, module_name))
+            time.sleep(delay)
+            return original(client_id, module_name, module_config)
+
+        engine._get_module_data = counted
+        return engine
+
+    make.reads = reads
+    make.db_dir = tmp_path
+    return make
+
+
+def test_concurrent_requests_for_one_client_share_a_build(make_engine):
+    engine = make_engine(delay=0.1)
+    barrier = threading.Barrier(6)
+    results = {}
+
+    def request(n, client_id):
+        barrier.wait()
+        results[n] = engine.get_unified_client_view(client_id, session_id=f"session-{n}")
+
+    threads = [threading.Thread(target=request, args=(n, "client-1" if n < 4 else "client-2")) for n in range(6)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert sorted(make_engine.reads) == sorted(
+        (client_id, module) for client_id in ("client-1", "client-2") for module in MODULES
+    )
+    # Two clients built side by side, not one after the other.
+    assert elapsed < 2 * 0.1 * len(MODULES)
+    assert {results[n].navigation_context.session_id for n in range(6)} == {f"session-{n}" for n in range(6)}
+    assert results[0].core_profile["client_id"] == "client-1"
+    metrics = engine.metrics()
+    assert (metrics["builds"], metrics["coalesced"] + metrics["memory_hits"]) == (2, 4)
+    assert metrics["builds_in_flight"] == 0
+
+
+def test_only_changed_sections_are_recomputed(make_engine):
+    engine = make_engine()
+    first = engine.get_unified_client_view("client-1")
+    assert first.cache_info["cached"] is False and len(make_engine.reads) == 3
+
+    hit = engine.get_unified_client_view("client-1", current_module="housing")
+    assert (hit.cache_info["cache_hit"], len(make_engine.reads)) == (True, 3)
+    assert hit.navigation_context.current_module == "housing"
+
+    time.sleep(0.01)
+    _write_client(make_engine.db_dir, "housing", "client-1", status="housed")
+    refreshed = engine.get_unified_client_view("client-1")
+
+    assert make_engine.reads[3:] == [("client-1", "housing")]
+    assert refreshed.modules["housing"].data["status"] == "housed"
+    assert (refreshed.cache_info["sections_refreshed"], refreshed.cache_info["sections_reused"]) == (1, 2)
+
+    # A section past its own TTL is re-read even without a change.
+    engine.modules["benefits"]["section_ttl"] = 0
+    engine.get_unified_client_view("client-1")
+    assert make_engine.reads[4:] == [("client-1", "benefits")]
+
+
+def test_a_section_ttl_longer_than_the_view_ttl_keeps_the_view(make_engine):
+    engine = make_engine()
+    engine.cache_ttl = 0
+    for module_config in engine.modules.values():
+        module_config["section_ttl"] = 3600
+    engine.get_unified_client_view("client-1")
+
+    hit = engine.get_unified_client_view("client-1")
+
+    assert (hit.cache_info["cache_hit"], len(make_engine.reads)) == (True, 3)
+    with sqlite3.connect(make_engine.db_dir / "unified_client_view.db") as conn:
+        expiry = conn.execute("SELECT expiry_timestamp FROM unified_view_cache").fetchone()[0]
+    assert (datetime.fromisoformat(expiry) - datetime.now()).total_seconds() > 3500
+
+
+def test_a_restarted_engine_reads_views_back_from_the_database(make_engine):
+    make_engine().get_unified_client_view("client-1")
+    make_engine.reads.clear()
+
+    restarted = make_engine()
+    view = restarted.get_unified_client_view("client-1", session_id="after-restart")
+
+    assert make_engine.reads == []
+    assert view.cache_info["cache_source"] == "database"
+    assert view.modules["housing"].status == mod.ModuleStatus.ACTIVE
+    assert view.modules["housing"].freshness == mod.DataFreshness.FRESH
+    assert view.navigation_context.session_id == "after-restart"
+    assert restarted.metrics()["database_hits"] == 1
+
+    restarted.get_unified_client_view("client-1", force_refresh=True)
+    assert len(make_engine.reads) == 3
+    assert restarted.invalidate_cached_view("client-1") is True
+    with sqlite3.connect(make_engine.db_dir / "unified_client_view.db") as conn:
+        conn.execute(
+            "INSERT INTO unified_view_cache (client_id, cached_data, cache_timestamp, expiry_timestamp, data_hash)"
+            " VALUES ('client-1', '{\"client_id\": \"client-1\", \"modules_count\": 3}', ?, '2999-01-01', 'x')",
+            (datetime.now().isoformat(),),
+        )
+    # Rows written in the old summary-only layout are ignored, not misread.
+    assert make_engine().get_unified_client_view("client-1").cache_info["cached"] is False
@@ -0,0 +1,172 @@
+"""Virgil St FTS5 search tests.
+
+Seeds the four searchable tables in a tmp DB and checks that search_services
+answers from the BM25 index (no LIKE scans), that triggers keep the index in
+sync with inserts / updates / deletes, synonym + prefix expansion, SQL-side
+dedupe and category-first ordering, pagination totals, and the LIKE fallback.
+"""
+import sqlite3
+
+import pytest
+
+from backend.modules.services.virgil_db_service import VirgilServiceDatabase
+from backend.modules.services.virgil_search_index import FTS_TABLE, build_match_expression
+
+SCHEMA = """
+CREATE TABLE resources (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, description TEXT, type TEXT NOT NULL,
+    address TEXT, phone TEXT, website TEXT, hours TEXT, zipCode TEXT, latitude REAL, longitude REAL,
+    isVerified INTEGER DEFAULT 0 NOT NULL);
+CREATE TABLE treatment_centers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, type TEXT NOT NULL, address TEXT, city TEXT,
+    zipCode TEXT, phone TEXT, website TEXT, description TEXT, servesPopulation TEXT NOT NULL,
+    acceptsMediCal INTEGER DEFAULT 0 NOT NULL, acceptsMedicare INTEGER DEFAULT 0 NOT NULL,
+    acceptsPrivateInsurance INTEGER DEFAULT 0 NOT NULL, priceRange TEXT, servicesOffered TEXT,
+    amenities TEXT, isPublished INTEGER DEFAULT 1 NOT NULL);
+CREATE TABLE medi_cal_providers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, providerName TEXT NOT NULL, facilityName TEXT, address TEXT,
+    city TEXT, zipCode TEXT, phone TEXT, specialties TEXT, gender TEXT, languagesSpoken TEXT, networks TEXT);
+CREATE TABLE meetings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, type TEXT NOT NULL, dayOfWeek TEXT NOT NULL,
+    time TEXT NOT NULL, duration INTEGER, venueName TEXT, address TEXT, city TEXT, zipCode TEXT,
+    format TEXT NOT NULL, meetingMode TEXT NOT NULL, zoomId TEXT, tags TEXT, description TEXT, notes TEXT,
+    isPublished INTEGER DEFAULT 1 NOT NULL);
+"""
+
+
+@pytest.fixture
+def virgil(tmp_path, monkeypatch):
+    monkeypatch.delenv("CMSX_VIRGIL_FTS", raising=False)
+    path = tmp_path / "virgil.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO resources (name, description, type, address) VALUES (?, ?, ?, ?)",
+            [
+                ("Hope Shelter", "Emergency beds", "shelter", "1 Main St"),
+                ("Eastside Food Pantry", "Groceries every Friday", "food", "2 Main St"),
+                ("Eastside Food Pantry", "Groceries every Friday", "food", "2 Main St"),
+                ("Legal Aid Clinic", "Free attorney consults for housing cases", "legal", "3 Main St"),
+                ("Bright Smiles", "Low-cost dentist", "dental", "4 Main St"),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO treatment_centers (name, type, address, city, zipCode, description, servesPopulation,"
+            " servicesOffered, isPublished) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("Harbor Detox", "detox", "9 Bay Rd", "Long Beach", "90802", "Medical detox", "men", "detox", 1),
+                ("Sober House", "sober_living", "8 Oak St", "Pasadena", "91101", "Structured housing", "women", "", 1),
+                ("Hidden Rehab", "residential", "7 Elm St", "Pasadena", "91101", "Rehab", "coed", "", 0),
+            ],
+        )
+        conn.execute(
+            "INSERT INTO meetings (name, type, dayOfWeek, time, city, format, meetingMode, tags)"
+            " VALUES ('Morning Serenity', 'AA', 'Monday', '7:00', 'Pasadena', 'Open', 'In person', 'speaker')"
+        )
+    db = VirgilServiceDatabase(db_path=str(path))
+    yield db
+    db.close()
+
+
+def _titles(result):
+    return [item["title"] for item in result["results"]]
+
+
+def _no_scans(db, monkeypatch):
+    def fail(*_args, **_kwargs):
+        raise AssertionError("ranked search should not fall back to LIKE scans")
+
+    monkeypatch.setattr(db, "_search_services_scan", fail)
+
+
+def test_search_is_answered_from_the_fts_index(virgil, monkeypatch):
+    _no_scans(virgil, monkeypatch)
+
+    result = virgil.search_services("food", per_page=10)
+
+    assert result["success"] is True
+    assert _titles(result) == ["Eastside Food Pantry"]  # duplicate row collapsed in SQL
+    assert result["results"][0]["source"] == "virgil_st_resources"
+    assert result["total_count"] == 1
+
+
+def test_synonyms_and_prefixes_expand_the_query(virgil):
+    assert virgil.search_services("lawyer")["results"][0]["title"] == "Legal Aid Clinic"
+    assert "Bright Smiles" in _titles(virgil.search_services("dentistry"))
+    expression = build_match_expression(["dental"])
+    # The query's own words match as prefixes, synonyms as whole tokens.
+    assert '"dental"*' in expression and '"dentist"' in expression and '"dentist"*' not in expression
+    assert build_match_expression(["dental"], synonyms=False) == '"dental"*'
+
+
+def test_unpublished_treatment_centers_are_excluded(virgil):
+    titles = _titles(virgil.search_services("rehab detox treatment", per_page=20))
+
+    assert "Harbor Detox" in titles
+    assert "Hidden Rehab" not in titles
+
+
+def test_triggers_keep_index_in_sync(virgil):
+    assert virgil.search_services("laundromat")["total_count"] == 0
+
+    virgil.connection.execute(
+        "INSERT INTO resources (name, description, type, address) VALUES ('Suds Laundromat', 'Free wash', 'hygiene', '5 Main St')"
+    )
+    assert _titles(virgil.search_services("laundromat")) == ["Suds Laundromat"]
+
+    virgil.connection.execute("UPDATE resources SET name = 'Suds Wash House' WHERE name = 'Suds Laundromat'")
+    assert virgil.search_services("laundromat")["total_count"] == 0
+
+    virgil.connection.execute("DELETE FROM resources WHERE name = 'Suds Wash House'")
+    fts_rows = virgil.connection.execute(
+        f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'suds'"
+    ).fetchone()[0]
+    assert fts_rows == 0
+
+
+def test_category_priority_then_pagination(virgil, monkeypatch):
+    _no_scans(virgil, monkeypatch)
+
+    first = virgil.search_services("social services", per_page=2, category="housing")
+    second = virgil.search_services("social services", page=2, per_page=2, category="housing")
+
+    # Housing/shelter types rank ahead of sober living (priority 0 vs 1).
+    assert _titles(first) == ["Hope Shelter", "Sober House"]
+    assert first["total_count"] == 2
+    assert first["pagination"]["total_pages"] == 1
+    assert _titles(second) == []
+    assert second["total_count"] == 2
+
+
+def test_synonym_only_matches_do_not_outrank_curated_results(virgil, monkeypatch):
+    _no_scans(virgil, monkeypatch)
+    virgil.connect()
+    virgil.connection.executemany(
+        "INSERT INTO resources (name, description, type, address) VALUES (?, ?, ?, ?)",
+        [
+            ("Westside Mental Health Center", "Walk-in counseling", "mental_health", "10 Main St"),
+            ("Peer Support Line", "Mental health peer support", "mental_health", "11 Main St"),
+            ("Calm Minds Collective", "Group counseling and behavioral therapy", "mental_health", "12 Main St"),
+        ],
+    )
+    # Directory rows that only match "mental" through its "psychiatric" synonym.
+    virgil.connection.executemany(
+        "INSERT INTO medi_cal_providers (providerName, address, specialties) VALUES (?, ?, ?)",
+        [("PHYSICIAN", f"{n} Clinic Way", '["PSYCHIATRIC", "PSYCHIATRY", "BEHAVIORAL", "THERAPY"]') for n in range(10)],
+    )
+
+    result = virgil.search_services("mental health", per_page=5, category="mental-health")
+
+    assert sorted(_titles(result)[:3]) == ["Calm Minds Collective", "Peer Support Line", "Westside Mental Health Center"]
+    assert all(item["source"] == "virgil_st_resources" for item in result["results"])
+    assert result["total_count"] == 3
+
+
+def test_fts_can_be_disabled_for_the_like_scan(virgil, monkeypatch):
+    monkeypatch.setenv("CMSX_VIRGIL_FTS", "0")
+    result = virgil.search_services("food", per_page=10)
+
+    assert _titles(result) == ["Eastside Food Pantry"]
+    assert virgil.connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = ?", (FTS_TABLE,)
+    ).fetchone()[0] == 0